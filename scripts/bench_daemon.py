@@ -0,0 +1,118 @@
+"""Latency benchmark: per-command wall time with and without ``outlook serve``.
+
+Points a throwaway HOME at a local fake Graph server (tests/fake_graph.py)
+with a fake token, runs each command N times as a fresh process, then starts
+the daemon and runs them again so they are forwarded to the warm session.
+
+Usage:
+    uv run python scripts/bench_daemon.py
+    uv run python scripts/bench_daemon.py --runs 50 --latency-ms 40
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import tomli_w
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from tests.fake_graph import FakeGraph, install_default_routes, write_fake_token  # noqa: E402
+
+COMMANDS = [
+    ["mail", "search", "--limit", "10"],
+    ["mail", "search", "--folder", "Archive", "--limit", "10"],
+    ["mail", "read", "msg-1"],
+]
+
+DRIVER = "from outlook_cli.main import app; app(prog_name='outlook')"
+
+
+def _time_command(argv: list[str], env: dict) -> float:
+    started = time.perf_counter()
+    subprocess.run([sys.executable, "-c", DRIVER, *argv], env=env, check=True, capture_output=True)
+    return (time.perf_counter() - started) * 1000
+
+
+def _measure(runs: int, env: dict, fake: FakeGraph) -> dict[str, tuple[float, float, float]]:
+    """Return {command: (median ms, p95 ms, Graph requests per run)}."""
+    results = {}
+    for argv in COMMANDS:
+        before = len(fake.requests)
+        timings = sorted(_time_command(argv, env) for _ in range(runs))
+        p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+        results[" ".join(argv)] = (statistics.median(timings), p95, (len(fake.requests) - before) / runs)
+    return results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=20, help="Invocations per command")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Artificial delay per Graph request")
+    args = parser.parse_args()
+
+    home = Path(tempfile.mkdtemp(prefix="outlook-cli-bench-"))
+    config_dir = home / ".outlook-cli"
+    config_dir.mkdir(mode=0o700)
+
+    with FakeGraph() as fake:
+        install_default_routes(fake)
+
+        @fake.route("GET", r"/me/mailFolders")
+        def _folders(req):
+            return {"value": [{"id": "folder-archive", "displayName": "Archive"}]}
+
+        if args.latency_ms:
+            for index, (method, pattern, handler) in enumerate(fake.routes):
+                def delayed(req, handler=handler):
+                    time.sleep(args.latency_ms / 1000)
+                    return handler(req)
+
+                fake.routes[index] = (method, pattern, delayed)
+
+        (config_dir / "config.toml").write_text(
+            tomli_w.dumps({"client_id": "fake-client", "tenant_id": "common", "graph_url": fake.url})
+        )
+        write_fake_token(config_dir)
+
+        env = {key: value for key, value in os.environ.items() if key != "OUTLOOK_CLI_NO_DAEMON"}
+        env["HOME"] = str(home)
+
+        cold = _measure(args.runs, env, fake)
+
+        server = subprocess.Popen(
+            [sys.executable, "-c", DRIVER, "serve"], env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+        try:
+            socket_file = config_dir / "daemon.sock"
+            for _ in range(500):
+                if socket_file.exists():
+                    break
+                time.sleep(0.01)
+            else:
+                print("daemon did not start", file=sys.stderr)
+                return 1
+            warm = _measure(args.runs, env, fake)
+        finally:
+            subprocess.run([sys.executable, "-c", DRIVER, "serve", "--stop"], env=env, capture_output=True)
+            server.wait(timeout=10)
+
+    print(f"{'command':42} {'in-process':>22} {'daemon':>22} {'speedup':>8}")
+    for name, (cold_median, cold_p95, cold_requests) in cold.items():
+        warm_median, warm_p95, warm_requests = warm[name]
+        print(
+            f"{name:42} {cold_median:7.1f} ms p95 {cold_p95:6.1f} "
+            f"{warm_median:7.1f} ms p95 {warm_p95:6.1f} {cold_median / warm_median:7.1f}x"
+        )
+        print(f"{'':42} {cold_requests:12.1f} req/run {warm_requests:12.1f} req/run")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,102 @@
+"""Export benchmark: ``cal export`` of a long range against a stand-in server.
+
+Fills the local fake Graph server (tests/fake_graph.py) with N occurrences,
+exports them to an .ics file the way ``cal export --out`` does, then changes a
+handful and exports again. Reports time, HTTP requests and events rendered
+for both runs; with --memory, also peak Python memory (traced, so slower), to
+show that memory follows the busiest day rather than the number of events.
+
+Usage:
+    uv run python scripts/bench_export.py
+    uv run python scripts/bench_export.py --events 100000 --changes 50 --memory
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "src"))
+
+import outlook_cli.config as config  # noqa: E402
+from outlook_cli import calendar_view, exporter, ids  # noqa: E402
+from outlook_cli.auth import _build_account  # noqa: E402
+from tests.fake_graph import CalendarView, FakeGraph, event_resource, install_default_routes, write_fake_token  # noqa: E402
+
+PER_DAY = 40
+
+
+def _occurrence(index: int) -> dict:
+    start = datetime(2025, 1, 1, 8) + timedelta(days=index // PER_DAY, minutes=15 * (index % PER_DAY))
+    return event_resource(
+        index,
+        iCalUId=f"series-{index % 200}",
+        type="occurrence",
+        originalStart=f"{start.isoformat()}Z",
+        start={"dateTime": f"{start.isoformat()}.0000000", "timeZone": "UTC"},
+        end={"dateTime": f"{(start + timedelta(minutes=30)).isoformat()}.0000000", "timeZone": "UTC"},
+    )
+
+
+def _run(account, path: Path, first: date, last: date, memory: bool) -> tuple:
+    view = calendar_view.CalendarView(
+        calendar_view.connect(calendar_view.db_path(ids.account_key(account))),
+        account.con,
+        account.protocol.service_url,
+        "bench",
+        fields=exporter.EXPORT_FIELDS,
+        page_size=1000,
+    )
+    if memory:
+        tracemalloc.start()
+    started = time.perf_counter()
+    result = exporter.export_file(view, first, last, path)
+    elapsed = (time.perf_counter() - started) * 1000
+    peak = tracemalloc.get_traced_memory()[1] if memory else None
+    tracemalloc.stop()
+    view.db.close()
+    return result, view.requests, elapsed, peak
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, default=50_000)
+    parser.add_argument("--changes", type=int, default=20)
+    parser.add_argument("--memory", action="store_true", help="Also trace peak memory (slower)")
+    args = parser.parse_args()
+
+    with FakeGraph() as fake:
+        install_default_routes(fake, events=0)
+        server = CalendarView(fake)
+        server.add(*(_occurrence(index) for index in range(args.events)))
+
+        token_dir = Path(tempfile.mkdtemp(prefix="outlook-cli-bench-"))
+        write_fake_token(token_dir)
+        config.CONFIG_DIR = token_dir
+        account = _build_account("fake-client", "common", fake.url)
+        account.con.requests_delay = 0
+
+        first = date(2025, 1, 1)
+        last = first + timedelta(days=args.events // PER_DAY + 1)
+        path = token_dir / "export.ics"
+        full = _run(account, path, first, last, args.memory)
+        size = path.stat().st_size
+        for index in range(0, args.events, max(1, args.events // args.changes)):
+            server.change(f"evt-{index}", subject=f"Changed {index}")
+        incremental = _run(account, path, first, last, args.memory)
+
+    print(f"{args.events:,} events over {(last - first).days} days, {size / 1e6:.1f} MB of iCalendar\n")
+    print(f"{'':14} {'time':>10} {'requests':>9} {'rendered':>9} {'peak memory':>12}")
+    for label, (result, requests, elapsed, peak) in (("full", full), ("incremental", incremental)):
+        traced = f"{peak / 1e6:10.1f}MB" if peak is not None else f"{'-':>12}"
+        print(f"{label:14} {elapsed:8.0f}ms {requests:>9} {result.added + result.changed:>9} {traced}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
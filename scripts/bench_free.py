@@ -0,0 +1,107 @@
+"""Free-slot benchmark: ``cal free`` against a stand-in getSchedule server.
+
+Gives N synthetic attendees a few busy blocks per working day over W weeks,
+serves them from the local fake Graph server (tests/fake_graph.py) and runs
+the same fetch and ranking ``cal free`` does. Reports HTTP round trips,
+getSchedule calls, fetch time, and the ranking time of the difference-array
+sweep next to a per-slot scan over every attendee.
+
+Usage:
+    uv run python scripts/bench_free.py
+    uv run python scripts/bench_free.py --attendees 500 --weeks 8 --duration 60
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "src"))
+
+import outlook_cli.config as config  # noqa: E402
+from outlook_cli.auth import _build_account  # noqa: E402
+from outlook_cli.availability import FreeTimeFinder  # noqa: E402
+from tests.fake_graph import FakeGraph, Schedules, write_fake_token  # noqa: E402
+
+
+def _median_ms(run, runs: int) -> float:
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        run()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def _scan_counts(finder: FreeTimeFinder, width: int) -> list[int]:
+    """The naive merge: test every attendee's runs at every slot start."""
+    return [
+        sum(
+            1
+            for schedule in finder.schedules.values()
+            if any(run_start < first + width and first < run_end for run_start, run_end in schedule.busy)
+        )
+        for first in range(finder.slot_count - width + 1)
+    ]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--attendees", type=int, default=250)
+    parser.add_argument("--weeks", type=int, default=4)
+    parser.add_argument("--duration", type=int, default=30, help="Meeting length in minutes")
+    parser.add_argument("--interval", type=int, default=15)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    start = datetime(2025, 3, 3, tzinfo=timezone.utc)
+    end = start + timedelta(weeks=args.weeks)
+    addresses = [f"person{i}@example.com" for i in range(args.attendees)]
+
+    with FakeGraph() as fake:
+        schedules = Schedules(fake)
+        for address in addresses:
+            blocks = []
+            for day in range(args.weeks * 7):
+                for _ in range(rng.randint(1, 4)):
+                    first = datetime(2025, 3, 3) + timedelta(days=day, hours=rng.randint(8, 16), minutes=rng.choice((0, 30)))
+                    blocks.append((first, first + timedelta(minutes=rng.choice((30, 60, 90))), rng.choice("122")))
+            schedules.add(address, *blocks)
+
+        token_dir = Path(tempfile.mkdtemp(prefix="outlook-cli-bench-"))
+        write_fake_token(token_dir)
+        config.CONFIG_DIR = token_dir
+        account = _build_account("fake-client", "common", fake.url)
+        account.con.requests_delay = 0
+
+        finder = FreeTimeFinder(start, end, interval=args.interval)
+        started = time.perf_counter()
+        report = finder.fetch(account.con, account.protocol.service_url, addresses)
+        fetch_ms = (time.perf_counter() - started) * 1000
+
+    width = -(-timedelta(minutes=args.duration) // finder.interval)
+    assert finder.busy_counts(width) == _scan_counts(finder, width)
+    sweep_ms = _median_ms(lambda: finder.busy_counts(width), args.runs)
+    scan_ms = _median_ms(lambda: _scan_counts(finder, width), max(1, args.runs // 5))
+    rank_ms = _median_ms(lambda: finder.candidates(timedelta(minutes=args.duration)), args.runs)
+
+    runs = sum(len(schedule.busy) for schedule in finder.schedules.values())
+    print(f"{args.attendees} attendees, {args.weeks} week(s), {finder.slot_count} intervals, {runs:,} busy runs\n")
+    print(f"{'HTTP round trips':28} {report.request_count:>10}")
+    print(f"{'getSchedule calls':28} {len(schedules.calls):>10}")
+    print(f"{'fetch':28} {fetch_ms:8.1f}ms")
+    print(f"{'merge: sweep':28} {sweep_ms:8.1f}ms")
+    print(f"{'merge: per-slot scan':28} {scan_ms:8.1f}ms")
+    print(f"{'rank top 10 (with sweep)':28} {rank_ms:8.1f}ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,153 @@
+"""HTML body benchmark: the old five-pass regex stripper vs. display.plain_text.
+
+Builds large, realistic bodies (a table-laid-out marketing mail with inline
+styles and tracking links, and a long reply thread of nested blockquotes)
+and reports, for each, the time and peak Python memory to convert the whole
+body with the old chain of uncompiled ``re.sub`` calls and with
+``display.plain_text`` (two precompiled passes, what ``mail read`` and
+``cal export`` use). A second table times what ``mail read`` does with the
+text: printing it through rich, all at once before, a few KB at a time now,
+with the time until the first line is out.
+
+Usage:
+    uv run python scripts/bench_html.py
+    uv run python scripts/bench_html.py --size 8 --repeat 5
+"""
+
+import argparse
+import html
+import io
+import re
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+from rich.console import Console  # noqa: E402
+
+from outlook_cli import display  # noqa: E402
+
+
+STYLE = "<style>" + "".join(f".c{i} {{ color: #{i:06x}; padding: {i % 9}px; }}\n" for i in range(400)) + "</style>"
+
+
+def _marketing(size_mb: float) -> str:
+    cell = (
+        '<td class="c{n}" style="padding:8px;font-family:Arial,sans-serif;font-size:14px;color:#333333">'
+        '<a href="https://click.example.com/ls/click?upn=u{n}-AbCdEf&amp;utm_source=newsletter">'
+        '<img src="https://img.example.com/p/{n}.png" alt="Product {n}" width="120"></a><br>'
+        "<b>Product&nbsp;{n}</b> &ndash; now &euro;{n}.99<br>"
+        '<a href="https://shop.example.com/p/{n}?ref=mail">Shop now &raquo;</a></td>'
+    )
+    rows = []
+    n = 0
+    while sum(map(len, rows)) < size_mb * 1024 * 1024:
+        rows.append("<tr>" + "".join(cell.format(n=n + i) for i in range(3)) + "</tr>\n")
+        n += 3
+    return (
+        f"<html><head><meta charset='utf-8'>{STYLE}</head><body>"
+        '<table width="600" cellpadding="0" cellspacing="0" border="0">'
+        + "".join(rows)
+        + "</table><p style='font-size:11px'>Unsubscribe &middot; Privacy</p></body></html>"
+    )
+
+
+def _thread(size_mb: float) -> str:
+    message = (
+        '<div dir="ltr"><p>Hi team,</p><p>Following up on the <b>quarterly plan</b>; '
+        "numbers are in the attached sheet &amp; the summary is below:</p>"
+        "<ul><li>Revenue up 4%</li><li>Churn flat</li><li>Hiring: 3 open roles</li></ul>"
+        "<p>Thanks,<br>Alice</p></div>"
+        '<div class="gmail_quote">On Mon, Feb 3, 2025 at 9:14 AM Bob &lt;bob@example.com&gt; wrote:<br>'
+    )
+    parts = []
+    depth = 0
+    while sum(map(len, parts)) < size_mb * 1024 * 1024:
+        parts.append(message + '<blockquote style="margin:0 0 0 .8ex;border-left:1px #ccc solid">')
+        depth += 1
+    return "<html><body>" + "".join(parts) + "</blockquote></div>" * depth + "</body></html>"
+
+
+def _measure(func, body: str, repeat: int) -> tuple[float, int]:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(body)
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    func(body)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak
+
+
+def _old_plain_text(body: str) -> str:
+    """The converter as it was before the patterns were precompiled and merged."""
+    if not re.search(r"<(html|div|p|br|table)\b", body, re.IGNORECASE):
+        return body
+    clean = re.sub(r"<br\s*/?>", "\n", body)
+    clean = re.sub(r"<p[^>]*>", "\n", clean)
+    clean = re.sub(r"</p>", "", clean)
+    clean = re.sub(r"<[^>]+>", "", clean)
+    clean = re.sub(r"&nbsp;", " ", clean)
+    clean = html.unescape(clean)
+    return clean.strip()
+
+
+def _read(body: str, show) -> tuple[float, float]:
+    """Total and time-to-first-output of ``show(body)`` printing into a null console."""
+    sink = io.StringIO()
+    first: list[float] = []
+    console = Console(file=sink, width=100)
+    original_print = console.print
+
+    def _print(*args, **kwargs):
+        original_print(*args, **kwargs)
+        if not first and sink.tell():
+            first.append(time.perf_counter())
+
+    console.print = _print  # type: ignore[method-assign]
+    display.console = console
+    start = time.perf_counter()
+    show(body)
+    return time.perf_counter() - start, (first[0] if first else time.perf_counter()) - start
+
+
+def _read_old(body: str) -> None:
+    display.console.print(_old_plain_text(body))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=float, default=2.0, help="Body size in MB")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    samples = {"marketing": _marketing(args.size), "thread": _thread(args.size)}
+    print(f"{'sample':10} {'converter':12} {'time':>9} {'peak mem':>10} {'text':>9}")
+    for name, body in samples.items():
+        for label, func in (
+            ("old chain", _old_plain_text),
+            ("plain_text", display.plain_text),
+        ):
+            seconds, peak = _measure(func, body, args.repeat)
+            produced = len(func(body))
+            print(f"{name:10} {label:12} {seconds * 1000:>7.1f}ms {peak / 2**20:>8.1f}MB {produced:>9,}")
+
+    print(f"\n{'sample':10} {'mail read':12} {'total':>9} {'first line':>11}")
+    for name, body in samples.items():
+        for label, show in (("before", _read_old), ("now", display._print_body)):
+            total, first = _read(body, show)
+            print(f"{name:10} {label:12} {total * 1000:>7.0f}ms {first * 1000:>9.1f}ms")
+
+    # Sanity: merging the passes does not change the text.
+    for body in samples.values():
+        assert display.plain_text(body) == _old_plain_text(body)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,82 @@
+"""ID cache benchmark: HTTP requests per command without and with ``ids.json``.
+
+Points the CLI at the local fake Graph server (tests/fake_graph.py) through a
+throwaway config directory. Each command runs once to warm the other caches
+(calendar days, folder map), once more with ``ids.json`` removed (what every
+run used to cost) and once with it in place. The difference is the lookup
+round trips the ID cache saves per invocation.
+
+Usage:
+    uv run python scripts/bench_ids.py
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "src"))
+
+os.environ["OUTLOOK_CLI_NO_DAEMON"] = "1"
+
+import outlook_cli.config as config  # noqa: E402
+from outlook_cli import ids  # noqa: E402
+from outlook_cli.config import save_config  # noqa: E402
+from outlook_cli.main import app  # noqa: E402
+from tests.fake_graph import (  # noqa: E402
+    CalendarView,
+    DeltaLog,
+    FakeGraph,
+    event_resource,
+    install_default_routes,
+    write_fake_token,
+)
+from typer.testing import CliRunner  # noqa: E402
+
+WINDOW = ["--start", "2025-02-01", "--end", "2025-03-01"]
+COMMANDS = [
+    ["cal", "list", *WINDOW],
+    ["cal", "read", "evt-1"],
+    ["cal", "export", *WINDOW],
+    ["mail", "search", "--limit", "10"],
+    ["mail", "search", "--folder", "Archive", "--limit", "10"],
+]
+
+
+def main() -> int:
+    runner = CliRunner()
+    with FakeGraph() as fake:
+        install_default_routes(fake, events=0)
+        CalendarView(fake).add(*(event_resource(i) for i in range(10)))
+        fake.route("GET", r"/me/calendars/[^/]+/events/(?P<id>[^/]+)")(lambda req: event_resource(1))
+        DeltaLog(fake, "me/mailFolders/delta").add(
+            {"id": "inbox", "displayName": "Inbox", "parentFolderId": "root"},
+            {"id": "archive", "displayName": "Archive", "parentFolderId": "root"},
+        )
+
+        config_dir = Path(tempfile.mkdtemp(prefix="outlook-cli-bench-"))
+        config.CONFIG_DIR = config_dir
+        config.CONFIG_FILE = config_dir / "config.toml"
+        save_config({"client_id": "fake-client", "graph_url": fake.url})
+        write_fake_token(config_dir)
+
+        print(f"{'command':52} {'before':>7} {'after':>6}")
+        for command in COMMANDS:
+            counts = []
+            for run in range(3):
+                if run == 1:
+                    (config_dir / ids.CACHE_FILENAME).unlink(missing_ok=True)
+                before = len(fake.requests)
+                result = runner.invoke(app, command)
+                if result.exit_code != 0:
+                    print(f"{' '.join(command)} failed: {result.output}", file=sys.stderr)
+                    return 1
+                counts.append(len(fake.requests) - before)
+            print(f"{' '.join(command):52} {counts[1]:>7} {counts[2]:>6}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,103 @@
+"""Cold-start benchmark: measure CLI import time with ``python -X importtime``.
+
+Runs a handful of cheap invocations in fresh interpreters, parses the
+``-X importtime`` report and fails if the median cumulative import time of
+imports triggered by the CLI (interpreter start-up excluded) exceeds the
+budget, or if a scenario imports a module it should not need (e.g. O365 for
+``--version``). ``auth status`` runs against an empty temporary HOME so it
+never touches real credentials or the network.
+
+Usage:
+    uv run python scripts/bench_import_time.py
+    uv run python scripts/bench_import_time.py --budget-ms 150 --runs 9
+"""
+
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+
+# (name, argv, modules that must NOT be imported)
+SCENARIOS = [
+    ("--version", ["--version"], ["O365", "msal", "outlook_cli.commands.auth_cmd", "outlook_cli.commands.mail_cmd"]),
+    (
+        "auth status",
+        ["auth", "status"],
+        ["O365", "msal", "outlook_cli.commands.mail_cmd", "outlook_cli.commands.cal_cmd"],
+    ),
+]
+
+DRIVER = (
+    "import sys\n"
+    "from outlook_cli.main import app\n"
+    "try:\n"
+    "    app(sys.argv[1:], prog_name='outlook')\n"
+    "except SystemExit:\n"
+    "    pass\n"
+)
+
+IMPORT_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)$")
+
+
+def _run_once(argv: list[str], home: str) -> tuple[float, dict[str, int]]:
+    """Run one invocation; return (CLI import ms, {module: cumulative us})."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", DRIVER, *argv],
+        capture_output=True,
+        text=True,
+        check=True,
+        env={**os.environ, "HOME": home},
+    )
+    modules: dict[str, int] = {}
+    total_us = 0
+    for line in proc.stderr.splitlines():
+        match = IMPORT_LINE.match(line)
+        if not match:
+            continue
+        cumulative, indent, name = int(match.group(2)), match.group(3), match.group(4)
+        modules[name] = cumulative
+        if len(indent) != 1:  # only count top-level imports
+            continue
+        if name == "site":  # everything so far was interpreter start-up
+            modules.clear()
+            total_us = 0
+        else:
+            total_us += cumulative
+    return total_us / 1000, modules
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--budget-ms", type=float, default=120.0, help="Max median import time per scenario")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters per scenario")
+    args = parser.parse_args()
+
+    home = tempfile.mkdtemp(prefix="outlook-cli-bench-")
+    failed = False
+    for name, argv, forbidden in SCENARIOS:
+        timings = []
+        modules: dict[str, int] = {}
+        for _ in range(args.runs):
+            elapsed, modules = _run_once(argv, home)
+            timings.append(elapsed)
+        median = statistics.median(timings)
+
+        leaked = [mod for mod in forbidden if mod in modules]
+        over_budget = median > args.budget_ms
+        status = "FAIL" if leaked or over_budget else "ok"
+        print(f"{status:4}  {name:14} median {median:7.1f} ms  (budget {args.budget_ms:.0f} ms)")
+        if leaked:
+            print(f"      unexpected imports: {', '.join(leaked)}")
+        heaviest = sorted(modules.items(), key=lambda item: item[1], reverse=True)[:5]
+        for mod, cumulative in heaviest:
+            print(f"      {cumulative / 1000:7.1f} ms  {mod}")
+        failed = failed or leaked or over_budget
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
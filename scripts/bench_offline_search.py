@@ -0,0 +1,145 @@
+"""Offline search benchmark: FTS5 index vs. a LIKE scan on a synthetic mirror.
+
+Builds a mirror of N synthetic messages in a temp directory (through the same
+``apply_changes`` path ``mail sync`` uses, so index maintenance is included),
+then times text + filter queries through ``mirror.search`` and through an
+equivalent substring scan, plus the cost of indexing a page of new arrivals.
+
+Usage:
+    uv run python scripts/bench_offline_search.py
+    uv run python scripts/bench_offline_search.py --messages 20000 --runs 50
+"""
+
+import argparse
+import itertools
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+from outlook_cli import mirror  # noqa: E402
+
+WORDS = (
+    "quarterly report budget review offsite agenda invoice contract renewal launch "
+    "roadmap hiring update planning draft feedback schedule meeting customer escalation "
+    "migration outage postmortem security audit travel expense approval design sprint "
+    "release notes onboarding training workshop forecast revenue pipeline partner"
+).split()
+PEOPLE = [f"person{i}" for i in range(200)]
+# Filler vocabulary with a Zipf-like frequency curve, as in real mail text.
+FILLER = [f"word{i}" for i in range(20_000)]
+FILLER_WEIGHTS = list(itertools.accumulate(1 / (rank + 1) for rank in range(len(FILLER))))
+
+QUERIES = [
+    ("quarterly report", {}),
+    ("quarterly report", {"sender": "person7@", "unread": True}),
+    ("budget", {"has_attachments": True, "start": datetime(2025, 1, 1), "end": datetime(2025, 6, 30)}),
+    ("postmortem outage", {"important": True}),
+    ("migration", {"sender": "person42@"}),
+]
+
+
+def _message(index: int, rng: random.Random, epoch: datetime) -> dict:
+    sender = rng.choice(PEOPLE)
+    recipients = rng.sample(PEOPLE, 3)
+    return {
+        "id": f"msg-{index}",
+        "subject": " ".join(rng.choices(WORDS, k=2) + rng.choices(FILLER, cum_weights=FILLER_WEIGHTS, k=4)),
+        "from": {"emailAddress": {"name": sender.title(), "address": f"{sender}@example.com"}},
+        "toRecipients": [{"emailAddress": {"name": name.title(), "address": f"{name}@example.com"}} for name in recipients],
+        "ccRecipients": [],
+        "receivedDateTime": (epoch + timedelta(minutes=index * 5)).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "isRead": rng.random() < 0.7,
+        "importance": "high" if rng.random() < 0.05 else "normal",
+        "hasAttachments": rng.random() < 0.2,
+        "body": {
+            "contentType": "text",
+            "content": " ".join(rng.choices(WORDS, k=3) + rng.choices(FILLER, cum_weights=FILLER_WEIGHTS, k=80)),
+        },
+    }
+
+
+def _like_search(db, query: str, **filters) -> list:
+    """The pre-index approach: every term as a substring scan over each column."""
+    clauses, params = [], []
+    for term in query.split():
+        clauses.append("(subject LIKE ? OR sender_name LIKE ? OR sender_address LIKE ? OR body LIKE ?)")
+        params.extend([f"%{term}%"] * 4)
+    if filters.get("sender"):
+        clauses.append("(sender_address LIKE ? OR sender_name LIKE ?)")
+        params.extend([f"%{filters['sender']}%"] * 2)
+    if filters.get("start"):
+        clauses.append("received >= ?")
+        params.append(filters["start"].strftime("%Y-%m-%dT%H:%M:%SZ"))
+    if filters.get("end"):
+        clauses.append("received <= ?")
+        params.append(filters["end"].strftime("%Y-%m-%dT%H:%M:%SZ"))
+    if filters.get("unread"):
+        clauses.append("is_read = 0")
+    if filters.get("important"):
+        clauses.append("importance = 'high'")
+    if filters.get("has_attachments"):
+        clauses.append("has_attachments = 1")
+    sql = f"SELECT * FROM messages WHERE {' AND '.join(clauses)} ORDER BY received DESC LIMIT 25"
+    return db.execute(sql, params).fetchall()
+
+
+def _time(fn, runs: int) -> tuple[float, float]:
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+    return statistics.median(timings), timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--messages", type=int, default=100_000, help="Size of the synthetic corpus")
+    parser.add_argument("--runs", type=int, default=20, help="Timed runs per query")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    epoch = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    path = Path(tempfile.mkdtemp(prefix="outlook-cli-bench-")) / mirror.DB_FILENAME
+    db = mirror.connect(path)
+
+    started = time.perf_counter()
+    for offset in range(0, args.messages, 1000):
+        page = [_message(i, rng, epoch) for i in range(offset, min(offset + 1000, args.messages))]
+        with db:
+            mirror.apply_changes(db, "Inbox", page)
+    build_s = time.perf_counter() - started
+    db.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    size_mb = path.stat().st_size / 1e6
+    print(f"built {args.messages:,} messages in {build_s:.1f} s ({size_mb:.0f} MB with index)\n")
+
+    print(f"{'query':58} {'FTS5 + BM25':>20} {'LIKE scan':>20} {'speedup':>8}")
+    for query, filters in QUERIES:
+        fts = _time(lambda: mirror.search(db, folder="Inbox", query=query, **filters), args.runs)
+        like = _time(lambda: _like_search(db, query, **filters), max(3, args.runs // 4))
+        label = query + "".join(f" --{key}" for key in filters)
+        print(
+            f"{label[:58]:58} {fts[0]:7.2f} ms p95 {fts[1]:6.2f} "
+            f"{like[0]:7.1f} ms p95 {like[1]:6.1f} {like[0] / fts[0]:7.0f}x"
+        )
+
+    arrivals = [_message(args.messages + i, rng, epoch) for i in range(100)]
+    started = time.perf_counter()
+    with db:
+        mirror.apply_changes(db, "Inbox", arrivals)
+    print(f"\nincremental: indexed a page of 100 new messages in {(time.perf_counter() - started) * 1000:.1f} ms")
+    db.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,96 @@
+"""Output benchmark: streaming ``--output`` writers vs. the rich table.
+
+Renders generated messages in each machine-readable format into a null sink
+and reports throughput and peak Python memory. Peak memory should stay flat
+as the row count grows, because records are serialized one at a time; the
+table baseline has to hold every row before it can lay out its columns.
+
+Usage:
+    uv run python scripts/bench_output.py
+    uv run python scripts/bench_output.py --rows 1000000 --table-rows 5000
+"""
+
+import argparse
+import io
+import os
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+from rich.console import Console  # noqa: E402
+
+from outlook_cli import display, output  # noqa: E402
+from outlook_cli.mirror import MirroredMessage  # noqa: E402
+from outlook_cli.output import MESSAGE_FIELDS, OutputFormat  # noqa: E402
+
+EPOCH = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+def _messages(count: int):
+    for index in range(count):
+        yield MirroredMessage(
+            object_id=f"AAMkAGI2TG93AAA{index:012d}",
+            folder="Inbox",
+            subject=f"Quarterly planning follow-up #{index}, action items",
+            sender=f"Sender {index % 50} <sender{index % 50}@example.com>",
+            received=EPOCH + timedelta(minutes=index),
+            is_read=index % 3 != 0,
+            importance="high" if index % 10 == 0 else "normal",
+            has_attachments=index % 5 == 0,
+            to=["me@example.com", "team@example.com"],
+            cc=[],
+            body="",
+        )
+
+
+def _measure(render, rows: int) -> tuple[float, float]:
+    """Wall time (s) and peak traced memory (MB) of rendering ``rows`` messages.
+
+    Tracing slows allocation-heavy code several times over, so the timed run
+    and the traced run are separate.
+    """
+    started = time.perf_counter()
+    render(_messages(rows))
+    elapsed = time.perf_counter() - started
+    tracemalloc.start()
+    render(_messages(rows))
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak / 1e6
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--table-rows", type=int, default=2_000, help="Rows for the rich table baseline")
+    args = parser.parse_args()
+
+    sink = open(os.devnull, "w")
+    renderers = {
+        fmt.value: lambda items, fmt=fmt: output.write(items, output.message_record, MESSAGE_FIELDS, fmt=fmt, out=sink)
+        for fmt in OutputFormat
+        if fmt is not OutputFormat.table
+    }
+
+    def _table(items):
+        display.console = Console(file=io.StringIO(), width=160)
+        display.print_mail_table(list(items))
+
+    print(f"{'format':8} {'rows':>9} {'time':>9} {'rows/s':>10} {'peak mem':>10}")
+    for name, render in renderers.items():
+        for rows in (args.rows // 10, args.rows):
+            elapsed, peak = _measure(render, rows)
+            print(f"{name:8} {rows:9,} {elapsed:8.2f}s {rows / elapsed:10,.0f} {peak:8.2f}MB")
+    elapsed, peak = _measure(_table, args.table_rows)
+    print(f"{'table':8} {args.table_rows:9,} {elapsed:8.2f}s {args.table_rows / elapsed:10,.0f} {peak:8.2f}MB")
+    sink.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
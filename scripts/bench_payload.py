@@ -0,0 +1,108 @@
+"""Payload benchmark: list views with the default ``$select`` projection vs. full resources.
+
+Serves messages and events with realistic HTML bodies from the local fake
+Graph server (tests/fake_graph.py) and fetches a page the way ``mail search``
+and ``cal list`` do, once with the list projection and once with
+``--fields all``. Reports bytes on the wire, wall time and peak Python memory.
+
+Usage:
+    uv run python scripts/bench_payload.py
+    uv run python scripts/bench_payload.py --limit 200 --body-kb 40
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "src"))
+
+import outlook_cli.config as config  # noqa: E402
+from outlook_cli.auth import _build_account  # noqa: E402
+from outlook_cli.query import EVENT_LIST_FIELDS, MAIL_LIST_FIELDS, ODataQuery  # noqa: E402
+from tests.fake_graph import FakeGraph, event_resource, message_resource, project, write_fake_token  # noqa: E402
+
+
+def _html_body(index: int, size_kb: int) -> dict:
+    paragraph = f"<p style=\"font-family:Calibri\">Paragraph for item {index} with some quoted history.</p>"
+    return {"contentType": "html", "content": "<html><body>" + paragraph * (size_kb * 1024 // len(paragraph)) + "</body></html>"}
+
+
+def _measure(fetch, runs: int) -> tuple[float, float]:
+    """Median wall time (ms) and peak traced memory (MB) of ``fetch``."""
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        fetch()
+        timings.append((time.perf_counter() - started) * 1000)
+    tracemalloc.start()
+    fetch()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return statistics.median(timings), peak / 1e6
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--limit", type=int, default=100, help="Items per list request")
+    parser.add_argument("--body-kb", type=int, default=20, help="Approximate HTML body size per item")
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    messages = [message_resource(i, body=_html_body(i, args.body_kb)) for i in range(args.limit)]
+    events = [event_resource(i, body=_html_body(i, args.body_kb)) for i in range(args.limit)]
+    sent = {"bytes": 0}
+
+    with FakeGraph() as fake:
+        def _serve(resources):
+            def handler(req):
+                body = {"value": [project(resource, req) for resource in resources]}
+                sent["bytes"] += len(json.dumps(body))
+                return body
+
+            return handler
+
+        fake.route("GET", r"/me/mailFolders/[^/]+/messages")(_serve(messages))
+        fake.route("GET", r"/me/calendars/[^/]+/calendarView")(_serve(events))
+        fake.route("GET", r"/me/calendar")(lambda req: {"id": "cal-default", "name": "Calendar"})
+
+        token_dir = Path(tempfile.mkdtemp(prefix="outlook-cli-bench-"))
+        write_fake_token(token_dir)
+        config.CONFIG_DIR = token_dir
+        account = _build_account("fake-client", "common", fake.url)
+        account.con.requests_delay = 0
+        inbox = account.mailbox().inbox_folder()
+        calendar = account.schedule().get_default_calendar()
+
+        start, end = datetime(2025, 2, 1).astimezone(), datetime(2025, 3, 1).astimezone()
+        scenarios = {
+            "mail search": lambda select: list(inbox.get_messages(limit=args.limit, query=ODataQuery(select=select))),
+            "cal list": lambda select: list(
+                calendar.get_events(
+                    limit=args.limit, query=ODataQuery(select=select), start_recurring=start, end_recurring=end
+                )
+            ),
+        }
+        projections = {"mail search": MAIL_LIST_FIELDS, "cal list": EVENT_LIST_FIELDS}
+
+        print(f"{args.limit} items per page, ~{args.body_kb} KB HTML body each\n")
+        print(f"{'command':14} {'fields':10} {'bytes/page':>12} {'median':>10} {'peak mem':>10}")
+        for name, fetch in scenarios.items():
+            for label, select in (("list", list(projections[name])), ("all", None)):
+                sent["bytes"] = 0
+                fetch(select)
+                page_bytes = sent["bytes"]
+                median, peak = _measure(lambda: fetch(select), args.runs)
+                print(f"{name:14} {label:10} {page_bytes:12,} {median:8.1f}ms {peak:8.1f}MB")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,248 @@
+"""Message attachments: listing, and streamed downloads (``mail attachments``).
+
+Listings select only metadata: ``contentBytes`` (the whole file, base64
+encoded inside the JSON) is never requested. Downloads read each
+attachment's raw ``/$value`` with a streamed response and write it to disk
+in :data:`CHUNK_SIZE` pieces, so memory stays flat for 100 MB files, and
+several attachments download at once (up to :data:`DEFAULT_WORKERS`, the
+per-mailbox concurrency the throttle allows anyway).
+
+Bytes go to ``NAME.part`` first. An interrupted download leaves the part
+file behind and the next run asks for the rest with a ``Range`` request
+(starting over if the server sends the whole body instead). A finished
+download is checked against the length the server declared before it is
+renamed into place, so a truncated file is never mistaken for a complete one,
+and a response that runs past that length is cut off as it streams.
+
+A file that is already saved is skipped only if its size matches the length
+the server declares for the attachment now; otherwise the download gets a
+numbered name (``name (2).ext``) and the existing file is left alone.
+"""
+
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from itertools import count
+from pathlib import Path
+from typing import Any, Callable, Iterable, Optional
+
+from requests.exceptions import HTTPError, RequestException
+
+CHUNK_SIZE = 1024 * 1024
+DEFAULT_WORKERS = 4
+PART_SUFFIX = ".part"
+LIST_FIELDS = ("id", "name", "size", "contentType", "isInline")
+RANGE_NOT_SATISFIABLE = 416
+
+_KINDS = {
+    "#microsoft.graph.fileAttachment": "file",
+    "#microsoft.graph.itemAttachment": "item",
+    "#microsoft.graph.referenceAttachment": "reference",
+}
+_CONTENT_RANGE = re.compile(r"bytes\s+(\d+)-(\d+)/(\d+)")
+_UNSAFE_NAME = re.compile(r'[\x00-\x1f<>:"/\\|?*]')
+
+
+@dataclass
+class Attachment:
+    id: str
+    name: str
+    size: int
+    content_type: str
+    kind: str
+    is_inline: bool
+
+    @classmethod
+    def from_resource(cls, resource: dict) -> "Attachment":
+        return cls(
+            id=resource["id"],
+            name=resource.get("name") or "attachment",
+            size=int(resource.get("size") or 0),
+            content_type=resource.get("contentType") or "",
+            kind=_KINDS.get(resource.get("@odata.type", ""), "file"),
+            is_inline=bool(resource.get("isInline")),
+        )
+
+    @property
+    def downloadable(self) -> bool:
+        """Reference attachments are links to cloud files; there is nothing to download."""
+        return self.kind != "reference"
+
+
+@dataclass
+class Download:
+    """Outcome of one attachment's download."""
+
+    attachment: Attachment
+    path: Path
+    size: int = 0
+    resumed_from: int = 0
+    skipped: bool = False
+    note: str = ""
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class IncompleteDownload(Exception):
+    """Fewer (or more) bytes arrived than the server declared."""
+
+
+def list_attachments(con: Any, service_url: str, message_id: str) -> list[Attachment]:
+    url: Optional[str] = (
+        f"{service_url.rstrip('/')}/me/messages/{message_id}/attachments?$select={','.join(LIST_FIELDS)}"
+    )
+    found = []
+    while url:
+        page = con.get(url).json()
+        found.extend(Attachment.from_resource(resource) for resource in page.get("value", []))
+        url = page.get("@odata.nextLink")
+    return found
+
+
+def _numbered(name: str, number: int) -> str:
+    """``name (number).ext``, the name a repeat of ``name`` is saved under."""
+    stem, dot, suffix = name.rpartition(".")
+    if not dot or not stem:
+        return f"{name} ({number})"
+    return f"{stem} ({number}).{suffix}"
+
+
+def file_names(attachments: Iterable[Attachment]) -> list[str]:
+    """Safe, distinct file names: no path separators, ``name (2).ext`` for repeats."""
+    taken: set[str] = set()
+    names = []
+    for attachment in attachments:
+        base = _UNSAFE_NAME.sub("_", attachment.name).strip(" .") or "attachment"
+        name, number = base, 1
+        while name.lower() in taken:
+            number += 1
+            name = _numbered(base, number)
+        taken.add(name.lower())
+        names.append(name)
+    return names
+
+
+def _declared_size(response: Any) -> Optional[int]:
+    """The complete file's length according to the response, if it says."""
+    if response.status_code == 206:
+        match = _CONTENT_RANGE.match(response.headers.get("Content-Range", ""))
+        return int(match.group(3)) if match else None
+    if response.headers.get("Content-Encoding", "identity") != "identity":
+        return None
+    length = response.headers.get("Content-Length")
+    return int(length) if length is not None and length.isdigit() else None
+
+
+def remote_size(con: Any, url: str) -> Optional[int]:
+    """The length the server declares for ``url``'s content, without reading it."""
+    with con.get(url, headers={"Accept-Encoding": "identity"}, stream=True) as response:
+        return _declared_size(response)
+
+
+def download(con: Any, url: str, path: Path, chunk_size: int = CHUNK_SIZE) -> tuple[int, int]:
+    """Stream ``url`` to ``path`` through ``path.part``; returns (size, resumed from byte)."""
+    part = path.with_name(path.name + PART_SUFFIX)
+    offset = part.stat().st_size if part.exists() else 0
+    headers = {"Accept-Encoding": "identity"}
+    if offset:
+        headers["Range"] = f"bytes={offset}-"
+    try:
+        response = con.get(url, headers=headers, stream=True)
+    except HTTPError as exc:
+        if not offset or exc.response is None or exc.response.status_code != RANGE_NOT_SATISFIABLE:
+            raise
+        # The part file is no prefix of the current content; start over.
+        part.unlink()
+        return download(con, url, path, chunk_size)
+
+    with response:
+        if offset and response.status_code != 206:
+            offset = 0  # The server ignored the range and sent everything.
+        expected = _declared_size(response)
+        size = offset
+        with part.open("r+b" if offset else "wb") as fh:
+            fh.seek(offset)
+            fh.truncate()
+            for chunk in response.iter_content(chunk_size):
+                size += len(chunk)
+                if expected is not None and size > expected:
+                    break
+                fh.write(chunk)
+    if expected is not None and size > expected:
+        # More than the server declared: the part file can't be trusted to resume from.
+        part.unlink()
+        raise IncompleteDownload(f"received more than the {expected:,} bytes declared")
+
+    size = part.stat().st_size
+    if expected is not None and size != expected:
+        raise IncompleteDownload(f"received {size:,} of {expected:,} bytes")
+    os.replace(part, path)
+    return size, offset
+
+
+def download_all(
+    con: Any,
+    service_url: str,
+    message_id: str,
+    attachments: list[Attachment],
+    directory: Path,
+    *,
+    workers: int = DEFAULT_WORKERS,
+    on_done: Optional[Callable[[Download], None]] = None,
+) -> list[Download]:
+    """Download ``attachments`` into ``directory``, several at a time.
+
+    Results come back in listing order; ``on_done`` sees each as it finishes.
+    Files already saved with the declared size are skipped, a different file
+    of the same name gets the download a numbered name, and errors are kept
+    per attachment.
+    """
+    base = f"{service_url.rstrip('/')}/me/messages/{message_id}/attachments"
+    results = [
+        Download(attachment, directory / name) for attachment, name in zip(attachments, file_names(attachments))
+    ]
+    taken = {result.path.name.lower() for result in results}
+    lock = threading.Lock()
+
+    def _already_saved(result: Download, size: Optional[int]) -> bool:
+        """Whether ``result``'s file (or a numbered copy) has ``size``; if not, pick a free name for it."""
+        original = result.path
+        names = (_numbered(original.name, number) for number in count(2))
+        free = (original.with_name(name) for name in names if name.lower() not in taken)
+        with lock:
+            path = original
+            while path.exists():
+                if size is not None and path.stat().st_size == size:
+                    result.path = path
+                    return True
+                path = next(free)
+            taken.add(path.name.lower())
+        result.path = path
+        result.note = f"{original.name} exists with other content"
+        return False
+
+    def _fetch(result: Download) -> Download:
+        url = f"{base}/{result.attachment.id}/$value"
+        if not result.attachment.downloadable:
+            result.skipped, result.note = True, "link to a cloud file"
+            return result
+        try:
+            if result.path.exists() and _already_saved(result, remote_size(con, url)):
+                result.skipped, result.note = True, "already saved"
+                result.size = result.path.stat().st_size
+            else:
+                result.size, result.resumed_from = download(con, url, result.path)
+        except (RequestException, IncompleteDownload, OSError) as exc:
+            result.error = str(exc)
+        return result
+
+    with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="outlook-attach") as pool:
+        for future in as_completed([pool.submit(_fetch, result) for result in results]):
+            if on_done is not None:
+                on_done(future.result())
+    return results
@@ -1,32 +1,55 @@
 """O365 authentication with device code flow via MSAL."""
 
+from typing import TYPE_CHECKING, Optional
+
 import typer
-from msal import PublicClientApplication
-from O365 import Account, FileSystemTokenBackend
 
 from outlook_cli.config import get_config_dir, load_config
 from outlook_cli.display import console, print_error
 
+if TYPE_CHECKING:
+    from O365 import Account, FileSystemTokenBackend
+
 
 SCOPES = ["message_all", "calendar_all"]
 TOKEN_FILENAME = "o365_token"
 MSAL_AUTHORITY = "https://login.microsoftonline.com/{tenant_id}"
 
+_warm_account: Optional["Account"] = None
+
+
+# O365 and msal are imported inside the functions that use them: together they
+# account for most of the CLI's start-up time and many commands never need them.
+
+
+def _token_backend() -> "FileSystemTokenBackend":
+    from O365 import FileSystemTokenBackend
 
-def _token_backend() -> FileSystemTokenBackend:
     return FileSystemTokenBackend(
         token_path=get_config_dir(),
         token_filename=TOKEN_FILENAME,
     )
 
 
-def _build_account(client_id: str, tenant_id: str = "common") -> Account:
-    return Account(
+def _build_account(
+    client_id: str, tenant_id: str = "common", graph_url: Optional[str] = None
+) -> "Account":
+    from O365 import Account
+
+    from outlook_cli import throttle
+
+    account = Account(
         (client_id,),
         auth_flow_type="public",
         tenant_id=tenant_id,
         token_backend=_token_backend(),
     )
+    if graph_url:
+        # National clouds or a local stand-in server for tests and benchmarks.
+        protocol = account.protocol
+        protocol.service_url = f"{graph_url.rstrip('/')}/{protocol.api_version}/"
+    throttle.install(account.con)
+    return account
 
 
 def _get_graph_scopes(client_id: str, tenant_id: str = "common") -> list[str]:
@@ -37,6 +60,8 @@ def _get_graph_scopes(client_id: str, tenant_id: str = "common") -> list[str]:
 
 def authenticate(client_id: str, tenant_id: str = "common") -> bool:
     """Run device code auth flow using MSAL. Returns True on success."""
+    from msal import PublicClientApplication
+
     backend = _token_backend()
     scopes = _get_graph_scopes(client_id, tenant_id)
     authority = MSAL_AUTHORITY.format(tenant_id=tenant_id)
@@ -87,8 +112,17 @@ def is_authenticated() -> bool:
         return False
 
 
-def get_account() -> Account:
+def set_warm_account(account: Optional["Account"]) -> None:
+    """Make get_account() return ``account`` (used by the ``outlook serve`` daemon)."""
+    global _warm_account
+    _warm_account = account
+
+
+def get_account() -> "Account":
     """Return an authenticated Account or exit with an error."""
+    if _warm_account is not None:
+        return _warm_account
+
     config = load_config()
     client_id = config.get("client_id")
 
@@ -97,7 +131,9 @@ def get_account() -> Account:
         raise typer.Exit(1)
 
     try:
-        account = _build_account(client_id, config.get("tenant_id", "common"))
+        account = _build_account(
+            client_id, config.get("tenant_id", "common"), config.get("graph_url")
+        )
     except Exception as exc:
         print_error(f"Failed to initialize account: {exc}")
         raise typer.Exit(1) from exc
@@ -0,0 +1,252 @@
+"""Common free time across many attendees, from ``getSchedule``.
+
+``POST /me/calendar/getSchedule`` takes a limited number of mailboxes and a
+limited window per call, so a request for many attendees over several weeks is
+split into calls of :data:`MAX_SCHEDULES` mailboxes and :data:`MAX_WINDOW_DAYS`
+days, and those calls go through the ``$batch`` engine (20 per round trip).
+
+Each mailbox comes back as an ``availabilityView`` string with one digit per
+interval. Its busy runs become +1/-1 marks in a difference array over the
+whole window, so a single prefix-sum sweep gives how many attendees are busy
+at every possible slot start in O(runs + intervals), however many attendees
+there are. Widening each busy run by the slot length first makes that the
+number of attendees who cannot make a slot starting there.
+"""
+
+import re
+from dataclasses import dataclass, field
+from datetime import datetime, time, timedelta, timezone
+from typing import Any, Iterator, Optional
+
+from outlook_cli.batch import BatchReport, BatchRequest, execute
+from outlook_cli.query import utc_timestamp
+
+# Mailboxes per getSchedule call, and the longest window one call may cover.
+MAX_SCHEDULES = 20
+MAX_WINDOW_DAYS = 62
+DEFAULT_INTERVAL = 15
+# availabilityView digits: 0 free, 1 tentative, 2 busy, 3 out of office, 4 working elsewhere.
+BUSY = frozenset("234")
+BUSY_WITH_TENTATIVE = frozenset("1234")
+
+_DURATION = re.compile(r"^\s*(?:(?P<hours>\d+)\s*h)?\s*(?:(?P<minutes>\d+)\s*m?)?\s*$", re.IGNORECASE)
+
+
+def parse_duration(value: str) -> timedelta:
+    """``30m``, ``1h``, ``1h30m`` or a bare number of minutes."""
+    match = _DURATION.match(value)
+    if not match or not (match["hours"] or match["minutes"]):
+        raise ValueError(f"Invalid duration: {value} (expected e.g. 30m, 1h, 1h30m)")
+    delta = timedelta(hours=int(match["hours"] or 0), minutes=int(match["minutes"] or 0))
+    if not delta:
+        raise ValueError("Duration must be longer than zero")
+    return delta
+
+
+@dataclass
+class Schedule:
+    """One attendee's busy intervals, as ``[start, end)`` slot indexes."""
+
+    address: str
+    busy: list[tuple[int, int]] = field(default_factory=list)
+    error: Optional[str] = None
+
+
+@dataclass
+class Slot:
+    start: datetime
+    end: datetime
+    available: int
+    busy: list[str]
+
+
+def _busy_runs(view: str, offset: int, busy_states: frozenset) -> Iterator[tuple[int, int]]:
+    run_start = None
+    for index, state in enumerate(view):
+        if state in busy_states:
+            if run_start is None:
+                run_start = index
+        elif run_start is not None:
+            yield offset + run_start, offset + index
+            run_start = None
+    if run_start is not None:
+        yield offset + run_start, offset + len(view)
+
+
+class FreeTimeFinder:
+    """Fetches schedules for a window and ranks candidate meeting slots."""
+
+    def __init__(self, start: datetime, end: datetime, interval: int = DEFAULT_INTERVAL) -> None:
+        self.start = start.astimezone(timezone.utc)
+        self.end = end.astimezone(timezone.utc)
+        self.interval = timedelta(minutes=interval)
+        self.slot_count = max(0, int((self.end - self.start) / self.interval))
+        self.schedules: dict[str, Schedule] = {}
+
+    # ── Fetching ───────────────────────────────────────────────
+
+    def _pieces(self) -> list[tuple[datetime, datetime, int]]:
+        """Sub-windows no longer than one call allows, with their first slot index."""
+        pieces = []
+        step = (timedelta(days=MAX_WINDOW_DAYS) // self.interval) * self.interval
+        piece_start = self.start
+        window_end = self.start + self.slot_count * self.interval
+        while piece_start < window_end:
+            piece_end = min(piece_start + step, window_end)
+            pieces.append((piece_start, piece_end, int((piece_start - self.start) / self.interval)))
+            piece_start = piece_end
+        return pieces
+
+    def requests(self, attendees: list[str]) -> tuple[list[BatchRequest], dict[str, int]]:
+        """getSchedule sub-requests for every attendee chunk and sub-window."""
+        requests = []
+        offsets = {}
+        for piece_start, piece_end, offset in self._pieces():
+            for first in range(0, len(attendees), MAX_SCHEDULES):
+                request_id = str(len(requests))
+                offsets[request_id] = offset
+                requests.append(
+                    BatchRequest(
+                        request_id,
+                        "POST",
+                        "/me/calendar/getSchedule",
+                        {
+                            "schedules": attendees[first:first + MAX_SCHEDULES],
+                            "startTime": {"dateTime": utc_timestamp(piece_start), "timeZone": "UTC"},
+                            "endTime": {"dateTime": utc_timestamp(piece_end), "timeZone": "UTC"},
+                            "availabilityViewInterval": int(self.interval.total_seconds() // 60),
+                        },
+                    )
+                )
+        return requests, offsets
+
+    def fetch(self, con: Any, service_url: str, attendees: list[str], tentative_busy: bool = True) -> BatchReport:
+        """Load every attendee's availability; failed calls mark their attendees with an error.
+
+        Schedules are keyed by lowercased address, as Graph may answer with
+        the mailbox's own spelling; addresses differing only in case count once.
+        """
+        self.schedules = {}
+        for address in attendees:
+            self.schedules.setdefault(address.lower(), Schedule(address))
+        requests, offsets = self.requests([schedule.address for schedule in self.schedules.values()])
+        report = execute(con, service_url, requests)
+        self.add_responses(report, requests, offsets, tentative_busy)
+        return report
+
+    def add_responses(
+        self, report: BatchReport, requests: list[BatchRequest], offsets: dict[str, int], tentative_busy: bool = True
+    ) -> None:
+        busy_states = BUSY_WITH_TENTATIVE if tentative_busy else BUSY
+        for request in requests:
+            response = report.responses[request.id]
+            if not response.ok:
+                for address in request.body["schedules"]:
+                    self.schedules[address.lower()].error = response.error
+                continue
+            answered = set()
+            for item in response.body.get("value", []):
+                key = item.get("scheduleId", "").lower()
+                schedule = self.schedules.get(key)
+                if schedule is None:
+                    continue
+                answered.add(key)
+                if item.get("error"):
+                    schedule.error = item["error"].get("message") or "unavailable"
+                    continue
+                view = item.get("availabilityView", "")
+                schedule.busy.extend(_busy_runs(view, offsets[request.id], busy_states))
+            for address in request.body["schedules"]:
+                if address.lower() not in answered:
+                    self.schedules[address.lower()].error = "no schedule returned"
+
+    # ── Ranking ────────────────────────────────────────────────
+
+    def busy_counts(self, width: int = 1) -> list[int]:
+        """Attendees busy at some point in the ``width`` intervals starting at each index.
+
+        A busy run ``[a, b)`` rules out every start in ``(a - width, b)``; each
+        attendee's widened runs are merged so they count once, marked in a
+        difference array and summed in one sweep.
+        """
+        starts = max(0, self.slot_count - width + 1)
+        marks = [0] * (starts + 1)
+        for schedule in self.schedules.values():
+            merged_start = merged_end = None
+            for run_start, run_end in sorted(schedule.busy):
+                low, high = max(0, run_start - width + 1), min(starts, run_end)
+                if low >= high:
+                    continue
+                if merged_end is not None and low <= merged_end:
+                    merged_end = max(merged_end, high)
+                    continue
+                if merged_end is not None:
+                    marks[merged_start] += 1
+                    marks[merged_end] -= 1
+                merged_start, merged_end = low, high
+            if merged_end is not None:
+                marks[merged_start] += 1
+                marks[merged_end] -= 1
+        counts = []
+        busy = 0
+        for mark in marks[:-1]:
+            busy += mark
+            counts.append(busy)
+        return counts
+
+    def slot_time(self, index: int) -> datetime:
+        return self.start + index * self.interval
+
+    def allowed(self, hours: Optional[tuple[time, time]], weekends: bool) -> list[bool]:
+        """Whether each interval lies within working hours (local time)."""
+        allowed = []
+        for index in range(self.slot_count):
+            local_start = self.slot_time(index).astimezone()
+            local_end = self.slot_time(index + 1).astimezone()
+            ok = weekends or local_start.weekday() < 5
+            if ok and hours is not None:
+                day_start = local_start.replace(hour=hours[0].hour, minute=hours[0].minute, second=0, microsecond=0)
+                day_end = local_start.replace(hour=hours[1].hour, minute=hours[1].minute, second=0, microsecond=0)
+                ok = day_start <= local_start and local_end <= day_end
+            allowed.append(ok)
+        return allowed
+
+    def candidates(
+        self,
+        duration: timedelta,
+        limit: int = 10,
+        hours: Optional[tuple[time, time]] = None,
+        weekends: bool = False,
+    ) -> list[Slot]:
+        """The best ``limit`` non-overlapping slots: fewest attendees busy, then earliest."""
+        width = -(-duration // self.interval)  # ceiling division
+        counts = self.busy_counts(width)
+        # Disallowed intervals before each index, to reject windows in O(1).
+        blocked = [0]
+        for ok in self.allowed(hours, weekends):
+            blocked.append(blocked[-1] + (not ok))
+
+        scored = sorted(
+            (busy, first) for first, busy in enumerate(counts) if blocked[first + width] == blocked[first]
+        )
+        taken: list[int] = []
+        slots = []
+        for _, first in scored:
+            if len(slots) >= limit:
+                break
+            if any(abs(first - other) < width for other in taken):
+                continue
+            taken.append(first)
+            slots.append(self._slot(first, width, duration))
+        return slots
+
+    def _slot(self, first: int, width: int, duration: timedelta) -> Slot:
+        """The slot at ``first``; busy attendees are those busy in any of its ``width`` intervals."""
+        last = first + width
+        busy = sorted(
+            schedule.address
+            for schedule in self.schedules.values()
+            if any(run_start < last and first < run_end for run_start, run_end in schedule.busy)
+        )
+        known = sum(1 for schedule in self.schedules.values() if schedule.error is None)
+        return Slot(self.slot_time(first), self.slot_time(first) + duration, known - len(busy), busy)
@@ -0,0 +1,249 @@
+"""Microsoft Graph JSON batching (``$batch``) for multi-item commands.
+
+Sub-requests are packed up to 20 per ``POST /$batch`` call, keeping requests
+linked by ``dependsOn`` in the same call as Graph requires. Sub-requests that
+are throttled, or fail with a transient 5xx status when resending them can't
+create anything twice (the same rule as :mod:`outlook_cli.throttle`), are
+resubmitted on their own (with any dependents that failed because of them)
+after the largest ``Retry-After`` reported; everything else is returned as-is
+for per-item reporting.
+"""
+
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional
+
+from requests.exceptions import HTTPError, RequestException
+
+from outlook_cli.throttle import IDEMPOTENT_METHODS, THROTTLE_STATUSES, TRANSIENT_STATUSES
+
+MAX_BATCH_SIZE = 20
+FAILED_DEPENDENCY = 424
+BACKOFF_SECONDS = 1.0
+MAX_BACKOFF_SECONDS = 30.0
+
+
+@dataclass
+class BatchRequest:
+    """One Graph sub-request; ``url`` is relative to the API root (``/me/...``)."""
+
+    id: str
+    method: str
+    url: str
+    body: Optional[dict] = None
+    depends_on: tuple[str, ...] = ()
+    headers: dict[str, str] = field(default_factory=dict)
+
+    def as_payload(self) -> dict:
+        payload: dict[str, Any] = {"id": self.id, "method": self.method, "url": self.url}
+        if self.headers:
+            payload["headers"] = dict(self.headers)
+        if self.body is not None:
+            payload["body"] = self.body
+            payload["headers"] = {**payload.get("headers", {}), "Content-Type": "application/json"}
+        if self.depends_on:
+            payload["dependsOn"] = list(self.depends_on)
+        return payload
+
+
+@dataclass
+class BatchResponse:
+    id: str
+    status: int
+    body: Any = None
+    headers: dict = field(default_factory=dict)
+    attempts: int = 1
+
+    @property
+    def ok(self) -> bool:
+        return 200 <= self.status < 300
+
+    @property
+    def error(self) -> str:
+        """Graph's error message for a failed sub-request."""
+        if isinstance(self.body, dict):
+            message = (self.body.get("error") or {}).get("message")
+            if message:
+                return message
+        return f"HTTP {self.status}" if self.status else "no response"
+
+    @property
+    def retry_after(self) -> Optional[float]:
+        for key, value in self.headers.items():
+            if key.lower() == "retry-after":
+                try:
+                    return float(value)
+                except (TypeError, ValueError):
+                    return None
+        return None
+
+
+@dataclass
+class BatchReport:
+    """Per-item outcomes, in request order, plus the HTTP calls spent."""
+
+    responses: dict[str, BatchResponse] = field(default_factory=dict)
+    request_count: int = 0
+
+    @property
+    def succeeded(self) -> list[BatchResponse]:
+        return [resp for resp in self.responses.values() if resp.ok]
+
+    @property
+    def failed(self) -> list[BatchResponse]:
+        return [resp for resp in self.responses.values() if not resp.ok]
+
+
+def chunk_requests(
+    requests: list[BatchRequest], size: int = MAX_BATCH_SIZE
+) -> list[list[BatchRequest]]:
+    """Pack requests into batches of at most ``size``, keeping dependsOn chains together."""
+    ids = {req.id for req in requests}
+    if len(ids) != len(requests):
+        raise ValueError("Batch request ids must be unique")
+
+    # Union-find over dependsOn edges; ids outside this set were satisfied earlier.
+    parent = {req.id: req.id for req in requests}
+
+    def find(node: str) -> str:
+        while parent[node] != node:
+            parent[node] = parent[parent[node]]
+            node = parent[node]
+        return node
+
+    for req in requests:
+        for dep in req.depends_on:
+            if dep in ids:
+                parent[find(req.id)] = find(dep)
+
+    groups: dict[str, list[BatchRequest]] = {}
+    for req in requests:
+        groups.setdefault(find(req.id), []).append(req)
+
+    chunks: list[list[BatchRequest]] = []
+    for group in groups.values():
+        if len(group) > size:
+            raise ValueError(f"dependsOn chain of {len(group)} requests exceeds batch size {size}")
+        for chunk in chunks:
+            if len(chunk) + len(group) <= size:
+                chunk.extend(group)
+                break
+        else:
+            chunks.append(list(group))
+    return chunks
+
+
+def _post_batch(con: Any, url: str, chunk: list[BatchRequest]) -> dict[str, BatchResponse]:
+    """POST one batch; a failure of the whole call is reported on every item."""
+    try:
+        response = con.post(url, data={"requests": [req.as_payload() for req in chunk]})
+    except HTTPError as exc:
+        response = exc.response
+    except RequestException as exc:
+        # No answer at all (connection dropped, timeout): nothing is known to have run.
+        body = {"error": {"message": str(exc)}}
+        return {req.id: BatchResponse(req.id, 0, body) for req in chunk}
+
+    if response is None or not response.ok:
+        status = response.status_code if response is not None else 0
+        headers = dict(response.headers) if response is not None else {}
+        try:
+            body = response.json() if response is not None else None
+        except ValueError:
+            body = None
+        return {req.id: BatchResponse(req.id, status, body, headers) for req in chunk}
+
+    results = {}
+    for item in response.json().get("responses", []):
+        item_id = str(item.get("id"))
+        results[item_id] = BatchResponse(
+            item_id, int(item.get("status", 0)), item.get("body"), item.get("headers") or {}
+        )
+    for req in chunk:
+        results.setdefault(req.id, BatchResponse(req.id, 0))
+    return results
+
+
+def _retryable(req: BatchRequest, resp: BatchResponse) -> bool:
+    """Throttled always; a 5xx only for methods that are safe to send twice."""
+    if resp.status in THROTTLE_STATUSES:
+        return True
+    return resp.status in TRANSIENT_STATUSES and req.method.upper() in IDEMPOTENT_METHODS
+
+
+def execute(
+    con: Any,
+    service_url: str,
+    requests: list[BatchRequest],
+    *,
+    max_retries: int = 3,
+    sleep: Callable[[float], None] = time.sleep,
+) -> BatchReport:
+    """Run ``requests`` through ``{service_url}$batch``, retrying only failed items."""
+    url = f"{service_url.rstrip('/')}/$batch"
+    report = BatchReport()
+    results: dict[str, BatchResponse] = {}
+    pending = list(requests)
+    attempt = 0
+
+    while pending:
+        attempt += 1
+        for chunk in chunk_requests(pending):
+            report.request_count += 1
+            for item_id, resp in _post_batch(con, url, chunk).items():
+                resp.attempts = attempt
+                results[item_id] = resp
+
+        if attempt > max_retries:
+            break
+
+        retry_ids = {req.id for req in pending if _retryable(req, results[req.id])}
+        # Dependents that failed only because their dependency did go along with it.
+        changed = True
+        while changed:
+            changed = False
+            for req in pending:
+                if (
+                    req.id not in retry_ids
+                    and results[req.id].status == FAILED_DEPENDENCY
+                    and any(dep in retry_ids for dep in req.depends_on)
+                ):
+                    retry_ids.add(req.id)
+                    changed = True
+
+        pending = [
+            BatchRequest(
+                req.id,
+                req.method,
+                req.url,
+                req.body,
+                tuple(dep for dep in req.depends_on if dep in retry_ids),
+                req.headers,
+            )
+            for req in pending
+            if req.id in retry_ids
+        ]
+        if pending:
+            hinted = [results[req.id].retry_after for req in pending]
+            delay = max((hint for hint in hinted if hint is not None), default=None)
+            if delay is None:
+                delay = min(BACKOFF_SECONDS * 2 ** (attempt - 1), MAX_BACKOFF_SECONDS)
+            sleep(delay)
+
+    report.responses = {req.id: results[req.id] for req in requests}
+    return report
+
+
+def read_ids(args: list[str]) -> list[str]:
+    """Expand command-line IDs, reading one per line from stdin for ``-``.
+
+    Duplicates are dropped (batch ids must be unique) and order is preserved.
+    """
+    ids: list[str] = []
+    for arg in args:
+        if arg == "-":
+            ids.extend(line.strip() for line in sys.stdin)
+        else:
+            ids.append(arg.strip())
+    return list(dict.fromkeys(item for item in ids if item))
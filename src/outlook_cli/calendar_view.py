@@ -0,0 +1,441 @@
+"""Calendar listings from ``calendarView``, cached per day.
+
+``/me/calendars/{id}/calendarView`` expands recurring series into the
+occurrences that fall in a window, so a listing transfers exactly the
+instances it shows. Expanded instances are kept in
+``~/.outlook-cli/calendar-<account>.db``, one row per (calendar, projection,
+day) with a fingerprint of the instances' ``changeKey`` values.
+
+A listing over days that are already cached first asks for the window with
+only ``id``, ``changeKey``, ``start`` and ``end``; days whose fingerprint still
+matches are served from the cache and only the changed days are downloaded in
+full. Days are local calendar days, since those are what ``cal list`` takes.
+
+Every stored day also refreshes an R*Tree index over instance start and end
+times (``instances``/``instance_spans``, kept in step by triggers), so overlap
+checks for new events are an O(log n) index lookup instead of a server query.
+"""
+
+import hashlib
+import heapq
+import json
+import sqlite3
+from collections import deque
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta, timezone
+from itertools import groupby
+from pathlib import Path
+from typing import Any, Iterable, Iterator, Optional, Sequence
+
+from outlook_cli.ids import account_path
+from outlook_cli.query import utc_timestamp
+
+DB_FILENAME = "calendar.db"
+DEFAULT_PAGE_SIZE = 100
+# Always fetched with a full listing: enough to validate, place and filter instances.
+VIEW_FIELDS = ("id", "changeKey", "start", "end", "subject", "location", "organizer", "isAllDay", "type", "showAs")
+PROBE_FIELDS = ("id", "changeKey", "start", "end")
+# calendarView types that belong to a recurring series.
+RECURRING_TYPES = frozenset({"occurrence", "exception", "seriesMaster"})
+# Instances shown as free never conflict with anything.
+FREE = "free"
+# Bumped when the layout changes; an older cache is dropped.
+SCHEMA_VERSION = 2
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS days (
+    calendar_id TEXT NOT NULL,
+    fields TEXT NOT NULL,
+    day TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    events TEXT NOT NULL,
+    cached_at TEXT NOT NULL,
+    PRIMARY KEY (calendar_id, fields, day)
+);
+CREATE TABLE IF NOT EXISTS instances (
+    pk INTEGER PRIMARY KEY,
+    calendar_id TEXT NOT NULL,
+    id TEXT NOT NULL,
+    subject TEXT NOT NULL DEFAULT '',
+    start_ts REAL NOT NULL,
+    end_ts REAL NOT NULL,
+    UNIQUE (calendar_id, id)
+);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS instance_spans USING rtree(pk, start_ts, end_ts);
+CREATE TRIGGER IF NOT EXISTS instance_spans_insert AFTER INSERT ON instances BEGIN
+    INSERT INTO instance_spans (pk, start_ts, end_ts) VALUES (new.pk, new.start_ts, new.end_ts);
+END;
+CREATE TRIGGER IF NOT EXISTS instance_spans_delete AFTER DELETE ON instances BEGIN
+    DELETE FROM instance_spans WHERE pk = old.pk;
+END;
+CREATE TRIGGER IF NOT EXISTS instance_spans_update AFTER UPDATE OF start_ts, end_ts ON instances BEGIN
+    UPDATE instance_spans SET start_ts = new.start_ts, end_ts = new.end_ts WHERE pk = new.pk;
+END;
+"""
+
+TABLES = ("days", "instances", "instance_spans")
+
+
+def db_path(account_key: str) -> Path:
+    return account_path(account_key, DB_FILENAME)
+
+
+def connect(path: Path) -> sqlite3.Connection:
+    """Open (and create if needed) the instance cache.
+
+    Listings are drained on a prefetch thread, so the connection may be used
+    from a thread other than the one that opened it (never two at once).
+    """
+    db = sqlite3.connect(path, check_same_thread=False)
+    db.row_factory = sqlite3.Row
+    db.execute("PRAGMA journal_mode=WAL")
+    if db.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+        db.executescript("".join(f"DROP TABLE IF EXISTS {table};" for table in TABLES))
+        db.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+    db.executescript(SCHEMA)
+    return db
+
+
+# ── Instances ──────────────────────────────────────────────────
+
+
+def instant(value: Optional[dict]) -> Optional[datetime]:
+    """A ``dateTimeTimeZone`` as an aware datetime.
+
+    calendarView answers in UTC unless asked for another zone with
+    ``Prefer: outlook.timezone``, which this module never sends.
+    """
+    if not value or not value.get("dateTime"):
+        return None
+    return datetime.fromisoformat(value["dateTime"][:19]).replace(tzinfo=timezone.utc)
+
+
+def _days_of(resource: dict) -> tuple[Optional[date], Optional[date]]:
+    """First and last local day an instance overlaps."""
+    start = instant(resource.get("start"))
+    if start is None:
+        return None, None
+    end = instant(resource.get("end")) or start
+    last = end - timedelta(microseconds=1) if end > start else start
+    return start.astimezone().date(), last.astimezone().date()
+
+
+def _day_start(day: date) -> datetime:
+    return datetime.combine(day, time()).astimezone()
+
+
+def sort_key(resource: dict) -> tuple[str, str]:
+    """Listing order: by start, ties by id, so a ``--cursor`` can resume exactly."""
+    return (resource.get("start") or {}).get("dateTime", ""), resource.get("id", "")
+
+
+def _fingerprint(resources: list[dict]) -> str:
+    keys = sorted(f"{resource['id']}:{resource.get('changeKey', '')}" for resource in resources)
+    return hashlib.sha1("\n".join(keys).encode()).hexdigest()
+
+
+def _fields_key(fields: Optional[Sequence[str]]) -> str:
+    if fields is None:
+        return "*"
+    return ",".join(sorted({*VIEW_FIELDS, *fields}))
+
+
+def matches(
+    resource: dict,
+    *,
+    subject: Optional[str] = None,
+    location: Optional[str] = None,
+    organizer: Optional[str] = None,
+    all_day: bool = False,
+    recurring: bool = False,
+) -> bool:
+    """Whether an instance passes ``cal list``'s filters (text matches ignore case)."""
+
+    def _has(text: Optional[str], part: str) -> bool:
+        return part.lower() in (text or "").lower()
+
+    if subject and not _has(resource.get("subject"), subject):
+        return False
+    if location and not _has((resource.get("location") or {}).get("displayName"), location):
+        return False
+    if organizer:
+        address = ((resource.get("organizer") or {}).get("emailAddress") or {}).get("address")
+        if not _has(address, organizer):
+            return False
+    if all_day and not resource.get("isAllDay"):
+        return False
+    if recurring and resource.get("type") not in RECURRING_TYPES and not resource.get("recurrence"):
+        return False
+    return True
+
+
+# ── Fetching ───────────────────────────────────────────────────
+
+
+class CalendarView:
+    """Instances of one calendar over a range of days, served through the cache."""
+
+    def __init__(
+        self,
+        db: sqlite3.Connection,
+        con: Any,
+        service_url: str,
+        calendar_id: str,
+        fields: Optional[Sequence[str]] = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+    ) -> None:
+        self.db = db
+        self.con = con
+        self.url = f"{service_url.rstrip('/')}/me/calendars/{calendar_id}/calendarView"
+        self.calendar_id = calendar_id
+        self.fields = None if fields is None else sorted({*VIEW_FIELDS, *fields})
+        self.fields_key = _fields_key(fields)
+        self.page_size = page_size
+        # Request counts and downloaded days, for reporting and tests.
+        self.requests = 0
+        self.refetched: list[date] = []
+
+    def _pages(self, first: date, last: date, fields: Optional[Sequence[str]]) -> Iterator[list[dict]]:
+        """calendarView pages for ``first``..``last`` (inclusive), ordered by start."""
+        params: Optional[dict] = {
+            "startDateTime": utc_timestamp(_day_start(first)) + "Z",
+            "endDateTime": utc_timestamp(_day_start(last + timedelta(days=1))) + "Z",
+            "$orderby": "start/dateTime",
+            "$top": self.page_size,
+        }
+        if fields is not None:
+            params["$select"] = ",".join(fields)
+        url: Optional[str] = self.url
+        while url:
+            response = self.con.get(url, params=params)
+            self.requests += 1
+            page = response.json()
+            yield page.get("value", [])
+            url = page.get("@odata.nextLink")
+            params = None
+
+    def _cached(self, days: list[date]) -> dict[date, str]:
+        """Fingerprints of the cached days; instances are read a day at a time when served."""
+        rows = self.db.execute(
+            "SELECT day, fingerprint FROM days WHERE calendar_id = ? AND fields = ? AND day BETWEEN ? AND ?",
+            (self.calendar_id, self.fields_key, days[0].isoformat(), days[-1].isoformat()),
+        )
+        return {date.fromisoformat(row["day"]): row["fingerprint"] for row in rows}
+
+    def _load(self, day: date) -> list[dict]:
+        row = self.db.execute(
+            "SELECT events FROM days WHERE calendar_id = ? AND fields = ? AND day = ?",
+            (self.calendar_id, self.fields_key, day.isoformat()),
+        ).fetchone()
+        return json.loads(row["events"])
+
+    def _stale(self, days: list[date], cached: dict[date, str]) -> set[date]:
+        """Days whose cached instances no longer match the server's changeKeys.
+
+        Like :meth:`_download`, each day is settled as soon as the probe has
+        moved past it, so only the days in flight are held in memory.
+        """
+        if not cached:
+            return set(days)
+        stale: set[date] = set()
+        current: dict[date, list[dict]] = {day: [] for day in days}
+        pending = deque(days)
+
+        def _settle(day: date) -> None:
+            if cached.get(day) != _fingerprint(current.pop(day)):
+                stale.add(day)
+
+        for page in self._pages(days[0], days[-1], PROBE_FIELDS):
+            self._bucket(page, current)
+            reached = _days_of(page[-1])[0] if page else None
+            while pending and reached is not None and pending[0] < reached:
+                _settle(pending.popleft())
+        while pending:
+            _settle(pending.popleft())
+        return stale
+
+    @staticmethod
+    def _bucket(resources: list[dict], by_day: dict[date, list[dict]]) -> None:
+        for resource in resources:
+            first, last = _days_of(resource)
+            if first is None:
+                continue
+            day = first
+            while day <= last:
+                if day in by_day:
+                    by_day[day].append(resource)
+                day += timedelta(days=1)
+
+    def _store(self, day: date, resources: list[dict]) -> None:
+        self.db.execute(
+            "INSERT OR REPLACE INTO days (calendar_id, fields, day, fingerprint, events, cached_at)"
+            " VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                self.calendar_id,
+                self.fields_key,
+                day.isoformat(),
+                _fingerprint(resources),
+                json.dumps(resources),
+                datetime.now(timezone.utc).isoformat(),
+            ),
+        )
+        index_day(self.db, self.calendar_id, day, resources)
+
+    def _download(self, days: list[date]) -> Iterator[tuple[date, list[dict]]]:
+        """Fetch consecutive ``days`` and cache each one as soon as it is complete.
+
+        Pages arrive ordered by start, so once an instance starting on a later
+        day has been seen every earlier day has all of its instances.
+        """
+        by_day: dict[date, list[dict]] = {day: [] for day in days}
+        pending = deque(days)
+        for page in self._pages(days[0], days[-1], self.fields):
+            self._bucket(page, by_day)
+            if not page:
+                continue
+            reached = _days_of(page[-1])[0]
+            while pending and reached is not None and pending[0] < reached:
+                yield self._finish(pending.popleft(), by_day)
+        while pending:
+            yield self._finish(pending.popleft(), by_day)
+
+    def _finish(self, day: date, by_day: dict[date, list[dict]]) -> tuple[date, list[dict]]:
+        resources = by_day.pop(day)
+        self._store(day, resources)
+        self.db.commit()
+        self.refetched.append(day)
+        return day, resources
+
+    def instances(self, start: date, end: date) -> Iterator[dict]:
+        """Instances overlapping the days ``start`` up to (not including) ``end``, by start time.
+
+        An instance spanning several days is yielded once. Days are read
+        from the cache or the server one at a time, so memory follows the
+        busiest day rather than the length of the range.
+        """
+        days = [start + timedelta(days=offset) for offset in range((end - start).days)]
+        if not days:
+            return
+        cached = self._cached(days)
+        stale = self._stale(days, cached)
+        seen: dict[str, date] = {}
+        for is_stale, run in groupby(days, key=lambda day: day in stale):
+            run = list(run)
+            if is_stale:
+                found = self._download(run)
+            else:
+                found = ((day, self._load(day)) for day in run)
+            for day, resources in found:
+                for resource in sorted(resources, key=sort_key):
+                    if resource["id"] not in seen:
+                        seen[resource["id"]] = _days_of(resource)[1] or day
+                        yield resource
+                # Only instances running into later days can be seen again.
+                seen = {event_id: last for event_id, last in seen.items() if last > day}
+
+
+def _tagged(key: str, resources: Iterable[dict]) -> Iterator[tuple[str, dict]]:
+    for resource in resources:
+        yield key, resource
+
+
+def merge(streams: dict[str, Iterable[dict]]) -> Iterator[tuple[str, dict]]:
+    """Several calendars' instances as one stream ordered by start, tagged with their key.
+
+    Each stream must already be in start order, as :meth:`CalendarView.instances`
+    yields it; a heap over the streams' next instances picks the earliest, so
+    merging k calendars costs O(log k) per instance and never buffers a stream.
+    """
+    return heapq.merge(
+        *(_tagged(key, resources) for key, resources in streams.items()),
+        key=lambda item: sort_key(item[1]),
+    )
+
+
+# ── Conflict index ─────────────────────────────────────────────
+
+
+@dataclass
+class Conflict:
+    id: str
+    subject: str
+    start: datetime
+    end: datetime
+
+
+def _span(resource: dict) -> Optional[tuple[float, float]]:
+    start = instant(resource.get("start"))
+    if start is None:
+        return None
+    end = instant(resource.get("end")) or start
+    return start.timestamp(), end.timestamp()
+
+
+def index_instance(db: sqlite3.Connection, calendar_id: str, resource: dict) -> None:
+    """Add or update one instance in the overlap index; free instances are left out."""
+    span = _span(resource)
+    if span is None or resource.get("showAs") == FREE:
+        db.execute("DELETE FROM instances WHERE calendar_id = ? AND id = ?", (calendar_id, resource["id"]))
+        return
+    db.execute(
+        "INSERT INTO instances (calendar_id, id, subject, start_ts, end_ts) VALUES (?, ?, ?, ?, ?)"
+        " ON CONFLICT (calendar_id, id) DO UPDATE SET"
+        " subject = excluded.subject, start_ts = excluded.start_ts, end_ts = excluded.end_ts",
+        (calendar_id, resource["id"], resource.get("subject") or "", *span),
+    )
+
+
+def index_day(db: sqlite3.Connection, calendar_id: str, day: date, resources: list[dict]) -> None:
+    """Replace the indexed instances overlapping ``day`` with ``resources``."""
+    first = _day_start(day).timestamp()
+    last = _day_start(day + timedelta(days=1)).timestamp()
+    db.execute(
+        "DELETE FROM instances WHERE calendar_id = ? AND pk IN"
+        " (SELECT pk FROM instance_spans WHERE start_ts < ? AND end_ts > ?)"
+        " AND start_ts < ? AND end_ts > ?",
+        (calendar_id, last, first, last, first),
+    )
+    for resource in resources:
+        index_instance(db, calendar_id, resource)
+
+
+def conflicts(db: sqlite3.Connection, calendar_id: str, start: datetime, end: datetime) -> list[Conflict]:
+    """Indexed instances overlapping ``[start, end)``, earliest first.
+
+    The R*Tree stores 32-bit floats and may return near misses; exact times
+    from ``instances`` settle them.
+    """
+    first, last = start.astimezone().timestamp(), end.astimezone().timestamp()
+    rows = db.execute(
+        "SELECT i.id, i.subject, i.start_ts, i.end_ts FROM instance_spans AS s"
+        " JOIN instances AS i ON i.pk = s.pk"
+        " WHERE s.start_ts < ? AND s.end_ts > ? AND i.calendar_id = ? AND i.start_ts < ? AND i.end_ts > ?"
+        " ORDER BY i.start_ts",
+        (last, first, calendar_id, last, first),
+    )
+    return [
+        Conflict(
+            row["id"],
+            row["subject"],
+            datetime.fromtimestamp(row["start_ts"], timezone.utc),
+            datetime.fromtimestamp(row["end_ts"], timezone.utc),
+        )
+        for row in rows
+    ]
+
+
+def overlapping_pairs(spans: list[tuple[datetime, datetime]]) -> list[tuple[int, int]]:
+    """Index pairs of ``spans`` that overlap each other, by a sort and sweep.
+
+    Used for events created together, which are not in the index yet.
+    """
+    order = sorted(range(len(spans)), key=lambda index: spans[index][0])
+    pairs = []
+    active: list[int] = []
+    for index in order:
+        start = spans[index][0]
+        active = [other for other in active if spans[other][1] > start]
+        pairs.extend((min(other, index), max(other, index)) for other in active)
+        active.append(index)
+    return sorted(pairs)
@@ -1,12 +1,33 @@
-"""Calendar commands: list, read, create."""
+"""Calendar commands: list, read, create, create-many, import, export, free."""
 
-from datetime import datetime, timedelta
-from typing import Optional
+import json
+import sys
+from datetime import datetime, time, timedelta
+from itertools import dropwhile, islice
+from pathlib import Path
+from typing import Iterator, Optional
 
 import typer
+from requests.exceptions import RequestException
 
+from outlook_cli import availability, calendar_view, exporter, importer, output, paging
+from outlook_cli import ids as id_cache
 from outlook_cli.auth import get_account
-from outlook_cli.display import console, print_error, print_event_detail, print_event_table, print_success
+from outlook_cli.batch import BatchReport, BatchRequest, execute, read_ids
+from outlook_cli.display import (
+    console,
+    print_batch_report,
+    print_cursor,
+    print_error,
+    print_event_detail,
+    print_event_table,
+    print_free_slots,
+    print_success,
+    print_warning,
+    stream_event_table,
+)
+from outlook_cli.query import EVENT_LIST_FIELDS, EVENT_RECORD_FIELDS, TEXT_BODIES, parse_fields, preferring
+from outlook_cli.stream import PAGE_SIZE, prefetch
 
 app = typer.Typer(help="Manage calendar events.")
 
@@ -29,6 +50,88 @@ def _parse_datetime(value: str) -> datetime:
         raise typer.Exit(1)
 
 
+def _parse_between(value: str) -> tuple[datetime, datetime]:
+    """Parse ``START..END`` dates; the window runs through the whole END day."""
+    first, sep, last = value.partition("..")
+    if not sep:
+        print_error(f"Invalid range: {value} (expected YYYY-MM-DD..YYYY-MM-DD)")
+        raise typer.Exit(1)
+    start_dt = _parse_date(first.strip())
+    end_dt = _parse_date(last.strip()) + timedelta(days=1)
+    if end_dt <= start_dt:
+        print_error(f"Invalid range: {value} (end is before start)")
+        raise typer.Exit(1)
+    return start_dt, end_dt
+
+
+def _parse_hours(value: str) -> Optional[tuple[time, time]]:
+    """Parse ``HH:MM-HH:MM`` working hours; ``any`` allows the whole day."""
+    if value.strip().lower() == "any":
+        return None
+    try:
+        first, last = (datetime.strptime(part.strip(), "%H:%M").time() for part in value.split("-"))
+    except ValueError:
+        print_error(f"Invalid hours: {value} (expected HH:MM-HH:MM or 'any')")
+        raise typer.Exit(1)
+    return first, last
+
+
+def _calendars(account, names: Optional[list[str]], all_calendars: bool) -> list:
+    """The calendars to read: named ones (case-insensitive), all, or the default."""
+    schedule = account.schedule()
+    if not names and not all_calendars:
+        calendar = id_cache.default_calendar(account)
+        if calendar is None:
+            print_error("Could not access default calendar.")
+            raise typer.Exit(1)
+        return [calendar]
+
+    try:
+        available = list(schedule.list_calendars())
+    except RequestException as exc:
+        print_error(f"Failed to list calendars: {exc}")
+        raise typer.Exit(1)
+    if all_calendars:
+        return available
+
+    by_name = {calendar.name.lower(): calendar for calendar in available}
+    missing = [name for name in names if name.lower() not in by_name]
+    if missing:
+        print_error(
+            f"Calendar not found: {', '.join(missing)} "
+            f"(available: {', '.join(calendar.name for calendar in available)})"
+        )
+        raise typer.Exit(1)
+    chosen = {by_name[name.lower()].calendar_id: by_name[name.lower()] for name in names}
+    return list(chosen.values())
+
+
+# ``cal list`` filters, as calendar_view.matches takes them and cursors record them.
+LIST_FILTERS = ("subject", "location", "organizer", "all_day", "recurring")
+
+
+def _resume_list(account, token: str) -> tuple:
+    """The listing a ``cal list`` cursor continues: (start, end, calendars, fields, filters, after)."""
+    schedule = account.schedule()
+    try:
+        state = paging.decode(token, "events")
+        calendars = [
+            schedule.calendar_constructor(parent=schedule, **{schedule._cloud_data_key: {"id": key, "name": name}})
+            for key, name in state["calendars"].items()
+        ]
+        return (
+            datetime.fromisoformat(state["day"]),
+            datetime.fromisoformat(state["end"]),
+            calendars,
+            state["fields"],
+            {name: state["filters"][name] for name in LIST_FILTERS},
+            tuple(state["after"]),
+        )
+    except (paging.CursorError, KeyError, TypeError, ValueError) as exc:
+        print_error(str(exc) if isinstance(exc, paging.CursorError) else "Invalid cursor.")
+        raise typer.Exit(1)
+
+
 @app.command("list")
 def list_events(
     start: Optional[str] = typer.Option(None, "--start", help="Start date (YYYY-MM-DD)"),
@@ -39,60 +142,158 @@ def list_events(
     organizer: Optional[str] = typer.Option(None, "--organizer", help="Filter by organizer email"),
     all_day: bool = typer.Option(False, "--all-day", help="Show only all-day events"),
     recurring: bool = typer.Option(False, "--recurring", help="Show only recurring events"),
+    fields: Optional[str] = typer.Option(
+        None, "--fields", help="Comma-separated Graph properties to fetch ('all' for full events)"
+    ),
+    calendar_names: Optional[list[str]] = typer.Option(
+        None, "--calendar", help="Calendar name to list (repeatable; default: your default calendar)"
+    ),
+    all_calendars: bool = typer.Option(False, "--all-calendars", help="List every calendar you can see"),
+    page_size: int = typer.Option(
+        PAGE_SIZE, "--page-size", min=1, max=1000, help="Events per Graph request when downloading days"
+    ),
+    cursor: Optional[str] = typer.Option(
+        None, "--cursor", help="Continue a previous listing where it stopped (printed with --output)"
+    ),
 ) -> None:
-    """List calendar events in a date range."""
-    start_dt = _parse_date(start) if start else datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
-    end_dt = _parse_date(end) if end else start_dt + timedelta(days=7)
-
+    """List calendar events in a date range.
+
+    Recurring series are expanded into their occurrences. Days listed before
+    are served from a local cache and only re-downloaded when their events
+    changed. With several calendars, they are fetched at the same time and
+    shown as one list ordered by start time. With --output, a cursor for the
+    rest of the range is printed on stderr; --cursor continues from it.
+    """
     account = get_account()
-    schedule = account.schedule()
-    calendar = schedule.get_default_calendar()
-
-    if calendar is None:
-        print_error("Could not access default calendar.")
-        raise typer.Exit(1)
-
-    query = calendar.new_query("start").greater_equal(start_dt)
-    query.chain("and").on_attribute("end").less_equal(end_dt)
-
-    if subject:
-        query.chain("and").on_attribute("subject").contains(subject)
-
-    if location:
-        query.chain("and").on_attribute("location/displayName").contains(location)
-
-    if organizer:
-        query.chain("and").on_attribute("organizer/emailAddress/address").contains(organizer)
-
-    if all_day:
-        query.chain("and").on_attribute("isAllDay").equals(True)
-
-    if recurring:
-        query.chain("and").on_attribute("recurrence").unequal(None)
+    after: Optional[tuple] = None
+    if cursor is not None:
+        start_dt, end_dt, calendars, select, filters, after = _resume_list(account, cursor)
+    else:
+        start_dt = _parse_date(start) if start else datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        end_dt = _parse_date(end) if end else start_dt + timedelta(days=7)
+        calendars = _calendars(account, calendar_names, all_calendars)
+        default_fields = EVENT_RECORD_FIELDS if output.is_machine() else EVENT_LIST_FIELDS
+        select = parse_fields(fields, default_fields)
+        filters = {
+            "subject": subject, "location": location, "organizer": organizer, "all_day": all_day,
+            "recurring": recurring,
+        }
+    if not calendars:
+        console.print("No calendars found.")
+        return
 
-    events = list(calendar.get_events(limit=limit, query=query))
+    def _instances(calendar) -> Iterator[dict]:
+        # One cache connection per calendar, as each is read on its own thread.
+        view = calendar_view.CalendarView(
+            calendar_view.connect(calendar_view.db_path(id_cache.account_key(account))),
+            account.con,
+            account.protocol.service_url,
+            calendar.calendar_id,
+            fields=select,
+            page_size=page_size,
+        )
+        return view.instances(start_dt.date(), end_dt.date())
+
+    by_id = {calendar.calendar_id: calendar for calendar in calendars}
+    if len(calendars) == 1:
+        only = calendars[0]
+        tagged: Iterator[tuple[str, dict]] = ((only.calendar_id, resource) for resource in _instances(only))
+    else:
+        # Every calendar downloads on its own prefetch thread (the throttle caps
+        # requests in flight); the merge takes whichever instance starts first.
+        tagged = calendar_view.merge({key: prefetch(_instances(calendar)) for key, calendar in by_id.items()})
+    if after is not None:
+        # Resuming: the cursor's day may begin with instances already listed.
+        tagged = dropwhile(lambda item: calendar_view.sort_key(item[1]) <= after, tagged)
+    found = ((key, resource) for key, resource in tagged if calendar_view.matches(resource, **filters))
+
+    last: list[dict] = []
+
+    def _taken(pairs: Iterator[tuple[str, dict]]) -> Iterator[tuple[str, dict]]:
+        for key, resource in pairs:
+            last[:] = [resource]
+            yield key, resource
+
+    events = (
+        by_id[key].event_constructor(parent=by_id[key], calendar_id=key, **{by_id[key]._cloud_data_key: resource})
+        for key, resource in _taken(islice(found, limit))
+    )
+    names = {key: calendar.name for key, calendar in by_id.items()} if len(calendars) > 1 else None
 
-    if not events:
-        console.print("No events found in the given range.")
-        return
+    try:
+        if output.is_machine():
+            shown = output.write_events(prefetch(events), calendars=names)
+        elif limit > PAGE_SIZE:
+            # Several pages: show rows as they arrive while the next page downloads.
+            shown = stream_event_table(prefetch(events), calendars=names)
+            if not shown:
+                console.print("No events found in the given range.")
+        else:
+            events = list(events)
+            shown = len(events)
+            if events:
+                print_event_table(events, calendars=names)
+            else:
+                console.print("No events found in the given range.")
+    except RequestException as exc:
+        for calendar in calendars:
+            id_cache.forget_missing_calendar(account, calendar.calendar_id, exc)
+        print_error(f"Failed to list events: {exc}")
+        raise typer.Exit(1)
 
-    print_event_table(events)
+    # A full page may have more after it; a short one ended the range.
+    if shown == limit and last and (output.is_machine() or cursor is not None):
+        state = {
+            "after": list(calendar_view.sort_key(last[0])),
+            "day": calendar_view.instant(last[0]["start"]).astimezone().date().isoformat(),
+            "end": end_dt.date().isoformat(),
+            "calendars": {key: calendar.name for key, calendar in by_id.items()},
+            "fields": select,
+            "filters": filters,
+        }
+        print_cursor(paging.encode("events", state))
 
 
 @app.command()
 def read(
-    event_id: str = typer.Argument(..., help="Event ID to retrieve"),
+    event_ids: list[str] = typer.Argument(..., help="Event ID(s); '-' reads IDs from stdin, one per line"),
+    as_html: bool = typer.Option(False, "--html", help="Download HTML descriptions and convert them locally"),
 ) -> None:
-    """Read a single calendar event."""
+    """Read one or more calendar events."""
+    ids = read_ids(event_ids)
+    if not ids:
+        print_error("No event IDs given.")
+        raise typer.Exit(1)
+
     account = get_account()
     schedule = account.schedule()
-    calendar = schedule.get_default_calendar()
+    preferences = () if as_html else (TEXT_BODIES,)
+
+    if len(ids) > 1:
+        headers = {"Prefer": ", ".join(preferences)} if preferences else {}
+        requests = [
+            BatchRequest(str(index), "GET", f"/me/events/{event_id}", headers=headers)
+            for index, event_id in enumerate(ids)
+        ]
+        report = execute(account.con, account.protocol.service_url, requests)
+        for resp in report.succeeded:
+            print_event_detail(
+                schedule.event_constructor(parent=schedule, **{schedule._cloud_data_key: resp.body})
+            )
+        print_batch_report(ids, report, "Read")
+        if report.failed:
+            raise typer.Exit(1)
+        return
+
+    event_id = ids[0]
+    calendar = id_cache.default_calendar(account)
 
     if calendar is None:
         print_error("Could not access default calendar.")
         raise typer.Exit(1)
 
-    event = calendar.get_event(object_id=event_id)
+    with preferring(account.con, *preferences):
+        event = calendar.get_event(event_id)
 
     if not event:
         print_error(f"Event not found: {event_id}")
@@ -101,6 +302,36 @@ def read(
     print_event_detail(event)
 
 
+def _sync_conflict_index(account, calendar, spans: list[tuple[datetime, datetime]]):
+    """Bring the cached days covering ``spans`` up to date; returns the cache.
+
+    One calendarView probe (or download) covers every span, however many
+    events are being created.
+    """
+    db = calendar_view.connect(calendar_view.db_path(id_cache.account_key(account)))
+    view = calendar_view.CalendarView(
+        db, account.con, account.protocol.service_url, calendar.calendar_id, fields=EVENT_LIST_FIELDS
+    )
+    first = min(start.astimezone().date() for start, _ in spans)
+    last = max(end.astimezone().date() for _, end in spans) + timedelta(days=1)
+    try:
+        for _ in view.instances(first, last):
+            pass
+    except RequestException as exc:
+        id_cache.forget_missing_calendar(account, calendar.calendar_id, exc)
+        print_error(f"Failed to check for conflicts: {exc}")
+        raise typer.Exit(1)
+    return db
+
+
+def _report_conflicts(label: str, found: list) -> None:
+    for conflict in found:
+        print_warning(
+            f"{label} overlaps {conflict.subject or '(no subject)'} "
+            f"({conflict.start.astimezone():%Y-%m-%d %H:%M}-{conflict.end.astimezone():%H:%M})"
+        )
+
+
 @app.command()
 def create(
     subject: str = typer.Option(..., "--subject", help="Event subject"),
@@ -108,19 +339,26 @@ def create(
     end: str = typer.Option(..., "--end", help="End datetime (YYYY-MM-DD HH:MM)"),
     body: Optional[str] = typer.Option(None, "--body", help="Event description"),
     location: Optional[str] = typer.Option(None, "--location", help="Event location"),
+    no_conflicts: bool = typer.Option(False, "--no-conflicts", help="Refuse to create an event that overlaps another"),
 ) -> None:
-    """Create a new calendar event."""
+    """Create a new calendar event, warning about overlapping events."""
     start_dt = _parse_datetime(start)
     end_dt = _parse_datetime(end)
 
     account = get_account()
-    schedule = account.schedule()
-    calendar = schedule.get_default_calendar()
+    calendar = id_cache.default_calendar(account)
 
     if calendar is None:
         print_error("Could not access default calendar.")
         raise typer.Exit(1)
 
+    db = _sync_conflict_index(account, calendar, [(start_dt, end_dt)])
+    found = calendar_view.conflicts(db, calendar.calendar_id, start_dt, end_dt)
+    _report_conflicts(subject, found)
+    if found and no_conflicts:
+        print_error(f"Not created: {subject} overlaps {len(found)} event(s).")
+        raise typer.Exit(1)
+
     new_event = calendar.new_event()
     new_event.subject = subject
     new_event.start = start_dt
@@ -131,8 +369,291 @@ def create(
     if location:
         new_event.location = location
 
-    if new_event.save():
+    try:
+        saved = new_event.save()
+    except RequestException as exc:
+        id_cache.forget_missing_calendar(account, calendar.calendar_id, exc)
+        print_error(f"Failed to create event: {exc}")
+        raise typer.Exit(1)
+
+    if saved:
+        if new_event.object_id:
+            calendar_view.index_instance(
+                db, calendar.calendar_id, {"id": new_event.object_id, **importer.event_payload(subject, start_dt, end_dt)}
+            )
+            db.commit()
         print_success(f"Event created: {subject}")
     else:
         print_error("Failed to create event.")
         raise typer.Exit(1)
+
+
+def _read_event_lines(path: str) -> list[dict]:
+    """Events from a JSON Lines file ('-' for stdin), one object per line."""
+    try:
+        lines = sys.stdin.readlines() if path == "-" else Path(path).read_text().splitlines()
+    except OSError as exc:
+        print_error(f"Cannot read {path}: {exc}")
+        raise typer.Exit(1)
+
+    events = []
+    for number, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        try:
+            item = json.loads(line)
+            start_dt = datetime.fromisoformat(item["start"])
+            end_dt = datetime.fromisoformat(item["end"])
+            subject = str(item["subject"])
+        except (ValueError, KeyError, TypeError) as exc:
+            print_error(f"Line {number}: expected subject, start and end ({exc})")
+            raise typer.Exit(1)
+        events.append(importer.event_payload(subject, start_dt, end_dt, item.get("body"), item.get("location")))
+    return events
+
+
+@app.command("create-many")
+def create_many(
+    path: str = typer.Argument(..., help="JSON Lines file of events ('-' for stdin)"),
+    no_conflicts: bool = typer.Option(False, "--no-conflicts", help="Skip events that overlap another"),
+) -> None:
+    """Create many events at once through Graph $batch.
+
+    Each line is an object with subject, start and end (YYYY-MM-DD HH:MM or
+    ISO 8601) and optional body and location. Every event is checked for
+    overlaps with the calendar and with the other events in the file.
+    """
+    payloads = _read_event_lines(path)
+    if not payloads:
+        print_error("No events given.")
+        raise typer.Exit(1)
+
+    account = get_account()
+    calendar = id_cache.default_calendar(account)
+    if calendar is None:
+        print_error("Could not access default calendar.")
+        raise typer.Exit(1)
+
+    spans = [(calendar_view.instant(item["start"]), calendar_view.instant(item["end"])) for item in payloads]
+    db = _sync_conflict_index(account, calendar, spans)
+    clashing = set()
+    for index, (start_dt, end_dt) in enumerate(spans):
+        found = calendar_view.conflicts(db, calendar.calendar_id, start_dt, end_dt)
+        _report_conflicts(payloads[index]["subject"], found)
+        if found:
+            clashing.add(index)
+    for first, second in calendar_view.overlapping_pairs(spans):
+        print_warning(f"{payloads[first]['subject']} overlaps {payloads[second]['subject']} (both in {path})")
+        clashing.add(second)
+
+    refused = sorted(clashing) if no_conflicts else []
+    for index in refused:
+        print_error(f"Not created: {payloads[index]['subject']} overlaps another event.")
+    chosen = [index for index in range(len(payloads)) if index not in set(refused)]
+
+    requests = [
+        BatchRequest(str(index), "POST", f"/me/calendars/{calendar.calendar_id}/events", payloads[index])
+        for index in chosen
+    ]
+    report = execute(account.con, account.protocol.service_url, requests) if requests else BatchReport()
+    path = f"/me/calendars/{calendar.calendar_id}/events"
+    if any(id_cache.calendar_missing(calendar.calendar_id, path, resp.status, resp.body) for resp in report.failed):
+        id_cache.forget_calendar(account, calendar.calendar_id)
+    for resp in report.succeeded:
+        if isinstance(resp.body, dict) and resp.body.get("id"):
+            calendar_view.index_instance(db, calendar.calendar_id, resp.body)
+    db.commit()
+
+    if requests:
+        print_batch_report([payloads[index]["subject"] for index in chosen], report, "Created")
+    if report.failed or refused:
+        raise typer.Exit(1)
+
+
+@app.command("import")
+def import_events(
+    path: str = typer.Argument(..., help="ICS or CSV file of events ('-' for stdin)"),
+    fmt: Optional[str] = typer.Option(None, "--format", help="ics or csv (default: from the file extension)"),
+    workers: int = typer.Option(
+        importer.DEFAULT_WORKERS, "--workers", min=1, max=16, help="$batch calls in flight at once"
+    ),
+) -> None:
+    """Import events from an iCalendar (.ics) or CSV file.
+
+    The file is read as a stream and events are created through Graph $batch.
+    Created events are recorded in a journal, so running the same import
+    again (say, after an interruption) only creates what is missing. CSV
+    files need subject, start and end columns and may have location, body,
+    uid and all_day.
+
+    Recurring ICS events become recurring events when their RRULE has a
+    Graph equivalent; series with EXDATE/RDATE dates, changed occurrences
+    and other rules are reported and not imported.
+    """
+    fmt = (fmt or importer.detect_format(path) or "").lower()
+    if fmt not in importer.FORMATS:
+        print_error(f"Cannot tell the format of {path}; pass --format ics or --format csv.")
+        raise typer.Exit(1)
+
+    account = get_account()
+    calendar = id_cache.default_calendar(account)
+    if calendar is None:
+        print_error("Could not access default calendar.")
+        raise typer.Exit(1)
+
+    journal = importer.connect_journal()
+    try:
+        with (sys.stdin if path == "-" else open(path, newline="", encoding="utf-8-sig")) as lines:
+            result = importer.run_import(
+                importer.read_events(lines, fmt),
+                account.con,
+                account.protocol.service_url,
+                calendar.calendar_id,
+                journal,
+                workers=workers,
+            )
+    except RequestException as exc:
+        # Before OSError: requests' exceptions are IOErrors too.
+        id_cache.forget_missing_calendar(account, calendar.calendar_id, exc)
+        print_error(f"Import failed: {exc}. Created events are journaled; run again to continue.")
+        raise typer.Exit(1)
+    except OSError as exc:
+        print_error(f"Cannot read {path}: {exc}")
+        raise typer.Exit(1)
+    except importer.ImportFormatError as exc:
+        print_error(f"Stopped: {exc}. Events before it were imported; rerun to continue after fixing it.")
+        raise typer.Exit(1)
+    finally:
+        journal.close()
+
+    for event in result.unsupported:
+        print_warning(f"Not imported: {event.source}: {event.subject or '(no subject)'}: {event.unsupported}.")
+    for event, error in result.failed:
+        print_error(f"{event.source}: {event.subject or '(no subject)'}: {error}")
+    summary = (
+        f"{result.created} created, {result.skipped} already imported, "
+        f"{len(result.failed)} failed in {result.request_count} request(s)."
+    )
+    if result.unsupported:
+        summary += f" {len(result.unsupported)} not supported."
+    if result.failed:
+        print_error(summary)
+        raise typer.Exit(1)
+    print_success(summary)
+
+
+@app.command("export")
+def export_events(
+    start: str = typer.Option(..., "--start", help="Start date (YYYY-MM-DD)"),
+    end: str = typer.Option(..., "--end", help="End date (YYYY-MM-DD), not included"),
+    out: Optional[Path] = typer.Option(None, "--out", "-o", help="File to write (default: stdout)"),
+) -> None:
+    """Export calendar events in a date range as iCalendar (.ics).
+
+    Recurring series are written as their occurrences. Events are written as
+    they are fetched, so long ranges need little memory. Exporting to the
+    same file again only fetches and rewrites events that changed.
+    """
+    start_dt = _parse_date(start)
+    end_dt = _parse_date(end)
+    if end_dt <= start_dt:
+        print_error("End date must be after the start date.")
+        raise typer.Exit(1)
+
+    account = get_account()
+    calendar = id_cache.default_calendar(account)
+    if calendar is None:
+        print_error("Could not access default calendar.")
+        raise typer.Exit(1)
+
+    view = calendar_view.CalendarView(
+        calendar_view.connect(calendar_view.db_path(id_cache.account_key(account))),
+        account.con,
+        account.protocol.service_url,
+        calendar.calendar_id,
+        fields=exporter.EXPORT_FIELDS,
+        page_size=PAGE_SIZE,
+    )
+    try:
+        if out is None or str(out) == "-":
+            exporter.write_calendar(sys.stdout.buffer, view.instances(start_dt.date(), end_dt.date()))
+            return
+        result = exporter.export_file(view, start_dt.date(), end_dt.date(), out)
+    except RequestException as exc:
+        id_cache.forget_missing_calendar(account, calendar.calendar_id, exc)
+        print_error(f"Export failed: {exc}")
+        raise typer.Exit(1)
+    except OSError as exc:
+        print_error(f"Cannot write {out}: {exc}")
+        raise typer.Exit(1)
+
+    if not result.rewritten:
+        print_success(f"{out} is up to date ({result.written} events).")
+        return
+    print_success(
+        f"Exported {result.written} events to {out} "
+        f"({result.added} new, {result.changed} changed, {result.removed} removed)."
+    )
+
+
+@app.command()
+def free(
+    attendees: list[str] = typer.Option(
+        ..., "--attendees", help="Comma-separated email addresses (repeatable); '-' reads them from stdin"
+    ),
+    duration: str = typer.Option("30m", "--duration", help="Meeting length, e.g. 30m, 1h, 1h30m"),
+    between: Optional[str] = typer.Option(
+        None, "--between", help="Days to search, YYYY-MM-DD..YYYY-MM-DD (default: the next 7 days)"
+    ),
+    hours: str = typer.Option("09:00-17:00", "--hours", help="Local working hours, HH:MM-HH:MM or 'any'"),
+    weekends: bool = typer.Option(False, "--weekends", help="Also suggest slots on Saturday and Sunday"),
+    tentative_free: bool = typer.Option(False, "--tentative-free", help="Treat tentative events as free"),
+    interval: int = typer.Option(
+        availability.DEFAULT_INTERVAL, "--interval", min=5, max=1440, help="Slot granularity in minutes"
+    ),
+    limit: int = typer.Option(10, "--limit", help="Number of candidate slots to show"),
+) -> None:
+    """Find times when many attendees are free, best candidates first.
+
+    Slots are ranked by how many attendees are busy during them, then by
+    start time; suggested slots never overlap.
+    """
+    addresses = read_ids([part for value in attendees for part in value.split(",")])
+    if not addresses:
+        print_error("No attendees given.")
+        raise typer.Exit(1)
+    try:
+        length = availability.parse_duration(duration)
+    except ValueError as exc:
+        print_error(str(exc))
+        raise typer.Exit(1)
+    if between:
+        start_dt, end_dt = _parse_between(between)
+    else:
+        start_dt = datetime.now().replace(minute=0, second=0, microsecond=0) + timedelta(hours=1)
+        end_dt = start_dt.replace(hour=0) + timedelta(days=8)
+    working_hours = _parse_hours(hours)
+
+    account = get_account()
+    finder = availability.FreeTimeFinder(start_dt, end_dt, interval=interval)
+    try:
+        finder.fetch(account.con, account.protocol.service_url, addresses, tentative_busy=not tentative_free)
+    except RequestException as exc:
+        print_error(f"Failed to read schedules: {exc}")
+        raise typer.Exit(1)
+
+    unknown = [schedule for schedule in finder.schedules.values() if schedule.error]
+    if len(unknown) == len(finder.schedules):
+        print_error(f"Could not read any schedule: {unknown[0].error}")
+        raise typer.Exit(1)
+    for schedule in unknown:
+        print_warning(f"No availability for {schedule.address}: {schedule.error}")
+
+    slots = finder.candidates(length, limit=limit, hours=working_hours, weekends=weekends)
+    if output.is_machine():
+        output.write_slots(slots)
+        return
+    if not slots:
+        console.print("No slots of that length in the given range.")
+        return
+    print_free_slots(slots, len(finder.schedules) - len(unknown))
@@ -1,20 +1,313 @@
-"""Mail commands: search, read, send, reply, mark."""
-
+"""Mail commands: search, read, attachments, send, reply, mark, move, delete, sync, watch, folders."""
+
+import csv
+import heapq
+import json
+import os
+import shlex
+import subprocess
 from datetime import datetime
-from typing import Optional
+from itertools import islice
+from pathlib import Path
+from typing import Iterator, Optional
+from urllib.parse import quote, urlencode
 
 import typer
+from requests.exceptions import RequestException
 
+from outlook_cli import attachments as attachment_files
+from outlook_cli import folders as folder_cache
+from outlook_cli import ids as id_cache
+from outlook_cli import merge, mirror, output, paging, uploads
+from outlook_cli import watch as delta_watch
 from outlook_cli.auth import get_account
-from outlook_cli.display import console, print_error, print_mail_detail, print_mail_table, print_success
+from outlook_cli.batch import BatchReport, BatchRequest, execute, read_ids
+from outlook_cli.display import (
+    console,
+    err_console,
+    format_size,
+    print_attachment_table,
+    print_batch_report,
+    print_cursor,
+    print_error,
+    print_folder_tree,
+    print_mail_detail,
+    print_mail_table,
+    print_success,
+    print_warning,
+    stream_mail_table,
+)
+from outlook_cli.query import (
+    MAIL_LIST_FIELDS,
+    MAIL_READ_FIELDS,
+    MAIL_RECORD_FIELDS,
+    TEXT_BODIES,
+    ODataQuery,
+    parse_fields,
+    preferring,
+)
+from outlook_cli.stream import PAGE_SIZE, prefetch
 
 app = typer.Typer(help="Read and send email.")
 
+IDS_HELP = "Message ID(s); '-' reads IDs from stdin, one per line"
+# Graph's largest $top for messages.
+MAX_PAGE_SIZE = 1000
+
+
+def _message_ids(args: list[str]) -> list[str]:
+    ids = read_ids(args)
+    if not ids:
+        print_error("No message IDs given.")
+        raise typer.Exit(1)
+    return ids
+
+
+def _run_batch(
+    account,
+    ids: list[str],
+    method: str,
+    path: str = "",
+    body: Optional[dict] = None,
+    headers: Optional[dict[str, str]] = None,
+) -> BatchReport:
+    """Issue one sub-request per message ID through Graph $batch."""
+    requests = [
+        BatchRequest(str(index), method, f"/me/messages/{message_id}{path}", body, headers=headers or {})
+        for index, message_id in enumerate(ids)
+    ]
+    return execute(account.con, account.protocol.service_url, requests)
+
+
+def _sync_folder_map(account, folder_map: folder_cache.FolderMap, full: bool = False) -> None:
+    try:
+        folder_cache.sync(folder_map, account.con, account.protocol.service_url, full=full)
+    except RequestException as exc:
+        print_error(f"Failed to load folders: {exc}")
+        raise typer.Exit(1)
+    folder_map.save(folder_cache.cache_path(id_cache.account_key(account)))
+
+
+def _get_folder(account, name: str):
+    """The folder for a name or ``Parent/Child`` path, resolved from the local folder map.
+
+    The map is only refreshed (through its delta link) when the name isn't in it,
+    or on every lookup with ``--refresh-ids``.
+    """
+    mailbox = account.mailbox()
+    if name == "Inbox":
+        return mailbox.inbox_folder()
+
+    folder_map = folder_cache.FolderMap.load(folder_cache.cache_path(id_cache.account_key(account)))
+    found = None if id_cache.refresh else folder_map.resolve(name)
+    if found is None:
+        _sync_folder_map(account, folder_map)
+        found = folder_map.resolve(name)
+    if found is None:
+        print_error(f"Folder not found: {name}")
+        raise typer.Exit(1)
+    return mailbox.folder_constructor(parent=mailbox, name=found.name, folder_id=found.id)
+
+
+def _parse_date(value: str) -> datetime:
+    try:
+        return datetime.strptime(value, "%Y-%m-%d")
+    except ValueError:
+        print_error(f"Invalid date format: {value} (expected YYYY-MM-DD)")
+        raise typer.Exit(1)
+
+
+def _search_offline(
+    path: Path,
+    query: Optional[str],
+    folders: Optional[list[str]],
+    limit: int,
+    sender: Optional[str],
+    start_date: Optional[str],
+    end_date: Optional[str],
+    unread: bool,
+    important: bool,
+    has_attachments: bool,
+    fallback: bool = False,
+) -> None:
+    """Answer ``mail search`` from the mirror at ``path``; filters combine with text search.
+
+    ``folders`` None searches every mirrored folder. ``fallback`` means the
+    mirror was chosen without --offline, which is said along with its age.
+    """
+    start = _parse_date(start_date) if start_date else None
+    end = _parse_date(end_date) if end_date else None
+    db = mirror.connect(path)
+    synced = {row["name"].lower(): row["name"] for row in mirror.synced_folders(db)}
+    for folder in folders or []:
+        if folder.lower() not in synced:
+            print_error(f"Folder not mirrored: {folder}. Run: outlook mail sync --folder {folder}")
+            raise typer.Exit(1)
+    names = [synced[folder.lower()] for folder in folders] if folders else list(synced.values())
+    if fallback:
+        _warn_mirror_age(db, names)
+
+    messages = mirror.search(
+        db,
+        folders=names,
+        query=query,
+        sender=sender,
+        start=start,
+        end=end,
+        unread=unread,
+        important=important,
+        has_attachments=has_attachments,
+        limit=limit,
+    )
+    labels = {name: name for name in names} if len(names) > 1 else None
+    if output.is_machine():
+        output.write_messages(messages, folders=labels)
+        return
+    if not messages:
+        console.print("No messages found.")
+        return
+
+    print_mail_table(messages, folders=labels)
+
+
+def _warn_mirror_age(db, names: list[str]) -> None:
+    """Say that results come from the mirror, and as of when."""
+    times = [row["synced_at"] for row in mirror.synced_folders(db) if row["name"] in names]
+    if not times or None in times:
+        when = "an unfinished sync"
+    else:
+        when = f"the sync of {datetime.fromisoformat(min(times)).astimezone():%Y-%m-%d %H:%M}"
+    print_warning(
+        f"Searching the local mirror as of {when}: Graph can't combine text search with filters. "
+        "Run 'outlook mail sync' to refresh it, or pass --offline to skip this note."
+    )
+
+
+def _search_folders(account, names: list[str], all_folders: bool) -> dict[str, tuple]:
+    """Folders to search by id, with the path shown for each.
+
+    ``--all-folders`` brings the folder map up to date first (one delta request
+    when nothing changed), so new folders are searched and deleted ones aren't.
+    """
+    mailbox = account.mailbox()
+    if not all_folders:
+        found = {}
+        for name in names:
+            mail_folder = _get_folder(account, name)
+            found.setdefault(mail_folder.folder_id, (name, mail_folder))
+        return found
+
+    folder_map = folder_cache.FolderMap.load(folder_cache.cache_path(id_cache.account_key(account)))
+    _sync_folder_map(account, folder_map)
+    return {
+        folder.id: (
+            folder_map.path(folder),
+            mailbox.folder_constructor(parent=mailbox, name=folder.name, folder_id=folder.id),
+        )
+        for _, folder in folder_map.walk()
+    }
+
+
+def _messages_url(mail_folder, query: ODataQuery, page_size: int) -> str:
+    """The first page of a folder's messages, as O365's ``get_messages`` requests it."""
+    url = mail_folder.build_url(mail_folder._endpoints.get("folder_messages").format(id=mail_folder.folder_id))
+    return f"{url}?{urlencode({'$top': page_size, **query.as_params()}, quote_via=quote)}"
+
+
+def _paged_messages(account, positions: dict[str, Optional[paging.Position]], limit: int) -> Iterator:
+    """Up to ``limit`` messages from each folder's position, newest first across folders.
+
+    Every folder is read on its own prefetch thread (the throttle caps
+    requests in flight per mailbox) and returns newest first, so a heap over
+    the folders' next messages yields the overall order without buffering a
+    folder. ``positions`` is updated as messages are consumed, so once
+    ``limit`` are out it says where each folder continues; the streams are
+    then closed and no further pages are requested. A folder that ran out
+    with every message it had shown is set to None, so a cursor leaves it out.
+    """
+    mailbox = account.mailbox()
+    # Where each folder that ran out stopped: after its last message, or where it started if it had none.
+    exhausted: dict[str, paging.Position] = {}
+
+    def _stream(key: str, position: paging.Position) -> Iterator[tuple]:
+        last, count = position, 0
+        # No folder can contribute more than ``limit`` messages.
+        for item, after in islice(paging.pages(account.con, position), limit):
+            message = mailbox.message_constructor(parent=mailbox, **{mailbox._cloud_data_key: item})
+            message.folder_id = key
+            last, count = after, count + 1
+            yield message, key, after
+        if count < limit and last is not None:
+            exhausted[key] = last
+
+    streams = [prefetch(_stream(key, position)) for key, position in positions.items() if position]
+    if len(streams) == 1:
+        merged: Iterator[tuple] = streams[0]
+    else:
+        merged = heapq.merge(*streams, key=lambda entry: entry[0].received, reverse=True)
+    try:
+        for message, key, after in islice(merged, limit):
+            positions[key] = after
+            yield message
+    finally:
+        for stream in streams:
+            stream.close()
+        for key, last in exhausted.items():
+            if positions[key] == last:
+                positions[key] = None
+
+
+def _write_paged(
+    account,
+    positions: dict[str, Optional[paging.Position]],
+    labels: Optional[dict[str, str]],
+    limit: int,
+    resumed: bool = False,
+) -> None:
+    """Show messages read through :func:`_paged_messages`, then the cursor to continue from.
+
+    The cursor is printed with machine output, and when continuing from one.
+    """
+    messages = _paged_messages(account, positions, limit)
+    if output.is_machine():
+        output.write_messages(messages, folders=labels)
+    elif limit > PAGE_SIZE:
+        if not stream_mail_table(messages, folders=labels):
+            console.print("No messages found.")
+    else:
+        messages = list(messages)
+        if messages:
+            print_mail_table(messages, folders=labels)
+        else:
+            console.print("No messages found.")
+
+    remaining = {key: list(position) for key, position in positions.items() if position}
+    if remaining and (output.is_machine() or resumed):
+        print_cursor(paging.encode("mail", {"folders": remaining, "labels": labels}))
+
+
+def _resume_search(token: str, limit: int) -> None:
+    account = get_account()
+    try:
+        state = paging.decode(token, "mail")
+        positions: dict[str, Optional[paging.Position]] = {
+            key: (paging.check_url(url, account.protocol.service_url), int(offset))
+            for key, (url, offset) in state["folders"].items()
+        }
+        labels = state.get("labels")
+    except (paging.CursorError, KeyError, TypeError, ValueError) as exc:
+        print_error(str(exc) if isinstance(exc, paging.CursorError) else "Invalid cursor.")
+        raise typer.Exit(1)
+    _write_paged(account, positions, labels, limit, resumed=True)
+
 
 @app.command()
 def search(
     query: Optional[str] = typer.Argument(None, help="Search terms to filter messages"),
-    folder: str = typer.Option("Inbox", "--folder", help="Folder name to search in"),
+    folders: list[str] = typer.Option(
+        ["Inbox"], "--folder", help="Folder name or path (Parent/Child) to search in (repeatable)"
+    ),
+    all_folders: bool = typer.Option(False, "--all-folders", help="Search every folder in the mailbox"),
     limit: int = typer.Option(25, "--limit", help="Maximum number of messages to return"),
     sender: Optional[str] = typer.Option(None, "--from", "--sender", help="Filter by sender email address"),
     start_date: Optional[str] = typer.Option(None, "--start-date", help="Messages received after this date (YYYY-MM-DD)"),
@@ -22,76 +315,94 @@ def search(
     unread: bool = typer.Option(False, "--unread", help="Show only unread messages"),
     important: bool = typer.Option(False, "--important", help="Show only high-importance messages"),
     has_attachments: bool = typer.Option(False, "--has-attachments", help="Show only messages with attachments"),
+    offline: bool = typer.Option(False, "--offline", help="Search the local mirror (see 'mail sync') instead of the server"),
+    fields: Optional[str] = typer.Option(
+        None, "--fields", help="Comma-separated Graph properties to fetch ('all' for full messages)"
+    ),
+    page_size: Optional[int] = typer.Option(
+        None, "--page-size", min=1, max=MAX_PAGE_SIZE, help="Messages per Graph request (default: up to 100)"
+    ),
+    cursor: Optional[str] = typer.Option(
+        None, "--cursor", help="Continue a previous search where it stopped (printed with --output)"
+    ),
 ) -> None:
-    """Search for messages in a mail folder."""
-    account = get_account()
-    mailbox = account.mailbox()
+    """Search for messages in one or more mail folders.
 
-    if folder == "Inbox":
-        mail_folder = mailbox.inbox_folder()
-    else:
-        mail_folder = mailbox.get_folder(folder_name=folder)
-        if mail_folder is None:
-            print_error(f"Folder not found: {folder}")
-            raise typer.Exit(1)
+    With --output, a cursor for the rest of the results is printed on stderr;
+    --cursor continues from it (the search options come from the cursor).
+    """
+    if cursor is not None:
+        _resume_search(cursor, limit)
+        return
 
+    account = get_account()
+    mirror_path = mirror.db_path(id_cache.account_key(account))
     has_filters = any([sender, start_date, end_date, unread, important, has_attachments])
+    # Graph cannot combine $search with $filter; the local index can.
+    if offline or (
+        query
+        and has_filters
+        and not all_folders
+        and all(mirror.is_mirrored(mirror_path, folder) for folder in folders)
+    ):
+        _search_offline(
+            mirror_path, query, None if all_folders else folders, limit, sender, start_date, end_date, unread,
+            important, has_attachments, fallback=not offline,
+        )
+        return
 
-    params = {"limit": limit}
+    by_id = _search_folders(account, folders, all_folders)
+    if not by_id:
+        console.print("No messages found.")
+        return
+
+    default_fields = MAIL_RECORD_FIELDS if output.is_machine() else MAIL_LIST_FIELDS
+    select = parse_fields(fields, default_fields)
+    if select and len(by_id) > 1 and "receivedDateTime" not in select:
+        # Needed to merge the folders' results.
+        select = [*select, "receivedDateTime"]
+    odata_query = ODataQuery(select=select)
     if query:
-        params["query"] = mailbox.q().search(query)
+        odata_query.search(query)
         if has_filters:
-            console.print(
-                "[bold yellow]Warning:[/] Filters are ignored when using text search. "
-                "Microsoft Graph API does not support combining search with OData filters."
+            sync_args = " ".join(f'--folder "{folder}"' for folder in folders)
+            print_warning(
+                "Filters are ignored when using text search. "
+                "Microsoft Graph API does not support combining search with OData filters. "
+                f"Run 'outlook mail sync {sync_args}' to search with filters offline."
             )
-    elif has_filters:
-        odata_query = mailbox.new_query()
-        first_filter = True
-
+    else:
         if start_date:
-            try:
-                start_dt = datetime.strptime(start_date, "%Y-%m-%d")
-            except ValueError:
-                print_error(f"Invalid date format: {start_date} (expected YYYY-MM-DD)")
-                raise typer.Exit(1)
-            clause = odata_query.on_attribute("receivedDateTime") if first_filter else odata_query.chain("and").on_attribute("receivedDateTime")
-            clause.greater_equal(start_dt)
-            first_filter = False
-
+            odata_query.greater_equal("receivedDateTime", _parse_date(start_date))
         if end_date:
-            try:
-                end_dt = datetime.strptime(end_date, "%Y-%m-%d")
-            except ValueError:
-                print_error(f"Invalid date format: {end_date} (expected YYYY-MM-DD)")
-                raise typer.Exit(1)
-            clause = odata_query.on_attribute("receivedDateTime") if first_filter else odata_query.chain("and").on_attribute("receivedDateTime")
-            clause.less_equal(end_dt)
-            first_filter = False
-
+            odata_query.less_equal("receivedDateTime", _parse_date(end_date))
         if unread:
-            clause = odata_query.on_attribute("isRead") if first_filter else odata_query.chain("and").on_attribute("isRead")
-            clause.equals(False)
-            first_filter = False
-
+            odata_query.equals("isRead", False)
         if important:
-            clause = odata_query.on_attribute("importance") if first_filter else odata_query.chain("and").on_attribute("importance")
-            clause.equals("high")
-            first_filter = False
-
+            odata_query.equals("importance", "high")
         if has_attachments:
-            clause = odata_query.on_attribute("hasAttachments") if first_filter else odata_query.chain("and").on_attribute("hasAttachments")
-            clause.equals(True)
-            first_filter = False
-
+            odata_query.equals("hasAttachments", True)
         if sender:
-            clause = odata_query.on_attribute("from/emailAddress/address") if first_filter else odata_query.chain("and").on_attribute("from/emailAddress/address")
-            clause.contains(sender)
-            first_filter = False
+            odata_query.contains("from/emailAddress/address", sender)
+
+    if output.is_machine() or len(by_id) > 1:
+        size = page_size or min(limit, PAGE_SIZE)
+        positions: dict[str, Optional[paging.Position]] = {
+            key: (_messages_url(mail_folder, odata_query, size), 0) for key, (_, mail_folder) in by_id.items()
+        }
+        labels = {key: label for key, (label, _) in by_id.items()} if len(by_id) > 1 else None
+        _write_paged(account, positions, labels, limit)
+        return
 
-        params["query"] = odata_query
+    ((_, mail_folder),) = by_id.values()
+    if limit > PAGE_SIZE:
+        # Several pages: show rows as they arrive while the next page downloads.
+        pages = mail_folder.get_messages(limit=limit, query=odata_query, batch=page_size or PAGE_SIZE)
+        if not stream_mail_table(prefetch(pages)):
+            console.print("No messages found.")
+        return
 
-    messages = list(mail_folder.get_messages(**params))
+    messages = list(mail_folder.get_messages(limit=limit, query=odata_query, batch=page_size))
 
     if not messages:
         console.print("No messages found.")
@@ -102,28 +413,173 @@ def search(
 
 @app.command()
 def read(
-    message_id: str = typer.Argument(..., help="ID of the message to read"),
+    message_ids: list[str] = typer.Argument(..., help=IDS_HELP),
+    max_body: Optional[int] = typer.Option(
+        None, "--max-body", min=1, help="Show only the first KB of each body"
+    ),
+    unique: bool = typer.Option(
+        False, "--unique", help="Show only what each message adds to its thread, without quoted history"
+    ),
+    as_html: bool = typer.Option(False, "--html", help="Download HTML bodies and convert them locally"),
 ) -> None:
-    """Read a single message by ID."""
+    """Read one or more messages by ID.
+
+    Bodies are requested as plain text, rendered by Graph, unless --html is
+    given.
+    """
+    ids = _message_ids(message_ids)
     account = get_account()
     mailbox = account.mailbox()
+    max_chars = max_body * 1024 if max_body else None
+    fields = (*MAIL_READ_FIELDS, "uniqueBody" if unique else "body")
+    preferences = () if as_html else (TEXT_BODIES,)
+
+    if len(ids) == 1:
+        with preferring(account.con, *preferences):
+            msg = mailbox.get_message(object_id=ids[0], query=ODataQuery(select=fields))
+        if msg is None:
+            print_error(f"Message not found: {ids[0]}")
+            raise typer.Exit(1)
+        print_mail_detail(msg, max_chars=max_chars, unique=unique)
+        return
 
-    msg = mailbox.get_message(object_id=message_id)
+    headers = {"Prefer": ", ".join(preferences)} if preferences else None
+    report = _run_batch(account, ids, "GET", f"?$select={','.join(fields)}", headers=headers)
+    for resp in report.succeeded:
+        print_mail_detail(
+            mailbox.message_constructor(parent=mailbox, **{mailbox._cloud_data_key: resp.body}),
+            max_chars=max_chars,
+            unique=unique,
+        )
+    print_batch_report(ids, report, "Read")
+    if report.failed:
+        raise typer.Exit(1)
+
+
+@app.command()
+def attachments(
+    message_id: str = typer.Argument(..., help="Message ID"),
+    save: Optional[Path] = typer.Option(
+        None, "--save", file_okay=False, help="Download the attachments into this directory"
+    ),
+    workers: int = typer.Option(
+        attachment_files.DEFAULT_WORKERS, "--workers", min=1, max=8, help="Downloads to run at once"
+    ),
+) -> None:
+    """List a message's attachments, or download them with --save.
+
+    Downloads stream to disk in chunks. An interrupted download resumes from
+    its .part file when the command is run again; files already saved are
+    skipped, and a different file with the same name is kept while the
+    download is saved as "name (2).ext".
+    """
+    account = get_account()
+    mailbox = account.mailbox()
+    msg = mailbox.get_message(object_id=message_id, query=ODataQuery(select=["id", "subject", "hasAttachments"]))
     if msg is None:
         print_error(f"Message not found: {message_id}")
         raise typer.Exit(1)
 
-    print_mail_detail(msg)
+    try:
+        found = attachment_files.list_attachments(account.con, account.protocol.service_url, msg.object_id)
+    except RequestException as exc:
+        print_error(f"Failed to list attachments: {exc}")
+        raise typer.Exit(1)
+
+    if save is None:
+        if output.is_machine():
+            output.write_attachments(found)
+        elif not found:
+            console.print("No attachments.")
+        else:
+            print_attachment_table(found, title=msg.subject or "Attachments")
+        return
+
+    save.mkdir(parents=True, exist_ok=True)
+
+    def _report(result: attachment_files.Download) -> None:
+        name = result.path.name
+        if result.error:
+            print_error(f"{name}: {result.error}. Run again to resume.")
+        elif result.skipped:
+            print_warning(f"{name}: skipped ({result.note}).")
+        else:
+            resumed = f", resumed at {format_size(result.resumed_from)}" if result.resumed_from else ""
+            note = f" ({result.note})" if result.note else ""
+            print_success(f"{name}: {format_size(result.size)}{resumed}{note}")
+
+    results = attachment_files.download_all(
+        account.con,
+        account.protocol.service_url,
+        msg.object_id,
+        found,
+        save,
+        workers=workers,
+        on_done=_report,
+    )
+    saved = [result for result in results if result.ok and not result.skipped]
+    failed = [result for result in results if not result.ok]
+    print_success(f"Saved {len(saved)} of {len(results)} attachment(s) to {save}.")
+    if failed:
+        raise typer.Exit(1)
 
 
 @app.command()
 def send(
     to: str = typer.Option(..., "--to", help="Recipient email address"),
     subject: str = typer.Option(..., "--subject", help="Message subject"),
-    body: str = typer.Option(..., "--body", help="Message body text"),
+    body: Optional[str] = typer.Option(None, "--body", help="Message body text"),
     cc: Optional[str] = typer.Option(None, "--cc", help="CC email address"),
+    attach: list[Path] = typer.Option(
+        [], "--attach", exists=True, dir_okay=False, readable=True, help="File to attach (repeatable)"
+    ),
+    template: Optional[Path] = typer.Option(
+        None, "--template", exists=True, dir_okay=False, help="Read the body from a file (.html for an HTML body)"
+    ),
+    batch: Optional[Path] = typer.Option(
+        None, "--batch", exists=True, dir_okay=False, help="Send one message per row of a CSV or JSONL file"
+    ),
+    journal: Optional[Path] = typer.Option(
+        None, "--journal", dir_okay=False, help="Batch journal (default: ROWS.journal.jsonl)"
+    ),
+    workers: int = typer.Option(merge.DEFAULT_WORKERS, "--workers", min=1, max=8, help="Batch sends at once"),
+    per_minute: float = typer.Option(
+        merge.PER_MINUTE, "--per-minute", min=0, help="Batch send rate limit (0: none)"
+    ),
 ) -> None:
-    """Compose and send a new message."""
+    """Compose and send a new message, or one per row with --batch.
+
+    Small attachments go inline with the message. Larger ones (over 3 MB, up
+    to 150 MB) are added to a draft through an upload session that reads the
+    file in chunks, and the draft is sent once every file is in.
+
+    With --batch, --to, --cc, --subject and the body are templates: {column}
+    is replaced with the row's value. Outcomes are appended to a journal, and
+    running the same batch again skips the rows already sent.
+    """
+    if (body is None) == (template is None):
+        print_error("Give the message body with either --body or --template.")
+        raise typer.Exit(1)
+    if template is not None:
+        body = template.read_text(encoding="utf-8")
+    html_body = template is not None and template.suffix.lower() in (".html", ".htm")
+
+    try:
+        plan = uploads.plan(attach)
+    except ValueError as exc:
+        print_error(f"Cannot attach {exc}.")
+        raise typer.Exit(1)
+
+    if batch is not None:
+        if plan.needs_draft:
+            print_error("--batch can only send attachments that fit inline (3 MB in total).")
+            raise typer.Exit(1)
+        message = merge.Template(
+            to, subject, body, cc, html_body, tuple(uploads.file_attachment(path) for path in plan.inline)
+        )
+        _send_batch(batch, message, journal or batch.with_name(batch.name + merge.JOURNAL_SUFFIX), workers, per_minute)
+        return
+
     account = get_account()
     new_message = account.new_message()
 
@@ -132,14 +588,74 @@ def send(
         new_message.cc.add(cc)
     new_message.subject = subject
     new_message.body = body
+    if html_body:
+        new_message.body_type = "HTML"
+    if plan.inline:
+        new_message.attachments.add(plan.inline)
+
+    if plan.needs_draft:
+        _attach_to_draft(account, new_message, plan)
 
     if new_message.send():
-        print_success("Message sent.")
+        print_success(f"Message sent with {len(attach)} attachment(s)." if attach else "Message sent.")
     else:
         print_error("Failed to send message.")
         raise typer.Exit(1)
 
 
+def _send_batch(rows: Path, message: merge.Template, journal_path: Path, workers: int, per_minute: float) -> None:
+    account = get_account()
+    journal = merge.Journal(journal_path)
+
+    def _report(result: merge.Result) -> None:
+        if result.status == "failed":
+            print_error(f"Row {result.row}{f' ({result.to})' if result.to else ''}: {result.error}")
+
+    try:
+        summary = merge.send_all(
+            account.con,
+            account.protocol.service_url,
+            merge.read_rows(rows),
+            message,
+            journal,
+            workers=workers,
+            per_minute=per_minute,
+            on_result=_report,
+        )
+    except (merge.MergeError, OSError, csv.Error) as exc:
+        print_error(f"Cannot read {rows.name}: {exc}. Rows sent so far are in {journal_path}.")
+        raise typer.Exit(1)
+    finally:
+        journal.close()
+
+    skipped = f", {summary.skipped} already sent" if summary.skipped else ""
+    print_success(f"Sent {summary.sent} message(s), {summary.failed} failed{skipped}. Journal: {journal_path}")
+    if summary.failed:
+        raise typer.Exit(1)
+
+
+def _attach_to_draft(account, new_message, plan: uploads.Plan) -> None:
+    """Save ``new_message`` as a draft and add the files that can't go inline."""
+    if not new_message.save_draft():
+        print_error("Failed to save the message as a draft.")
+        raise typer.Exit(1)
+
+    service_url = account.protocol.service_url
+    path = None
+    try:
+        for path in plan.posted:
+            uploads.post(account.con, service_url, new_message.object_id, path)
+        for path in plan.uploaded:
+            upload_url = uploads.create_session(account.con, service_url, new_message.object_id, path)
+            size = uploads.upload(account.con, upload_url, path)
+            print_success(f"Uploaded {path.name} ({format_size(size)}).")
+    except (RequestException, uploads.UploadFailed) as exc:
+        print_error(f"Failed to attach {path.name if path else 'files'}: {exc}")
+        # Don't leave a half-attached draft behind.
+        new_message.delete()
+        raise typer.Exit(1)
+
+
 @app.command()
 def reply(
     message_id: str = typer.Argument(..., help="ID of the message to reply to"),
@@ -168,16 +684,24 @@ def reply(
 
 @app.command()
 def mark(
-    message_id: str = typer.Argument(..., help="ID of the message to mark"),
+    message_ids: list[str] = typer.Argument(..., help=IDS_HELP),
     read_flag: bool = typer.Option(True, "--read/--unread", help="Mark as read (default) or unread"),
 ) -> None:
-    """Mark a message as read or unread."""
+    """Mark one or more messages as read or unread."""
+    ids = _message_ids(message_ids)
     account = get_account()
     mailbox = account.mailbox()
 
-    msg = mailbox.get_message(object_id=message_id)
+    if len(ids) > 1:
+        report = _run_batch(account, ids, "PATCH", body={"isRead": read_flag})
+        print_batch_report(ids, report, "Marked as read" if read_flag else "Marked as unread")
+        if report.failed:
+            raise typer.Exit(1)
+        return
+
+    msg = mailbox.get_message(object_id=ids[0])
     if msg is None:
-        print_error(f"Message not found: {message_id}")
+        print_error(f"Message not found: {ids[0]}")
         raise typer.Exit(1)
 
     if read_flag:
@@ -192,3 +716,158 @@ def mark(
         else:
             print_error("Failed to mark message as unread.")
             raise typer.Exit(1)
+
+
+@app.command()
+def move(
+    message_ids: list[str] = typer.Argument(..., help=IDS_HELP),
+    folder: str = typer.Option(..., "--folder", help="Destination folder name or path (Parent/Child)"),
+) -> None:
+    """Move one or more messages to another folder."""
+    ids = _message_ids(message_ids)
+    account = get_account()
+    destination = _get_folder(account, folder)
+
+    report = _run_batch(account, ids, "POST", "/move", {"destinationId": destination.folder_id})
+    print_batch_report(ids, report, f"Moved to {folder}")
+    if report.failed:
+        raise typer.Exit(1)
+
+
+@app.command()
+def delete(
+    message_ids: list[str] = typer.Argument(..., help=IDS_HELP),
+) -> None:
+    """Delete one or more messages (they move to Deleted Items)."""
+    ids = _message_ids(message_ids)
+    account = get_account()
+
+    report = _run_batch(account, ids, "DELETE")
+    print_batch_report(ids, report, "Deleted")
+    if report.failed:
+        raise typer.Exit(1)
+
+
+@app.command()
+def sync(
+    folders: list[str] = typer.Option(["Inbox"], "--folder", help="Folder to mirror (repeatable)"),
+    bodies: bool = typer.Option(False, "--bodies", help="Also mirror message bodies as plain text"),
+    full: bool = typer.Option(False, "--full", help="Discard the mirror and download everything again"),
+) -> None:
+    """Mirror folders into a local database for offline search.
+
+    The first run downloads each folder; later runs only fetch what changed.
+    An interrupted sync picks up where it stopped.
+    """
+    account = get_account()
+    db = mirror.connect(mirror.db_path(id_cache.account_key(account)))
+
+    for name in folders:
+        folder_id = _get_folder(account, name).folder_id
+
+        try:
+            result = mirror.sync_folder(
+                db, account.con, account.protocol.service_url, name, folder_id, bodies=bodies, full=full
+            )
+        except RequestException as exc:
+            print_error(f"Sync of {name} failed: {exc}. Run again to resume.")
+            raise typer.Exit(1)
+
+        how = "resumed" if result.resumed else "full" if result.full else "incremental"
+        print_success(
+            f"{name}: {result.upserted} updated, {result.removed} removed "
+            f"({how}, {result.requests} request(s)); {result.total} messages mirrored."
+        )
+
+
+def _run_hook(command: list[str], record: dict) -> None:
+    """Run ``--exec`` for one message: the record as JSON on stdin, key fields in the environment."""
+    env = {
+        **os.environ,
+        "OUTLOOK_MESSAGE_ID": record["id"],
+        "OUTLOOK_MESSAGE_SUBJECT": record["subject"],
+        "OUTLOOK_MESSAGE_FROM": record["from_address"],
+    }
+    try:
+        completed = subprocess.run(command, input=json.dumps(record, ensure_ascii=False), text=True, env=env)
+    except OSError as exc:
+        print_warning(f"Hook failed for {record['id']}: {exc}")
+        return
+    if completed.returncode != 0:
+        print_warning(f"Hook exited with {completed.returncode} for {record['id']}")
+
+
+@app.command("watch")
+def watch_folder(
+    folder: str = typer.Option("Inbox", "--folder", help="Folder to watch"),
+    interval: float = typer.Option(10.0, "--interval", min=1.0, help="Seconds between polls while mail is arriving"),
+    max_interval: float = typer.Option(300.0, "--max-interval", min=1.0, help="Longest wait while the folder is idle"),
+    hook: Optional[str] = typer.Option(
+        None, "--exec", help="Command to run per message, with the message as JSON on stdin"
+    ),
+    once: bool = typer.Option(False, "--once", help="Poll once and exit (for cron)"),
+) -> None:
+    """Follow a folder and report new or changed messages as they arrive.
+
+    Each message is written as a JSON line on stdout, or handed to the
+    --exec command. The first run only records the folder's current state;
+    later polls (and later runs) report what changed since.
+    """
+    # Records are JSON Lines on stdout whatever --output says, so status and
+    # warnings go to stderr as they do for machine output.
+    if not output.is_machine():
+        output.selected = output.OutputFormat.jsonl
+    account = get_account()
+    mail_folder = _get_folder(account, folder)
+    mailbox = account.mailbox()
+    key = f"{id_cache.account_key(account)}|{mail_folder.folder_id}"
+    watcher = delta_watch.Watcher(
+        account.con,
+        account.protocol.service_url,
+        mail_folder.folder_id,
+        delta_link=delta_watch.load_links().get(key),
+    )
+    command = shlex.split(hook) if hook else None
+
+    def _report(result: delta_watch.Round) -> None:
+        if result.baseline:
+            err_console.print(f"Watching {folder}; new messages will be reported from now on.")
+        for item in result.changed:
+            msg = mailbox.message_constructor(parent=mailbox, **{mailbox._cloud_data_key: item})
+            record = output.message_record(msg)
+            if command:
+                _run_hook(command, record)
+            else:
+                typer.echo(json.dumps(record, ensure_ascii=False))
+        # Only once the round is handed on: a run stopped part-way reports it again.
+        if watcher.delta_link:
+            delta_watch.save_link(key, watcher.delta_link)
+
+    backoff = delta_watch.Backoff(interval, max_interval)
+    try:
+        delta_watch.follow(watcher, _report, backoff, rounds=1 if once else None)
+    except RequestException as exc:
+        print_error(f"Watch of {folder} failed: {exc}")
+        raise typer.Exit(1)
+    except KeyboardInterrupt:
+        pass
+
+
+@app.command("folders")
+def list_folders() -> None:
+    """List the folder tree with item and unread counts.
+
+    Downloads the whole tree in one delta round, which also refreshes the
+    folder map that --folder names are resolved from.
+    """
+    account = get_account()
+    folder_map = folder_cache.FolderMap()
+    _sync_folder_map(account, folder_map, full=True)
+
+    if output.is_machine():
+        output.write_folders(folder_map)
+        return
+    if not folder_map.folders:
+        console.print("No folders found.")
+        return
+    print_folder_tree(folder_map)
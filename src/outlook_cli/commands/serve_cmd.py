@@ -0,0 +1,48 @@
+"""Daemon command: serve mail/cal commands from a warm session."""
+
+import typer
+
+from outlook_cli import daemon
+from outlook_cli.auth import get_account
+from outlook_cli.display import console, print_error, print_success
+
+app = typer.Typer(help="Run a local daemon that keeps a warm session.")
+
+
+@app.callback(invoke_without_command=True)
+def serve(
+    stop: bool = typer.Option(False, "--stop", help="Stop the running daemon"),
+    status: bool = typer.Option(False, "--status", help="Show whether a daemon is running"),
+) -> None:
+    """Keep an authenticated session warm; mail and cal commands use it while it runs."""
+    path = daemon.socket_path()
+
+    if stop:
+        if daemon.request({"command": "shutdown"}, path) is None:
+            console.print("No daemon running.")
+        else:
+            print_success("Daemon stopped.")
+        return
+
+    info = daemon.request({"command": "ping"}, path)
+    if status:
+        if info is None:
+            console.print("No daemon running.")
+            return
+        console.print(f"[bold]PID:[/] {info['pid']}")
+        console.print(f"[bold]Socket:[/] {path}")
+        console.print(f"[bold]Uptime:[/] {int(info['uptime'])}s")
+        console.print(f"[bold]Commands served:[/] {info['served']}")
+        console.print(f"[bold]Cached lookups:[/] {info['cached_lookups']}")
+        if "throttle" in info:
+            console.print(f"[bold]Graph requests:[/] {info['throttle']}")
+        return
+
+    if info is not None:
+        print_error(f"Daemon already running (pid {info['pid']}).")
+        raise typer.Exit(1)
+
+    server = daemon.Daemon(get_account(), path)
+    console.print(f"Serving on {path} — press Ctrl+C to stop.")
+    server.serve_forever()
+    print_success("Daemon stopped.")
@@ -6,8 +6,9 @@ import tomllib
 
 import tomli_w
 
-from outlook_cli.display import print_error
 
+# print_error is imported on the error paths only: display pulls in rich, which
+# the daemon client and --version never need.
 
 CONFIG_DIR = Path.home() / ".outlook-cli"
 CONFIG_FILE = CONFIG_DIR / "config.toml"
@@ -26,9 +27,13 @@ def load_config() -> dict:
     try:
         return tomllib.loads(CONFIG_FILE.read_text())
     except tomllib.TOMLDecodeError:
+        from outlook_cli.display import print_error
+
         print_error(f"Corrupt config file: {CONFIG_FILE}")
         sys.exit(1)
     except OSError as exc:
+        from outlook_cli.display import print_error
+
         print_error(f"Cannot read config: {exc}")
         sys.exit(1)
 
@@ -40,5 +45,7 @@ def save_config(config: dict) -> None:
         CONFIG_FILE.write_bytes(tomli_w.dumps(config).encode())
         CONFIG_FILE.chmod(0o600)
     except OSError as exc:
+        from outlook_cli.display import print_error
+
         print_error(f"Cannot save config: {exc}")
         sys.exit(1)
@@ -0,0 +1,378 @@
+"""Opt-in local daemon that keeps an authenticated session warm.
+
+``outlook serve`` builds the O365 Account once and keeps its HTTP connection
+pool, token (refreshed in place by O365 when it expires) and folder/calendar
+lookups alive. While it listens on the Unix socket in the config dir, the
+groups in ``main.DAEMON_GROUPS`` (``mail``, ``cal``) forward their arguments
+to it; when no daemon is running they execute in-process as before.
+
+Output is sent back as it is written, a line at a time, in JSON frames
+(``{"stream": "output", "data": ...}``) ended by ``{"exit_code": N}``, so
+long listings start printing at once and neither side holds them in memory.
+
+Requests are served one at a time: commands share the module-level console
+and the process working directory, so running them concurrently is unsafe.
+"""
+
+import io
+import json
+import os
+import re
+import shutil
+import signal
+import socket
+import socketserver
+import sys
+import threading
+import time
+import traceback
+from contextlib import redirect_stderr, redirect_stdout
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+from outlook_cli import config
+
+SOCKET_NAME = "daemon.sock"
+NO_DAEMON_ENV = "OUTLOOK_CLI_NO_DAEMON"
+
+MAILBOX_LOOKUPS = frozenset({
+    "inbox_folder", "junk_folder", "deleted_folder", "drafts_folder",
+    "sent_folder", "outbox_folder", "archive_folder", "get_folder",
+})
+SCHEDULE_LOOKUPS = frozenset({"get_default_calendar", "get_calendar"})
+
+# Set while the daemon executes a command so it never forwards to itself.
+_executing = threading.local()
+
+_ANSI_ESCAPE = re.compile(r"\x1b\[[0-9;?]*[A-Za-z]|\x1b\]8;[^\x1b]*\x1b\\")
+
+# Output is sent at line ends, or once this much is pending without one.
+FRAME_SIZE = 64 * 1024
+
+
+def socket_path() -> Path:
+    """Return the daemon socket path inside the config dir."""
+    return config.CONFIG_DIR / SOCKET_NAME
+
+
+# ── Warm account ───────────────────────────────────────────────
+
+
+class _CachedLookups:
+    """Proxy that memoizes the non-None results of selected lookup methods."""
+
+    def __init__(self, target: Any, methods: frozenset[str]) -> None:
+        self._target = target
+        self._methods = methods
+        self._cache: dict[tuple, Any] = {}
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._target, name)
+        if name not in self._methods:
+            return attr
+
+        def lookup(*args: Any, **kwargs: Any) -> Any:
+            key = (name, args, tuple(sorted(kwargs.items())))
+            if key not in self._cache:
+                result = attr(*args, **kwargs)
+                if result is None:
+                    return None
+                self._cache[key] = result
+            return self._cache[key]
+
+        return lookup
+
+
+class WarmAccount:
+    """Account wrapper whose mailbox and schedule cache folder/calendar lookups."""
+
+    def __init__(self, account: Any) -> None:
+        self._account = account
+        self._mailbox = _CachedLookups(account.mailbox(), MAILBOX_LOOKUPS)
+        self._schedule = _CachedLookups(account.schedule(), SCHEDULE_LOOKUPS)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._account, name)
+
+    def mailbox(self, resource: Optional[str] = None) -> Any:
+        if resource is not None:
+            return self._account.mailbox(resource=resource)
+        return self._mailbox
+
+    def schedule(self, resource: Optional[str] = None) -> Any:
+        if resource is not None:
+            return self._account.schedule(resource=resource)
+        return self._schedule
+
+    @property
+    def cached_lookups(self) -> int:
+        return len(self._mailbox) + len(self._schedule)
+
+
+# ── Server ─────────────────────────────────────────────────────
+
+
+class _FrameWriter(io.TextIOBase):
+    """Text stream that sends what a command writes to the client, line by line."""
+
+    def __init__(self, send: Any, stream: str) -> None:
+        self._send = send
+        self._stream = stream
+        self._pending: list[str] = []
+        self._size = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def isatty(self) -> bool:
+        return False
+
+    def write(self, text: str) -> int:
+        self._pending.append(text)
+        self._size += len(text)
+        if text.endswith("\n") or self._size >= FRAME_SIZE:
+            self.flush()
+        return len(text)
+
+    def flush(self) -> None:
+        if self._pending:
+            data = "".join(self._pending)
+            self._pending, self._size = [], 0
+            self._send({"stream": self._stream, "data": data})
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    server: "_Server"
+
+    def handle(self) -> None:
+        try:
+            request = json.loads(self.rfile.readline())
+        except ValueError:
+            return
+        if request.get("command") == "run":
+            self.server.owner.run(request, self._send_frame)
+            return
+        response = self.server.owner.handle(request)
+        self.wfile.write(json.dumps(response).encode())
+
+    def _send_frame(self, frame: dict) -> None:
+        try:
+            self.wfile.write(json.dumps(frame).encode() + b"\n")
+            self.wfile.flush()
+        except OSError:
+            pass  # The client went away (e.g. ``| head``); the command still finishes.
+
+
+class _Server(socketserver.UnixStreamServer):
+    def __init__(self, path: Path, owner: "Daemon") -> None:
+        self.owner = owner
+        super().__init__(str(path), _Handler)
+
+
+class Daemon:
+    """Executes forwarded CLI invocations against one warm Account."""
+
+    def __init__(self, account: Any, path: Path) -> None:
+        self.account = WarmAccount(account)
+        self.path = path
+        self.started_at = time.time()
+        self.served = 0
+        self._cli: Any = None
+        self._server: Optional[_Server] = None
+
+    def handle(self, request: dict) -> dict:
+        command = request.get("command")
+        if command == "ping":
+            from outlook_cli import throttle
+
+            return {
+                "pid": os.getpid(),
+                "uptime": time.time() - self.started_at,
+                "served": self.served,
+                "cached_lookups": self.account.cached_lookups,
+                "throttle": throttle.shared().snapshot().summary(),
+            }
+        if command == "shutdown":
+            self.shutdown()
+            return {"ok": True}
+        return {"output": f"Error: unknown daemon request: {command}\n", "exit_code": 2}
+
+    def run(self, request: dict, send: Callable[[dict], None]) -> int:
+        """Execute a forwarded ``run`` request, passing output frames to ``send``."""
+        self.served += 1
+        exit_code = self._run(
+            request.get("argv", []),
+            request.get("cwd"),
+            request.get("width"),
+            request.get("stdin"),
+            request.get("tty"),
+            send,
+        )
+        send({"exit_code": exit_code})
+        return exit_code
+
+    def _run(
+        self,
+        argv: list[str],
+        cwd: Optional[str],
+        width: Optional[int],
+        stdin: Optional[str],
+        tty: Optional[bool],
+        send: Callable[[dict], None],
+    ) -> int:
+        from outlook_cli import display
+
+        if self._cli is None:
+            import typer
+
+            from outlook_cli.main import app
+
+            self._cli = typer.main.get_command(app)
+
+        buffer = _FrameWriter(send, "output")
+        errors = _FrameWriter(send, "errors")
+        previous_cwd = os.getcwd()
+        previous_stdin = sys.stdin
+        sys.stdin = io.StringIO(stdin or "")
+        display.console.file = buffer
+        if width:
+            display.console.width = width
+        # Render for the caller's terminal (tables) or pipe (lines), not our buffer.
+        display.interactive = tty
+        exit_code = 0
+        _executing.active = True
+        try:
+            with redirect_stdout(buffer), redirect_stderr(errors):
+                if cwd:
+                    os.chdir(cwd)
+                try:
+                    self._cli.main(args=argv, prog_name="outlook", standalone_mode=True)
+                except SystemExit as exc:
+                    exit_code = exc.code if isinstance(exc.code, int) else int(exc.code is not None)
+                except Exception:
+                    traceback.print_exc()
+                    exit_code = 1
+        finally:
+            _executing.active = False
+            sys.stdin = previous_stdin
+            display.console.file = None
+            display.interactive = None
+            os.chdir(previous_cwd)
+            buffer.flush()
+            errors.flush()
+        return exit_code
+
+    def serve_forever(self) -> None:
+        """Listen on the socket until shutdown() or SIGTERM/SIGINT."""
+        from outlook_cli.auth import set_warm_account
+
+        set_warm_account(self.account)
+        self.path.unlink(missing_ok=True)
+        self._server = _Server(self.path, self)
+        os.chmod(self.path, 0o600)
+
+        in_main_thread = threading.current_thread() is threading.main_thread()
+        if in_main_thread:
+            previous_handler = signal.signal(signal.SIGTERM, lambda *_: self.shutdown())
+        try:
+            self._server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            if in_main_thread:
+                signal.signal(signal.SIGTERM, previous_handler)
+            self._server.server_close()
+            self.path.unlink(missing_ok=True)
+            set_warm_account(None)
+
+    def shutdown(self) -> None:
+        # serve_forever() is blocked in this thread while handling a request
+        # or a signal, so stop it from another one.
+        if self._server is not None:
+            threading.Thread(target=self._server.shutdown, daemon=True).start()
+
+
+# ── Client ─────────────────────────────────────────────────────
+
+
+def _exchange(sock: socket.socket, payload: dict) -> dict:
+    sock.sendall(json.dumps(payload).encode() + b"\n")
+    sock.shutdown(socket.SHUT_WR)
+    chunks = []
+    while chunk := sock.recv(65536):
+        chunks.append(chunk)
+    return json.loads(b"".join(chunks))
+
+
+def _connect(path: Path) -> Optional[socket.socket]:
+    """Connect to the daemon, or return None if nothing is listening."""
+    if not path.exists():
+        return None
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(str(path))
+    except OSError:
+        sock.close()
+        return None
+    return sock
+
+
+def request(payload: dict, path: Optional[Path] = None) -> Optional[dict]:
+    """Send a control request; return the reply, or None if no daemon is running."""
+    sock = _connect(path or socket_path())
+    if sock is None:
+        return None
+    with sock:
+        try:
+            return _exchange(sock, payload)
+        except (OSError, ValueError):
+            return None
+
+
+def forward(argv: list[str], path: Optional[Path] = None) -> Optional[int]:
+    """Run ``argv`` on the daemon if one is listening.
+
+    Returns the command's exit code, or None when the caller should execute
+    the command in-process (no daemon running or forwarding disabled).
+    """
+    if os.environ.get(NO_DAEMON_ENV) or getattr(_executing, "active", False):
+        return None
+    sock = _connect(path or socket_path())
+    if sock is None:
+        return None
+
+    payload = {
+        "command": "run",
+        "argv": argv,
+        "cwd": os.getcwd(),
+        "width": shutil.get_terminal_size().columns,
+        "tty": sys.stdout.isatty(),
+        # Only read stdin when a command asks for it ("-"), so forwarding never
+        # blocks on an idle pipe.
+        "stdin": sys.stdin.read() if "-" in argv else None,
+    }
+    streams = {"output": sys.stdout, "errors": sys.stderr}
+    with sock:
+        try:
+            sock.sendall(json.dumps(payload).encode() + b"\n")
+            sock.shutdown(socket.SHUT_WR)
+            with sock.makefile("rb") as frames:
+                for line in frames:
+                    frame = json.loads(line)
+                    if "exit_code" in frame:
+                        return int(frame["exit_code"])
+                    stream = streams.get(frame.get("stream"), sys.stderr)
+                    text = frame.get("data", "")
+                    if not stream.isatty():
+                        text = _ANSI_ESCAPE.sub("", text)
+                    stream.write(text)
+                    stream.flush()
+            raise ConnectionError("the daemon closed the connection")
+        except (OSError, ValueError) as exc:
+            # The command may already have run; re-executing it locally could
+            # send a message twice, so report the failure instead.
+            sys.stderr.write(f"Error: lost connection to outlook daemon: {exc}\n")
+            return 1
@@ -2,76 +2,260 @@
 
 import html
 import re
+from typing import Callable, Iterable, Optional
 
 from rich.console import Console
+from rich.live import Live
 from rich.panel import Panel
 from rich.table import Table
+from rich.text import Text
+
+from outlook_cli import output
 
 console = Console()
+# Diagnostics go here while stdout carries ``--output`` records.
+err_console = Console(stderr=True)
 
 
 # ── Utilities ─────────────────────────────────────────────────
 
 
+_LINE_BREAK = re.compile(r"<br\s*/?>|<p[^>]*>")
+_TAG = re.compile(r"<[^>]+>")
+_HTML_HINT = re.compile(r"<(html|div|p|br|table)\b", re.IGNORECASE)
+# How much text ``_print_body`` hands to rich at a time.
+_PRINT_CHUNK = 8 * 1024
+
+
 def _strip_html(text: str) -> str:
     """Strip HTML tags for plain text display."""
-    clean = re.sub(r"<br\s*/?>", "\n", text)
-    clean = re.sub(r"<p[^>]*>", "\n", clean)
-    clean = re.sub(r"</p>", "", clean)
-    clean = re.sub(r"<[^>]+>", "", clean)
-    clean = re.sub(r"&nbsp;", " ", clean)
-    clean = html.unescape(clean)
+    clean = _TAG.sub("", _LINE_BREAK.sub("\n", text))
+    clean = html.unescape(clean.replace("&nbsp;", " "))
     return clean.strip()
 
 
 def _looks_like_html(text: str) -> bool:
     """Return True if text appears to contain HTML markup."""
-    return bool(re.search(r"<(html|div|p|br|table)\b", text, re.IGNORECASE))
+    return bool(_HTML_HINT.search(text))
+
+
+def plain_text(body: str) -> str:
+    """A message or event body as plain text, stripping HTML when it looks like HTML."""
+    return _strip_html(body) if _looks_like_html(body) else body
+
+
+def _print_body(body: str, max_chars: Optional[int] = None) -> None:
+    """Print a body as plain text, stopping after ``max_chars`` characters.
+
+    Text goes to rich a few KB at a time, ending on a line break, so the top of
+    a long body shows up before the rest has been laid out.
+    """
+    text = plain_text(body)
+    truncated = max_chars is not None and len(text) > max_chars
+    if truncated:
+        text = text[:max_chars]
+    start = 0
+    while start < len(text):
+        end = text.find("\n", start + _PRINT_CHUNK) + 1 or len(text)
+        console.print(text[start:end], markup=False, highlight=False, end="")
+        start = end
+    console.print()
+    if truncated:
+        console.print(f"[dim]… truncated after {max_chars // 1024} KB[/]", highlight=False)
 
 
 # ── Styled output ──────────────────────────────────────────────
 
 
+def _status_console() -> Console:
+    return err_console if output.is_machine() else console
+
+
 def print_error(msg: str) -> None:
-    console.print(f"[bold red]Error:[/] {msg}")
+    _status_console().print(f"[bold red]Error:[/] {msg}")
+
+
+def print_warning(msg: str) -> None:
+    _status_console().print(f"[bold yellow]Warning:[/] {msg}")
+
+
+def print_cursor(token: str) -> None:
+    """Where the next page of a listing starts; on stderr with machine output."""
+    _status_console().print(f"Next page: --cursor {token}", soft_wrap=True, highlight=False, markup=False)
 
 
 def print_success(msg: str) -> None:
-    console.print(f"[bold green]OK:[/] {msg}")
+    _status_console().print(f"[bold green]OK:[/] {msg}")
+
+
+def print_batch_report(ids: list[str], report, action: str) -> None:
+    """Print per-item outcomes of a batched command and the HTTP calls used."""
+    table = Table(title=action, show_lines=False)
+    table.add_column("ID", style="dim", max_width=36)
+    table.add_column("Status", max_width=8)
+    table.add_column("Detail")
+
+    for item_id, resp in zip(ids, report.responses.values()):
+        if resp.ok:
+            table.add_row(item_id, "[bold green]OK[/]", "")
+        else:
+            table.add_row(item_id, f"[bold red]{resp.status or 'ERR'}[/]", resp.error)
+
+    console.print(table)
+    console.print(
+        f"{len(report.succeeded)} of {len(ids)} succeeded "
+        f"in {report.request_count} request(s)."
+    )
+
+
+# ── Streaming ──────────────────────────────────────────────────
+
+# Whether output goes to a person (tables) or a pipe (one line per row).
+# None follows the console; the daemon sets it from the calling terminal.
+interactive: Optional[bool] = None
+
+
+def is_interactive() -> bool:
+    return console.is_terminal if interactive is None else interactive
+
+
+class _LiveTail:
+    """The newest rows that fit on screen, re-rendered by ``rich.live.Live``."""
+
+    def __init__(self, rows: list, build: Callable[[Iterable[tuple]], Table]) -> None:
+        self.rows = rows
+        self.build = build
+
+    def __rich__(self) -> Table:
+        # Title, header and borders take about six lines.
+        visible = max(1, console.height - 7)
+        table = self.build(self.rows[-visible:])
+        table.caption = f"{len(self.rows)} so far…"
+        return table
+
+
+def _stream_rows(items: Iterable, to_row: Callable, build: Callable[[Iterable[tuple]], Table]) -> int:
+    """Show rows as ``items`` yields them.
+
+    On a terminal a live table follows the newest rows and the complete
+    table is printed at the end; when piped, each row is written as one
+    tab-separated line as soon as it arrives. Only the rendered strings are
+    kept, never the message or event objects.
+    """
+    if not is_interactive():
+        out = console.file
+        count = 0
+        for item in items:
+            cells = (Text.from_markup(cell).plain for cell in to_row(item))
+            out.write("\t".join(cells) + "\n")
+            out.flush()
+            count += 1
+        return count
+
+    rows: list[tuple] = []
+    if not console.is_terminal:
+        # Interactive but buffered (the daemon): nothing to update live.
+        rows.extend(to_row(item) for item in items)
+    else:
+        with Live(_LiveTail(rows, build), console=console, transient=True, refresh_per_second=8):
+            for item in items:
+                rows.append(to_row(item))
+    if rows:
+        console.print(build(rows))
+    return len(rows)
 
 
 # ── Mail ───────────────────────────────────────────────────────
 
 
-def print_mail_table(messages: list) -> None:
+def _mail_table(rows: Iterable[tuple], folders: bool = False) -> Table:
     table = Table(title="Messages", show_lines=False)
     table.add_column("", max_width=1)  # unread dot
     table.add_column("Imp", max_width=1)
     table.add_column("Att", max_width=2)
     table.add_column("From", style="cyan", max_width=30)
     table.add_column("Subject", style="white")
+    if folders:
+        table.add_column("Folder", style="magenta", max_width=20)
     table.add_column("Date", style="green", max_width=20)
     table.add_column("ID", style="dim", max_width=36)
+    for row in rows:
+        table.add_row(*row)
+    return table
 
-    for msg in messages:
-        is_read = getattr(msg, "is_read", True)
-        importance = getattr(msg, "importance", None)
-        has_attachments = getattr(msg, "has_attachments", False)
 
-        status = "[bold blue]●[/]" if not is_read else ""
-        imp = "[bold red]![/]" if str(importance).lower() == "high" else ""
-        att = "📎" if has_attachments else ""
+def _mail_row(msg, folders: Optional[dict[str, str]] = None) -> tuple:
+    is_read = getattr(msg, "is_read", True)
+    importance = getattr(msg, "importance", None)
+    has_attachments = getattr(msg, "has_attachments", False)
+
+    status = "[bold blue]●[/]" if not is_read else ""
+    imp = "[bold red]![/]" if str(importance).lower() == "high" else ""
+    att = "📎" if has_attachments else ""
+
+    sender = str(msg.sender) if msg.sender else ""
+    date = msg.received.strftime("%Y-%m-%d %H:%M") if msg.received else ""
+    if folders is not None:
+        folder = folders.get(getattr(msg, "folder_id", None) or "", "")
+        return (status, imp, att, sender, msg.subject or "", folder, date, msg.object_id or "")
+    return (status, imp, att, sender, msg.subject or "", date, msg.object_id or "")
+
+
+def print_mail_table(messages: list, folders: Optional[dict[str, str]] = None) -> None:
+    """``folders`` maps folder ids to paths, adding a Folder column."""
+    console.print(_mail_table((_mail_row(msg, folders) for msg in messages), folders is not None))
+
+
+def stream_mail_table(messages: Iterable, folders: Optional[dict[str, str]] = None) -> int:
+    """Render messages as they arrive; returns how many were shown."""
+    return _stream_rows(
+        messages,
+        lambda msg: _mail_row(msg, folders),
+        lambda rows: _mail_table(rows, folders is not None),
+    )
+
+
+def print_folder_tree(folder_map) -> None:
+    """Folders in tree order, children indented under their parent."""
+    table = Table(title="Folders", show_lines=False)
+    table.add_column("Folder", style="cyan")
+    table.add_column("Unread", justify="right", style="bold")
+    table.add_column("Total", justify="right")
+    for depth, folder in folder_map.walk():
+        table.add_row("  " * depth + folder.name, str(folder.unread or ""), str(folder.total))
+    console.print(table)
+
+
+def format_size(size: int) -> str:
+    if size < 1024:
+        return f"{size} B"
+    value = size / 1024
+    for unit in ("KB", "MB"):
+        if value < 1024:
+            return f"{value:.1f} {unit}"
+        value /= 1024
+    return f"{value:.1f} GB"
 
-        sender = str(msg.sender) if msg.sender else ""
-        date = msg.received.strftime("%Y-%m-%d %H:%M") if msg.received else ""
-        table.add_row(
-            status, imp, att, sender, msg.subject or "", date, msg.object_id or ""
-        )
 
+def print_attachment_table(attachments, title: str = "Attachments") -> None:
+    table = Table(title=title, show_lines=False)
+    table.add_column("Name", style="white")
+    table.add_column("Size", justify="right", style="green")
+    table.add_column("Type", style="cyan", max_width=30)
+    table.add_column("ID", style="dim", max_width=36)
+    for attachment in attachments:
+        kind = attachment.content_type or attachment.kind
+        if attachment.kind != "file":
+            kind = f"{kind} ({attachment.kind})" if attachment.content_type else attachment.kind
+        name = f"{attachment.name} [dim](inline)[/]" if attachment.is_inline else attachment.name
+        table.add_row(name, format_size(attachment.size), kind, attachment.id)
     console.print(table)
+    total = sum(attachment.size for attachment in attachments)
+    console.print(f"{len(attachments)} attachment(s), {format_size(total)}.")
 
 
-def print_mail_detail(msg) -> None:
+def print_mail_detail(msg, max_chars: Optional[int] = None, unique: bool = False) -> None:
+    """``unique`` shows the message's ``uniqueBody`` (its part of the thread) instead of the body."""
     sender = str(msg.sender) if msg.sender else "Unknown"
     to_list = ", ".join(str(r) for r in (msg.to or []))
     cc_list = ", ".join(str(r) for r in (msg.cc or []))
@@ -82,48 +266,85 @@ def print_mail_detail(msg) -> None:
         header += f"[bold]CC:[/] {cc_list}\n"
     header += f"[bold]Date:[/] {date}"
 
-    body = msg.body or "(empty)"
-    if _looks_like_html(body):
-        body = _strip_html(body)
-
     console.print(
         Panel(header, title=msg.subject or "(no subject)", border_style="blue")
     )
-    console.print(body)
+    body = msg.unique_body if unique else msg.body
+    _print_body(body or "(empty)", max_chars)
 
 
 # ── Calendar ───────────────────────────────────────────────────
 
 
-def print_event_table(events: list) -> None:
+def _event_table(rows: Iterable[tuple], calendars: bool = False) -> Table:
     table = Table(title="Events", show_lines=False)
     table.add_column("Subject", style="white")
+    if calendars:
+        table.add_column("Calendar", style="magenta", max_width=20)
     table.add_column("Start", style="green", max_width=20)
     table.add_column("End", style="green", max_width=20)
     table.add_column("Location", style="cyan", max_width=25)
     table.add_column("Info", style="yellow", max_width=20)
     table.add_column("ID", style="dim", max_width=36)
+    for row in rows:
+        table.add_row(*row)
+    return table
+
+
+def _event_row(ev, calendars: Optional[dict[str, str]] = None) -> tuple:
+    start = ev.start.strftime("%Y-%m-%d %H:%M") if ev.start else ""
+    end = ev.end.strftime("%Y-%m-%d %H:%M") if ev.end else ""
+    location = (
+        ev.location.get("displayName", "")
+        if isinstance(ev.location, dict)
+        else str(ev.location or "")
+    )
+
+    info_parts = []
+    if getattr(ev, "is_all_day", False):
+        info_parts.append("All-day")
+    # O365 always attaches a recurrence object; it is falsy for single events.
+    if getattr(ev, "recurrence", None):
+        info_parts.append("Recurring")
+    info = ", ".join(info_parts)
+
+    if calendars is not None:
+        calendar = calendars.get(getattr(ev, "calendar_id", None) or "", "")
+        return (ev.subject or "", calendar, start, end, location, info, ev.object_id or "")
+    return (ev.subject or "", start, end, location, info, ev.object_id or "")
 
-    for ev in events:
-        start = ev.start.strftime("%Y-%m-%d %H:%M") if ev.start else ""
-        end = ev.end.strftime("%Y-%m-%d %H:%M") if ev.end else ""
-        location = (
-            ev.location.get("displayName", "")
-            if isinstance(ev.location, dict)
-            else str(ev.location or "")
-        )
 
-        info_parts = []
-        if getattr(ev, "is_all_day", False):
-            info_parts.append("All-day")
-        if getattr(ev, "recurrence", None) is not None:
-            info_parts.append("Recurring")
-        info = ", ".join(info_parts)
+def print_event_table(events: list, calendars: Optional[dict[str, str]] = None) -> None:
+    """``calendars`` maps calendar ids to names, adding a Calendar column."""
+    console.print(_event_table((_event_row(ev, calendars) for ev in events), calendars is not None))
 
+
+def stream_event_table(events: Iterable, calendars: Optional[dict[str, str]] = None) -> int:
+    """Render events as they arrive; returns how many were shown."""
+    return _stream_rows(
+        events,
+        lambda ev: _event_row(ev, calendars),
+        lambda rows: _event_table(rows, calendars is not None),
+    )
+
+
+def print_free_slots(slots: list, attendees: int) -> None:
+    """Ranked candidate slots from ``cal free``."""
+    table = Table(title="Free slots", show_lines=False)
+    table.add_column("#", justify="right", style="dim")
+    table.add_column("Start", style="green", max_width=20)
+    table.add_column("End", style="green", max_width=20)
+    table.add_column("Available", justify="right", style="bold")
+    table.add_column("Busy", style="yellow")
+    for rank, slot in enumerate(slots, 1):
+        busy = ", ".join(slot.busy[:3]) + (f" +{len(slot.busy) - 3}" if len(slot.busy) > 3 else "")
         table.add_row(
-            ev.subject or "", start, end, location, info, ev.object_id or ""
+            str(rank),
+            slot.start.astimezone().strftime("%Y-%m-%d %a %H:%M"),
+            slot.end.astimezone().strftime("%H:%M"),
+            f"{slot.available}/{attendees}",
+            busy,
         )
-
     console.print(table)
 
 
@@ -187,11 +408,7 @@ def print_event_detail(event) -> None:
         for att in attendees:
             header += f"\n  \u2022 {_format_attendee(att)}"
 
-    body = event.body or "(no description)"
-    if _looks_like_html(body):
-        body = _strip_html(body)
-
     console.print(
         Panel(header, title=event.subject or "(no subject)", border_style="green")
     )
-    console.print(body)
+    _print_body(event.body or "(no description)")
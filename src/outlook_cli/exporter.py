@@ -0,0 +1,258 @@
+"""Calendar export to iCalendar files (``cal export``).
+
+Instances come from :class:`~outlook_cli.calendar_view.CalendarView`, which
+pages ``calendarView`` (or the local cache) a day at a time, and each one is
+written as a ``VEVENT`` as soon as it arrives, so a range with tens of
+thousands of occurrences is exported in bounded memory.
+
+Exporting to a file also records where each event's ``VEVENT`` block sits in
+it, with the event's ``changeKey``, in the calendar cache. Re-exporting to the
+same file (if nobody has touched it since) copies the blocks of unchanged
+events byte for byte and renders only new and changed ones; when nothing
+changed at all the file is left as it is. Combined with the day cache, a
+re-export downloads and rewrites only what changed since the last one.
+"""
+
+import os
+import sqlite3
+from dataclasses import dataclass
+from datetime import date, datetime, timezone
+from pathlib import Path
+from typing import BinaryIO, Iterable, Optional
+
+from outlook_cli import ical
+from outlook_cli.calendar_view import FREE, CalendarView, instant
+from outlook_cli.display import plain_text
+
+# Fetched on top of calendar_view.VIEW_FIELDS.
+EXPORT_FIELDS = ("iCalUId", "body", "attendees", "lastModifiedDateTime", "originalStart", "sensitivity")
+PRODID = "-//outlook-cli//EN"
+# Rows written to the block index per executemany call.
+_ROW_BATCH = 1000
+
+HEADER = "".join(
+    [
+        ical.content_line("BEGIN", "VCALENDAR"),
+        ical.content_line("VERSION", "2.0"),
+        ical.content_line("PRODID", PRODID),
+        ical.content_line("CALSCALE", "GREGORIAN"),
+        ical.content_line("METHOD", "PUBLISH"),
+    ]
+).encode()
+FOOTER = ical.content_line("END", "VCALENDAR").encode()
+
+EXPORT_SCHEMA = """
+CREATE TABLE IF NOT EXISTS export_files (
+    path TEXT PRIMARY KEY,
+    generation INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS export_events (
+    path TEXT NOT NULL,
+    generation INTEGER NOT NULL,
+    id TEXT NOT NULL,
+    change_key TEXT NOT NULL,
+    offset INTEGER NOT NULL,
+    length INTEGER NOT NULL,
+    PRIMARY KEY (path, generation, id)
+);
+"""
+
+_PARTSTAT = {"accepted": "ACCEPTED", "declined": "DECLINED", "tentativelyAccepted": "TENTATIVE"}
+_ROLE = {"required": "REQ-PARTICIPANT", "optional": "OPT-PARTICIPANT", "resource": "NON-PARTICIPANT"}
+_CLASS = {"private": "PRIVATE", "confidential": "CONFIDENTIAL"}
+
+
+# ── Rendering ──────────────────────────────────────────────────
+
+
+def _timestamp(value: str) -> datetime:
+    """A Graph ``DateTimeOffset`` (always UTC in responses)."""
+    return datetime.fromisoformat(value[:19]).replace(tzinfo=timezone.utc)
+
+
+def _when(name: str, value: Optional[dict], all_day: bool) -> str:
+    if all_day:
+        return ical.content_line(name, value["dateTime"][:10].replace("-", ""), {"VALUE": "DATE"})
+    return ical.content_line(name, ical.format_datetime(instant(value)))
+
+
+def _address(name: str, email: dict, params: dict[str, str]) -> str:
+    if email.get("name"):
+        params = {"CN": email["name"], **params}
+    return ical.content_line(name, f"mailto:{email.get('address', '')}", params)
+
+
+def vevent(resource: dict) -> str:
+    """One calendarView instance as a ``VEVENT`` block."""
+    all_day = bool(resource.get("isAllDay"))
+    stamp = resource.get("lastModifiedDateTime")
+    lines = [
+        ical.content_line("BEGIN", "VEVENT"),
+        ical.content_line("UID", resource.get("iCalUId") or resource["id"]),
+        ical.content_line(
+            "DTSTAMP", ical.format_datetime(_timestamp(stamp) if stamp else instant(resource["start"]))
+        ),
+    ]
+    original = resource.get("originalStart")
+    if original and resource.get("type") in ("occurrence", "exception"):
+        if all_day:
+            lines.append(ical.content_line("RECURRENCE-ID", original[:10].replace("-", ""), {"VALUE": "DATE"}))
+        else:
+            lines.append(ical.content_line("RECURRENCE-ID", ical.format_datetime(_timestamp(original))))
+    lines.append(_when("DTSTART", resource["start"], all_day))
+    if resource.get("end"):
+        lines.append(_when("DTEND", resource["end"], all_day))
+    lines.append(ical.content_line("SUMMARY", ical.escape(resource.get("subject") or "")))
+
+    location = (resource.get("location") or {}).get("displayName")
+    if location:
+        lines.append(ical.content_line("LOCATION", ical.escape(location)))
+    body = (resource.get("body") or {}).get("content")
+    if body and body.strip():
+        lines.append(ical.content_line("DESCRIPTION", ical.escape(plain_text(body).strip())))
+
+    organizer = (resource.get("organizer") or {}).get("emailAddress")
+    if organizer and organizer.get("address"):
+        lines.append(_address("ORGANIZER", organizer, {}))
+    for attendee in resource.get("attendees") or []:
+        email = attendee.get("emailAddress") or {}
+        if not email.get("address"):
+            continue
+        params = {
+            "ROLE": _ROLE.get(attendee.get("type", ""), "REQ-PARTICIPANT"),
+            "PARTSTAT": _PARTSTAT.get((attendee.get("status") or {}).get("response", ""), "NEEDS-ACTION"),
+        }
+        lines.append(_address("ATTENDEE", email, params))
+
+    lines.append(ical.content_line("TRANSP", "TRANSPARENT" if resource.get("showAs") == FREE else "OPAQUE"))
+    if resource.get("sensitivity") in _CLASS:
+        lines.append(ical.content_line("CLASS", _CLASS[resource["sensitivity"]]))
+    lines.append(ical.content_line("END", "VEVENT"))
+    return "".join(lines)
+
+
+def write_calendar(out: BinaryIO, resources: Iterable[dict]) -> int:
+    """Write a whole ``VCALENDAR`` to a binary stream; returns the event count."""
+    count = 0
+    out.write(HEADER)
+    for resource in resources:
+        out.write(vevent(resource).encode())
+        count += 1
+    out.write(FOOTER)
+    return count
+
+
+# ── Incremental file export ────────────────────────────────────
+
+
+@dataclass
+class ExportResult:
+    added: int = 0
+    changed: int = 0
+    unchanged: int = 0
+    removed: int = 0
+    # False when the file already matched the calendar and was left alone.
+    rewritten: bool = True
+
+    @property
+    def written(self) -> int:
+        return self.added + self.changed + self.unchanged
+
+
+def _previous(db: sqlite3.Connection, key: str, path: Path) -> Optional[sqlite3.Row]:
+    """The last export to ``path``, if the file is still exactly as it was written."""
+    row = db.execute("SELECT generation, size, mtime_ns FROM export_files WHERE path = ?", (key,)).fetchone()
+    if row is None or not path.exists():
+        return None
+    stat = path.stat()
+    if (stat.st_size, stat.st_mtime_ns) != (row["size"], row["mtime_ns"]):
+        return None
+    return row
+
+
+def export_file(view: CalendarView, start: date, end: date, path: Path) -> ExportResult:
+    """Export the days ``start`` up to (not including) ``end`` to ``path``.
+
+    The file is written next to ``path`` and moved into place when complete,
+    so an interrupted export leaves the previous file intact.
+    """
+    db = view.db
+    db.executescript(EXPORT_SCHEMA)
+    path = path.resolve()
+    key = str(path)
+    previous = _previous(db, key, path)
+    generation = (previous["generation"] if previous else 0) + 1
+    db.execute("DELETE FROM export_events WHERE path = ? AND generation >= ?", (key, generation))
+
+    result = ExportResult()
+    rows: list[tuple] = []
+
+    def _flush() -> None:
+        db.executemany(
+            "INSERT OR REPLACE INTO export_events (path, generation, id, change_key, offset, length)"
+            " VALUES (?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+        rows.clear()
+
+    partial = path.with_name(path.name + ".part")
+    old = open(path, "rb") if previous else None
+    try:
+        with open(partial, "wb") as out:
+            out.write(HEADER)
+            for resource in view.instances(start, end):
+                change_key = resource.get("changeKey", "")
+                known = None
+                if previous:
+                    known = db.execute(
+                        "SELECT change_key, offset, length FROM export_events"
+                        " WHERE path = ? AND generation = ? AND id = ?",
+                        (key, previous["generation"], resource["id"]),
+                    ).fetchone()
+                if known and change_key and known["change_key"] == change_key:
+                    old.seek(known["offset"])
+                    block = old.read(known["length"])
+                    result.unchanged += 1
+                else:
+                    block = vevent(resource).encode()
+                    if known:
+                        result.changed += 1
+                    else:
+                        result.added += 1
+                rows.append((key, generation, resource["id"], change_key, out.tell(), len(block)))
+                out.write(block)
+                if len(rows) >= _ROW_BATCH:
+                    _flush()
+            out.write(FOOTER)
+        _flush()
+    except BaseException:
+        partial.unlink(missing_ok=True)
+        db.rollback()
+        raise
+    finally:
+        if old:
+            old.close()
+
+    if previous:
+        (before,) = db.execute(
+            "SELECT COUNT(*) FROM export_events WHERE path = ? AND generation = ?", (key, previous["generation"])
+        ).fetchone()
+        result.removed = before - result.unchanged - result.changed
+
+    if previous and not (result.added or result.changed or result.removed):
+        # Nothing to do: keep the file (and its mtime) and the index as they were.
+        partial.unlink()
+        db.execute("DELETE FROM export_events WHERE path = ? AND generation = ?", (key, generation))
+        result.rewritten = False
+    else:
+        os.replace(partial, path)
+        stat = path.stat()
+        db.execute(
+            "INSERT OR REPLACE INTO export_files (path, generation, size, mtime_ns) VALUES (?, ?, ?, ?)",
+            (key, generation, stat.st_size, stat.st_mtime_ns),
+        )
+        db.execute("DELETE FROM export_events WHERE path = ? AND generation < ?", (key, generation))
+    db.commit()
+    return result
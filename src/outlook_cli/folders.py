@@ -0,0 +1,168 @@
+"""Local map of the mailbox folder tree, for resolving names without a round trip.
+
+Folder names given to ``--folder`` used to cost a ``get_folder`` request on
+every run, and only matched top-level folders. The map in
+``~/.outlook-cli/folders-<account>.json`` holds every folder's id, parent and
+counts, as returned by ``/me/mailFolders/delta``, so names and slash-separated paths such
+as ``Projects/2025/Q1`` resolve locally. It is refreshed with the stored delta
+link when a name is not found, and in full by ``mail folders``.
+"""
+
+import json
+import os
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Iterator, Optional
+
+from requests.exceptions import HTTPError
+
+from outlook_cli.ids import account_path
+
+CACHE_FILENAME = "folders.json"
+SEPARATOR = "/"
+DELTA_FIELDS = ("displayName", "parentFolderId", "childFolderCount", "totalItemCount", "unreadItemCount")
+DEFAULT_PAGE_SIZE = 250
+# Graph answers 410 Gone when a delta token has expired; start over.
+RESYNC_STATUS = 410
+
+
+@dataclass
+class MailFolder:
+    id: str
+    name: str
+    parent_id: Optional[str] = None
+    child_count: int = 0
+    total: int = 0
+    unread: int = 0
+
+
+def cache_path(account_key: str) -> Path:
+    return account_path(account_key, CACHE_FILENAME)
+
+
+class FolderMap:
+    """Every known folder by id, plus the delta link that continues the sync."""
+
+    def __init__(self, folders: Optional[dict[str, MailFolder]] = None, delta_link: Optional[str] = None) -> None:
+        self.folders = folders or {}
+        self.delta_link = delta_link
+
+    # ── Persistence ────────────────────────────────────────────
+
+    @classmethod
+    def load(cls, path: Path) -> "FolderMap":
+        """Read the cached map; a missing or unreadable file gives an empty one."""
+        try:
+            data = json.loads(path.read_text())
+            folders = {item["id"]: MailFolder(**item) for item in data.get("folders", [])}
+        except (OSError, ValueError, TypeError, KeyError):
+            return cls()
+        return cls(folders, data.get("delta_link"))
+
+    def save(self, path: Path) -> None:
+        data = {"delta_link": self.delta_link, "folders": [asdict(folder) for folder in self.folders.values()]}
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(data))
+        os.replace(tmp, path)
+
+    # ── Changes ────────────────────────────────────────────────
+
+    def apply(self, items: list[dict]) -> None:
+        """Apply one page of ``mailFolders/delta`` results."""
+        for item in items:
+            if "@removed" in item:
+                self.folders.pop(item["id"], None)
+                continue
+            current = self.folders.get(item["id"])
+            self.folders[item["id"]] = MailFolder(
+                id=item["id"],
+                name=item.get("displayName", current.name if current else ""),
+                parent_id=item.get("parentFolderId", current.parent_id if current else None),
+                child_count=item.get("childFolderCount", current.child_count if current else 0),
+                total=item.get("totalItemCount", current.total if current else 0),
+                unread=item.get("unreadItemCount", current.unread if current else 0),
+            )
+
+    # ── Lookups ────────────────────────────────────────────────
+
+    def children(self, parent_id: Optional[str]) -> list[MailFolder]:
+        """Folders under ``parent_id``; None gives the top level (parent not in the map)."""
+        if parent_id is None:
+            found = [folder for folder in self.folders.values() if folder.parent_id not in self.folders]
+        else:
+            found = [folder for folder in self.folders.values() if folder.parent_id == parent_id]
+        return sorted(found, key=lambda folder: folder.name.lower())
+
+    def path(self, folder: MailFolder) -> str:
+        names = [folder.name]
+        seen = {folder.id}
+        while folder.parent_id in self.folders and folder.parent_id not in seen:
+            folder = self.folders[folder.parent_id]
+            seen.add(folder.id)
+            names.append(folder.name)
+        return SEPARATOR.join(reversed(names))
+
+    def walk(self, parent_id: Optional[str] = None, depth: int = 0) -> Iterator[tuple[int, MailFolder]]:
+        """(depth, folder) pairs in tree order."""
+        for folder in self.children(parent_id):
+            yield depth, folder
+            yield from self.walk(folder.id, depth + 1)
+
+    def resolve(self, name: str) -> Optional[MailFolder]:
+        """Find a folder by path (``Projects/2025/Q1``) or by name.
+
+        Names are case-insensitive. A path is walked from the top level; a
+        single name that is not a top-level folder matches a nested folder
+        when exactly one has that name.
+        """
+        parts = [part.strip() for part in name.strip(SEPARATOR).split(SEPARATOR)]
+        parent_id = None
+        folder = None
+        for part in parts:
+            folder = next((f for f in self.children(parent_id) if f.name.lower() == part.lower()), None)
+            if folder is None:
+                break
+            parent_id = folder.id
+        if folder is not None or len(parts) > 1:
+            return folder
+        matches = [f for f in self.folders.values() if f.name.lower() == parts[0].lower()]
+        return matches[0] if len(matches) == 1 else None
+
+
+def _initial_url(service_url: str) -> str:
+    return f"{service_url.rstrip('/')}/me/mailFolders/delta?$select={','.join(DELTA_FIELDS)}"
+
+
+def sync(
+    folder_map: FolderMap, con: Any, service_url: str, *, full: bool = False, page_size: int = DEFAULT_PAGE_SIZE
+) -> int:
+    """Bring ``folder_map`` up to date through ``mailFolders/delta``; returns requests made.
+
+    Without a delta link (or with ``full``) the whole tree is downloaded and
+    replaces the map, which also refreshes every folder's counts.
+    """
+    url = None if full else folder_map.delta_link
+    if url is None:
+        folder_map.folders = {}
+        url = _initial_url(service_url)
+
+    headers = {"Prefer": f"odata.maxpagesize={page_size}"}
+    requests = 0
+    restarted = False
+    while url:
+        try:
+            response = con.get(url, headers=dict(headers))
+        except HTTPError as exc:
+            if exc.response is None or exc.response.status_code != RESYNC_STATUS or restarted:
+                raise
+            restarted = True
+            folder_map.folders = {}
+            url = _initial_url(service_url)
+            continue
+        requests += 1
+        page = response.json()
+        folder_map.apply(page.get("value", []))
+        url = page.get("@odata.nextLink")
+        if url is None:
+            folder_map.delta_link = page.get("@odata.deltaLink")
+    return requests
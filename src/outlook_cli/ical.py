@@ -0,0 +1,208 @@
+"""Minimal iCalendar (RFC 5545) reading and writing for ``cal import``/``export``.
+
+Files are read line by line: folded lines are joined as they stream past and
+each ``VEVENT`` is handed on as soon as its ``END`` line is seen, so memory
+does not grow with the size of the file. Only what event import needs is
+understood: properties with their parameters, text escapes, ``DATE`` /
+``DATE-TIME`` values in UTC, with a ``TZID`` or floating (local), and the
+parts of an ``RRULE``.
+
+Writing is the reverse, one content line at a time: values are escaped,
+parameters quoted where needed and lines folded at 75 octets.
+"""
+
+import re
+from datetime import date, datetime, time, timedelta, timezone, tzinfo
+from typing import Iterable, Iterator, Optional
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+Property = tuple[dict[str, str], str]
+
+_DURATION = re.compile(
+    r"^(?P<sign>[+-])?P(?:(?P<weeks>\d+)W)?(?:(?P<days>\d+)D)?"
+    r"(?:T(?:(?P<hours>\d+)H)?(?:(?P<minutes>\d+)M)?(?:(?P<seconds>\d+)S)?)?$"
+)
+
+
+def unfold(lines: Iterable[str]) -> Iterator[str]:
+    """Content lines with RFC 5545 folding (CRLF + space or tab) undone."""
+    current: Optional[str] = None
+    for raw in lines:
+        line = raw.rstrip("\r\n")
+        if line[:1] in (" ", "\t") and current is not None:
+            current += line[1:]
+            continue
+        if current:
+            yield current
+        current = line
+    if current:
+        yield current
+
+
+def _split_unquoted(text: str, separator: str) -> list[str]:
+    parts = []
+    quoted = False
+    start = 0
+    for index, char in enumerate(text):
+        if char == '"':
+            quoted = not quoted
+        elif char == separator and not quoted:
+            parts.append(text[start:index])
+            start = index + 1
+    parts.append(text[start:])
+    return parts
+
+
+def parse_line(line: str) -> tuple[str, dict[str, str], str]:
+    """``NAME;PARAM=VALUE:value`` as (upper-case name, params, raw value)."""
+    head, _, value = line.partition(":")
+    # A colon inside a quoted parameter belongs to the head.
+    while head.count('"') % 2 and _:
+        more, _, value = value.partition(":")
+        head = f"{head}:{more}"
+    name, *params = _split_unquoted(head, ";")
+    parsed = {}
+    for param in params:
+        key, _, param_value = param.partition("=")
+        parsed[key.upper()] = param_value.strip('"')
+    return name.upper(), parsed, value
+
+
+def unescape(text: str) -> str:
+    """Undo TEXT escaping (``\\n``, ``\\,``, ``\\;``, ``\\\\``)."""
+    out = []
+    chars = iter(text)
+    for char in chars:
+        if char == "\\":
+            following = next(chars, "")
+            out.append("\n" if following in ("n", "N") else following)
+        else:
+            out.append(char)
+    return "".join(out)
+
+
+def components(lines: Iterable[str], name: str = "VEVENT") -> Iterator[dict[str, Property]]:
+    """Each ``name`` component's properties (first occurrence of each), one at a time.
+
+    Nested components such as ``VALARM`` are skipped.
+    """
+    depth = 0
+    current: Optional[dict[str, Property]] = None
+    for line in unfold(lines):
+        prop, params, value = parse_line(line)
+        if prop == "BEGIN":
+            if current is None and value.upper() == name:
+                current = {}
+            elif current is not None:
+                depth += 1
+        elif prop == "END":
+            if current is not None and depth:
+                depth -= 1
+            elif current is not None and value.upper() == name:
+                yield current
+                current = None
+        elif current is not None and not depth:
+            current.setdefault(prop, (params, value))
+
+
+def _zone(params: dict[str, str]) -> Optional[tzinfo]:
+    tzid = params.get("TZID")
+    if not tzid:
+        return None
+    try:
+        return ZoneInfo(tzid.lstrip("/"))
+    except (ZoneInfoNotFoundError, ValueError):
+        # Windows zone names and custom VTIMEZONEs are treated as local time.
+        return None
+
+
+def parse_datetime(prop: Property) -> tuple[datetime, bool]:
+    """An aware datetime and whether the value was a whole ``DATE``.
+
+    Floating times and unknown ``TZID`` zones are taken as local time.
+    """
+    params, value = prop
+    value = value.strip()
+    if params.get("VALUE", "").upper() == "DATE" or len(value) == 8:
+        day = date(int(value[:4]), int(value[4:6]), int(value[6:8]))
+        return datetime.combine(day, time()).astimezone(), True
+    parsed = datetime.strptime(value.rstrip("Zz"), "%Y%m%dT%H%M%S")
+    if value[-1:] in ("Z", "z"):
+        return parsed.replace(tzinfo=timezone.utc), False
+    zone = _zone(params)
+    return (parsed.replace(tzinfo=zone) if zone else parsed.astimezone()), False
+
+
+def parse_duration(value: str) -> timedelta:
+    """A ``DURATION`` value such as ``PT1H30M`` or ``P1D``."""
+    match = _DURATION.match(value.strip().upper())
+    if not match:
+        raise ValueError(f"Invalid duration: {value}")
+    delta = timedelta(
+        weeks=int(match["weeks"] or 0),
+        days=int(match["days"] or 0),
+        hours=int(match["hours"] or 0),
+        minutes=int(match["minutes"] or 0),
+        seconds=int(match["seconds"] or 0),
+    )
+    return -delta if match["sign"] == "-" else delta
+
+
+def parse_rrule(value: str) -> dict[str, str]:
+    """An ``RRULE`` value (``FREQ=WEEKLY;BYDAY=MO,WE``) as upper-case parts."""
+    parts = {}
+    for part in filter(None, value.strip().split(";")):
+        key, sep, item = part.partition("=")
+        if not sep:
+            raise ValueError(f"Invalid RRULE part: {part}")
+        parts[key.strip().upper()] = item.strip().upper()
+    return parts
+
+
+def escape(text: str) -> str:
+    """TEXT escaping, the inverse of :func:`unescape`."""
+    return (
+        text.replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\r\n", "\n")
+        .replace("\n", "\\n")
+    )
+
+
+def _param(value: str) -> str:
+    value = value.replace('"', "'")
+    return f'"{value}"' if any(char in value for char in ":;,") else value
+
+
+def fold(line: str, limit: int = 75) -> str:
+    """A content line folded to ``limit`` octets, never splitting a UTF-8 sequence."""
+    if len(line.encode()) <= limit:
+        return line + "\r\n"
+    parts = []
+    current, size = "", 0
+    for char in line:
+        width = len(char.encode())
+        # Continuation lines start with a space, which counts toward the limit.
+        if size + width > (limit if not parts else limit - 1):
+            parts.append(current)
+            current, size = "", 0
+        current += char
+        size += width
+    parts.append(current)
+    return "\r\n ".join(parts) + "\r\n"
+
+
+def content_line(name: str, value: str, params: Optional[dict[str, str]] = None) -> str:
+    """``NAME;PARAM=VALUE:value`` with a line break, folded; ``value`` is written as given."""
+    head = name + "".join(f";{key}={_param(param)}" for key, param in (params or {}).items())
+    return fold(f"{head}:{value}")
+
+
+def format_datetime(value: datetime) -> str:
+    """A ``DATE-TIME`` in UTC (``20250210T090000Z``)."""
+    return value.astimezone(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+
+def format_date(value: date) -> str:
+    return value.strftime("%Y%m%d")
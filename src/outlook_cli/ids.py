@@ -0,0 +1,144 @@
+"""Persistent cache of well-known Graph IDs, so warm runs skip lookup round trips.
+
+Calendar commands used to start with ``schedule.get_default_calendar()``, a
+``GET /me/calendar`` before any real work. The id and name it returns are kept
+in ``~/.outlook-cli/ids.json``, one section per signed-in account (and Graph
+endpoint), and later runs build the calendar from there.
+
+Mail folders need no entry here: the Inbox is addressed by its well-known
+name and other folders resolve through the folder map (:mod:`folders`).
+
+The commands that use the cached calendar drop it when Graph answers 404 (or
+``ErrorItemNotFound``) for the calendar itself, so a stale id costs one failed
+command, after which the next run looks it up again. ``outlook --refresh-ids``
+ignores the cache for one run and rewrites it.
+"""
+
+import json
+import os
+import re
+from pathlib import Path
+from typing import Any, Optional
+from urllib.parse import unquote, urlsplit
+
+from outlook_cli.config import get_config_dir
+
+CACHE_FILENAME = "ids.json"
+DEFAULT_CALENDAR = "default_calendar"
+NOT_FOUND = "ErrorItemNotFound"
+
+# Set by ``outlook --refresh-ids``: look everything up again and re-cache it.
+refresh = False
+
+
+def cache_path() -> Path:
+    return get_config_dir() / CACHE_FILENAME
+
+
+class IdCache:
+    """Cached resources by account key and name."""
+
+    def __init__(self, accounts: Optional[dict[str, dict[str, dict]]] = None) -> None:
+        self.accounts = accounts or {}
+
+    @classmethod
+    def load(cls, path: Optional[Path] = None) -> "IdCache":
+        """Read the cache; a missing or unreadable file gives an empty one."""
+        try:
+            data = json.loads((path or cache_path()).read_text())
+            accounts = data["accounts"]
+            if not isinstance(accounts, dict):
+                return cls()
+        except (OSError, ValueError, TypeError, KeyError):
+            return cls()
+        return cls(accounts)
+
+    def save(self, path: Optional[Path] = None) -> None:
+        path = path or cache_path()
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps({"accounts": self.accounts}))
+        os.replace(tmp, path)
+
+    def get(self, account: str, name: str) -> Optional[dict]:
+        return self.accounts.get(account, {}).get(name)
+
+    def put(self, account: str, name: str, resource: dict) -> None:
+        self.accounts.setdefault(account, {})[name] = resource
+
+    def forget(self, account: str, name: str) -> bool:
+        return self.accounts.get(account, {}).pop(name, None) is not None
+
+
+def account_key(account: Any) -> str:
+    """Which section of the cache belongs to ``account``."""
+    return f"{account.username or 'default'}@{account.protocol.service_url}"
+
+
+def account_path(key: str, filename: str) -> Path:
+    """``filename`` in the config directory, for account ``key`` alone.
+
+    Caches of mailbox contents (mirror, calendar days, folder map) get a file
+    per account, named after a digest of the key: ``mirror-<digest>.db``.
+    """
+    import hashlib
+
+    digest = hashlib.sha1(key.encode()).hexdigest()[:12]
+    name = Path(filename)
+    return get_config_dir() / f"{name.stem}-{digest}{name.suffix}"
+
+
+def calendar_missing(calendar_id: str, path: str, status: int, body: Any) -> bool:
+    """Whether Graph's answer to a request for ``path`` says calendar ``calendar_id`` is gone.
+
+    Only the calendar's own URL, its event collection and its calendarView
+    count: a 404 for one event in the calendar says nothing about the calendar.
+    """
+    code = (body.get("error") or {}).get("code") if isinstance(body, dict) else None
+    if status != 404 and code != NOT_FOUND:
+        return False
+    own = rf"/calendars/{re.escape(calendar_id)}(?:/(?:events|calendarView))?/?"
+    return re.search(own + "$", path, re.IGNORECASE) is not None
+
+
+def forget_calendar(account: Any, calendar_id: str) -> bool:
+    """Drop the cached default calendar if it is ``calendar_id``; True if it was."""
+    key = account_key(account)
+    cache = IdCache.load()
+    cached = cache.get(key, DEFAULT_CALENDAR)
+    if cached is None or cached.get("id") != calendar_id:
+        return False
+    cache.forget(key, DEFAULT_CALENDAR)
+    cache.save()
+    return True
+
+
+def forget_missing_calendar(account: Any, calendar_id: str, exc: BaseException) -> bool:
+    """``forget_calendar`` if the failed request behind ``exc`` found no such calendar."""
+    response = getattr(exc, "response", None)
+    if response is None:
+        return False
+    try:
+        body = response.json()
+    except ValueError:
+        body = None
+    path = unquote(urlsplit(response.url or "").path)
+    if not calendar_missing(calendar_id, path, response.status_code, body):
+        return False
+    return forget_calendar(account, calendar_id)
+
+
+def default_calendar(account: Any) -> Any:
+    """``schedule.get_default_calendar()``, from the cache on warm runs; None if unavailable."""
+    schedule = account.schedule()
+    key = account_key(account)
+    cache = IdCache.load()
+    cached = None if refresh else cache.get(key, DEFAULT_CALENDAR)
+    if cached is not None:
+        calendar = schedule.calendar_constructor(parent=schedule, **{schedule._cloud_data_key: cached})
+    else:
+        calendar = schedule.get_default_calendar()
+        if calendar is None:
+            return None
+        cache.put(key, DEFAULT_CALENDAR, {"id": calendar.calendar_id, "name": calendar.name})
+        cache.save()
+    return calendar
@@ -0,0 +1,402 @@
+"""Bulk event import from ICS and CSV files (``cal import``).
+
+Files are parsed as a stream and turned into Graph event resources that are
+posted through ``$batch``, 20 per call, with up to :data:`DEFAULT_WORKERS`
+calls in flight (the per-mailbox limit the throttle enforces anyway).
+
+Every event has a client-side key: its ``UID`` in ICS, a ``uid`` column in
+CSV, or else a hash of subject and times. The key is sent as the event's
+``transactionId`` so Graph drops a resent create, and each created event is
+written to a journal in ``~/.outlook-cli/import_journal.db`` as its batch
+completes, so rerunning an interrupted import skips what already exists.
+
+A recurring ICS event becomes a Graph series when its ``RRULE`` has a Graph
+pattern (daily, weekly, monthly or yearly, by date or by "nth weekday").
+Graph can't take a series with ``EXDATE``/``RDATE`` dates or a changed
+occurrence (``RECURRENCE-ID``) on creation, so those events are skipped and
+reported instead of being imported as a single meeting.
+"""
+
+import csv
+import hashlib
+import re
+import sqlite3
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Iterable, Iterator, Optional
+from zoneinfo import ZoneInfo
+
+from outlook_cli import ical
+from outlook_cli.batch import MAX_BATCH_SIZE, BatchReport, BatchRequest, execute
+from outlook_cli.query import utc_timestamp
+
+JOURNAL_FILENAME = "import_journal.db"
+DEFAULT_WORKERS = 4
+FORMATS = ("ics", "csv")
+CSV_COLUMNS = ("subject", "start", "end", "location", "body", "uid", "all_day")
+
+_WEEKDAYS = {
+    "MO": "monday",
+    "TU": "tuesday",
+    "WE": "wednesday",
+    "TH": "thursday",
+    "FR": "friday",
+    "SA": "saturday",
+    "SU": "sunday",
+}
+_WEEK_INDEX = {1: "first", 2: "second", 3: "third", 4: "fourth", -1: "last"}
+_BYDAY = re.compile(r"^([+-]?\d{1,2})?(MO|TU|WE|TH|FR|SA|SU)$")
+_RRULE_PARTS = {"FREQ", "INTERVAL", "COUNT", "UNTIL", "BYDAY", "BYMONTHDAY", "BYMONTH", "BYSETPOS", "WKST"}
+
+JOURNAL_SCHEMA = """
+CREATE TABLE IF NOT EXISTS imported (
+    calendar_id TEXT NOT NULL,
+    key TEXT NOT NULL,
+    event_id TEXT NOT NULL,
+    imported_at TEXT NOT NULL,
+    PRIMARY KEY (calendar_id, key)
+);
+"""
+
+
+def event_payload(
+    subject: str,
+    start: datetime,
+    end: datetime,
+    body: Optional[str] = None,
+    location: Optional[str] = None,
+    *,
+    all_day: bool = False,
+    transaction_id: Optional[str] = None,
+    recurrence: Optional[dict] = None,
+    time_zone: str = "UTC",
+) -> dict:
+    """A Graph event resource for a new event; times are sent in UTC.
+
+    All-day events keep their calendar dates, as Graph requires midnight
+    boundaries for them. A series is sent as wall-clock time in ``time_zone``
+    instead, so its occurrences keep their local time across DST changes.
+    """
+    if all_day:
+        start_text, end_text = f"{start.date()}T00:00:00", f"{end.date()}T00:00:00"
+    elif time_zone == "UTC":
+        start_text, end_text = utc_timestamp(start), utc_timestamp(end)
+    else:
+        zone = ZoneInfo(time_zone)
+        start_text, end_text = (value.astimezone(zone).strftime("%Y-%m-%dT%H:%M:%S") for value in (start, end))
+    payload: dict = {
+        "subject": subject,
+        "start": {"dateTime": start_text, "timeZone": time_zone},
+        "end": {"dateTime": end_text, "timeZone": time_zone},
+    }
+    if all_day:
+        payload["isAllDay"] = True
+    if body:
+        payload["body"] = {"contentType": "text", "content": body}
+    if location:
+        payload["location"] = {"displayName": location}
+    if transaction_id:
+        payload["transactionId"] = transaction_id
+    if recurrence:
+        payload["recurrence"] = recurrence
+    return payload
+
+
+def _zone_name(value: datetime) -> str:
+    """The IANA zone of ``value``; fixed offsets (floating or UTC times) are UTC."""
+    return getattr(value.tzinfo, "key", None) or "UTC"
+
+
+def recurrence(rule: str, start: datetime) -> dict:
+    """An ``RRULE`` as a Graph ``patternedRecurrence`` for a series starting at ``start``.
+
+    Raises ValueError for rules Graph has no pattern for, such as hourly
+    repeats, several days of the month, or every Monday of a month.
+    """
+    parts = ical.parse_rrule(rule)
+    unknown = set(parts) - _RRULE_PARTS
+    if unknown:
+        raise ValueError(f"RRULE {', '.join(sorted(unknown))} has no Graph equivalent")
+    freq = parts.get("FREQ", "")
+    interval = int(parts.get("INTERVAL", "1"))
+    days: list[str] = []
+    positions: set[int] = set()
+    for item in filter(None, parts.get("BYDAY", "").split(",")):
+        match = _BYDAY.match(item)
+        if not match:
+            raise ValueError(f"RRULE BYDAY={item} is not understood")
+        days.append(_WEEKDAYS[match[2]])
+        if match[1]:
+            positions.add(int(match[1]))
+    if "BYSETPOS" in parts:
+        positions.add(int(parts["BYSETPOS"]))
+    if len(positions) > 1 or not positions <= set(_WEEK_INDEX):
+        raise ValueError("RRULE weekday position has no Graph equivalent")
+    month_days = [int(day) for day in parts.get("BYMONTHDAY", "").split(",") if day]
+    if len(month_days) > 1 or any(day < 1 for day in month_days) or "," in parts.get("BYMONTH", ""):
+        raise ValueError("RRULE with several or negative month days has no Graph equivalent")
+
+    pattern: dict[str, Any] = {"interval": interval}
+    if freq == "DAILY" and days and interval == 1 and not positions:
+        # "Every weekday" is a daily rule in iCalendar and a weekly one in Graph.
+        pattern.update(type="weekly", daysOfWeek=days)
+    elif freq == "DAILY" and not days:
+        pattern["type"] = "daily"
+    elif freq == "WEEKLY" and not positions:
+        pattern.update(type="weekly", daysOfWeek=days or [list(_WEEKDAYS.values())[start.weekday()]])
+    elif freq in ("MONTHLY", "YEARLY") and days and positions:
+        pattern.update(type="relativeMonthly", daysOfWeek=days, index=_WEEK_INDEX[positions.pop()])
+    elif freq in ("MONTHLY", "YEARLY") and not days:
+        pattern.update(type="absoluteMonthly", dayOfMonth=month_days[0] if month_days else start.day)
+    else:
+        raise ValueError(f"RRULE {rule} has no Graph equivalent")
+    if freq == "YEARLY":
+        pattern["type"] = pattern["type"].replace("Monthly", "Yearly")
+        pattern["month"] = int(parts.get("BYMONTH") or start.month)
+    elif "BYMONTH" in parts:
+        raise ValueError("RRULE BYMONTH is only supported for yearly events")
+    if pattern["type"] == "weekly":
+        pattern["firstDayOfWeek"] = _WEEKDAYS[parts.get("WKST", "MO")]
+
+    zone = _zone_name(start)
+    series: dict[str, Any] = {"startDate": start.date().isoformat(), "recurrenceTimeZone": zone}
+    if "COUNT" in parts:
+        series.update(type="numbered", numberOfOccurrences=int(parts["COUNT"]))
+    elif "UNTIL" in parts:
+        until, _ = ical.parse_datetime(({}, parts["UNTIL"]))
+        series.update(type="endDate", endDate=until.astimezone(start.tzinfo).date().isoformat())
+    else:
+        series["type"] = "noEnd"
+    return {"pattern": pattern, "range": series}
+
+
+@dataclass
+class NewEvent:
+    subject: str
+    start: datetime
+    end: datetime
+    all_day: bool = False
+    location: Optional[str] = None
+    body: Optional[str] = None
+    uid: Optional[str] = None
+    # Where it came from, for error messages ("line 12", "event 3").
+    source: str = ""
+    recurrence: Optional[dict] = None
+    # Why the event can't be imported, if it can't.
+    unsupported: Optional[str] = None
+
+    @property
+    def key(self) -> str:
+        """Stable client-side key, used as ``transactionId`` and in the journal."""
+        identity = self.uid or f"{self.subject}\n{self.start.isoformat()}\n{self.end.isoformat()}"
+        return hashlib.sha1(identity.encode()).hexdigest()
+
+    def payload(self) -> dict:
+        return event_payload(
+            self.subject,
+            self.start,
+            self.end,
+            self.body,
+            self.location,
+            all_day=self.all_day,
+            transaction_id=self.key,
+            recurrence=self.recurrence,
+            time_zone=_zone_name(self.start) if self.recurrence else "UTC",
+        )
+
+
+class ImportFormatError(ValueError):
+    """A record in the input that cannot be turned into an event."""
+
+
+# ── Readers ────────────────────────────────────────────────────
+
+
+def read_ics(lines: Iterable[str]) -> Iterator[NewEvent]:
+    for number, props in enumerate(ical.components(lines), 1):
+        source = f"event {number}"
+        try:
+            start, all_day = ical.parse_datetime(props["DTSTART"])
+            if "DTEND" in props:
+                end, _ = ical.parse_datetime(props["DTEND"])
+            elif "DURATION" in props:
+                end = start + ical.parse_duration(props["DURATION"][1])
+            else:
+                end = start + (timedelta(days=1) if all_day else timedelta())
+        except (KeyError, ValueError) as exc:
+            raise ImportFormatError(f"{source}: bad or missing DTSTART/DTEND ({exc})") from exc
+        uid = props.get("UID", ({}, ""))[1].strip() or None
+        series, unsupported = None, None
+        if "RECURRENCE-ID" in props:
+            unsupported = "changed occurrences of a recurring event can't be imported"
+        elif "EXDATE" in props or "RDATE" in props:
+            unsupported = "recurring events with EXDATE or RDATE dates can't be imported"
+        elif "RRULE" in props:
+            try:
+                series = recurrence(props["RRULE"][1], start)
+            except ValueError as exc:
+                unsupported = str(exc)
+        yield NewEvent(
+            subject=ical.unescape(props.get("SUMMARY", ({}, ""))[1]),
+            start=start,
+            end=end,
+            all_day=all_day,
+            location=ical.unescape(props["LOCATION"][1]) if "LOCATION" in props else None,
+            body=ical.unescape(props["DESCRIPTION"][1]) if "DESCRIPTION" in props else None,
+            uid=uid,
+            source=source,
+            recurrence=series,
+            unsupported=unsupported,
+        )
+
+
+def _csv_time(value: str) -> datetime:
+    """``YYYY-MM-DD HH:MM`` or ISO 8601; naive times are local."""
+    parsed = datetime.fromisoformat(value.strip())
+    return parsed if parsed.tzinfo else parsed.astimezone()
+
+
+def read_csv(lines: Iterable[str]) -> Iterator[NewEvent]:
+    """Rows with ``subject``, ``start`` and ``end`` columns (see :data:`CSV_COLUMNS`)."""
+    reader = csv.DictReader(lines)
+    missing = {"subject", "start", "end"} - {name.strip().lower() for name in reader.fieldnames or []}
+    if missing:
+        raise ImportFormatError(f"CSV header is missing: {', '.join(sorted(missing))}")
+    for row in reader:
+        row = {(key or "").strip().lower(): (value or "").strip() for key, value in row.items()}
+        source = f"line {reader.line_num}"
+        try:
+            start, end = _csv_time(row["start"]), _csv_time(row["end"])
+        except ValueError as exc:
+            raise ImportFormatError(f"{source}: {exc}") from exc
+        yield NewEvent(
+            subject=row["subject"],
+            start=start,
+            end=end,
+            all_day=row.get("all_day", "").lower() in ("1", "true", "yes"),
+            location=row.get("location") or None,
+            body=row.get("body") or None,
+            uid=row.get("uid") or None,
+            source=source,
+        )
+
+
+def detect_format(path: str) -> Optional[str]:
+    suffix = Path(path).suffix.lower().lstrip(".")
+    if suffix in ("ics", "ical", "ifb", "icalendar"):
+        return "ics"
+    if suffix == "csv":
+        return "csv"
+    return None
+
+
+def read_events(lines: Iterable[str], fmt: str) -> Iterator[NewEvent]:
+    return read_ics(lines) if fmt == "ics" else read_csv(lines)
+
+
+# ── Journal ────────────────────────────────────────────────────
+
+
+def journal_path() -> Path:
+    from outlook_cli.config import get_config_dir
+
+    return get_config_dir() / JOURNAL_FILENAME
+
+
+def connect_journal(path: Optional[Path] = None) -> sqlite3.Connection:
+    db = sqlite3.connect(path or journal_path())
+    db.execute("PRAGMA journal_mode=WAL")
+    db.executescript(JOURNAL_SCHEMA)
+    return db
+
+
+def _imported(journal: sqlite3.Connection, calendar_id: str, key: str) -> bool:
+    row = journal.execute("SELECT 1 FROM imported WHERE calendar_id = ? AND key = ?", (calendar_id, key))
+    return row.fetchone() is not None
+
+
+# ── Import ─────────────────────────────────────────────────────
+
+
+@dataclass
+class ImportResult:
+    created: int = 0
+    skipped: int = 0
+    failed: list[tuple[NewEvent, str]] = field(default_factory=list)
+    unsupported: list[NewEvent] = field(default_factory=list)
+    request_count: int = 0
+
+
+def _chunks(events: Iterable[NewEvent], size: int) -> Iterator[list[NewEvent]]:
+    chunk: list[NewEvent] = []
+    for event in events:
+        chunk.append(event)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def run_import(
+    events: Iterable[NewEvent],
+    con: Any,
+    service_url: str,
+    calendar_id: str,
+    journal: sqlite3.Connection,
+    *,
+    workers: int = DEFAULT_WORKERS,
+) -> ImportResult:
+    """Create ``events`` that the journal doesn't know yet, ``workers`` batches at a time.
+
+    Input is consumed only as fast as batches complete, so a large file is
+    never held in memory. The journal is written from this thread only.
+    """
+    result = ImportResult()
+    url = f"/me/calendars/{calendar_id}/events"
+    seen: set[str] = set()
+
+    def _new() -> Iterator[NewEvent]:
+        for event in events:
+            if event.unsupported:
+                result.unsupported.append(event)
+                continue
+            key = event.key
+            if key in seen or _imported(journal, calendar_id, key):
+                result.skipped += 1
+                continue
+            seen.add(key)
+            yield event
+
+    def _settle(chunk: list[NewEvent], future: "Future[BatchReport]") -> None:
+        report = future.result()
+        result.request_count += report.request_count
+        now = datetime.now(timezone.utc).isoformat()
+        for index, event in enumerate(chunk):
+            resp = report.responses[str(index)]
+            if resp.ok and isinstance(resp.body, dict):
+                journal.execute(
+                    "INSERT OR REPLACE INTO imported (calendar_id, key, event_id, imported_at) VALUES (?, ?, ?, ?)",
+                    (calendar_id, event.key, resp.body.get("id", ""), now),
+                )
+                result.created += 1
+            else:
+                result.failed.append((event, resp.error))
+        journal.commit()
+
+    pending: deque[tuple[list[NewEvent], Future]] = deque()
+    with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="outlook-import") as pool:
+        try:
+            for chunk in _chunks(_new(), MAX_BATCH_SIZE):
+                requests = [BatchRequest(str(index), "POST", url, event.payload()) for index, event in enumerate(chunk)]
+                pending.append((chunk, pool.submit(execute, con, service_url, requests)))
+                if len(pending) >= workers:
+                    _settle(*pending.popleft())
+        finally:
+            # Journal what was sent even if reading the input failed part-way.
+            while pending:
+                _settle(*pending.popleft())
+    return result
@@ -1,27 +1,122 @@
 """CLI for Microsoft Outlook — main app assembly."""
 
+import importlib
+import sys
+from typing import Any, Optional, Sequence
+
 import typer
+from typer.core import TyperGroup
+
+
+# Subcommand groups are imported on first use so that trivial invocations
+# (``--version``, ``auth status``) don't pay for modules they never touch.
+SUBCOMMANDS: dict[str, tuple[str, str]] = {
+    "auth": ("outlook_cli.commands.auth_cmd", "Authentication commands"),
+    "mail": ("outlook_cli.commands.mail_cmd", "Email commands"),
+    "cal": ("outlook_cli.commands.cal_cmd", "Calendar commands"),
+    "serve": ("outlook_cli.commands.serve_cmd", "Run a local daemon that keeps a warm session"),
+}
+
+# Groups that run on the ``outlook serve`` daemon when one is listening.
+DAEMON_GROUPS = frozenset({"mail", "cal"})
+# Commands in those groups that always run here: ``mail watch`` runs until
+# interrupted and would hold the daemon, which serves one command at a time,
+# and ``cal export`` writes bytes to stdout, which the daemon's text streams
+# can't carry.
+IN_PROCESS_COMMANDS = frozenset({("mail", "watch"), ("cal", "export")})
+# Root options that take a value, so the group name can be found after them.
+VALUE_OPTIONS = frozenset({"--output", "-o"})
+
+
+def _command_path(argv: list[str]) -> tuple[Optional[str], Optional[str]]:
+    """The subcommand group in ``argv`` and the command after it, skipping root options."""
+    args = iter(argv)
+    for arg in args:
+        if arg in VALUE_OPTIONS:
+            next(args, None)
+        elif not arg.startswith("-"):
+            return arg, next((rest for rest in args if not rest.startswith("-")), None)
+    return None, None
+
+
+class LazyGroup(TyperGroup):
+    """Typer group that resolves registered subcommand modules lazily."""
+
+    def main(self, args: Optional[Sequence[str]] = None, *pargs: Any, **kwargs: Any) -> Any:
+        argv = list(sys.argv[1:] if args is None else args)
+        path = _command_path(argv)
+        if path[0] in DAEMON_GROUPS and path not in IN_PROCESS_COMMANDS:
+            from outlook_cli import daemon
 
-from outlook_cli import __version__
-from outlook_cli.commands import auth_cmd, cal_cmd, mail_cmd
+            exit_code = daemon.forward(argv)
+            if exit_code is not None:
+                sys.exit(exit_code)
+        return super().main(args, *pargs, **kwargs)
+
+    def list_commands(self, ctx: typer.Context) -> list[str]:
+        names = list(super().list_commands(ctx))
+        return names + [name for name in SUBCOMMANDS if name not in names]
+
+    def get_command(self, ctx: typer.Context, cmd_name: str) -> Optional[TyperGroup]:
+        cmd = super().get_command(ctx, cmd_name)
+        if cmd is not None or cmd_name not in SUBCOMMANDS:
+            return cmd
+
+        module_name, help_text = SUBCOMMANDS[cmd_name]
+        module = importlib.import_module(module_name)
+        cmd = typer.main.get_group(module.app)
+        cmd.name = cmd_name
+        cmd.help = help_text
+        self.add_command(cmd, cmd_name)
+        return cmd
 
 
 def version_callback(value: bool) -> None:
     if value:
+        from outlook_cli import __version__
+
         print(f"outlook-cli {__version__}")
         raise typer.Exit()
 
 
-app = typer.Typer(help="CLI for Microsoft Outlook")
-app.add_typer(auth_cmd.app, name="auth", help="Authentication commands")
-app.add_typer(mail_cmd.app, name="mail", help="Email commands")
-app.add_typer(cal_cmd.app, name="cal", help="Calendar commands")
+app = typer.Typer(cls=LazyGroup, help="CLI for Microsoft Outlook")
 
 
 @app.callback()
 def main(
+    ctx: typer.Context,
     version: bool = typer.Option(
         None, "--version", callback=version_callback, is_eager=True
     ),
+    # A plain string checked below: the OutputFormat choice would import
+    # ``output`` (and ``email.utils``) on every start-up.
+    output_format: str = typer.Option(
+        "table",
+        "--output",
+        "-o",
+        help="Output format for list commands: table, json, jsonl, csv or tsv",
+    ),
+    throttle_stats: bool = typer.Option(
+        False, "--throttle-stats", help="Report Graph requests, throttling and retries on stderr"
+    ),
+    refresh_ids: bool = typer.Option(
+        False, "--refresh-ids", help="Look up cached calendar and folder IDs again instead of reusing them"
+    ),
 ) -> None:
-    pass
+    from outlook_cli import ids, output
+
+    try:
+        output.selected = output.OutputFormat(output_format.lower())
+    except ValueError:
+        raise typer.BadParameter(
+            f"{output_format!r} is not one of {', '.join(fmt.value for fmt in output.OutputFormat)}.",
+            param_hint="'--output' / '-o'",
+        )
+    ids.refresh = refresh_ids
+    if throttle_stats:
+        from outlook_cli import throttle
+
+        before = throttle.shared().snapshot()
+        ctx.call_on_close(
+            lambda: typer.echo(f"Graph: {throttle.shared().snapshot().since(before).summary()}", err=True)
+        )
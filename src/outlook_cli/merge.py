@@ -0,0 +1,251 @@
+"""Mail merge: one templated message per row of a CSV or JSONL file (``mail send --batch``).
+
+Sending notices one ``mail send`` at a time pays process start-up and token
+loading for every message. Here a single process reads the rows lazily,
+renders each into a ``sendMail`` payload and hands it to a small pool of
+workers sharing the account's session, so the input is never held in
+memory and only a bounded window of messages is in flight.
+
+Requests go through the throttle like every other Graph call (per-mailbox
+concurrency, ``Retry-After`` on 429/503). On top of that Exchange Online
+limits how many messages a mailbox may submit per minute, so sends are
+paced by a token bucket at :data:`PER_MINUTE` unless told otherwise.
+
+Every outcome is appended to a journal (JSON Lines) as it happens. A row is
+identified by a digest of its values, so running the same batch again skips
+rows already sent and retries the ones that failed, even if the file was
+re-sorted or extended in between.
+"""
+
+import csv
+import hashlib
+import html
+import json
+import re
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator, Optional
+
+from requests.exceptions import RequestException
+
+from outlook_cli.throttle import TokenBucket
+
+# Exchange Online's message submission rate limit per mailbox.
+PER_MINUTE = 30
+DEFAULT_WORKERS = 4
+JOURNAL_SUFFIX = ".journal.jsonl"
+
+_FIELD = re.compile(r"\{\{|\}\}|\{\s*([^{}]*?)\s*\}")
+
+
+class MergeError(Exception):
+    """A row can't be rendered into a message."""
+
+
+def read_rows(path: Path) -> Iterator[dict[str, Any]]:
+    """Rows of a ``.jsonl``/``.ndjson`` file (one object per line) or a CSV with a header."""
+    if path.suffix.lower() in (".jsonl", ".ndjson"):
+        with path.open(encoding="utf-8") as fh:
+            for number, line in enumerate(fh, 1):
+                if not line.strip():
+                    continue
+                try:
+                    row = json.loads(line)
+                except ValueError as exc:
+                    raise MergeError(f"line {number}: {exc}") from exc
+                if not isinstance(row, dict):
+                    raise MergeError(f"line {number}: expected a JSON object")
+                yield row
+    else:
+        with path.open(encoding="utf-8-sig", newline="") as fh:
+            yield from csv.DictReader(fh)
+
+
+def row_key(row: dict[str, Any]) -> str:
+    """Stable identity of a row's values, for the journal."""
+    return hashlib.sha1(json.dumps(row, sort_keys=True, default=str).encode()).hexdigest()[:16]
+
+
+def render(template: str, row: dict[str, Any], escape: bool = False) -> str:
+    """Replace ``{column}`` with the row's value; ``{{`` and ``}}`` are literal braces."""
+
+    def _value(match: re.Match) -> str:
+        token = match.group(0)
+        if token in ("{{", "}}"):
+            return token[0]
+        name = match.group(1)
+        if name not in row:
+            raise MergeError(f"no column {name!r}")
+        value = "" if row[name] is None else str(row[name])
+        return html.escape(value) if escape else value
+
+    return _FIELD.sub(_value, template)
+
+
+@dataclass
+class Template:
+    """The message every row is rendered into."""
+
+    to: str
+    subject: str
+    body: str
+    cc: Optional[str] = None
+    html: bool = False
+    attachments: tuple[dict, ...] = ()
+
+    def payload(self, row: dict[str, Any]) -> dict:
+        """The ``sendMail`` request body for ``row``."""
+        to = _addresses(render(self.to, row))
+        if not to:
+            raise MergeError("no recipient")
+        message: dict[str, Any] = {
+            "subject": render(self.subject, row),
+            "body": {"contentType": "HTML" if self.html else "Text", "content": render(self.body, row, self.html)},
+            "toRecipients": to,
+        }
+        if self.cc:
+            message["ccRecipients"] = _addresses(render(self.cc, row))
+        if self.attachments:
+            message["attachments"] = list(self.attachments)
+        return {"message": message, "saveToSentItems": True}
+
+
+def _addresses(value: str) -> list[dict]:
+    return [{"emailAddress": {"address": part.strip()}} for part in re.split(r"[,;]", value) if part.strip()]
+
+
+class Journal:
+    """Append-only record of sent and failed rows; the latest entry per row wins."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.sent: set[str] = set()
+        try:
+            with path.open(encoding="utf-8") as fh:
+                for line in fh:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue  # a line cut short by an interrupted run
+                    if entry.get("status") == "sent":
+                        self.sent.add(entry["key"])
+                    else:
+                        self.sent.discard(entry.get("key"))
+        except FileNotFoundError:
+            pass
+        self._fh = None
+
+    def record(self, result: "Result") -> None:
+        if self._fh is None:
+            self._fh = self.path.open("a", encoding="utf-8")
+        entry = {"row": result.row, "key": result.key, "to": result.to, "status": result.status}
+        if result.error:
+            entry["error"] = result.error
+        self._fh.write(json.dumps(entry) + "\n")
+        # Flushed per row, so a killed run never forgets a sent message.
+        self._fh.flush()
+        if result.status == "sent":
+            self.sent.add(result.key)
+
+    def close(self) -> None:
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+
+
+@dataclass
+class Result:
+    row: int
+    key: str
+    to: str = ""
+    status: str = "sent"
+    error: Optional[str] = None
+
+
+@dataclass
+class Summary:
+    sent: int = 0
+    failed: int = 0
+    skipped: int = 0
+
+
+def _prepared(rows: Iterable[dict], template: Template, journal: Journal) -> Iterator[tuple[Result, Optional[dict]]]:
+    """Rows as (result so far, payload); a payload of None means nothing to send."""
+    for number, row in enumerate(rows, 1):
+        result = Result(number, row_key(row))
+        if result.key in journal.sent:
+            result.status = "skipped"
+            yield result, None
+            continue
+        try:
+            payload = template.payload(row)
+        except MergeError as exc:
+            result.status, result.error = "failed", str(exc)
+            yield result, None
+            continue
+        result.to = ", ".join(item["emailAddress"]["address"] for item in payload["message"]["toRecipients"])
+        yield result, payload
+
+
+def send_all(
+    con: Any,
+    service_url: str,
+    rows: Iterable[dict],
+    template: Template,
+    journal: Journal,
+    *,
+    workers: int = DEFAULT_WORKERS,
+    per_minute: float = PER_MINUTE,
+    on_result: Optional[Callable[[Result], None]] = None,
+    sleep: Callable[[float], None] = time.sleep,
+) -> Summary:
+    """Render and send a message per row, journaling each outcome as it completes."""
+    url = f"{service_url.rstrip('/')}/me/sendMail"
+    # One token of burst: sends are spaced evenly rather than front-loaded.
+    pace = TokenBucket(per_minute / 60, 1) if per_minute > 0 else None
+    summary = Summary()
+
+    def _send(result: Result, payload: dict) -> Result:
+        if pace is not None:
+            delay = pace.reserve()
+            if delay > 0:
+                sleep(delay)
+        try:
+            con.post(url, data=payload)
+        except RequestException as exc:
+            result.status, result.error = "failed", str(exc)
+        return result
+
+    def _finish(result: Result) -> None:
+        if result.status == "skipped":
+            summary.skipped += 1
+        else:
+            journal.record(result)
+            if result.status == "sent":
+                summary.sent += 1
+            else:
+                summary.failed += 1
+        if on_result is not None:
+            on_result(result)
+
+    workers = max(1, workers)
+    in_flight: set[Future] = set()
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="outlook-merge") as pool:
+        try:
+            for result, payload in _prepared(rows, template, journal):
+                if payload is None:
+                    _finish(result)
+                    continue
+                if len(in_flight) >= workers * 2:
+                    done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        _finish(future.result())
+                in_flight.add(pool.submit(_send, result, payload))
+        finally:
+            # Journal what was sent even if reading the input failed part-way,
+            # or a rerun would mail those recipients again.
+            for future in wait(in_flight).done:
+                _finish(future.result())
+    return summary
@@ -0,0 +1,412 @@
+"""Local SQLite mirror of mailbox folders, kept current with Graph delta queries.
+
+``mail sync`` walks ``/me/mailFolders/{id}/messages/delta`` and stores message
+metadata (and optionally text bodies) in ``~/.outlook-cli/mirror-<account>.db``.
+Each page is committed together with the ``@odata.nextLink`` that follows it,
+so an interrupted sync resumes where it stopped; a finished sync stores the
+``@odata.deltaLink`` so the next run only transfers what changed. Items marked
+``@removed`` are deleted from the mirror.
+
+A contentless FTS5 index over subject, sender, recipients and body is kept in
+step with the ``messages`` table by triggers, so text search can be combined
+with every filter and ranked by BM25 without a separate indexing pass.
+"""
+
+import json
+import sqlite3
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Optional, Sequence
+
+from requests.exceptions import HTTPError
+
+from outlook_cli.ids import account_path
+
+DB_FILENAME = "mirror.db"
+DEFAULT_PAGE_SIZE = 100
+MESSAGE_FIELDS = (
+    "subject",
+    "from",
+    "toRecipients",
+    "ccRecipients",
+    "receivedDateTime",
+    "isRead",
+    "importance",
+    "hasAttachments",
+    "changeKey",
+)
+# Graph answers 410 Gone when a delta token has expired; start over.
+RESYNC_STATUS = 410
+# Bumped when the layout changes; an older mirror is dropped and re-synced.
+SCHEMA_VERSION = 2
+# BM25 column weights: subject, sender, recipients, body.
+RANK_WEIGHTS = (10.0, 5.0, 2.0, 1.0)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS folders (
+    name TEXT PRIMARY KEY COLLATE NOCASE,
+    folder_id TEXT NOT NULL,
+    delta_link TEXT,
+    next_link TEXT,
+    with_bodies INTEGER NOT NULL DEFAULT 0,
+    synced_at TEXT
+);
+CREATE TABLE IF NOT EXISTS messages (
+    pk INTEGER PRIMARY KEY,
+    folder TEXT NOT NULL COLLATE NOCASE,
+    id TEXT NOT NULL,
+    subject TEXT NOT NULL DEFAULT '',
+    sender_name TEXT NOT NULL DEFAULT '',
+    sender_address TEXT NOT NULL DEFAULT '',
+    to_recipients TEXT NOT NULL DEFAULT '',
+    cc_recipients TEXT NOT NULL DEFAULT '',
+    received TEXT,
+    is_read INTEGER NOT NULL DEFAULT 0,
+    importance TEXT NOT NULL DEFAULT 'normal',
+    has_attachments INTEGER NOT NULL DEFAULT 0,
+    body TEXT,
+    change_key TEXT,
+    UNIQUE (folder, id)
+);
+CREATE INDEX IF NOT EXISTS messages_by_received ON messages (folder, received DESC);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS messages_fts USING fts5(
+    subject, sender, recipients, body,
+    content='', tokenize='unicode61 remove_diacritics 2'
+);
+CREATE TRIGGER IF NOT EXISTS messages_fts_insert AFTER INSERT ON messages BEGIN
+    INSERT INTO messages_fts (rowid, subject, sender, recipients, body)
+    VALUES (new.pk, new.subject, new.sender_name || ' ' || new.sender_address,
+            new.to_recipients || ' ' || new.cc_recipients, COALESCE(new.body, ''));
+END;
+CREATE TRIGGER IF NOT EXISTS messages_fts_delete AFTER DELETE ON messages BEGIN
+    INSERT INTO messages_fts (messages_fts, rowid, subject, sender, recipients, body)
+    VALUES ('delete', old.pk, old.subject, old.sender_name || ' ' || old.sender_address,
+            old.to_recipients || ' ' || old.cc_recipients, COALESCE(old.body, ''));
+END;
+CREATE TRIGGER IF NOT EXISTS messages_fts_update AFTER UPDATE ON messages
+WHEN old.subject IS NOT new.subject OR old.sender_name IS NOT new.sender_name
+    OR old.sender_address IS NOT new.sender_address OR old.to_recipients IS NOT new.to_recipients
+    OR old.cc_recipients IS NOT new.cc_recipients OR old.body IS NOT new.body
+BEGIN
+    INSERT INTO messages_fts (messages_fts, rowid, subject, sender, recipients, body)
+    VALUES ('delete', old.pk, old.subject, old.sender_name || ' ' || old.sender_address,
+            old.to_recipients || ' ' || old.cc_recipients, COALESCE(old.body, ''));
+    INSERT INTO messages_fts (rowid, subject, sender, recipients, body)
+    VALUES (new.pk, new.subject, new.sender_name || ' ' || new.sender_address,
+            new.to_recipients || ' ' || new.cc_recipients, COALESCE(new.body, ''));
+END;
+"""
+
+
+@dataclass
+class MirroredMessage:
+    """A mirrored message exposing the attributes the display helpers read."""
+
+    object_id: str
+    folder: str
+    subject: str
+    sender: str
+    received: Optional[datetime]
+    is_read: bool
+    importance: str
+    has_attachments: bool
+    to: list[str]
+    cc: list[str]
+    body: str
+
+    @property
+    def folder_id(self) -> str:
+        """Mirrored messages are filed by folder name, which stands in for the id."""
+        return self.folder
+
+
+@dataclass
+class SyncResult:
+    folder: str
+    upserted: int = 0
+    removed: int = 0
+    requests: int = 0
+    total: int = 0
+    resumed: bool = False
+    full: bool = False
+
+
+def db_path(account_key: str) -> Path:
+    return account_path(account_key, DB_FILENAME)
+
+
+def connect(path: Path) -> sqlite3.Connection:
+    """Open (and create if needed) the mirror database."""
+    db = sqlite3.connect(path)
+    db.row_factory = sqlite3.Row
+    db.execute("PRAGMA journal_mode=WAL")
+    if db.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+        # The mirror is a cache of the server: rebuilding beats migrating.
+        db.executescript(
+            "DROP TABLE IF EXISTS messages; DROP TABLE IF EXISTS messages_fts; DROP TABLE IF EXISTS folders;"
+        )
+        db.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+    db.executescript(SCHEMA)
+    return db
+
+
+# ── Sync ───────────────────────────────────────────────────────
+
+
+def _format_recipient(entry: Optional[dict]) -> str:
+    email = (entry or {}).get("emailAddress") or {}
+    name, address = email.get("name", ""), email.get("address", "")
+    return f"{name} <{address}>" if name and address else name or address
+
+
+def _row(folder: str, item: dict) -> dict:
+    sender = (item.get("from") or {}).get("emailAddress") or {}
+    body = item.get("body")
+    return {
+        "folder": folder,
+        "id": item["id"],
+        "subject": item.get("subject") or "",
+        "sender_name": sender.get("name", ""),
+        "sender_address": sender.get("address", ""),
+        "to_recipients": json.dumps([_format_recipient(r) for r in item.get("toRecipients") or []]),
+        "cc_recipients": json.dumps([_format_recipient(r) for r in item.get("ccRecipients") or []]),
+        "received": item.get("receivedDateTime"),
+        "is_read": int(bool(item.get("isRead"))),
+        "importance": item.get("importance") or "normal",
+        "has_attachments": int(bool(item.get("hasAttachments"))),
+        "body": body.get("content") if isinstance(body, dict) else None,
+        "change_key": item.get("changeKey"),
+    }
+
+
+def _upsert(db: sqlite3.Connection, row: dict) -> None:
+    columns = ", ".join(row)
+    placeholders = ", ".join(f":{key}" for key in row)
+    # Keep a previously mirrored body when this page did not select one.
+    updates = ", ".join(
+        f"{key} = COALESCE(excluded.{key}, {key})" if key == "body" else f"{key} = excluded.{key}"
+        for key in row
+        if key not in ("folder", "id")
+    )
+    db.execute(
+        f"INSERT INTO messages ({columns}) VALUES ({placeholders}) "
+        f"ON CONFLICT (folder, id) DO UPDATE SET {updates}",
+        row,
+    )
+
+
+def apply_changes(db: sqlite3.Connection, folder: str, items: list[dict]) -> tuple[int, int]:
+    """Store one page of delta items; returns (upserted, removed). Caller commits."""
+    upserted = removed = 0
+    for item in items:
+        if "@removed" in item:
+            cursor = db.execute("DELETE FROM messages WHERE folder = ? AND id = ?", (folder, item["id"]))
+            removed += cursor.rowcount
+        else:
+            _upsert(db, _row(folder, item))
+            upserted += 1
+    return upserted, removed
+
+
+def _initial_url(service_url: str, folder_id: str, bodies: bool) -> str:
+    fields = ",".join(MESSAGE_FIELDS + (("body",) if bodies else ()))
+    return f"{service_url.rstrip('/')}/me/mailFolders/{folder_id}/messages/delta?$select={fields}"
+
+
+def reset_folder(db: sqlite3.Connection, name: str) -> None:
+    """Forget a folder's messages and delta state."""
+    with db:
+        db.execute("DELETE FROM messages WHERE folder = ?", (name,))
+        db.execute("UPDATE folders SET delta_link = NULL, next_link = NULL WHERE name = ?", (name,))
+
+
+def sync_folder(
+    db: sqlite3.Connection,
+    con: Any,
+    service_url: str,
+    name: str,
+    folder_id: str,
+    *,
+    bodies: bool = False,
+    full: bool = False,
+    page_size: int = DEFAULT_PAGE_SIZE,
+) -> SyncResult:
+    """Bring the mirror of one folder up to date; returns what changed."""
+    result = SyncResult(folder=name)
+    state = db.execute("SELECT * FROM folders WHERE name = ?", (name,)).fetchone()
+    if state is not None and (full or bool(state["with_bodies"]) != bodies or state["folder_id"] != folder_id):
+        # Changing the selected fields or the folder needs a fresh baseline.
+        reset_folder(db, name)
+        state = None
+    with db:
+        db.execute(
+            "INSERT INTO folders (name, folder_id, with_bodies) VALUES (?, ?, ?) "
+            "ON CONFLICT (name) DO UPDATE SET folder_id = excluded.folder_id, with_bodies = excluded.with_bodies",
+            (name, folder_id, int(bodies)),
+        )
+
+    if state is not None and state["next_link"]:
+        url = state["next_link"]
+        result.resumed = True
+    elif state is not None and state["delta_link"]:
+        url = state["delta_link"]
+    else:
+        url = _initial_url(service_url, folder_id, bodies)
+        result.full = True
+
+    headers = {"Prefer": f'odata.maxpagesize={page_size}, outlook.body-content-type="text"'}
+    restarted = False
+    while url:
+        try:
+            response = con.get(url, headers=dict(headers))
+        except HTTPError as exc:
+            if exc.response is None or exc.response.status_code != RESYNC_STATUS or restarted:
+                raise
+            restarted = True
+            reset_folder(db, name)
+            url = _initial_url(service_url, folder_id, bodies)
+            result.full = True
+            continue
+        result.requests += 1
+        page = response.json()
+
+        next_link = page.get("@odata.nextLink")
+        delta_link = page.get("@odata.deltaLink")
+        with db:
+            upserted, removed = apply_changes(db, name, page.get("value", []))
+            result.upserted += upserted
+            result.removed += removed
+            if next_link:
+                db.execute("UPDATE folders SET next_link = ? WHERE name = ?", (next_link, name))
+            else:
+                db.execute(
+                    "UPDATE folders SET delta_link = ?, next_link = NULL, synced_at = ? WHERE name = ?",
+                    (delta_link, datetime.now(timezone.utc).isoformat(timespec="seconds"), name),
+                )
+        url = next_link
+
+    result.total = db.execute("SELECT COUNT(*) FROM messages WHERE folder = ?", (name,)).fetchone()[0]
+    return result
+
+
+# ── Offline queries ────────────────────────────────────────────
+
+
+def _parse_received(value: Optional[str]) -> Optional[datetime]:
+    if not value:
+        return None
+    return datetime.fromisoformat(value.replace("Z", "+00:00")).astimezone()
+
+
+def to_message(row: sqlite3.Row) -> MirroredMessage:
+    sender = (
+        f"{row['sender_name']} <{row['sender_address']}>"
+        if row["sender_name"] and row["sender_address"]
+        else row["sender_name"] or row["sender_address"]
+    )
+    return MirroredMessage(
+        object_id=row["id"],
+        folder=row["folder"],
+        subject=row["subject"],
+        sender=sender,
+        received=_parse_received(row["received"]),
+        is_read=bool(row["is_read"]),
+        importance=row["importance"],
+        has_attachments=bool(row["has_attachments"]),
+        to=json.loads(row["to_recipients"] or "[]"),
+        cc=json.loads(row["cc_recipients"] or "[]"),
+        body=row["body"] or "",
+    )
+
+
+def match_expression(query: str) -> str:
+    """Turn free text into an FTS5 query: every term must match.
+
+    Terms are quoted so punctuation and FTS5 operators in user input are taken
+    literally; a trailing ``*`` keeps its meaning as a prefix search.
+    """
+    phrases = []
+    for term in query.split():
+        prefix = term.endswith("*") and len(term) > 1
+        text = term.rstrip("*") if prefix else term
+        phrases.append('"{}"{}'.format(text.replace('"', '""'), "*" if prefix else ""))
+    return " ".join(phrases)
+
+
+def _utc(value: datetime) -> str:
+    """Render a naive local or aware datetime as Graph's UTC timestamp format."""
+    return value.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def search(
+    db: sqlite3.Connection,
+    *,
+    folders: Optional[Sequence[str]] = None,
+    query: Optional[str] = None,
+    sender: Optional[str] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    unread: bool = False,
+    important: bool = False,
+    has_attachments: bool = False,
+    limit: int = 25,
+) -> list[MirroredMessage]:
+    """Answer a search from the mirror with every filter applied.
+
+    ``folders`` limits it to those folders; by default every mirrored one counts.
+
+    Text queries go through the FTS index and are ranked by BM25 (best first);
+    without one, messages come newest first.
+    """
+    clauses: list[str] = []
+    params: list[Any] = []
+    if query and query.strip():
+        source = "messages JOIN messages_fts ON messages_fts.rowid = messages.pk"
+        clauses.append("messages_fts MATCH ?")
+        params.append(match_expression(query))
+        weights = ", ".join(str(weight) for weight in RANK_WEIGHTS)
+        order = f"bm25(messages_fts, {weights}), received DESC"
+    else:
+        source = "messages"
+        order = "received DESC"
+    if folders:
+        clauses.append(f"folder IN ({', '.join('?' * len(folders))})")
+        params.extend(folders)
+    if sender:
+        clauses.append("(sender_address LIKE ? OR sender_name LIKE ?)")
+        params.extend([f"%{sender}%"] * 2)
+    if start:
+        clauses.append("received >= ?")
+        params.append(_utc(start))
+    if end:
+        clauses.append("received <= ?")
+        params.append(_utc(end))
+    if unread:
+        clauses.append("is_read = 0")
+    if important:
+        clauses.append("importance = 'high'")
+    if has_attachments:
+        clauses.append("has_attachments = 1")
+
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    rows = db.execute(
+        f"SELECT messages.* FROM {source} {where} ORDER BY {order} LIMIT ?", (*params, limit)
+    ).fetchall()
+    return [to_message(row) for row in rows]
+
+
+def is_mirrored(path: Path, folder: str) -> bool:
+    """Whether ``folder`` has been synced into ``path``, without creating the database."""
+    if not path.exists():
+        return False
+    db = connect(path)
+    try:
+        return any(row["name"].lower() == folder.lower() for row in synced_folders(db))
+    finally:
+        db.close()
+
+
+def synced_folders(db: sqlite3.Connection) -> list[sqlite3.Row]:
+    return db.execute("SELECT * FROM folders ORDER BY name").fetchall()
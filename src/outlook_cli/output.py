@@ -0,0 +1,236 @@
+"""Machine-readable output: JSON, JSON Lines, CSV and TSV.
+
+Selected with the global ``--output`` option. Records are written to stdout
+one at a time as messages or events are yielded, without going through rich,
+so memory stays flat however many rows a listing returns. Field names are part
+of the CLI's interface: add new ones, don't rename.
+"""
+
+import csv
+import json
+import sys
+from datetime import datetime
+from enum import Enum
+from typing import Any, Callable, Iterable, Optional, TextIO
+
+
+class OutputFormat(str, Enum):
+    table = "table"
+    json = "json"
+    jsonl = "jsonl"
+    csv = "csv"
+    tsv = "tsv"
+
+
+# Set by the root ``--output`` option for the current invocation.
+selected: OutputFormat = OutputFormat.table
+
+MESSAGE_FIELDS = (
+    "id",
+    "received",
+    "from_name",
+    "from_address",
+    "subject",
+    "is_read",
+    "importance",
+    "has_attachments",
+    "to",
+    "cc",
+)
+FOLDER_FIELDS = ("path", "id", "unread", "total", "child_count")
+EVENT_FIELDS = ("id", "subject", "start", "end", "is_all_day", "location", "organizer", "is_recurring")
+SLOT_FIELDS = ("start", "end", "available", "busy")
+ATTACHMENT_FIELDS = ("id", "name", "size", "content_type", "kind", "is_inline")
+
+
+def is_machine() -> bool:
+    return selected is not OutputFormat.table
+
+
+# ── Records ────────────────────────────────────────────────────
+
+
+def _timestamp(value: Optional[datetime]) -> Optional[str]:
+    return value.isoformat() if value else None
+
+
+def _address(value: Any) -> tuple[str, str]:
+    """(name, address) from an O365 Recipient or a ``Name <address>`` string."""
+    if value is None:
+        return "", ""
+    if hasattr(value, "address"):
+        return getattr(value, "name", "") or "", value.address or ""
+    from email.utils import parseaddr
+
+    return parseaddr(str(value))
+
+
+def _enum_text(value: Any) -> str:
+    """Lower-case text of an O365 enum member or a plain string."""
+    return str(getattr(value, "value", value) or "").lower()
+
+
+def _addresses(values: Any) -> list[str]:
+    return [address for _, address in map(_address, values or []) if address]
+
+
+def message_record(msg: Any) -> dict:
+    from_name, from_address = _address(msg.sender)
+    record = {
+        "id": msg.object_id,
+        "received": _timestamp(msg.received),
+        "from_name": from_name,
+        "from_address": from_address,
+        "subject": msg.subject or "",
+        "is_read": bool(getattr(msg, "is_read", True)),
+        "importance": _enum_text(getattr(msg, "importance", None)) or "normal",
+        "has_attachments": bool(getattr(msg, "has_attachments", False)),
+        "to": _addresses(getattr(msg, "to", None)),
+        "cc": _addresses(getattr(msg, "cc", None)),
+    }
+    body = getattr(msg, "body", None)
+    if body:
+        record["body"] = body
+    return record
+
+
+def event_record(event: Any) -> dict:
+    location = event.location
+    if isinstance(location, dict):
+        location = location.get("displayName", "")
+    organizer = getattr(event, "organizer", None)
+    record = {
+        "id": event.object_id,
+        "subject": event.subject or "",
+        "start": _timestamp(event.start),
+        "end": _timestamp(event.end),
+        "is_all_day": bool(getattr(event, "is_all_day", False)),
+        "location": str(location or ""),
+        "organizer": _address(organizer)[1] if organizer else "",
+        # O365 always attaches a recurrence object; it is falsy for single events.
+        "is_recurring": bool(getattr(event, "recurrence", None)),
+    }
+    body = getattr(event, "body", None)
+    if body:
+        record["body"] = body
+    return record
+
+
+# ── Writers ────────────────────────────────────────────────────
+
+
+def _flat(value: Any) -> Any:
+    """Spreadsheet cell for a record value: lists are joined with ``;``."""
+    if isinstance(value, list):
+        return ";".join(str(item) for item in value)
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return "" if value is None else value
+
+
+def write(
+    items: Iterable[Any],
+    to_record: Callable[[Any], dict],
+    fields: tuple[str, ...],
+    fmt: Optional[OutputFormat] = None,
+    out: Optional[TextIO] = None,
+) -> int:
+    """Serialize ``items`` one by one in ``fmt``; returns the number written.
+
+    JSON is a single array (``[]`` when empty); CSV/TSV have a header row and
+    the fixed ``fields`` columns, while JSON records may carry extra keys such
+    as ``body`` when it was fetched.
+    """
+    fmt = fmt or selected
+    out = out or sys.stdout
+    count = 0
+
+    if fmt is OutputFormat.json:
+        out.write("[")
+        for item in items:
+            out.write(",\n" if count else "\n")
+            out.write(json.dumps(to_record(item), ensure_ascii=False))
+            count += 1
+        out.write("\n]\n" if count else "]\n")
+    elif fmt is OutputFormat.jsonl:
+        for item in items:
+            out.write(json.dumps(to_record(item), ensure_ascii=False))
+            out.write("\n")
+            count += 1
+    elif fmt in (OutputFormat.csv, OutputFormat.tsv):
+        delimiter = "," if fmt is OutputFormat.csv else "\t"
+        writer = csv.writer(out, delimiter=delimiter, lineterminator="\n")
+        writer.writerow(fields)
+        for item in items:
+            record = to_record(item)
+            writer.writerow([_flat(record.get(name)) for name in fields])
+            count += 1
+    else:
+        raise ValueError(f"Not a machine-readable format: {fmt}")
+
+    out.flush()
+    return count
+
+
+def write_messages(messages: Iterable[Any], folders: Optional[dict[str, str]] = None) -> int:
+    """``folders`` maps folder ids to paths, adding a ``folder`` field."""
+    if folders is None:
+        return write(messages, message_record, MESSAGE_FIELDS)
+
+    def _record(message: Any) -> dict:
+        return {**message_record(message), "folder": folders.get(message.folder_id or "", "")}
+
+    return write(messages, _record, (*MESSAGE_FIELDS, "folder"))
+
+
+def write_events(events: Iterable[Any], calendars: Optional[dict[str, str]] = None) -> int:
+    """``calendars`` maps calendar ids to names, adding a ``calendar`` field."""
+    if calendars is None:
+        return write(events, event_record, EVENT_FIELDS)
+
+    def _record(event: Any) -> dict:
+        return {**event_record(event), "calendar": calendars.get(event.calendar_id or "", "")}
+
+    return write(events, _record, (*EVENT_FIELDS, "calendar"))
+
+
+def slot_record(slot: Any) -> dict:
+    return {
+        "start": _timestamp(slot.start),
+        "end": _timestamp(slot.end),
+        "available": slot.available,
+        "busy": list(slot.busy),
+    }
+
+
+def write_slots(slots: Iterable[Any]) -> int:
+    return write(slots, slot_record, SLOT_FIELDS)
+
+
+def attachment_record(attachment: Any) -> dict:
+    return {
+        "id": attachment.id,
+        "name": attachment.name,
+        "size": attachment.size,
+        "content_type": attachment.content_type,
+        "kind": attachment.kind,
+        "is_inline": attachment.is_inline,
+    }
+
+
+def write_attachments(attachments: Iterable[Any]) -> int:
+    return write(attachments, attachment_record, ATTACHMENT_FIELDS)
+
+
+def write_folders(folder_map: Any) -> int:
+    def _record(entry: tuple) -> dict:
+        folder = entry[1]
+        return {
+            "path": folder_map.path(folder),
+            "id": folder.id,
+            "unread": folder.unread,
+            "total": folder.total,
+            "child_count": folder.child_count,
+        }
+
+    return write(folder_map.walk(), _record, FOLDER_FIELDS)
@@ -0,0 +1,138 @@
+"""OData query parameters and field projections for list requests.
+
+:class:`ODataQuery` is accepted anywhere O365 takes a query object (it only
+needs ``as_params()``), and builds ``$filter``, ``$search`` and ``$select``
+directly so attribute paths such as ``from/emailAddress/address`` are sent as
+written.
+
+List views ask Graph only for the properties their tables render; bodies are
+most of a message's payload and are never shown in a list. Detail views ask
+for bodies as text (:data:`TEXT_BODIES`), which Graph renders server-side, so
+HTML markup is neither downloaded nor converted locally.
+"""
+
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Any, Iterator, Optional, Sequence, Union
+
+MAIL_LIST_FIELDS = ("id", "subject", "from", "receivedDateTime", "isRead", "importance", "hasAttachments")
+EVENT_LIST_FIELDS = ("id", "subject", "start", "end", "location", "isAllDay", "recurrence")
+# ``--output`` records also carry recipients and organizers.
+MAIL_RECORD_FIELDS = (*MAIL_LIST_FIELDS, "toRecipients", "ccRecipients")
+EVENT_RECORD_FIELDS = (*EVENT_LIST_FIELDS, "organizer")
+# ``mail read`` shows these plus either ``body`` or ``uniqueBody``.
+MAIL_READ_FIELDS = ("id", "subject", "from", "sender", "toRecipients", "ccRecipients", "receivedDateTime")
+# ``Prefer`` value asking Graph for ``body``/``uniqueBody`` as plain text.
+TEXT_BODIES = 'outlook.body-content-type="text"'
+# ``--fields`` values that turn projection off and fetch whole resources.
+FULL_FETCH = frozenset({"*", "all"})
+
+FilterValue = Union[str, bool, int, float, datetime, None]
+
+
+def utc_timestamp(value: datetime) -> str:
+    """Render a datetime in UTC the way Graph stores ``dateTime`` strings.
+
+    Naive datetimes are local time, like the dates users type.
+    """
+    return value.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S")
+
+
+def _literal(value: FilterValue) -> str:
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return str(value).lower()
+    if isinstance(value, datetime):
+        return f"{utc_timestamp(value)}Z"
+    if isinstance(value, str):
+        return "'{}'".format(value.replace("'", "''"))
+    return str(value)
+
+
+class ODataQuery:
+    """``$filter`` clauses (joined with ``and``), an optional ``$search`` and ``$select``."""
+
+    def __init__(self, select: Optional[Sequence[str]] = None) -> None:
+        self.filters: list[str] = []
+        self.search_text: Optional[str] = None
+        self.select = list(select) if select else None
+
+    def equals(self, attribute: str, value: FilterValue) -> "ODataQuery":
+        self.filters.append(f"{attribute} eq {_literal(value)}")
+        return self
+
+    def unequal(self, attribute: str, value: FilterValue) -> "ODataQuery":
+        self.filters.append(f"{attribute} ne {_literal(value)}")
+        return self
+
+    def greater_equal(self, attribute: str, value: FilterValue) -> "ODataQuery":
+        self.filters.append(f"{attribute} ge {_literal(value)}")
+        return self
+
+    def less_equal(self, attribute: str, value: FilterValue) -> "ODataQuery":
+        self.filters.append(f"{attribute} le {_literal(value)}")
+        return self
+
+    def contains(self, attribute: str, value: str) -> "ODataQuery":
+        self.filters.append(f"contains({attribute}, {_literal(value)})")
+        return self
+
+    def search(self, text: str) -> "ODataQuery":
+        """Full-text search; Graph rejects it combined with ``$filter``."""
+        self.search_text = text
+        return self
+
+    # O365's single-item getters only send a query that selects or expands.
+    @property
+    def has_selects(self) -> bool:
+        return bool(self.select)
+
+    @property
+    def has_expands(self) -> bool:
+        return False
+
+    def as_params(self) -> dict:
+        params = {}
+        if self.filters:
+            params["$filter"] = " and ".join(self.filters)
+        if self.search_text:
+            params["$search"] = '"{}"'.format(self.search_text.replace("\\", "\\\\").replace('"', '\\"'))
+        if self.select:
+            params["$select"] = ",".join(self.select)
+        return params
+
+
+@contextmanager
+def preferring(con: Any, *preferences: str) -> Iterator[None]:
+    """Add ``preferences`` to the ``Prefer`` header of requests made through ``con``.
+
+    O365 builds its own requests (``mailbox.get_message``, ``calendar.get_event``)
+    and merges ``con.default_headers`` into each one, so this is how a
+    preference reaches them.
+    """
+    headers = con.default_headers
+    previous = headers.get("Prefer")
+    headers["Prefer"] = ", ".join(filter(None, (previous, *preferences)))
+    try:
+        yield
+    finally:
+        if previous is None:
+            headers.pop("Prefer", None)
+        else:
+            headers["Prefer"] = previous
+
+
+def parse_fields(value: Optional[str], default: Sequence[str]) -> Optional[list[str]]:
+    """Resolve a ``--fields`` option into a ``$select`` list.
+
+    ``None`` keeps the view's default projection; ``*`` or ``all`` returns
+    ``None`` (fetch everything). ``id`` is always included so rows stay
+    addressable.
+    """
+    names = [name.strip() for name in (value or "").split(",") if name.strip()]
+    if not names:
+        return list(default)
+    if any(name.lower() in FULL_FETCH for name in names):
+        return None
+    return list(dict.fromkeys(["id", *names]))
@@ -0,0 +1,71 @@
+"""Background prefetch for paged Graph results.
+
+O365 returns long listings as a lazy ``Pagination`` that downloads the next
+page only when the previous one is exhausted. :func:`prefetch` drains such an
+iterator on a worker thread into a bounded queue, so the next page is already
+in flight while the current one is being rendered.
+"""
+
+import queue
+import threading
+from typing import Iterable, Iterator, TypeVar
+
+T = TypeVar("T")
+
+# Items per Graph page for streamed listings; small enough for a quick first
+# paint, large enough to keep the request count low.
+PAGE_SIZE = 100
+
+_DONE = object()
+_POLL_SECONDS = 0.1
+
+
+class _Failure:
+    def __init__(self, exc: BaseException) -> None:
+        self.exc = exc
+
+
+def prefetch(items: Iterable[T], buffer: int = PAGE_SIZE) -> Iterator[T]:
+    """Yield ``items`` while a worker thread keeps up to ``buffer`` of them ready.
+
+    Errors raised while fetching are re-raised in the consumer. If the consumer
+    stops early the worker is told to stop after its current item.
+    """
+    ready: queue.Queue = queue.Queue(maxsize=max(1, buffer))
+    stop = threading.Event()
+
+    def _put(value: object) -> bool:
+        while not stop.is_set():
+            try:
+                ready.put(value, timeout=_POLL_SECONDS)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _worker() -> None:
+        try:
+            for item in items:
+                if not _put(item):
+                    return
+        except BaseException as exc:  # re-raised on the consumer side
+            _put(_Failure(exc))
+            return
+        _put(_DONE)
+
+    def _consume() -> Iterator[T]:
+        try:
+            while True:
+                value = ready.get()
+                if value is _DONE:
+                    return
+                if isinstance(value, _Failure):
+                    raise value.exc
+                yield value
+        finally:
+            stop.set()
+
+    # Started now rather than on first use, so several prefetches run at once.
+    thread = threading.Thread(target=_worker, name="outlook-prefetch", daemon=True)
+    thread.start()
+    return _consume()
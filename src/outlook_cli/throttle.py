@@ -0,0 +1,274 @@
+"""Client-side pacing and retry for every Microsoft Graph request.
+
+Outlook resources are throttled per mailbox: roughly 10,000 requests per ten
+minutes and at most four concurrent requests. :class:`Throttle` keeps each
+mailbox under both limits with a token bucket and a semaphore, and when Graph
+answers 429 or 503 anyway it pauses the whole mailbox for the ``Retry-After``
+period (or a jittered exponential backoff when none is given) before retrying.
+
+It is mounted on the O365 connection's HTTP session as a transport adapter by
+:func:`install`, so every call the commands make, including ``$batch`` and
+delta pages, goes through it without any per-command code. The adapter
+replaces O365's own urllib3 status retries, which ignored the per-mailbox
+state and never retried POSTs.
+"""
+
+import email.utils
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass, fields
+from typing import Any, Callable, Optional
+
+from requests import PreparedRequest, Response
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Rejected before processing: safe to resend for any method.
+THROTTLE_STATUSES = frozenset({429, 503})
+# May have been partly processed: only resent for idempotent methods.
+TRANSIENT_STATUSES = frozenset({500, 502, 504})
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+
+MAX_CONCURRENT = 4
+RATE_PER_SECOND = 10_000 / 600
+BURST = 40
+MAX_RETRIES = 5
+BACKOFF_SECONDS = 1.0
+MAX_BACKOFF_SECONDS = 60.0
+
+_MAILBOX_PATH = re.compile(r"/users/([^/?]+)", re.IGNORECASE)
+
+
+@dataclass
+class ThrottleStats:
+    requests: int = 0
+    throttled: int = 0
+    retries: int = 0
+    waited: float = 0.0
+    peak_concurrency: int = 0
+
+    def since(self, earlier: "ThrottleStats") -> "ThrottleStats":
+        """Counters accumulated after ``earlier`` was copied; the peak is kept."""
+        delta = ThrottleStats(
+            **{f.name: getattr(self, f.name) - getattr(earlier, f.name) for f in fields(self)}
+        )
+        delta.peak_concurrency = self.peak_concurrency
+        return delta
+
+    def summary(self) -> str:
+        return (
+            f"{self.requests} request(s), {self.throttled} throttled, {self.retries} retried, "
+            f"{self.waited:.1f}s waiting, peak {self.peak_concurrency} concurrent"
+        )
+
+
+class TokenBucket:
+    """Refills at ``rate`` tokens per second up to ``capacity``."""
+
+    def __init__(self, rate: float, capacity: float, clock: Callable[[], float] = time.monotonic) -> None:
+        self.rate = rate
+        self.capacity = capacity
+        self._clock = clock
+        self._tokens = capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Take a token; returns how long to wait before it may be used.
+
+        Tokens can be borrowed from the future, so concurrent callers queue up
+        at the refill rate instead of all waking at once.
+        """
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            return max(0.0, -self._tokens / self.rate)
+
+
+class _Mailbox:
+    def __init__(self, rate: float, burst: float, concurrency: int, clock: Callable[[], float]) -> None:
+        self.bucket = TokenBucket(rate, burst, clock)
+        self.slots = threading.BoundedSemaphore(concurrency)
+        self.resume_at = 0.0
+        self.in_flight = 0
+
+
+def mailbox_key(url: str) -> str:
+    """The mailbox a Graph URL addresses: a ``/users/{id}`` segment, else ``me``."""
+    match = _MAILBOX_PATH.search(url)
+    return match.group(1).lower() if match else "me"
+
+
+def retry_after(response: Response) -> Optional[float]:
+    """Seconds from a ``Retry-After`` header (delta-seconds or HTTP date)."""
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, when.timestamp() - time.time())
+
+
+class Throttle:
+    """Per-mailbox pacing, concurrency limit and retries shared by all requests."""
+
+    def __init__(
+        self,
+        *,
+        rate: float = RATE_PER_SECOND,
+        burst: float = BURST,
+        concurrency: int = MAX_CONCURRENT,
+        max_retries: int = MAX_RETRIES,
+        sleep: Callable[[float], None] = time.sleep,
+        clock: Callable[[], float] = time.monotonic,
+        jitter: Callable[[], float] = random.random,
+    ) -> None:
+        self.rate = rate
+        self.burst = burst
+        self.concurrency = concurrency
+        self.max_retries = max_retries
+        self.stats = ThrottleStats()
+        self._sleep = sleep
+        self._clock = clock
+        self._jitter = jitter
+        self._mailboxes: dict[str, _Mailbox] = {}
+        self._lock = threading.Lock()
+
+    def _mailbox(self, key: str) -> _Mailbox:
+        with self._lock:
+            if key not in self._mailboxes:
+                self._mailboxes[key] = _Mailbox(self.rate, self.burst, self.concurrency, self._clock)
+            return self._mailboxes[key]
+
+    def _wait(self, seconds: float) -> None:
+        if seconds > 0:
+            with self._lock:
+                self.stats.waited += seconds
+            self._sleep(seconds)
+
+    def backoff(self, attempt: int) -> float:
+        """Exponential delay for retry ``attempt`` (1-based), jittered to 50-100%."""
+        delay = min(BACKOFF_SECONDS * 2 ** (attempt - 1), MAX_BACKOFF_SECONDS)
+        return delay * (0.5 + self._jitter() / 2)
+
+    def snapshot(self) -> ThrottleStats:
+        with self._lock:
+            return ThrottleStats(**{f.name: getattr(self.stats, f.name) for f in fields(self.stats)})
+
+    def send(self, mailbox: str, method: str, attempt: Callable[[], Response]) -> Response:
+        """Run ``attempt`` within ``mailbox``'s limits, retrying throttled responses."""
+        state = self._mailbox(mailbox)
+        retries = 0
+        while True:
+            self._wait(state.resume_at - self._clock())
+            self._wait(state.bucket.reserve())
+            with state.slots:
+                with self._lock:
+                    self.stats.requests += 1
+                    state.in_flight += 1
+                    self.stats.peak_concurrency = max(self.stats.peak_concurrency, state.in_flight)
+                try:
+                    response = attempt()
+                finally:
+                    with self._lock:
+                        state.in_flight -= 1
+
+            status = response.status_code
+            throttled = status in THROTTLE_STATUSES
+            retryable = throttled or (status in TRANSIENT_STATUSES and method.upper() in IDEMPOTENT_METHODS)
+            if throttled:
+                with self._lock:
+                    self.stats.throttled += 1
+            if not retryable or retries >= self.max_retries:
+                return response
+
+            retries += 1
+            with self._lock:
+                self.stats.retries += 1
+            hinted = retry_after(response)
+            delay = hinted if hinted is not None else self.backoff(retries)
+            response.close()
+            if throttled:
+                # Graph throttles the mailbox, not the request: hold everyone back.
+                with self._lock:
+                    state.resume_at = max(state.resume_at, self._clock() + delay)
+            else:
+                self._wait(delay)
+
+
+class ThrottledAdapter(HTTPAdapter):
+    """Transport adapter sending every request through a :class:`Throttle`."""
+
+    def __init__(self, throttle: Throttle) -> None:
+        # Connection and read failures are still retried at the socket level;
+        # HTTP statuses are left to the throttle.
+        super().__init__(
+            max_retries=Retry(
+                total=throttle.max_retries,
+                connect=throttle.max_retries,
+                read=throttle.max_retries,
+                status=0,
+                respect_retry_after_header=False,
+                raise_on_status=False,
+                backoff_factor=0.5,
+            )
+        )
+        self.throttle = throttle
+
+    def send(self, request: PreparedRequest, **kwargs: Any) -> Response:
+        return self.throttle.send(
+            mailbox_key(request.url or ""),
+            request.method or "GET",
+            lambda: super(ThrottledAdapter, self).send(request, **kwargs),
+        )
+
+
+_shared: Optional[Throttle] = None
+
+
+def shared() -> Throttle:
+    """The process-wide throttle (one per CLI run, or per daemon)."""
+    global _shared
+    if _shared is None:
+        _shared = Throttle()
+    return _shared
+
+
+def install(con: Any, throttle: Optional[Throttle] = None) -> Throttle:
+    """Route ``con``'s Graph requests through ``throttle`` (default :func:`shared`).
+
+    O365 creates its sessions lazily, so the adapter is mounted on the current
+    ones if there are any and on every session made later, both the OAuth one
+    and the unauthenticated one used for upload sessions.
+    The token bucket takes over from O365's fixed delay between requests.
+    """
+    throttle = throttle or shared()
+    adapter = ThrottledAdapter(throttle)
+
+    def _mount(session: Any) -> Any:
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    make_session = getattr(con, "_unthrottled_get_session", con.get_session)
+    con._unthrottled_get_session = make_session
+    con.get_session = lambda load_token=False: _mount(make_session(load_token=load_token))
+    # The unauthenticated session carries attachment upload chunks.
+    make_naive = getattr(con, "_unthrottled_get_naive_session", con.get_naive_session)
+    con._unthrottled_get_naive_session = make_naive
+    con.get_naive_session = lambda: _mount(make_naive())
+    con.requests_delay = 0
+    for session in (con.session, con.naive_session):
+        if session is not None:
+            _mount(session)
+    return throttle
@@ -0,0 +1,162 @@
+"""Attachments for outgoing mail (``mail send --attach``).
+
+Graph takes at most about 4 MB in one request, base64 included, so only
+small files travel inline with the message (up to :data:`INLINE_LIMIT` in
+total). Other small files are added to a draft one request each, and files
+over the limit go through an upload session: the file is read and PUT in
+:data:`CHUNK_SIZE` pieces, so a 100 MB report never sits in memory (O365's
+own attachment support base64-encodes the whole file up front).
+
+Each chunk is retried by the throttle like any other idempotent request.
+When one still fails, or the server says the range is not the one it
+expected, :func:`upload` asks the session which bytes it is missing and
+carries on from there instead of starting over.
+"""
+
+import base64
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+from requests.exceptions import RequestException
+
+from outlook_cli import throttle
+
+INLINE_LIMIT = 3 * 1024 * 1024
+# Graph's largest attachment; upload ranges must be multiples of 320 KiB.
+MAX_SIZE = 150 * 1024 * 1024
+CHUNK_SIZE = 10 * 320 * 1024
+MAX_RETRIES = 5
+RANGE_NOT_SATISFIABLE = 416
+# Besides 5xx and dropped connections: worth asking the session where it stands.
+_RECOVERABLE = frozenset({RANGE_NOT_SATISFIABLE, *throttle.THROTTLE_STATUSES})
+
+
+class UploadFailed(Exception):
+    """An upload session could not be completed."""
+
+
+@dataclass
+class Plan:
+    """How each file gets attached: inline, posted to the draft, or uploaded."""
+
+    inline: list[Path] = field(default_factory=list)
+    posted: list[Path] = field(default_factory=list)
+    uploaded: list[Path] = field(default_factory=list)
+
+    @property
+    def needs_draft(self) -> bool:
+        return bool(self.posted or self.uploaded)
+
+
+def plan(paths: list[Path]) -> Plan:
+    """Sort ``paths`` by size; raises ValueError for files Graph won't take."""
+    result = Plan()
+    inline_total = 0
+    for path in paths:
+        size = path.stat().st_size
+        if size > MAX_SIZE:
+            raise ValueError(f"{path.name} is larger than {MAX_SIZE // 2**20} MB")
+        if size > INLINE_LIMIT:
+            result.uploaded.append(path)
+        elif inline_total + size <= INLINE_LIMIT:
+            result.inline.append(path)
+            inline_total += size
+        else:
+            result.posted.append(path)
+    return result
+
+
+def _attachments_url(service_url: str, message_id: str) -> str:
+    return f"{service_url.rstrip('/')}/me/messages/{message_id}/attachments"
+
+
+def file_attachment(path: Path) -> dict:
+    """``path`` as an inline ``fileAttachment`` resource."""
+    return {
+        "@odata.type": "#microsoft.graph.fileAttachment",
+        "name": path.name,
+        "contentBytes": base64.b64encode(path.read_bytes()).decode("ascii"),
+    }
+
+
+def post(con: Any, service_url: str, message_id: str, path: Path) -> None:
+    """Add a small file to draft ``message_id`` in one request."""
+    con.post(_attachments_url(service_url, message_id), data=file_attachment(path))
+
+
+def create_session(con: Any, service_url: str, message_id: str, path: Path) -> str:
+    """Open an upload session for ``path`` on draft ``message_id``; returns its URL."""
+    response = con.post(
+        f"{_attachments_url(service_url, message_id)}/createUploadSession",
+        data={"AttachmentItem": {"attachmentType": "file", "name": path.name, "size": path.stat().st_size}},
+    )
+    upload_url = response.json().get("uploadUrl")
+    if not upload_url:
+        raise UploadFailed(f"no upload URL for {path.name}")
+    return upload_url
+
+
+def _next_expected(state: dict) -> Optional[int]:
+    ranges = state.get("nextExpectedRanges") or []
+    return int(ranges[0].split("-", 1)[0]) if ranges else None
+
+
+def _missing_from(con: Any, upload_url: str) -> Optional[int]:
+    """The first byte the session still needs, or None if it can't say."""
+    try:
+        return _next_expected(con.naive_request(upload_url, "GET").json())
+    except (RequestException, ValueError):
+        return None
+
+
+def upload(
+    con: Any,
+    upload_url: str,
+    path: Path,
+    *,
+    chunk_size: int = CHUNK_SIZE,
+    max_retries: int = MAX_RETRIES,
+    sleep: Callable[[float], None] = time.sleep,
+) -> int:
+    """PUT ``path`` to ``upload_url`` chunk by chunk; returns the bytes sent.
+
+    The session URL carries its own credentials, so chunks go out on O365's
+    unauthenticated session.
+    """
+    size = path.stat().st_size
+    offset = 0
+    failures = 0
+    with path.open("rb") as fh:
+        while offset < size:
+            fh.seek(offset)
+            chunk = fh.read(chunk_size)
+            headers = {
+                "Content-type": "application/octet-stream",
+                "Content-Range": f"bytes {offset}-{offset + len(chunk) - 1}/{size}",
+            }
+            try:
+                response = con.naive_request(upload_url, "PUT", data=chunk, headers=headers)
+            except RequestException as exc:
+                status = exc.response.status_code if exc.response is not None else None
+                if status is not None and status < 500 and status not in _RECOVERABLE:
+                    raise UploadFailed(f"{path.name}: {exc}") from exc
+                failures += 1
+                if failures > max_retries:
+                    raise UploadFailed(f"{path.name}: gave up after {max_retries} retries ({exc})") from exc
+                if status != RANGE_NOT_SATISFIABLE:
+                    sleep(throttle.shared().backoff(failures))
+                resume = _missing_from(con, upload_url)
+                if resume is None and status == RANGE_NOT_SATISFIABLE:
+                    raise UploadFailed(f"{path.name}: the session lost track of the upload") from exc
+                offset = offset if resume is None else resume
+                continue
+
+            failures = 0
+            if response.status_code == 201:
+                offset = size
+            else:
+                expected = _next_expected(response.json())
+                offset = offset + len(chunk) if expected is None else expected
+    return size
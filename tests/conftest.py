@@ -6,6 +6,12 @@ from unittest.mock import MagicMock
 import pytest
 
 
+@pytest.fixture(autouse=True)
+def _no_daemon(monkeypatch):
+    """Never forward commands to a developer's running ``outlook serve``."""
+    monkeypatch.setenv("OUTLOOK_CLI_NO_DAEMON", "1")
+
+
 @pytest.fixture()
 def config_dir(tmp_path, monkeypatch):
     """Redirect config dir to a temp directory."""
@@ -17,10 +23,12 @@ def config_dir(tmp_path, monkeypatch):
 
 
 @pytest.fixture()
-def mock_account():
+def mock_account(config_dir):
     """Return a MagicMock that mimics an O365 Account."""
     account = MagicMock()
     account.is_authenticated = True
+    # Merged by O365 into every request; commands add ``Prefer`` values here.
+    account.con.default_headers = {}
 
     # Mailbox
     mailbox = MagicMock()
@@ -32,7 +40,12 @@ def mock_account():
     schedule = MagicMock()
     account.schedule.return_value = schedule
     calendar = MagicMock()
+    calendar.calendar_id = "cal-default"
+    calendar.name = "Calendar"
     schedule.get_default_calendar.return_value = calendar
+    # Built from the ID cache on warm runs.
+    schedule._cloud_data_key = "__cloud_data__"
+    schedule.calendar_constructor.return_value = calendar
 
     return account
 
@@ -65,3 +78,26 @@ def mock_event():
     event.object_id = "evt-456"
     event.body = "Weekly sync"
     return event
+
+
+@pytest.fixture()
+def fake_graph():
+    """A running local stand-in for Microsoft Graph."""
+    from tests.fake_graph import FakeGraph
+
+    with FakeGraph() as server:
+        yield server
+
+
+@pytest.fixture()
+def graph_account(fake_graph, config_dir):
+    """A real O365 Account whose requests go to ``fake_graph``."""
+    from outlook_cli import throttle
+    from outlook_cli.auth import _build_account
+    from tests.fake_graph import write_fake_token
+
+    write_fake_token(config_dir)
+    account = _build_account("fake-client", "common", fake_graph.url)
+    # A fresh throttle per test, so pacing state doesn't carry between tests.
+    throttle.install(account.con, throttle.Throttle())
+    return account
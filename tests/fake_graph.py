@@ -0,0 +1,711 @@
+"""Local stand-in for the Microsoft Graph API, used by tests and benchmarks.
+
+Routes are registered per test with :meth:`FakeGraph.route`; every request is
+recorded in :attr:`FakeGraph.requests` so tests can assert on round trips.
+"""
+
+import base64
+import json
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable, Optional
+from urllib.parse import parse_qs, urlencode, urlsplit
+
+
+@dataclass
+class FakeRequest:
+    method: str
+    path: str
+    query: dict[str, str]
+    headers: dict[str, str]
+    body: bytes = b""
+    match: Optional[re.Match] = None
+
+    def json(self) -> Any:
+        return json.loads(self.body or b"null")
+
+
+@dataclass
+class FakeResponse:
+    status: int = 200
+    body: Any = None
+    headers: dict[str, str] = field(default_factory=dict)
+
+
+Handler = Callable[[FakeRequest], Any]
+
+
+class FakeGraph:
+    """Threaded HTTP server answering Graph-shaped requests on 127.0.0.1.
+
+    ``POST /$batch`` is built in: sub-requests are dispatched to the registered
+    routes (recorded in :attr:`batched`, not :attr:`requests`) and honour
+    ``dependsOn`` by answering 424 when a dependency failed.
+    """
+
+    def __init__(self) -> None:
+        self.routes: list[tuple[str, re.Pattern, Handler]] = []
+        self.requests: list[FakeRequest] = []
+        self.batched: list[FakeRequest] = []
+        self.faults: list[list[Any]] = []
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self._lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+        self.route("POST", r"/\$batch")(self._batch)
+
+    @property
+    def url(self) -> str:
+        """Root URL; Graph paths live under ``{url}v1.0/``."""
+        assert self._server is not None, "server not started"
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    @property
+    def service_url(self) -> str:
+        return f"{self.url}v1.0/"
+
+    def route(self, method: str, pattern: str) -> Callable[[Handler], Handler]:
+        """Register a handler for ``method`` and a regex matched against the path.
+
+        The path excludes the ``/v1.0`` prefix. Handlers return a
+        :class:`FakeResponse`, a JSON-serializable body (status 200) or None (204).
+        """
+        def decorator(handler: Handler) -> Handler:
+            self.routes.append((method.upper(), re.compile(pattern), handler))
+            return handler
+
+        return decorator
+
+    def count(self, method: Optional[str] = None, pattern: str = "") -> int:
+        """Number of recorded requests matching ``method`` and path regex."""
+        regex = re.compile(pattern)
+        with self._lock:
+            return sum(
+                1
+                for req in self.requests
+                if (method is None or req.method == method.upper()) and regex.search(req.path)
+            )
+
+    def inject(
+        self, pattern: str, status: int = 429, times: int = 1, retry_after: Optional[str] = "1"
+    ) -> None:
+        """Answer the next ``times`` top-level requests matching ``pattern`` with ``status``.
+
+        Mimics Graph throttling: the error carries ``Retry-After`` unless it is None.
+        """
+        headers = {"Retry-After": retry_after} if retry_after is not None else {}
+        body = {"error": {"code": "TooManyRequests" if status == 429 else "ServiceUnavailable", "message": "Throttled"}}
+        self.faults.append([re.compile(pattern), times, FakeResponse(status, body, headers)])
+
+    def _fault(self, request: FakeRequest) -> Optional[FakeResponse]:
+        with self._lock:
+            for fault in self.faults:
+                pattern, remaining, response = fault
+                if remaining > 0 and pattern.search(request.path):
+                    fault[1] -= 1
+                    return response
+        return None
+
+    def start(self) -> "FakeGraph":
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler_class())
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, args=(0.05,), daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> "FakeGraph":
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+    # ── Dispatch ───────────────────────────────────────────────
+
+    def _dispatch(self, request: FakeRequest, log: Optional[list] = None) -> FakeResponse:
+        with self._lock:
+            (self.requests if log is None else log).append(request)
+        for method, pattern, handler in reversed(self.routes):
+            if method != request.method:
+                continue
+            match = pattern.fullmatch(request.path)
+            if match is None:
+                continue
+            request.match = match
+            result = handler(request)
+            if isinstance(result, FakeResponse):
+                return result
+            if result is None:
+                return FakeResponse(status=204)
+            return FakeResponse(body=result)
+        return FakeResponse(
+            status=404,
+            body={"error": {"code": "ErrorItemNotFound", "message": f"No route for {request.method} {request.path}"}},
+        )
+
+    def _batch(self, request: FakeRequest) -> dict:
+        statuses: dict[str, int] = {}
+        responses = []
+        for item in request.json()["requests"]:
+            failed_deps = [dep for dep in item.get("dependsOn", []) if not 200 <= statuses.get(dep, 0) < 300]
+            if failed_deps:
+                result = FakeResponse(status=424, body={"error": {"code": "FailedDependency", "message": "Dependency failed"}})
+            else:
+                parts = urlsplit(item["url"])
+                sub_request = FakeRequest(
+                    method=item["method"].upper(),
+                    path=parts.path,
+                    query={key: values[-1] for key, values in parse_qs(parts.query).items()},
+                    headers={key.lower(): value for key, value in (item.get("headers") or {}).items()},
+                    body=json.dumps(item["body"]).encode() if "body" in item else b"",
+                )
+                result = self._dispatch(sub_request, log=self.batched)
+            statuses[item["id"]] = result.status
+            responses.append({"id": item["id"], "status": result.status, "headers": result.headers, "body": result.body})
+        return {"responses": responses}
+
+    def _handler_class(self) -> type[BaseHTTPRequestHandler]:
+        fake = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+                pass
+
+            def _handle(self) -> None:
+                parts = urlsplit(self.path)
+                path = parts.path
+                if path.startswith("/v1.0"):
+                    path = path[len("/v1.0"):]
+                length = int(self.headers.get("Content-Length") or 0)
+                request = FakeRequest(
+                    method=self.command,
+                    path=path,
+                    query={key: values[-1] for key, values in parse_qs(parts.query).items()},
+                    headers={key.lower(): value for key, value in self.headers.items()},
+                    body=self.rfile.read(length) if length else b"",
+                )
+                with fake._lock:
+                    fake.in_flight += 1
+                    fake.peak_in_flight = max(fake.peak_in_flight, fake.in_flight)
+                try:
+                    response = fake._fault(request)
+                    if response is None:
+                        response = fake._dispatch(request)
+                    else:
+                        with fake._lock:
+                            fake.requests.append(request)
+                finally:
+                    with fake._lock:
+                        fake.in_flight -= 1
+
+                if isinstance(response.body, (bytes, bytearray)):
+                    payload = bytes(response.body)
+                    content_type = "application/octet-stream"
+                elif response.body is None:
+                    payload = b""
+                    content_type = "application/json"
+                else:
+                    payload = json.dumps(response.body).encode()
+                    content_type = "application/json"
+
+                self.send_response(response.status)
+                headers = {"Content-Type": content_type, **response.headers}
+                for key, value in headers.items():
+                    self.send_header(key, value)
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                if payload:
+                    self.wfile.write(payload)
+
+            do_GET = do_POST = do_PATCH = do_PUT = do_DELETE = _handle
+
+        return _Handler
+
+
+# ── Canned resources ───────────────────────────────────────────
+
+
+def message_resource(index: int, **overrides: Any) -> dict:
+    """A Graph message resource with predictable values."""
+    resource = {
+        "id": f"msg-{index}",
+        "subject": f"Message {index}",
+        "from": {"emailAddress": {"name": f"Sender {index % 7}", "address": f"sender{index % 7}@example.com"}},
+        "sender": {"emailAddress": {"name": f"Sender {index % 7}", "address": f"sender{index % 7}@example.com"}},
+        "toRecipients": [{"emailAddress": {"name": "Me", "address": "me@example.com"}}],
+        "ccRecipients": [],
+        "receivedDateTime": f"2025-02-{(index % 28) + 1:02d}T10:{index % 60:02d}:00Z",
+        "isRead": index % 3 != 0,
+        "importance": "high" if index % 10 == 0 else "normal",
+        "hasAttachments": index % 5 == 0,
+        "body": {"contentType": "text", "content": f"Body of message {index}"},
+    }
+    resource.update(overrides)
+    return resource
+
+
+def event_resource(index: int, **overrides: Any) -> dict:
+    """A Graph event resource with predictable values."""
+    day = (index % 28) + 1
+    resource = {
+        "id": f"evt-{index}",
+        "subject": f"Event {index}",
+        "start": {"dateTime": f"2025-02-{day:02d}T09:00:00.0000000", "timeZone": "UTC"},
+        "end": {"dateTime": f"2025-02-{day:02d}T10:00:00.0000000", "timeZone": "UTC"},
+        "location": {"displayName": f"Room {index % 4}"},
+        "organizer": {"emailAddress": {"name": "Boss", "address": "boss@example.com"}},
+        "isAllDay": False,
+        "type": "singleInstance",
+        "changeKey": f"ck-{index}-0",
+        "body": {"contentType": "text", "content": f"Agenda for event {index}"},
+        "attendees": [],
+    }
+    resource.update(overrides)
+    return resource
+
+
+def project(resource: dict, req: FakeRequest) -> dict:
+    """Apply the request's ``$select`` to a resource, as Graph does."""
+    select = req.query.get("$select")
+    if not select:
+        return resource
+    fields = set(select.split(",")) | {"id"}
+    return {key: value for key, value in resource.items() if key in fields}
+
+
+def render_bodies(resource: dict, req: FakeRequest) -> dict:
+    """Project ``resource`` and, when the request prefers text, render its bodies as text.
+
+    Graph does the HTML-to-text conversion server-side; tags are simply dropped here.
+    """
+    resource = project(resource, req)
+    if 'outlook.body-content-type="text"' not in req.headers.get("prefer", ""):
+        return resource
+    rendered = dict(resource)
+    for key in ("body", "uniqueBody"):
+        body = resource.get(key)
+        if body and body.get("contentType", "").lower() == "html":
+            text = re.sub(r"<[^>]+>", "", re.sub(r"</p>|<br\s*/?>", "\n", body["content"]))
+            rendered[key] = {"contentType": "text", "content": text.strip()}
+    return rendered
+
+
+def _page(fake: FakeGraph, req: FakeRequest, total: int, resource: Callable[[int], dict]) -> dict:
+    """One ``$top``/``$skip`` page of ``total`` resources, linking to the next."""
+    top = int(req.query.get("$top", total))
+    skip = int(req.query.get("$skip", 0))
+    body: dict[str, Any] = {"value": [project(resource(i), req) for i in range(skip, min(skip + top, total))]}
+    if skip + top < total:
+        query = {**req.query, "$skip": str(skip + top)}
+        body["@odata.nextLink"] = f"{fake.service_url}{req.path.lstrip('/')}?{urlencode(query)}"
+    return body
+
+
+def install_default_routes(fake: FakeGraph, messages: int = 25, events: int = 10) -> None:
+    """Serve an inbox and a default calendar with canned resources."""
+
+    @fake.route("GET", r"/me/mailFolders/(?P<folder>[^/]+)/messages")
+    def _messages(req: FakeRequest) -> dict:
+        return _page(fake, req, messages, message_resource)
+
+    @fake.route("GET", r"/me/messages/(?P<id>[^/]+)")
+    def _message(req: FakeRequest) -> dict:
+        index = int(req.match["id"].rsplit("-", 1)[-1])
+        return message_resource(index)
+
+    @fake.route("GET", r"/me/calendar")
+    def _calendar(req: FakeRequest) -> dict:
+        return {"id": "cal-default", "name": "Calendar", "isDefaultCalendar": True}
+
+    @fake.route("GET", r"/me/calendars/(?P<cal>[^/]+)/events")
+    def _events(req: FakeRequest) -> dict:
+        return _page(fake, req, events, event_resource)
+
+    CalendarView(fake).add(*(event_resource(i) for i in range(events)))
+
+
+class CalendarView:
+    """Serves ``calendarView`` for a calendar from a list of event instances.
+
+    Like Graph, only instances overlapping ``startDateTime``/``endDateTime``
+    are returned, ordered by start and paged with ``$top``/``$skip``.
+    Instances are replaced by id, so :meth:`change` bumps an event's
+    ``changeKey`` the way an edit would.
+    """
+
+    def __init__(self, fake: FakeGraph, calendar_id: str = "[^/]+") -> None:
+        self.fake = fake
+        self.instances: dict[str, dict] = {}
+        fake.route("GET", rf"/me/calendars/{calendar_id}/calendarView")(self._view)
+
+    def add(self, *resources: dict) -> None:
+        for resource in resources:
+            self.instances[resource["id"]] = resource
+
+    def change(self, event_id: str, **fields: Any) -> None:
+        resource = self.instances[event_id]
+        version = int(resource.get("changeKey", "ck-0").rsplit("-", 1)[-1]) + 1
+        self.instances[event_id] = {**resource, **fields, "changeKey": f"ck-{event_id}-{version}"}
+
+    def remove(self, event_id: str) -> None:
+        del self.instances[event_id]
+
+    def _view(self, req: FakeRequest) -> dict:
+        start = req.query["startDateTime"].rstrip("Z")[:19]
+        end = req.query["endDateTime"].rstrip("Z")[:19]
+        found = sorted(
+            (
+                resource
+                for resource in self.instances.values()
+                if resource["start"]["dateTime"][:19] < end and resource["end"]["dateTime"][:19] > start
+            ),
+            key=lambda resource: resource["start"]["dateTime"],
+        )
+        return _page(self.fake, req, len(found), lambda index: found[index])
+
+
+class DeltaLog:
+    """Serves a Graph ``delta`` function at ``path`` from a change log.
+
+    Tokens are positions in the log: a page walks the log from ``$skiptoken``
+    and the final page hands out a ``$deltatoken`` at the current end, so later
+    rounds return only what changed since. Page size follows the client's
+    ``Prefer: odata.maxpagesize`` and ``$select`` projects the returned items.
+    Tokens listed in :attr:`expired` answer 410.
+    """
+
+    def __init__(self, fake: FakeGraph, path: str) -> None:
+        self.fake = fake
+        self.path = path
+        self.log: list[dict] = []
+        self.expired: set[int] = set()
+        fake.route("GET", "/" + re.escape(path))(self._delta)
+
+    def add(self, *resources: dict) -> None:
+        self.log.extend(resources)
+
+    def remove(self, *ids: str) -> None:
+        self.log.extend({"id": item_id, "@removed": {"reason": "deleted"}} for item_id in ids)
+
+    def _changes(self, start: int) -> list[dict]:
+        """Log entries after ``start``, latest state per id."""
+        latest: dict[str, dict] = {}
+        for entry in self.log[start:]:
+            latest.pop(entry["id"], None)
+            latest[entry["id"]] = entry
+        return list(latest.values())
+
+    def _delta(self, req: FakeRequest) -> Any:
+        match = re.search(r"maxpagesize=(\d+)", req.headers.get("prefer", ""))
+        page_size = int(match.group(1)) if match else 10
+        if "$deltatoken" in req.query:
+            base, offset = int(req.query["$deltatoken"]), 0
+        elif "$skiptoken" in req.query:
+            base, offset = (int(part) for part in req.query["$skiptoken"].split("."))
+        else:
+            base, offset = 0, 0
+        if base in self.expired:
+            return FakeResponse(410, {"error": {"code": "SyncStateNotFound", "message": "Sync state expired"}})
+
+        # Real tokens encode the projection; carry it along in the links instead.
+        select = req.query.get("$select")
+        fields = set(select.split(",")) | {"id", "@removed"} if select else None
+        changes = self._changes(base)
+        page = [
+            {key: value for key, value in entry.items() if fields is None or key in fields}
+            for entry in changes[offset:offset + page_size]
+        ]
+        link = f"{self.fake.service_url}{self.path}"
+        suffix = f"&$select={select}" if select else ""
+        body: dict[str, Any] = {"value": page}
+        if offset + page_size < len(changes):
+            body["@odata.nextLink"] = f"{link}?$skiptoken={base}.{offset + page_size}{suffix}"
+        else:
+            body["@odata.deltaLink"] = f"{link}?$deltatoken={len(self.log)}{suffix}"
+        return body
+
+
+class DeltaFolder(DeltaLog):
+    """A mail folder that serves ``messages/delta``."""
+
+    def __init__(self, fake: FakeGraph, folder_id: str = "inbox") -> None:
+        self.folder_id = folder_id
+        super().__init__(fake, f"me/mailFolders/{folder_id}/messages/delta")
+
+
+def folder_resource(folder_id: str, name: str, parent_id: str = "root", total: int = 0, unread: int = 0) -> dict:
+    """A Graph mailFolder resource; ``root`` stands for the mailbox's root folder."""
+    return {
+        "id": folder_id,
+        "displayName": name,
+        "parentFolderId": parent_id,
+        "childFolderCount": 0,
+        "totalItemCount": total,
+        "unreadItemCount": unread,
+    }
+
+
+class FolderTree(DeltaLog):
+    """The mailbox folder hierarchy served from ``mailFolders/delta``.
+
+    Starts with Inbox, Archive and a nested ``Projects/2025/Q1`` tree.
+    """
+
+    def __init__(self, fake: FakeGraph) -> None:
+        super().__init__(fake, "me/mailFolders/delta")
+        self.add(
+            folder_resource("inbox", "Inbox", total=25, unread=8),
+            folder_resource("archive", "Archive", total=120),
+            folder_resource("projects", "Projects", total=3),
+            folder_resource("projects-2025", "2025", "projects", total=4, unread=1),
+            folder_resource("projects-2025-q1", "Q1", "projects-2025", total=9, unread=2),
+            folder_resource("archive-2025", "2025", "archive", total=40),
+        )
+
+
+class FolderMessages:
+    """Serves ``/me/mailFolders/{id}/messages`` from per-folder messages, newest first.
+
+    Folder ids match case-insensitively, so the well-known name ``Inbox``
+    reaches the ``inbox`` folder of :class:`FolderTree`.
+    """
+
+    def __init__(self, fake: FakeGraph, folders: dict[str, list[dict]]) -> None:
+        self.fake = fake
+        self.folders = {
+            key.lower(): sorted(resources, key=lambda resource: resource["receivedDateTime"], reverse=True)
+            for key, resources in folders.items()
+        }
+        fake.route("GET", r"/me/mailFolders/(?P<folder>[^/]+)/messages")(self._messages)
+
+    def _messages(self, req: FakeRequest) -> dict:
+        resources = self.folders.get(req.match["folder"].lower(), [])
+        return _page(self.fake, req, len(resources), resources.__getitem__)
+
+
+class Schedules:
+    """Serves ``POST /me/calendar/getSchedule`` from per-mailbox busy times.
+
+    ``busy`` maps an address to ``(start, end, status)`` tuples of naive UTC
+    datetimes, where status is an availabilityView digit ("2" busy, "1"
+    tentative, ...). Unknown addresses get a per-schedule error, as Graph
+    returns for mailboxes it cannot resolve. :attr:`calls` records the
+    mailboxes asked for in each call. :attr:`answer_as` sets the scheduleId
+    an address comes back under; None leaves it out of the answer.
+    """
+
+    def __init__(self, fake: FakeGraph) -> None:
+        self.busy: dict[str, list[tuple[datetime, datetime, str]]] = {}
+        self.calls: list[list[str]] = []
+        self.answer_as: dict[str, Optional[str]] = {}
+        fake.route("POST", r"/me/calendar/getSchedule")(self._schedule)
+
+    def add(self, address: str, *items: tuple[datetime, datetime, str]) -> None:
+        self.busy.setdefault(address, []).extend(items)
+
+    def _schedule(self, req: FakeRequest) -> Any:
+        body = req.json()
+        self.calls.append(list(body["schedules"]))
+        if len(body["schedules"]) > 20:
+            return FakeResponse(400, {"error": {"code": "ErrorInvalidRequest", "message": "Too many schedules"}})
+        start = datetime.fromisoformat(body["startTime"]["dateTime"])
+        end = datetime.fromisoformat(body["endTime"]["dateTime"])
+        interval = timedelta(minutes=body.get("availabilityViewInterval", 30))
+        values = []
+        for address in body["schedules"]:
+            schedule_id = self.answer_as.get(address, address)
+            if schedule_id is None:
+                continue
+            if address not in self.busy:
+                error = {"message": "Mailbox not found", "responseCode": "Error"}
+                values.append({"scheduleId": schedule_id, "error": error})
+                continue
+            view = []
+            slot = start
+            while slot < end:
+                states = [state for first, last, state in self.busy[address] if first < slot + interval and slot < last]
+                view.append(max(states, default="0"))
+                slot += interval
+            values.append({"scheduleId": schedule_id, "availabilityView": "".join(view), "scheduleItems": []})
+        return {"value": values}
+
+
+class MessageAttachments:
+    """A message's attachments: the metadata listing and raw ``/$value`` downloads.
+
+    ``$value`` honours ``Range: bytes=N-`` with a 206 and ``Content-Range``
+    unless :attr:`ranges` is off, when the whole file comes back with a 200
+    as from a server that ignores ranges. :attr:`declared` overrides the total
+    a 206 claims, to mimic a file that changed between runs, and :attr:`delay`
+    slows each download down so concurrent ones overlap.
+    """
+
+    def __init__(self, fake: FakeGraph, message_id: str = "msg-1") -> None:
+        self.items: dict[str, tuple[dict, bytes]] = {}
+        self.ranges = True
+        self.declared: Optional[int] = None
+        self.delay = 0.0
+        base = f"/me/messages/{re.escape(message_id)}/attachments"
+        fake.route("GET", base)(self._list)
+        fake.route("GET", base + r"/(?P<id>[^/]+)/\$value")(self._value)
+
+    def add(self, name: str, content: bytes = b"", kind: str = "file", **overrides: Any) -> str:
+        attachment_id = f"att-{len(self.items) + 1}"
+        resource = {
+            "@odata.type": f"#microsoft.graph.{kind}Attachment",
+            "id": attachment_id,
+            "name": name,
+            "size": len(content),
+            "contentType": "application/octet-stream",
+            "isInline": False,
+            **overrides,
+        }
+        self.items[attachment_id] = (resource, content)
+        return attachment_id
+
+    def _list(self, req: FakeRequest) -> dict:
+        # Graph always includes the type annotation, whatever $select says.
+        return {
+            "value": [
+                {**project(resource, req), "@odata.type": resource["@odata.type"]}
+                for resource, _ in self.items.values()
+            ]
+        }
+
+    def _value(self, req: FakeRequest) -> FakeResponse:
+        time.sleep(self.delay)
+        resource, content = self.items[req.match["id"]]
+        match = re.fullmatch(r"bytes=(\d+)-", req.headers.get("range", ""))
+        if not match or not self.ranges:
+            return FakeResponse(body=content)
+        start = int(match.group(1))
+        if start >= len(content):
+            return FakeResponse(416, {"error": {"code": "RangeNotSatisfiable", "message": "Bad range"}})
+        total = len(content) if self.declared is None else self.declared
+        headers = {"Content-Range": f"bytes {start}-{len(content) - 1}/{total}"}
+        return FakeResponse(206, content[start:], headers)
+
+
+def write_fake_token(directory: Path, client_id: str = "fake-client") -> None:
+    """Write an O365 token file that makes ``Account.is_authenticated`` true.
+
+    The stand-in server ignores the bearer token, so any value will do.
+    """
+    from O365 import FileSystemTokenBackend
+
+    from outlook_cli.auth import TOKEN_FILENAME
+
+    client_info = base64.urlsafe_b64encode(json.dumps({"uid": "uid", "utid": "utid"}).encode())
+    backend = FileSystemTokenBackend(token_path=directory, token_filename=TOKEN_FILENAME)
+    backend.add({
+        "client_id": client_id,
+        "scope": ["https://graph.microsoft.com/Mail.ReadWrite"],
+        "token_endpoint": "https://login.microsoftonline.com/common/oauth2/v2.0/token",
+        "response": {
+            "access_token": "fake-access-token",
+            "refresh_token": "fake-refresh-token",
+            "token_type": "Bearer",
+            "expires_in": 3600,
+            "client_info": client_info.decode().rstrip("="),
+        },
+    })
+    backend.save_token(force=True)
+
+
+class Outbox:
+    """Sending mail: ``sendMail``, drafts, their attachments and upload sessions.
+
+    Upload sessions live at ``{url}upload/N`` outside the Graph path, like
+    Outlook's own upload URLs, and expect chunks in order: a ``Content-Range``
+    that doesn't start at the next missing byte gets a 416, and ``GET`` on
+    the session reports ``nextExpectedRanges``. Chunk numbers (0-based, per
+    session) in :attr:`lost` are stored but answered with a 500, as if the
+    response had been lost on the way back.
+    """
+
+    def __init__(self, fake: FakeGraph) -> None:
+        self.fake = fake
+        self.sent: list[dict] = []
+        self.drafts: dict[str, dict] = {}
+        self.deleted: list[str] = []
+        self.sessions: list[dict] = []
+        self.lost: set[int] = set()
+        fake.route("POST", r"/me/sendMail")(self._send_mail)
+        fake.route("POST", r"/me/mailFolders/[^/]+/messages")(self._create_draft)
+        fake.route("POST", r"/me/messages/(?P<id>[^/]+)/attachments")(self._attach)
+        fake.route("POST", r"/me/messages/(?P<id>[^/]+)/attachments/createUploadSession")(self._create_session)
+        fake.route("POST", r"/me/messages/(?P<id>[^/]+)/send")(self._send_draft)
+        fake.route("DELETE", r"/me/messages/(?P<id>[^/]+)")(self._delete)
+        fake.route("PUT", r"/upload/(?P<n>\d+)")(self._put)
+        fake.route("GET", r"/upload/(?P<n>\d+)")(self._status)
+
+    @staticmethod
+    def attachments(message: dict) -> dict[str, bytes]:
+        """A sent message's attachments by name."""
+        return {
+            item["name"]: item["content"] if "content" in item else base64.b64decode(item["contentBytes"])
+            for item in message.get("attachments", [])
+        }
+
+    def _send_mail(self, req: FakeRequest) -> FakeResponse:
+        self.sent.append(req.json()["message"])
+        return FakeResponse(202)
+
+    def _create_draft(self, req: FakeRequest) -> FakeResponse:
+        draft_id = f"draft-{len(self.drafts) + 1}"
+        self.drafts[draft_id] = {**req.json(), "id": draft_id}
+        self.drafts[draft_id].setdefault("attachments", [])
+        return FakeResponse(201, self.drafts[draft_id])
+
+    def _attach(self, req: FakeRequest) -> FakeResponse:
+        attachment = req.json()
+        self.drafts[req.match["id"]]["attachments"].append(attachment)
+        return FakeResponse(201, {**attachment, "id": f"att-{len(self.drafts[req.match['id']]['attachments'])}"})
+
+    def _create_session(self, req: FakeRequest) -> dict:
+        item = req.json()["AttachmentItem"]
+        self.sessions.append(
+            {"draft": req.match["id"], "name": item["name"], "size": item["size"], "data": bytearray(), "puts": 0}
+        )
+        return {"uploadUrl": f"{self.fake.url}upload/{len(self.sessions) - 1}", "nextExpectedRanges": ["0-"]}
+
+    def _put(self, req: FakeRequest) -> FakeResponse:
+        session = self.sessions[int(req.match["n"])]
+        start, end, total = map(int, re.fullmatch(r"bytes (\d+)-(\d+)/(\d+)", req.headers["content-range"]).groups())
+        received = len(session["data"])
+        if start != received or total != session["size"] or end - start + 1 != len(req.body):
+            return FakeResponse(416, {"error": {"code": "InvalidRange", "message": f"Expected bytes {received}-"}})
+        session["data"] += req.body
+        chunk, session["puts"] = session["puts"], session["puts"] + 1
+        if chunk in self.lost:
+            self.lost.discard(chunk)
+            return FakeResponse(500, {"error": {"code": "InternalServerError", "message": "Lost"}})
+        if len(session["data"]) == total:
+            attachment = {"name": session["name"], "content": bytes(session["data"])}
+            self.drafts[session["draft"]]["attachments"].append(attachment)
+            return FakeResponse(201)
+        return FakeResponse(body={"nextExpectedRanges": [f"{len(session['data'])}-"]})
+
+    def _status(self, req: FakeRequest) -> dict:
+        session = self.sessions[int(req.match["n"])]
+        return {"nextExpectedRanges": [f"{len(session['data'])}-"]}
+
+    def _send_draft(self, req: FakeRequest) -> FakeResponse:
+        self.sent.append(self.drafts.pop(req.match["id"]))
+        return FakeResponse(202)
+
+    def _delete(self, req: FakeRequest) -> None:
+        self.drafts.pop(req.match["id"], None)
+        self.deleted.append(req.match["id"])
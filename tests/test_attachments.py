@@ -0,0 +1,207 @@
+"""Tests for ``mail attachments``: listing and streamed, resumable downloads."""
+
+import json
+from unittest.mock import patch
+
+import pytest
+import requests
+from typer.testing import CliRunner
+
+from outlook_cli.attachments import Attachment, download, file_names
+from outlook_cli.main import app
+from tests.fake_graph import MessageAttachments, install_default_routes
+
+runner = CliRunner()
+
+REPORT = bytes(range(256)) * 4096  # 1 MB
+SHEET = b"name,qty\n" + b"apple,3\n" * 20_000
+
+
+@pytest.fixture()
+def files(graph_account, fake_graph):
+    install_default_routes(fake_graph)
+    store = MessageAttachments(fake_graph)
+    with patch("outlook_cli.commands.mail_cmd.get_account") as mock_get:
+        mock_get.return_value = graph_account
+        yield store
+
+
+def _value_requests(fake_graph) -> list:
+    return [req for req in fake_graph.requests if req.path.endswith("/$value")]
+
+
+def test_list_shows_metadata_without_content(files, fake_graph):
+    files.add("report.pdf", REPORT, contentType="application/pdf")
+    files.add("sheet.csv", SHEET, contentType="text/csv")
+    files.add("Plan", kind="reference", size=0)
+
+    result = runner.invoke(app, ["mail", "attachments", "msg-1"])
+
+    assert result.exit_code == 0, result.output
+    assert "report.pdf" in result.output and "1.0 MB" in result.output
+    assert "sheet.csv" in result.output
+    listing = [req for req in fake_graph.requests if req.path.endswith("/attachments")]
+    assert "contentBytes" not in listing[0].query["$select"]
+    assert not _value_requests(fake_graph)
+
+
+def test_list_jsonl(files):
+    files.add("report.pdf", REPORT, contentType="application/pdf")
+    files.add("Plan", kind="reference", size=0)
+
+    result = runner.invoke(app, ["--output", "jsonl", "mail", "attachments", "msg-1"])
+
+    assert result.exit_code == 0, result.output
+    records = [json.loads(line) for line in result.stdout.splitlines()]
+    assert [(r["name"], r["size"], r["kind"]) for r in records] == [
+        ("report.pdf", len(REPORT), "file"),
+        ("Plan", 0, "reference"),
+    ]
+
+
+def test_save_downloads_concurrently(files, fake_graph, tmp_path):
+    files.delay = 0.2
+    contents = {"report.pdf": REPORT, "sheet.csv": SHEET, "notes.txt": b"hello\n"}
+    for name, content in contents.items():
+        files.add(name, content)
+
+    result = runner.invoke(app, ["mail", "attachments", "msg-1", "--save", str(tmp_path / "out")])
+
+    assert result.exit_code == 0, result.output
+    for name, content in contents.items():
+        assert (tmp_path / "out" / name).read_bytes() == content
+    assert not list((tmp_path / "out").glob("*.part"))
+    assert fake_graph.peak_in_flight > 1
+    assert "Saved 3 of 3" in result.output
+
+
+def test_save_resumes_a_partial_download(files, fake_graph, tmp_path):
+    files.add("report.pdf", REPORT)
+    (tmp_path / "report.pdf.part").write_bytes(REPORT[:300_000])
+
+    result = runner.invoke(app, ["mail", "attachments", "msg-1", "--save", str(tmp_path)])
+
+    assert result.exit_code == 0, result.output
+    assert (tmp_path / "report.pdf").read_bytes() == REPORT
+    assert _value_requests(fake_graph)[0].headers["range"] == "bytes=300000-"
+    assert "resumed at" in result.output
+
+
+def test_save_starts_over_when_the_range_is_ignored(files, tmp_path):
+    files.add("report.pdf", REPORT)
+    files.ranges = False
+    (tmp_path / "report.pdf.part").write_bytes(b"stale bytes from another file")
+
+    result = runner.invoke(app, ["mail", "attachments", "msg-1", "--save", str(tmp_path)])
+
+    assert result.exit_code == 0, result.output
+    assert (tmp_path / "report.pdf").read_bytes() == REPORT
+    assert "resumed" not in result.output
+
+
+def test_save_starts_over_when_the_part_file_is_too_long(files, tmp_path):
+    files.add("notes.txt", b"short")
+    (tmp_path / "notes.txt.part").write_bytes(b"much longer than the file")
+
+    result = runner.invoke(app, ["mail", "attachments", "msg-1", "--save", str(tmp_path)])
+
+    assert result.exit_code == 0, result.output
+    assert (tmp_path / "notes.txt").read_bytes() == b"short"
+
+
+def test_save_keeps_the_part_file_when_sizes_disagree(files, tmp_path):
+    files.add("report.pdf", REPORT)
+    files.declared = len(REPORT) + 10
+    (tmp_path / "report.pdf.part").write_bytes(REPORT[:1000])
+
+    result = runner.invoke(app, ["mail", "attachments", "msg-1", "--save", str(tmp_path)])
+
+    assert result.exit_code == 1
+    assert "Run again to resume" in result.output
+    assert not (tmp_path / "report.pdf").exists()
+    assert (tmp_path / "report.pdf.part").stat().st_size == len(REPORT)
+
+
+def test_save_skips_links_and_saved_files(files, fake_graph, tmp_path):
+    files.add("done.txt", b"new content")
+    files.add("Plan", kind="reference", size=0)
+    files.add("todo.txt", b"todo")
+    (tmp_path / "done.txt").write_bytes(b"same length")
+
+    result = runner.invoke(app, ["mail", "attachments", "msg-1", "--save", str(tmp_path)])
+
+    assert result.exit_code == 0, result.output
+    assert (tmp_path / "done.txt").read_bytes() == b"same length"
+    assert (tmp_path / "todo.txt").read_bytes() == b"todo"
+    assert not (tmp_path / "Plan").exists()
+    assert "link to a cloud file" in result.output and "already saved" in result.output
+    # One request only reads done.txt's declared length; its body is never written.
+    assert len(_value_requests(fake_graph)) == 2
+    assert "Saved 1 of 3" in result.output
+
+
+def test_save_keeps_a_different_file_with_the_same_name(files, tmp_path):
+    files.add("notes.txt", b"new content")
+    files.add("notes (2).txt", b"another")
+    (tmp_path / "notes.txt").write_bytes(b"written by someone else")
+
+    result = runner.invoke(app, ["mail", "attachments", "msg-1", "--save", str(tmp_path)])
+
+    assert result.exit_code == 0, result.output
+    assert (tmp_path / "notes.txt").read_bytes() == b"written by someone else"
+    assert (tmp_path / "notes (2).txt").read_bytes() == b"another"
+    assert (tmp_path / "notes (3).txt").read_bytes() == b"new content"
+    assert "notes.txt exists with other content" in result.output
+
+    result = runner.invoke(app, ["mail", "attachments", "msg-1", "--save", str(tmp_path)])
+    assert "Saved 0 of 2" in result.output
+    assert not (tmp_path / "notes (4).txt").exists()
+
+
+def test_save_stops_reading_past_the_declared_length(files, tmp_path):
+    files.add("report.pdf", REPORT)
+    files.declared = len(REPORT) - 10
+    (tmp_path / "report.pdf.part").write_bytes(REPORT[:1000])
+
+    result = runner.invoke(app, ["mail", "attachments", "msg-1", "--save", str(tmp_path)])
+
+    assert result.exit_code == 1
+    assert f"received more than the {len(REPORT) - 10:,} bytes declared" in result.output
+    assert not (tmp_path / "report.pdf").exists()
+    assert not (tmp_path / "report.pdf.part").exists()
+
+
+def test_file_names_are_safe_and_distinct():
+    names = ["a.txt", "A.txt", "a.txt", "../../etc/passwd", "noext", "noext", "...", 'what?:"<>.doc']
+    attachments = [Attachment(str(i), name, 0, "", "file", False) for i, name in enumerate(names)]
+    assert file_names(attachments) == [
+        "a.txt",
+        "A (2).txt",
+        "a (3).txt",
+        "_.._etc_passwd",
+        "noext",
+        "noext (2)",
+        "attachment",
+        "what_____.doc",
+    ]
+
+
+def test_download_streams_in_chunks(graph_account, fake_graph, tmp_path):
+    store = MessageAttachments(fake_graph)
+    attachment_id = store.add("report.pdf", REPORT)
+    url = f"{fake_graph.url}/me/messages/msg-1/attachments/{attachment_id}/$value"
+
+    chunks = []
+    original = requests.Response.iter_content
+
+    def _iter_content(self, chunk_size=1, decode_unicode=False):
+        for chunk in original(self, chunk_size, decode_unicode):
+            chunks.append(len(chunk))
+            yield chunk
+
+    with patch.object(requests.Response, "iter_content", _iter_content):
+        size, resumed = download(graph_account.con, url, tmp_path / "report.pdf", chunk_size=64 * 1024)
+
+    assert (size, resumed) == (len(REPORT), 0)
+    assert max(chunks) == 64 * 1024 and len(chunks) == len(REPORT) // (64 * 1024)
+    assert (tmp_path / "report.pdf").read_bytes() == REPORT
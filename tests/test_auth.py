@@ -8,7 +8,7 @@ import typer
 from outlook_cli.auth import authenticate, get_account, is_authenticated
 
 
-@patch("outlook_cli.auth.PublicClientApplication")
+@patch("msal.PublicClientApplication")
 @patch("outlook_cli.auth._get_graph_scopes", return_value=["https://graph.microsoft.com/Mail.ReadWrite"])
 @patch("outlook_cli.auth._token_backend")
 def test_authenticate_success(mock_backend, mock_scopes, mock_msal_cls):
@@ -25,7 +25,7 @@ def test_authenticate_success(mock_backend, mock_scopes, mock_msal_cls):
     mock_backend.return_value.save_token.assert_called_once_with(force=True)
 
 
-@patch("outlook_cli.auth.PublicClientApplication")
+@patch("msal.PublicClientApplication")
 @patch("outlook_cli.auth._get_graph_scopes", return_value=["https://graph.microsoft.com/Mail.ReadWrite"])
 @patch("outlook_cli.auth._token_backend")
 def test_authenticate_failure(mock_backend, mock_scopes, mock_msal_cls):
@@ -95,7 +95,7 @@ def test_get_account_returns_account(mock_config, mock_build):
     assert result is account
 
 
-@patch("outlook_cli.auth.PublicClientApplication")
+@patch("msal.PublicClientApplication")
 @patch("outlook_cli.auth._get_graph_scopes", return_value=["https://graph.microsoft.com/Mail.ReadWrite"])
 @patch("outlook_cli.auth._token_backend")
 def test_authenticate_device_flow_initiation_failure(mock_backend, mock_scopes, mock_msal_cls):
@@ -113,7 +113,7 @@ def test_authenticate_device_flow_initiation_failure(mock_backend, mock_scopes,
 @patch("outlook_cli.auth._token_backend")
 def test_authenticate_msal_init_failure(mock_backend, mock_scopes):
     """authenticate returns False when MSAL constructor raises."""
-    with patch("outlook_cli.auth.PublicClientApplication", side_effect=Exception("bad client")):
+    with patch("msal.PublicClientApplication", side_effect=Exception("bad client")):
         assert authenticate("client-id") is False
 
 
@@ -132,7 +132,7 @@ def test_get_account_exits_on_build_failure(mock_config, mock_build):
         get_account()
 
 
-@patch("outlook_cli.auth.PublicClientApplication")
+@patch("msal.PublicClientApplication")
 @patch("outlook_cli.auth._get_graph_scopes", return_value=["https://graph.microsoft.com/Mail.ReadWrite"])
 @patch("outlook_cli.auth._token_backend")
 def test_authenticate_token_save_failure(mock_backend, mock_scopes, mock_msal_cls):
@@ -0,0 +1,184 @@
+"""Tests for ``cal free`` and the availability sweep."""
+
+import json
+import random
+import time
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+import pytest
+from requests.exceptions import ConnectionError
+from typer.testing import CliRunner
+
+from outlook_cli.availability import FreeTimeFinder, Schedule, parse_duration
+from outlook_cli.main import app
+from tests.fake_graph import Schedules
+
+runner = CliRunner()
+
+MONDAY = datetime(2025, 3, 3, tzinfo=timezone.utc)
+
+
+@pytest.fixture(autouse=True)
+def _utc(monkeypatch):
+    """Working hours are local; pin local time to UTC."""
+    monkeypatch.setenv("TZ", "UTC")
+    time.tzset()
+    yield
+    monkeypatch.undo()
+    time.tzset()
+
+
+@pytest.fixture()
+def schedules(fake_graph):
+    return Schedules(fake_graph)
+
+
+def _at(day: int, hour: int, minute: int = 0) -> datetime:
+    return datetime(2025, 3, day, hour, minute)
+
+
+def test_parse_duration():
+    assert parse_duration("30m") == timedelta(minutes=30)
+    assert parse_duration("1h30m") == timedelta(minutes=90)
+    assert parse_duration("45") == timedelta(minutes=45)
+    with pytest.raises(ValueError):
+        parse_duration("soon")
+
+
+def test_busy_counts_match_brute_force():
+    rng = random.Random(7)
+    finder = FreeTimeFinder(MONDAY, MONDAY + timedelta(days=2))
+    for index in range(30):
+        runs = []
+        for _ in range(rng.randint(0, 6)):
+            first = rng.randrange(finder.slot_count)
+            runs.append((first, min(finder.slot_count, first + rng.randint(1, 12))))
+        finder.schedules[f"p{index}"] = Schedule(f"p{index}", runs)
+
+    width = 4
+    expected = [
+        sum(
+            1
+            for schedule in finder.schedules.values()
+            if any(a < first + width and first < b for a, b in schedule.busy)
+        )
+        for first in range(finder.slot_count - width + 1)
+    ]
+    assert finder.busy_counts(width) == expected
+
+
+def test_requests_split_by_mailboxes_and_window():
+    finder = FreeTimeFinder(MONDAY, MONDAY + timedelta(days=70), interval=30)
+    requests, offsets = finder.requests([f"p{i}@example.com" for i in range(45)])
+    assert len(requests) == 6
+    assert {len(request.body["schedules"]) for request in requests} == {20, 5}
+    assert sorted(set(offsets.values())) == [0, 62 * 48]
+
+
+@patch("outlook_cli.commands.cal_cmd.get_account")
+def test_free_ranks_common_slots(mock_get, graph_account, schedules):
+    mock_get.return_value = graph_account
+    schedules.add("ann@example.com", (_at(3, 9), _at(3, 12), "2"))
+    schedules.add("bob@example.com", (_at(3, 13), _at(3, 17), "2"), (_at(4, 9), _at(4, 10), "1"))
+
+    result = runner.invoke(app, [
+        "-o", "jsonl", "cal", "free",
+        "--attendees", "ann@example.com,bob@example.com",
+        "--duration", "1h", "--between", "2025-03-03..2025-03-04", "--limit", "3",
+    ])
+    assert result.exit_code == 0
+    slots = [json.loads(line) for line in result.stdout.splitlines()]
+    assert slots[0]["start"].startswith("2025-03-03T12:00")
+    assert slots[0]["available"] == 2
+    assert slots[1]["start"].startswith("2025-03-04T10:00")
+    assert slots[2]["start"].startswith("2025-03-04T11:00")
+    assert all(slot["busy"] == [] for slot in slots)
+
+    result = runner.invoke(app, [
+        "-o", "jsonl", "cal", "free", "--tentative-free",
+        "--attendees", "ann@example.com,bob@example.com",
+        "--duration", "1h", "--between", "2025-03-04..2025-03-04", "--limit", "1",
+    ])
+    assert json.loads(result.stdout)["start"].startswith("2025-03-04T09:00")
+
+
+@patch("outlook_cli.commands.cal_cmd.get_account")
+def test_free_scales_to_many_attendees(mock_get, graph_account, schedules, fake_graph):
+    mock_get.return_value = graph_account
+    addresses = [f"p{i}@example.com" for i in range(210)]
+    for index, address in enumerate(addresses):
+        hour = 9 + index % 8
+        schedules.add(address, *((_at(day, hour), _at(day, hour + 1), "2") for day in range(3, 8)))
+
+    result = runner.invoke(app, [
+        "cal", "free", "--attendees", ",".join(addresses), "--between", "2025-03-03..2025-03-07",
+    ])
+    assert result.exit_code == 0
+    assert max(len(call) for call in schedules.calls) == 20
+    assert len(schedules.calls) == 11
+    assert fake_graph.count("POST", r"/\$batch") == 1
+    assert "Free slots" in result.output
+
+
+@patch("outlook_cli.commands.cal_cmd.get_account")
+def test_free_warns_about_unknown_mailboxes(mock_get, graph_account, schedules):
+    mock_get.return_value = graph_account
+    schedules.add("ann@example.com")
+
+    result = runner.invoke(app, [
+        "cal", "free", "--attendees", "ann@example.com,ghost@example.com", "--between", "2025-03-03..2025-03-03",
+    ])
+    assert result.exit_code == 0
+    assert "ghost@example.com" in result.output
+    assert "1/1" in result.output
+
+
+@patch("outlook_cli.commands.cal_cmd.get_account")
+def test_free_slot_ends_after_the_duration(mock_get, graph_account, schedules):
+    mock_get.return_value = graph_account
+    schedules.add("ann@example.com", (_at(3, 9), _at(3, 10), "2"))
+
+    result = runner.invoke(app, [
+        "-o", "jsonl", "cal", "free", "--attendees", "ann@example.com",
+        "--duration", "45m", "--interval", "30", "--between", "2025-03-03..2025-03-03", "--limit", "1",
+    ])
+    assert result.exit_code == 0
+    slot = json.loads(result.stdout)
+    # The search still rules out the whole second interval, but the slot is 45 minutes long.
+    assert slot["start"].startswith("2025-03-03T10:00")
+    assert slot["end"].startswith("2025-03-03T10:45")
+
+
+@patch("outlook_cli.commands.cal_cmd.get_account")
+def test_free_matches_schedules_case_insensitively(mock_get, graph_account, schedules):
+    mock_get.return_value = graph_account
+    schedules.add("Ann@Example.com", (_at(3, 9), _at(3, 17), "2"))
+    schedules.add("bob@example.com")
+    schedules.answer_as = {"Ann@Example.com": "ann@example.com", "bob@example.com": None}
+
+    result = runner.invoke(app, [
+        "-o", "jsonl", "cal", "free", "--attendees", "Ann@Example.com,bob@example.com,ANN@example.com",
+        "--between", "2025-03-03..2025-03-03", "--limit", "1",
+    ])
+    assert result.exit_code == 0
+    assert schedules.calls == [["Ann@Example.com", "bob@example.com"]]
+    assert "No availability for bob@example.com: no schedule returned" in result.output
+    slot = json.loads(result.stdout)
+    assert slot["busy"] == ["Ann@Example.com"]
+    assert slot["available"] == 0
+
+
+@patch("outlook_cli.commands.cal_cmd.get_account")
+def test_free_reports_request_failures(mock_get, graph_account):
+    mock_get.return_value = graph_account
+    with patch("outlook_cli.availability.execute", side_effect=ConnectionError("connection reset")):
+        result = runner.invoke(app, ["cal", "free", "--attendees", "ann@example.com"])
+    assert result.exit_code == 1
+    assert "Failed to read schedules: connection reset" in result.output
+
+
+def test_free_rejects_bad_duration():
+    result = runner.invoke(app, ["cal", "free", "--attendees", "a@example.com", "--duration", "soon"])
+    assert result.exit_code == 1
+    assert "invalid duration" in result.output.lower()
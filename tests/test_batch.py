@@ -0,0 +1,298 @@
+"""Tests for the Graph $batch engine and the multi-ID commands built on it."""
+
+from unittest.mock import patch
+
+import pytest
+from requests.exceptions import ConnectionError
+from typer.testing import CliRunner
+
+from outlook_cli import throttle
+from outlook_cli.batch import BatchRequest, chunk_requests, execute, read_ids
+from outlook_cli.main import app
+from tests.fake_graph import FakeResponse, FolderTree, message_resource
+
+runner = CliRunner()
+
+
+def _no_sleep(seconds):
+    pass
+
+
+# ── Chunking ──────────────────────────────────────────────────
+
+
+def test_chunk_requests_caps_batch_size():
+    requests = [BatchRequest(str(i), "GET", f"/me/messages/{i}") for i in range(45)]
+    chunks = chunk_requests(requests)
+    assert [len(chunk) for chunk in chunks] == [20, 20, 5]
+
+
+def test_chunk_requests_keeps_dependency_chains_together():
+    requests = [BatchRequest(str(i), "GET", f"/me/messages/{i}") for i in range(19)]
+    requests.append(BatchRequest("a", "POST", "/me/messages"))
+    requests.append(BatchRequest("b", "POST", "/me/messages/x/send", depends_on=("a",)))
+    chunks = chunk_requests(requests)
+    for chunk in chunks:
+        ids = {req.id for req in chunk}
+        assert ("a" in ids) == ("b" in ids)
+    assert all(len(chunk) <= 20 for chunk in chunks)
+
+
+def test_chunk_requests_rejects_duplicate_ids():
+    with pytest.raises(ValueError):
+        chunk_requests([BatchRequest("1", "GET", "/a"), BatchRequest("1", "GET", "/b")])
+
+
+def test_read_ids_from_args_and_stdin(monkeypatch):
+    import io
+
+    monkeypatch.setattr("sys.stdin", io.StringIO("id-2\n\nid-3\nid-1\n"))
+    assert read_ids(["id-1", "-"]) == ["id-1", "id-2", "id-3"]
+
+
+# ── Execution against the stand-in server ─────────────────────
+
+
+def test_execute_reports_per_item_status(graph_account, fake_graph):
+    @fake_graph.route("GET", r"/me/messages/(?P<id>[^/]+)")
+    def _message(req):
+        if req.match["id"] == "missing":
+            return FakeResponse(404, {"error": {"code": "ErrorItemNotFound", "message": "Not found"}})
+        return message_resource(1, id=req.match["id"])
+
+    requests = [
+        BatchRequest("0", "GET", "/me/messages/m-0"),
+        BatchRequest("1", "GET", "/me/messages/missing"),
+        BatchRequest("2", "GET", "/me/messages/m-2"),
+    ]
+    report = execute(graph_account.con, graph_account.protocol.service_url, requests, sleep=_no_sleep)
+
+    assert report.request_count == 1
+    assert [resp.status for resp in report.responses.values()] == [200, 404, 200]
+    assert report.responses["1"].error == "Not found"
+    assert report.responses["2"].body["id"] == "m-2"
+
+
+def test_execute_splits_into_batches_of_twenty(graph_account, fake_graph):
+    fake_graph.route("PATCH", r"/me/messages/[^/]+")(lambda req: {"isRead": True})
+
+    requests = [BatchRequest(str(i), "PATCH", f"/me/messages/m-{i}", {"isRead": True}) for i in range(50)]
+    report = execute(graph_account.con, graph_account.protocol.service_url, requests, sleep=_no_sleep)
+
+    assert report.request_count == 3
+    assert fake_graph.count("POST", r"\$batch") == 3
+    assert len(report.succeeded) == 50
+    assert fake_graph.batched[0].json() == {"isRead": True}
+
+
+def test_execute_retries_only_throttled_items(graph_account, fake_graph):
+    attempts = {}
+
+    @fake_graph.route("PATCH", r"/me/messages/(?P<id>[^/]+)")
+    def _patch(req):
+        message_id = req.match["id"]
+        attempts[message_id] = attempts.get(message_id, 0) + 1
+        if message_id == "m-1" and attempts[message_id] == 1:
+            return FakeResponse(429, {"error": {"message": "Too many requests"}}, {"Retry-After": "2"})
+        return {"id": message_id}
+
+    delays = []
+    requests = [BatchRequest(str(i), "PATCH", f"/me/messages/m-{i}", {"isRead": True}) for i in range(3)]
+    report = execute(graph_account.con, graph_account.protocol.service_url, requests, sleep=delays.append)
+
+    assert len(report.succeeded) == 3
+    assert report.request_count == 2
+    assert attempts == {"m-0": 1, "m-1": 2, "m-2": 1}
+    assert report.responses["1"].attempts == 2
+    assert delays == [2.0]
+
+
+def test_execute_resends_only_idempotent_items_after_server_errors(graph_account, fake_graph):
+    fake_graph.route("GET", r"/me/messages/[^/]+")(lambda req: FakeResponse(502, {"error": {"message": "gateway"}}))
+    fake_graph.route("POST", r"/me/events")(lambda req: FakeResponse(500, {"error": {"message": "server"}}))
+
+    requests = [BatchRequest("0", "GET", "/me/messages/m-0"), BatchRequest("1", "POST", "/me/events", {"subject": "x"})]
+    report = execute(graph_account.con, graph_account.protocol.service_url, requests, max_retries=1, sleep=_no_sleep)
+
+    assert report.responses["0"].attempts == 2
+    # A POST that may have been applied is not sent again.
+    assert report.responses["1"].attempts == 1
+    assert report.responses["1"].status == 500
+
+
+def test_execute_gives_up_after_max_retries(graph_account, fake_graph):
+    fake_graph.route("GET", r"/me/messages/[^/]+")(lambda req: FakeResponse(503, {"error": {"message": "busy"}}))
+
+    report = execute(
+        graph_account.con,
+        graph_account.protocol.service_url,
+        [BatchRequest("0", "GET", "/me/messages/m-0")],
+        max_retries=2,
+        sleep=_no_sleep,
+    )
+    assert report.request_count == 3
+    assert report.responses["0"].status == 503
+    assert report.responses["0"].attempts == 3
+
+
+def test_execute_retries_dependents_of_failed_dependency(graph_account, fake_graph):
+    calls = {"create": 0}
+
+    @fake_graph.route("POST", r"/me/messages")
+    def _create(req):
+        calls["create"] += 1
+        if calls["create"] == 1:
+            return FakeResponse(503, {"error": {"message": "try later"}})
+        return FakeResponse(201, {"id": "draft-1"})
+
+    fake_graph.route("POST", r"/me/messages/draft-1/send")(lambda req: FakeResponse(202))
+
+    requests = [
+        BatchRequest("create", "POST", "/me/messages", {"subject": "Hi"}),
+        BatchRequest("send", "POST", "/me/messages/draft-1/send", depends_on=("create",)),
+    ]
+    report = execute(graph_account.con, graph_account.protocol.service_url, requests, sleep=_no_sleep)
+
+    assert [resp.status for resp in report.responses.values()] == [201, 202]
+    assert report.request_count == 2
+
+
+def test_whole_batch_throttling_is_retried_by_the_transport(graph_account, fake_graph):
+    state = {"throttled": False}
+    original = fake_graph.routes[0]
+
+    @fake_graph.route("POST", r"/\$batch")
+    def _batch(req):
+        if not state["throttled"]:
+            state["throttled"] = True
+            return FakeResponse(429, {"error": {"message": "slow down"}}, {"Retry-After": "1"})
+        return original[2](req)
+
+    fake_graph.route("GET", r"/me/messages/[^/]+")(lambda req: {"id": "x"})
+    delays = []
+    throttle.install(graph_account.con, throttle.Throttle(sleep=delays.append))
+    report = execute(
+        graph_account.con,
+        graph_account.protocol.service_url,
+        [BatchRequest("0", "GET", "/me/messages/x")],
+        sleep=delays.append,
+    )
+    assert report.responses["0"].ok
+    assert report.request_count == 1
+    assert fake_graph.count("POST", r"/\$batch") == 2
+    assert delays == [pytest.approx(1.0, abs=0.1)]
+
+
+# ── Multi-ID commands ─────────────────────────────────────────
+
+
+def _report(statuses):
+    from outlook_cli.batch import BatchReport, BatchResponse
+
+    return BatchReport(
+        responses={str(i): BatchResponse(str(i), status, {"id": f"m-{i}"}) for i, status in enumerate(statuses)},
+        request_count=1,
+    )
+
+
+@patch("outlook_cli.commands.mail_cmd.execute")
+@patch("outlook_cli.commands.mail_cmd.get_account")
+def test_mark_many_routes_through_batch(mock_get, mock_execute):
+    mock_execute.return_value = _report([200, 200, 200])
+
+    result = runner.invoke(app, ["mail", "mark", "m-0", "m-1", "m-2", "--unread"])
+    assert result.exit_code == 0
+    requests = mock_execute.call_args[0][2]
+    assert [req.url for req in requests] == ["/me/messages/m-0", "/me/messages/m-1", "/me/messages/m-2"]
+    assert all(req.method == "PATCH" and req.body == {"isRead": False} for req in requests)
+    assert "3 of 3 succeeded in 1 request(s)" in result.output
+
+
+@patch("outlook_cli.commands.mail_cmd.execute")
+@patch("outlook_cli.commands.mail_cmd.get_account")
+def test_mark_reads_ids_from_stdin(mock_get, mock_execute):
+    mock_execute.return_value = _report([200, 404])
+
+    result = runner.invoke(app, ["mail", "mark", "-"], input="m-0\nm-1\n")
+    assert result.exit_code == 1
+    assert len(mock_execute.call_args[0][2]) == 2
+    assert "1 of 2 succeeded" in result.output
+
+
+@patch("outlook_cli.commands.mail_cmd.execute")
+@patch("outlook_cli.commands.mail_cmd.get_account")
+def test_delete_messages(mock_get, mock_execute):
+    mock_execute.return_value = _report([204])
+
+    result = runner.invoke(app, ["mail", "delete", "m-0"])
+    assert result.exit_code == 0
+    request = mock_execute.call_args[0][2][0]
+    assert (request.method, request.url) == ("DELETE", "/me/messages/m-0")
+
+
+@patch("outlook_cli.commands.mail_cmd.execute")
+@patch("outlook_cli.commands.mail_cmd.get_account")
+def test_move_messages(mock_get, mock_execute, graph_account, fake_graph):
+    FolderTree(fake_graph)
+    mock_get.return_value = graph_account
+    mock_execute.return_value = _report([201, 201])
+
+    result = runner.invoke(app, ["mail", "move", "m-0", "m-1", "--folder", "Archive"])
+    assert result.exit_code == 0
+    requests = mock_execute.call_args[0][2]
+    assert requests[0].url == "/me/messages/m-0/move"
+    assert requests[0].body == {"destinationId": "archive"}
+
+
+@patch("outlook_cli.commands.mail_cmd.get_account")
+def test_move_unknown_folder(mock_get, graph_account, fake_graph):
+    FolderTree(fake_graph)
+    mock_get.return_value = graph_account
+
+    result = runner.invoke(app, ["mail", "move", "m-0", "--folder", "Nope"])
+    assert result.exit_code != 0
+    assert "folder not found" in result.output.lower()
+
+
+@patch("outlook_cli.commands.mail_cmd.get_account")
+def test_read_many_messages_end_to_end(mock_get, graph_account, fake_graph):
+    mock_get.return_value = graph_account
+    fake_graph.route("GET", r"/me/messages/(?P<id>[^/]+)")(
+        lambda req: message_resource(int(req.match["id"].split("-")[1]))
+    )
+
+    result = runner.invoke(app, ["mail", "read", "msg-1", "msg-2"])
+    assert result.exit_code == 0
+    assert "Message 1" in result.output
+    assert "Message 2" in result.output
+    assert fake_graph.count("POST", r"\$batch") == 1
+
+
+@patch("outlook_cli.commands.mail_cmd.get_account")
+def test_batch_connection_failure_is_reported_per_item(mock_get, graph_account, fake_graph):
+    mock_get.return_value = graph_account
+    fake_graph.route("GET", r"/me/messages/(?P<id>[^/]+)")(
+        lambda req: message_resource(int(req.match["id"].split("-")[1]))
+    )
+
+    with patch.object(graph_account.con, "post", side_effect=ConnectionError("connection reset")):
+        result = runner.invoke(app, ["mail", "read", "msg-1", "msg-2"])
+
+    assert result.exit_code == 1
+    assert "connection reset" in result.output
+    assert "0 of 2 succeeded in 1 request(s)" in result.output
+
+
+@patch("outlook_cli.commands.cal_cmd.get_account")
+def test_cal_read_many_events_end_to_end(mock_get, graph_account, fake_graph):
+    from tests.fake_graph import event_resource
+
+    mock_get.return_value = graph_account
+    fake_graph.route("GET", r"/me/events/(?P<id>[^/]+)")(
+        lambda req: event_resource(int(req.match["id"].split("-")[1]))
+    )
+
+    result = runner.invoke(app, ["cal", "read", "evt-1", "evt-2", "evt-3"])
+    assert result.exit_code == 0
+    assert "Event 3" in result.output
+    assert "3 of 3 succeeded in 1 request(s)" in result.output
@@ -0,0 +1,98 @@
+"""Tests for server-rendered text bodies in ``mail read`` and ``cal read``."""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+from typer.testing import CliRunner
+
+from outlook_cli.main import app
+from outlook_cli.query import TEXT_BODIES, preferring
+from tests.fake_graph import event_resource, message_resource, render_bodies
+
+runner = CliRunner()
+
+QUOTED = "<div>On Monday, Alice wrote:</div><blockquote><p>Original question?</p></blockquote>"
+
+
+def _reply(index: int) -> dict:
+    return message_resource(
+        index,
+        body={"contentType": "html", "content": f"<html><body><p>Answer {index}</p>{QUOTED}</body></html>"},
+        uniqueBody={"contentType": "html", "content": f"<html><body><p>Answer {index}</p></body></html>"},
+    )
+
+
+@pytest.fixture()
+def mail(graph_account, fake_graph):
+    fake_graph.route("GET", r"/me/messages/(?P<id>[^/]+)")(
+        lambda req: render_bodies(_reply(int(req.match["id"].split("-")[1])), req)
+    )
+    with patch("outlook_cli.commands.mail_cmd.get_account") as mock_get:
+        mock_get.return_value = graph_account
+        yield fake_graph
+
+
+def _read(*args: str) -> str:
+    result = runner.invoke(app, ["mail", "read", *args])
+    assert result.exit_code == 0, result.output
+    return result.output
+
+
+def test_preferring_merges_and_restores_default_headers():
+    con = MagicMock(default_headers={"Prefer": 'IdType="ImmutableId"'})
+    with preferring(con, TEXT_BODIES):
+        assert con.default_headers["Prefer"] == f'IdType="ImmutableId", {TEXT_BODIES}'
+    assert con.default_headers == {"Prefer": 'IdType="ImmutableId"'}
+
+    con = MagicMock(default_headers={})
+    with preferring(con):
+        pass
+    assert con.default_headers == {}
+
+
+def test_read_asks_graph_for_a_text_body(mail, graph_account):
+    output = _read("msg-1")
+    request = mail.requests[-1]
+    assert TEXT_BODIES in request.headers["prefer"]
+    fields = request.query["$select"].split(",")
+    assert "body" in fields and "uniqueBody" not in fields
+    assert "Answer 1" in output and "Original question?" in output
+    # The preference is only for this request.
+    assert "Prefer" not in graph_account.con.default_headers
+
+
+def test_read_unique_skips_quoted_history(mail):
+    output = _read("msg-1", "--unique")
+    fields = mail.requests[-1].query["$select"].split(",")
+    assert "uniqueBody" in fields and "body" not in fields
+    assert "Answer 1" in output
+    assert "Original question?" not in output
+
+
+def test_read_html_converts_locally(mail):
+    output = _read("msg-1", "--html")
+    assert TEXT_BODIES not in mail.requests[-1].headers.get("prefer", "")
+    assert "Answer 1" in output
+    assert "Original question?" in output
+
+
+def test_batched_read_prefers_text_per_sub_request(mail):
+    output = _read("msg-1", "msg-2", "--unique")
+    assert all(TEXT_BODIES in req.headers["prefer"] for req in mail.batched)
+    assert all("uniqueBody" in req.query["$select"] for req in mail.batched)
+    assert "Answer 1" in output and "Answer 2" in output
+    assert "Original question?" not in output
+
+
+def test_cal_read_prefers_text(graph_account, fake_graph):
+    description = {"contentType": "html", "content": "<html><body><p>Agenda</p><p>Item one</p></body></html>"}
+    fake_graph.route("GET", r"/me/calendar$")(lambda req: {"id": "cal-default", "name": "Calendar"})
+    fake_graph.route("GET", r"/me/calendars/[^/]+/events/(?P<id>[^/]+)")(
+        lambda req: render_bodies(event_resource(1, body=description), req)
+    )
+    with patch("outlook_cli.commands.cal_cmd.get_account") as mock_get:
+        mock_get.return_value = graph_account
+        result = runner.invoke(app, ["cal", "read", "evt-1"])
+    assert result.exit_code == 0, result.output
+    assert TEXT_BODIES in fake_graph.requests[-1].headers["prefer"]
+    assert "Agenda" in result.output and "Item one" in result.output
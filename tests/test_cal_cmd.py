@@ -1,19 +1,20 @@
 """CLI integration tests for calendar commands."""
 
-from unittest.mock import MagicMock, patch
+from unittest.mock import patch
 
+import pytest
 from typer.testing import CliRunner
 
 from outlook_cli.main import app
+from tests.fake_graph import FakeResponse, install_default_routes
 
 runner = CliRunner()
 
 
 @patch("outlook_cli.commands.cal_cmd.get_account")
-def test_list_no_events(mock_get, mock_account):
-    mock_get.return_value = mock_account
-    calendar = mock_account.schedule().get_default_calendar()
-    calendar.get_events.return_value = iter([])
+def test_list_no_events(mock_get, graph_account, fake_graph):
+    mock_get.return_value = graph_account
+    install_default_routes(fake_graph, events=0)
 
     result = runner.invoke(app, ["cal", "list"])
     assert result.exit_code == 0
@@ -21,28 +22,30 @@ def test_list_no_events(mock_get, mock_account):
 
 
 @patch("outlook_cli.commands.cal_cmd.get_account")
-def test_list_with_events(mock_get, mock_account, mock_event):
-    mock_get.return_value = mock_account
-    calendar = mock_account.schedule().get_default_calendar()
-    calendar.get_events.return_value = iter([mock_event])
+def test_list_with_events(mock_get, graph_account, fake_graph):
+    mock_get.return_value = graph_account
+    install_default_routes(fake_graph, events=3)
 
-    result = runner.invoke(app, ["cal", "list"])
+    result = runner.invoke(app, ["cal", "list", "--start", "2025-02-01"])
     assert result.exit_code == 0
-    assert "Team Meeting" in result.output
+    assert "Event 2" in result.output
 
 
 @patch("outlook_cli.commands.cal_cmd.get_account")
-def test_list_with_date_range(mock_get, mock_account, mock_event):
-    mock_get.return_value = mock_account
-    calendar = mock_account.schedule().get_default_calendar()
-    calendar.get_events.return_value = iter([mock_event])
+def test_list_with_date_range(mock_get, graph_account, fake_graph):
+    mock_get.return_value = graph_account
+    install_default_routes(fake_graph, events=10)
 
     result = runner.invoke(app, [
         "cal", "list",
-        "--start", "2025-02-01",
-        "--end", "2025-02-28",
+        "--start", "2025-02-03",
+        "--end", "2025-02-05",
     ])
     assert result.exit_code == 0
+    assert "Event 2" in result.output
+    assert "Event 3" in result.output
+    assert "Event 1 " not in result.output
+    assert "Event 4" not in result.output
 
 
 @patch("outlook_cli.commands.cal_cmd.get_account")
@@ -66,12 +69,23 @@ def test_read_event_not_found(mock_get, mock_account):
     assert result.exit_code != 0
 
 
+@pytest.fixture()
+def created(fake_graph):
+    """Answers event creation like Graph; the posted bodies are collected."""
+    install_default_routes(fake_graph, events=3)
+    bodies = []
+
+    @fake_graph.route("POST", r"/me/calendars/(?P<cal>[^/]+)/events")
+    def _create(req):
+        bodies.append(req.json())
+        return {**req.json(), "id": f"evt-new-{len(bodies)}", "changeKey": "ck-new"}
+
+    return bodies
+
+
 @patch("outlook_cli.commands.cal_cmd.get_account")
-def test_create_event(mock_get, mock_account):
-    mock_get.return_value = mock_account
-    calendar = mock_account.schedule().get_default_calendar()
-    new_event = MagicMock()
-    calendar.new_event.return_value = new_event
+def test_create_event(mock_get, graph_account, created):
+    mock_get.return_value = graph_account
 
     result = runner.invoke(app, [
         "cal", "create",
@@ -81,15 +95,12 @@ def test_create_event(mock_get, mock_account):
     ])
     assert result.exit_code == 0
     assert "lunch" in result.output.lower()
-    new_event.save.assert_called_once()
+    assert [body["subject"] for body in created] == ["Lunch"]
 
 
 @patch("outlook_cli.commands.cal_cmd.get_account")
-def test_create_event_with_optional_fields(mock_get, mock_account):
-    mock_get.return_value = mock_account
-    calendar = mock_account.schedule().get_default_calendar()
-    new_event = MagicMock()
-    calendar.new_event.return_value = new_event
+def test_create_event_with_optional_fields(mock_get, graph_account, created):
+    mock_get.return_value = graph_account
 
     result = runner.invoke(app, [
         "cal", "create",
@@ -100,8 +111,8 @@ def test_create_event_with_optional_fields(mock_get, mock_account):
         "--location", "Conference Room A",
     ])
     assert result.exit_code == 0
-    assert new_event.body == "Full day workshop"
-    assert new_event.location == "Conference Room A"
+    assert created[0]["body"]["content"] == "Full day workshop"
+    assert created[0]["location"]["displayName"] == "Conference Room A"
 
 
 # ── Error handling tests ─────────────────────────────────────
@@ -127,12 +138,12 @@ def test_create_invalid_datetime(mock_get, mock_account):
 
 
 @patch("outlook_cli.commands.cal_cmd.get_account")
-def test_create_event_save_failure(mock_get, mock_account):
-    mock_get.return_value = mock_account
-    calendar = mock_account.schedule().get_default_calendar()
-    new_event = MagicMock()
-    new_event.save.return_value = False
-    calendar.new_event.return_value = new_event
+def test_create_event_save_failure(mock_get, graph_account, fake_graph):
+    mock_get.return_value = graph_account
+    install_default_routes(fake_graph, events=0)
+    fake_graph.route("POST", r"/me/calendars/(?P<cal>[^/]+)/events")(
+        lambda req: FakeResponse(400, {"error": {"code": "ErrorInvalidRequest", "message": "Bad event"}})
+    )
 
     result = runner.invoke(app, [
         "cal", "create",
@@ -140,7 +151,8 @@ def test_create_event_save_failure(mock_get, mock_account):
         "--start", "2025-02-08 12:00",
         "--end", "2025-02-08 13:00",
     ])
-    assert result.exit_code != 0
+    assert result.exit_code == 1
+    assert "failed to create event" in result.output.lower()
 
 
 @patch("outlook_cli.commands.cal_cmd.get_account")
@@ -1,105 +1,142 @@
-"""CLI integration tests for enhanced calendar commands: list filters."""
+"""CLI integration tests for enhanced calendar commands: list filters and calendars."""
 
-from unittest.mock import MagicMock, patch
+import json
+import time
+from unittest.mock import patch
 
+import pytest
 from typer.testing import CliRunner
 
 from outlook_cli.main import app
+from tests.fake_graph import CalendarView, event_resource, install_default_routes
 
 runner = CliRunner()
 
+WINDOW = ["--start", "2025-02-01", "--end", "2025-03-01"]
+
+
+@pytest.fixture()
+def mock_get():
+    with patch("outlook_cli.commands.cal_cmd.get_account") as mock:
+        yield mock
 
-# ── List with filters ─────────────────────────────────────────
 
+@pytest.fixture()
+def calendar(mock_get, graph_account, fake_graph):
+    mock_get.return_value = graph_account
+    install_default_routes(fake_graph, events=0)
+    view = CalendarView(fake_graph)
+    view.add(
+        event_resource(0, subject="Team Meeting"),
+        event_resource(1, subject="Lunch", location={"displayName": "Cafeteria"}),
+        event_resource(2, subject="Offsite", isAllDay=True),
+        event_resource(3, subject="Daily standup", type="occurrence", seriesMasterId="series-1"),
+        event_resource(4, subject="Review", organizer={"emailAddress": {"name": "Ann", "address": "ann@example.com"}}),
+    )
+    return view
 
-@patch("outlook_cli.commands.cal_cmd.get_account")
-def test_list_subject_filter(mock_get, mock_account):
-    mock_get.return_value = mock_account
-    calendar = mock_account.schedule().get_default_calendar()
-    calendar.get_events.return_value = iter([])
 
-    result = runner.invoke(app, ["cal", "list", "--subject", "meeting"])
+def _listed(*args: str) -> str:
+    result = runner.invoke(app, ["cal", "list", *WINDOW, *args])
     assert result.exit_code == 0
-    calendar.get_events.assert_called_once()
+    return result.output
 
 
-@patch("outlook_cli.commands.cal_cmd.get_account")
-def test_list_location_filter(mock_get, mock_account):
-    mock_get.return_value = mock_account
-    calendar = mock_account.schedule().get_default_calendar()
-    calendar.get_events.return_value = iter([])
+# ── List with filters ─────────────────────────────────────────
 
-    result = runner.invoke(app, ["cal", "list", "--location", "Room"])
-    assert result.exit_code == 0
-    calendar.get_events.assert_called_once()
 
+def test_list_subject_filter(calendar):
+    output = _listed("--subject", "meeting")
+    assert "Team Meeting" in output
+    assert "Lunch" not in output
 
-@patch("outlook_cli.commands.cal_cmd.get_account")
-def test_list_all_day_filter(mock_get, mock_account):
-    mock_get.return_value = mock_account
-    calendar = mock_account.schedule().get_default_calendar()
-    calendar.get_events.return_value = iter([])
 
-    result = runner.invoke(app, ["cal", "list", "--all-day"])
-    assert result.exit_code == 0
-    calendar.get_events.assert_called_once()
+def test_list_location_filter(calendar):
+    output = _listed("--location", "cafe")
+    assert "Lunch" in output
+    assert "Team Meeting" not in output
 
 
-@patch("outlook_cli.commands.cal_cmd.get_account")
-def test_list_recurring_filter(mock_get, mock_account):
-    mock_get.return_value = mock_account
-    calendar = mock_account.schedule().get_default_calendar()
-    calendar.get_events.return_value = iter([])
+def test_list_all_day_filter(calendar):
+    output = _listed("--all-day")
+    assert "Offsite" in output
+    assert "Lunch" not in output
 
-    result = runner.invoke(app, ["cal", "list", "--recurring"])
-    assert result.exit_code == 0
-    calendar.get_events.assert_called_once()
+
+def test_list_recurring_filter(calendar):
+    output = _listed("--recurring")
+    assert "Daily standup" in output
+    assert "Offsite" not in output
 
 
-@patch("outlook_cli.commands.cal_cmd.get_account")
-def test_list_combined_filters(mock_get, mock_account):
+def test_list_combined_filters(calendar):
     """Multiple filters can be combined in a single query."""
-    mock_get.return_value = mock_account
-    calendar = mock_account.schedule().get_default_calendar()
-    calendar.get_events.return_value = iter([])
-
-    result = runner.invoke(app, [
-        "cal", "list",
-        "--subject", "standup",
-        "--recurring",
-    ])
-    assert result.exit_code == 0
-    calendar.get_events.assert_called_once()
+    assert "Daily standup" in _listed("--subject", "standup", "--recurring")
+    assert "no events" in _listed("--subject", "lunch", "--recurring").lower()
 
 
-@patch("outlook_cli.commands.cal_cmd.get_account")
-def test_list_subject_filter_with_results(mock_get, mock_account, mock_event):
-    mock_get.return_value = mock_account
-    calendar = mock_account.schedule().get_default_calendar()
-    calendar.get_events.return_value = iter([mock_event])
+def test_list_organizer_filter(calendar):
+    output = _listed("--organizer", "ann@")
+    assert "Review" in output
+    assert "Team Meeting" not in output
 
-    result = runner.invoke(app, ["cal", "list", "--subject", "Team"])
-    assert result.exit_code == 0
-    assert "Team Meeting" in result.output
 
+def test_list_all_day_no_results(calendar):
+    calendar.remove("evt-2")
+    assert "no events" in _listed("--all-day").lower()
 
-@patch("outlook_cli.commands.cal_cmd.get_account")
-def test_list_organizer_filter(mock_get, mock_account):
-    mock_get.return_value = mock_account
-    calendar = mock_account.schedule().get_default_calendar()
-    calendar.get_events.return_value = iter([])
 
-    result = runner.invoke(app, ["cal", "list", "--organizer", "boss@example.com"])
-    assert result.exit_code == 0
-    calendar.get_events.assert_called_once()
+# ── Several calendars ─────────────────────────────────────────
 
+CALENDARS = {"cal-default": "Calendar", "cal-team": "Team", "cal-holidays": "Holidays"}
 
-@patch("outlook_cli.commands.cal_cmd.get_account")
-def test_list_all_day_no_results(mock_get, mock_account):
-    mock_get.return_value = mock_account
-    calendar = mock_account.schedule().get_default_calendar()
-    calendar.get_events.return_value = iter([])
 
-    result = runner.invoke(app, ["cal", "list", "--all-day"])
-    assert result.exit_code == 0
-    assert "no events" in result.output.lower()
+@pytest.fixture()
+def calendars(mock_get, graph_account, fake_graph):
+    mock_get.return_value = graph_account
+    install_default_routes(fake_graph, events=0)
+
+    @fake_graph.route("GET", r"/me/calendars")
+    def _calendars(req):
+        return {"value": [{"id": key, "name": name} for key, name in CALENDARS.items()]}
+
+    views = {key: CalendarView(fake_graph, calendar_id=key) for key in CALENDARS}
+    for offset, key in enumerate(CALENDARS):
+        views[key].add(
+            *(event_resource(day * 3 + offset, subject=f"{CALENDARS[key]} {day}") for day in range(5))
+        )
+    return views
+
+
+def test_list_all_calendars_merges_by_start(calendars):
+    result = runner.invoke(app, ["--output", "jsonl", "cal", "list", *WINDOW, "--all-calendars"])
+    assert result.exit_code == 0, result.output
+    records = [json.loads(line) for line in result.output.splitlines()]
+    assert len(records) == 15
+    assert [record["start"] for record in records] == sorted(record["start"] for record in records)
+    assert [record["calendar"] for record in records[:3]] == ["Calendar", "Team", "Holidays"]
+
+
+def test_list_named_calendars(calendars):
+    output = _listed("--calendar", "team", "--calendar", "Holidays", "--limit", "100")
+    assert "Team 4" in output and "Holidays 0" in output
+    assert "Calendar 0" not in output
+    assert "Calendar" in output  # the column header
+
+
+def test_list_unknown_calendar(calendars):
+    result = runner.invoke(app, ["cal", "list", *WINDOW, "--calendar", "Nope"])
+    assert result.exit_code == 1
+    assert "Nope" in result.output and "Team" in result.output
+
+
+def test_list_fetches_calendars_concurrently(calendars, fake_graph):
+    for key, view in calendars.items():
+
+        @fake_graph.route("GET", rf"/me/calendars/{key}/calendarView")
+        def _slow(req, view=view):
+            time.sleep(0.1)
+            return view._view(req)
+
+    assert "Team 0" in _listed("--all-calendars")
+    assert fake_graph.peak_in_flight == len(CALENDARS)
@@ -0,0 +1,115 @@
+"""Tests for calendarView listings and the per-day instance cache."""
+
+import time
+from datetime import date
+
+import pytest
+
+from outlook_cli import calendar_view, ids
+from tests.fake_graph import CalendarView, event_resource
+
+FEB_1 = date(2025, 2, 1)
+MAR_1 = date(2025, 3, 1)
+
+
+@pytest.fixture(autouse=True)
+def _utc(monkeypatch):
+    """Local days equal UTC days, so day assertions hold on any machine."""
+    monkeypatch.setenv("TZ", "UTC")
+    time.tzset()
+    yield
+    monkeypatch.undo()
+    time.tzset()
+
+
+@pytest.fixture()
+def server(fake_graph):
+    view = CalendarView(fake_graph)
+    view.add(*(event_resource(i) for i in range(28)))
+    return view
+
+
+@pytest.fixture()
+def db(graph_account):
+    db = calendar_view.connect(calendar_view.db_path(ids.account_key(graph_account)))
+    yield db
+    db.close()
+
+
+def _view(db, account, **kwargs) -> calendar_view.CalendarView:
+    return calendar_view.CalendarView(
+        db, account.con, account.protocol.service_url, "cal-default", fields=["subject"], **kwargs
+    )
+
+
+def _ids(view, start=FEB_1, end=MAR_1) -> list[str]:
+    return [resource["id"] for resource in view.instances(start, end)]
+
+
+def test_first_listing_downloads_window_once(db, graph_account, server, fake_graph):
+    view = _view(db, graph_account)
+    assert _ids(view) == [f"evt-{i}" for i in range(28)]
+    assert view.requests == 1
+    request = fake_graph.requests[-1]
+    assert request.query["startDateTime"] == "2025-02-01T00:00:00Z"
+    assert request.query["endDateTime"] == "2025-03-01T00:00:00Z"
+
+
+def test_unchanged_days_are_served_from_cache(db, graph_account, server, fake_graph):
+    _ids(_view(db, graph_account))
+
+    view = _view(db, graph_account)
+    assert _ids(view) == [f"evt-{i}" for i in range(28)]
+    assert (view.requests, view.refetched) == (1, [])
+    assert fake_graph.requests[-1].query["$select"] == "id,changeKey,start,end"
+
+
+def test_only_changed_days_are_refetched(db, graph_account, server):
+    _ids(_view(db, graph_account))
+    server.change("evt-4", subject="Moved")
+    server.remove("evt-9")
+
+    view = _view(db, graph_account)
+    found = list(view.instances(FEB_1, MAR_1))
+    assert view.refetched == [date(2025, 2, 5), date(2025, 2, 10)]
+    assert view.requests == 3
+    assert [r["subject"] for r in found if r["id"] == "evt-4"] == ["Moved"]
+    assert "evt-9" not in {r["id"] for r in found}
+
+
+def test_projection_has_its_own_cache(db, graph_account, server):
+    _ids(_view(db, graph_account))
+    view = calendar_view.CalendarView(db, graph_account.con, graph_account.protocol.service_url, "cal-default")
+    _ids(view)
+    assert len(view.refetched) == 28
+
+
+def test_occurrences_and_multi_day_instances(db, graph_account, fake_graph):
+    server = CalendarView(fake_graph)
+    server.add(
+        event_resource(
+            100,
+            start={"dateTime": "2025-02-03T22:00:00.0000000", "timeZone": "UTC"},
+            end={"dateTime": "2025-02-05T08:00:00.0000000", "timeZone": "UTC"},
+        ),
+        *(
+            event_resource(200 + day, type="occurrence", seriesMasterId="series-1", start={
+                "dateTime": f"2025-02-{day:02d}T08:00:00.0000000", "timeZone": "UTC",
+            }, end={"dateTime": f"2025-02-{day:02d}T08:15:00.0000000", "timeZone": "UTC"})
+            for day in range(3, 7)
+        ),
+    )
+    view = _view(db, graph_account, page_size=2)
+    assert _ids(view, date(2025, 2, 3), date(2025, 2, 7)) == ["evt-203", "evt-100", "evt-204", "evt-205", "evt-206"]
+    assert view.requests == 3
+
+    # The overnight event is cached under each day it touches.
+    assert _ids(_view(db, graph_account), date(2025, 2, 5), date(2025, 2, 6)) == ["evt-100", "evt-205"]
+
+
+def test_matches_filters():
+    resource = event_resource(3, type="occurrence")
+    assert calendar_view.matches(resource, subject="event 3", location="room", recurring=True)
+    assert calendar_view.matches(resource, organizer="BOSS@")
+    assert not calendar_view.matches(resource, all_day=True)
+    assert not calendar_view.matches(event_resource(4), recurring=True)
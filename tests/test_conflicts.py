@@ -0,0 +1,134 @@
+"""Tests for the calendar overlap index and conflict checks on create."""
+
+import json
+import time
+from datetime import date, datetime, timezone
+from unittest.mock import patch
+
+import pytest
+from typer.testing import CliRunner
+
+from outlook_cli import calendar_view, ids
+from outlook_cli.main import app
+from tests.fake_graph import event_resource, install_default_routes
+
+runner = CliRunner()
+
+
+@pytest.fixture(autouse=True)
+def _utc(monkeypatch):
+    monkeypatch.setenv("TZ", "UTC")
+    time.tzset()
+    yield
+    monkeypatch.undo()
+    time.tzset()
+
+
+@pytest.fixture()
+def db(graph_account):
+    db = calendar_view.connect(calendar_view.db_path(ids.account_key(graph_account)))
+    yield db
+    db.close()
+
+
+@pytest.fixture()
+def created(fake_graph):
+    install_default_routes(fake_graph, events=10)
+    bodies = []
+
+    @fake_graph.route("POST", r"/me/calendars/(?P<cal>[^/]+)/events")
+    def _create(req):
+        bodies.append(req.json())
+        return {**req.json(), "id": f"evt-new-{len(bodies)}"}
+
+    return bodies
+
+
+def _utc_at(day: int, hour: int, minute: int = 0) -> datetime:
+    return datetime(2025, 2, day, hour, minute, tzinfo=timezone.utc)
+
+
+def test_index_finds_overlaps_only(db):
+    calendar_view.index_day(db, "cal", date(2025, 2, 3), [
+        event_resource(2),  # 2025-02-03 09:00-10:00
+        event_resource(50, start=event_resource(2)["end"], end={"dateTime": "2025-02-03T11:00:00", "timeZone": "UTC"}),
+        event_resource(51, showAs="free"),
+    ])
+    assert [c.id for c in calendar_view.conflicts(db, "cal", _utc_at(3, 9, 30), _utc_at(3, 9, 45))] == ["evt-2"]
+    assert [c.id for c in calendar_view.conflicts(db, "cal", _utc_at(3, 9, 59), _utc_at(3, 10, 1))] == ["evt-2", "evt-50"]
+    # Touching end to start is not an overlap.
+    assert calendar_view.conflicts(db, "cal", _utc_at(3, 11), _utc_at(3, 12)) == []
+    assert calendar_view.conflicts(db, "other", _utc_at(3, 9), _utc_at(3, 10)) == []
+
+
+def test_reindexing_a_day_drops_removed_instances(db):
+    calendar_view.index_day(db, "cal", date(2025, 2, 3), [event_resource(2)])
+    calendar_view.index_day(db, "cal", date(2025, 2, 3), [])
+    assert calendar_view.conflicts(db, "cal", _utc_at(3, 0), _utc_at(4, 0)) == []
+
+
+def test_overlapping_pairs():
+    spans = [(_utc_at(1, 9), _utc_at(1, 10)), (_utc_at(1, 12), _utc_at(1, 13)), (_utc_at(1, 9, 30), _utc_at(1, 12, 30))]
+    assert calendar_view.overlapping_pairs(spans) == [(0, 2), (1, 2)]
+
+
+@patch("outlook_cli.commands.cal_cmd.get_account")
+def test_create_warns_about_overlap(mock_get, graph_account, created):
+    mock_get.return_value = graph_account
+
+    result = runner.invoke(app, ["cal", "create", "--subject", "Clash", "--start", "2025-02-08 09:30", "--end", "2025-02-08 10:30"])
+    assert result.exit_code == 0
+    assert "overlaps Event 7" in result.output
+    assert len(created) == 1
+
+
+@patch("outlook_cli.commands.cal_cmd.get_account")
+def test_no_conflicts_refuses(mock_get, graph_account, created):
+    mock_get.return_value = graph_account
+
+    result = runner.invoke(app, [
+        "cal", "create", "--subject", "Clash", "--start", "2025-02-08 09:30", "--end", "2025-02-08 10:30", "--no-conflicts",
+    ])
+    assert result.exit_code == 1
+    assert created == []
+
+
+@patch("outlook_cli.commands.cal_cmd.get_account")
+def test_created_events_are_indexed_right_away(mock_get, graph_account, created, fake_graph):
+    mock_get.return_value = graph_account
+    args = ["cal", "create", "--subject", "Room booking", "--start", "2025-02-20 14:00", "--end", "2025-02-20 15:00"]
+
+    assert runner.invoke(app, args).exit_code == 0
+    result = runner.invoke(app, [*args, "--no-conflicts"])
+    assert result.exit_code == 1
+    assert "overlaps Room booking" in result.output
+    # The second check cost one probe, not a download.
+    assert fake_graph.requests[-1].query["$select"] == "id,changeKey,start,end"
+
+
+@patch("outlook_cli.commands.cal_cmd.get_account")
+def test_create_many_checks_calendar_and_file(mock_get, graph_account, created, fake_graph, tmp_path):
+    mock_get.return_value = graph_account
+    lines = [
+        {"subject": "Clean", "start": "2025-02-12 14:00", "end": "2025-02-12 15:00", "location": "Room 1"},
+        {"subject": "Clash", "start": "2025-02-08 09:30", "end": "2025-02-08 10:30"},
+        {"subject": "First", "start": "2025-02-13 14:00", "end": "2025-02-13 15:00"},
+        {"subject": "Second", "start": "2025-02-13 14:30", "end": "2025-02-13 15:30"},
+    ]
+    path = tmp_path / "events.jsonl"
+    path.write_text("\n".join(json.dumps(line) for line in lines))
+
+    result = runner.invoke(app, ["cal", "create-many", str(path), "--no-conflicts"])
+    assert result.exit_code == 1
+    assert [body["subject"] for body in created] == ["Clean", "First"]
+    assert created[0]["location"] == {"displayName": "Room 1"}
+    assert fake_graph.count("POST", r"/\$batch") == 1
+    assert "2 of 2 succeeded" in result.output
+
+
+def test_create_many_rejects_bad_lines(tmp_path):
+    path = tmp_path / "events.jsonl"
+    path.write_text('{"subject": "No times"}\n')
+    result = runner.invoke(app, ["cal", "create-many", str(path)])
+    assert result.exit_code == 1
+    assert "line 1" in result.output.lower()
@@ -0,0 +1,113 @@
+"""Tests for the ``outlook serve`` daemon and command forwarding."""
+
+import threading
+import time
+from unittest.mock import MagicMock
+
+import pytest
+from typer.testing import CliRunner
+
+from outlook_cli import daemon
+from outlook_cli.main import app
+
+runner = CliRunner()
+
+
+@pytest.fixture()
+def running_daemon(tmp_path, mock_account, mock_message, monkeypatch):
+    """Serve a daemon around ``mock_account`` on a temp socket."""
+    monkeypatch.delenv("OUTLOOK_CLI_NO_DAEMON")
+    mock_account.mailbox().get_message.return_value = mock_message
+    server = daemon.Daemon(mock_account, tmp_path / "daemon.sock")
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    for _ in range(200):
+        if daemon.request({"command": "ping"}, server.path) is not None:
+            break
+        time.sleep(0.01)
+    yield server
+    server.shutdown()
+    thread.join(timeout=5)
+
+
+def test_forward_without_daemon_runs_in_process(tmp_path, monkeypatch):
+    monkeypatch.delenv("OUTLOOK_CLI_NO_DAEMON")
+    assert daemon.forward(["mail", "search"], tmp_path / "daemon.sock") is None
+
+
+def test_forward_ignores_stale_socket(tmp_path, monkeypatch):
+    monkeypatch.delenv("OUTLOOK_CLI_NO_DAEMON")
+    stale = tmp_path / "daemon.sock"
+    stale.touch()
+    assert daemon.forward(["mail", "search"], stale) is None
+
+
+def test_forward_disabled_by_env(running_daemon, monkeypatch):
+    monkeypatch.setenv("OUTLOOK_CLI_NO_DAEMON", "1")
+    assert daemon.forward(["mail", "read", "msg-123"], running_daemon.path) is None
+
+
+def test_forward_runs_command_on_daemon(running_daemon, mock_account, capsys):
+    exit_code = daemon.forward(["mail", "read", "msg-123"], running_daemon.path)
+    assert exit_code == 0
+    output = capsys.readouterr().out
+    assert "Test Subject" in output
+    assert "Hello, world!" in output
+    mock_account.mailbox().get_message.assert_called_once()
+    assert mock_account.mailbox().get_message.call_args.kwargs["object_id"] == "msg-123"
+
+
+def test_daemon_sends_output_in_frames_as_it_is_written(running_daemon, mock_account):
+    frames: list[dict] = []
+    exit_code = running_daemon.run({"argv": ["mail", "read", "msg-123"], "width": 100}, frames.append)
+
+    assert exit_code == 0
+    assert frames[-1] == {"exit_code": 0}
+    output = [frame for frame in frames[:-1] if frame["stream"] == "output"]
+    # Sent as each write completes a line, not as one reply at the end.
+    assert len(output) > 1
+    text = "".join(frame["data"] for frame in output)
+    assert "Test Subject" in text and "Hello, world!" in text
+
+
+def test_forward_propagates_exit_code(running_daemon, mock_account, capsys):
+    mock_account.mailbox().get_message.return_value = None
+    exit_code = daemon.forward(["mail", "read", "missing"], running_daemon.path)
+    assert exit_code == 1
+    assert "not found" in capsys.readouterr().out.lower()
+
+
+def test_daemon_caches_calendar_lookup(running_daemon, mock_account, capsys):
+    calendar = mock_account.schedule().get_default_calendar()
+    calendar.get_event.return_value = MagicMock(subject="Standup", body="", location="")
+    schedule = mock_account.schedule()
+    schedule.get_default_calendar.reset_mock()
+
+    for _ in range(3):
+        assert daemon.forward(["cal", "read", "evt-1"], running_daemon.path) == 0
+
+    schedule.get_default_calendar.assert_called_once()
+    info = daemon.request({"command": "ping"}, running_daemon.path)
+    assert info["served"] == 3
+    assert info["cached_lookups"] == 1
+
+
+def test_daemon_stops_on_shutdown_request(running_daemon):
+    assert daemon.request({"command": "shutdown"}, running_daemon.path) == {"ok": True}
+    for _ in range(200):
+        if not running_daemon.path.exists():
+            break
+        time.sleep(0.01)
+    assert not running_daemon.path.exists()
+
+
+def test_serve_status_without_daemon(config_dir):
+    result = runner.invoke(app, ["serve", "--status"])
+    assert result.exit_code == 0
+    assert "no daemon running" in result.output.lower()
+
+
+def test_serve_stop_without_daemon(config_dir):
+    result = runner.invoke(app, ["serve", "--stop"])
+    assert result.exit_code == 0
+    assert "no daemon running" in result.output.lower()
@@ -2,12 +2,21 @@
 
 from io import StringIO
 
+import pytest
 from rich.console import Console
 
 from outlook_cli import display
 from outlook_cli.display import _looks_like_html, _strip_html
 
 
+@pytest.fixture(autouse=True)
+def _restore_console():
+    """Put the module console back so later tests don't write into a buffer."""
+    original = display.console
+    yield
+    display.console = original
+
+
 def _capture_console():
     """Replace the module console with one that captures output."""
     buf = StringIO()
@@ -69,6 +78,23 @@ def test_print_mail_table_empty():
     assert "Messages" in output
 
 
+def test_print_body_prints_every_piece_literally():
+    buf = _capture_console()
+    body = "".join(f"<p>[line {n}]</p>" for n in range(2000))
+    display._print_body(body)
+    output = buf.getvalue()
+    assert "[line 0]" in output
+    assert "[line 1999]" in output
+
+
+def test_print_body_truncates_after_max_chars():
+    buf = _capture_console()
+    display._print_body("<p>" + "x" * 5000 + "</p>", max_chars=1024)
+    output = buf.getvalue()
+    assert output.count("x") == 1024
+    assert "truncated after 1 KB" in output
+
+
 # ── _strip_html / _looks_like_html ──────────────────────────
 
 
@@ -0,0 +1,165 @@
+"""Tests for iCalendar writing and ``cal export``."""
+
+import time
+from datetime import date
+from unittest.mock import patch
+
+import pytest
+from typer.testing import CliRunner
+
+from outlook_cli import calendar_view, exporter, ical, ids, importer
+from outlook_cli.main import app
+from tests.fake_graph import CalendarView, event_resource, install_default_routes
+
+runner = CliRunner()
+
+
+@pytest.fixture(autouse=True)
+def _utc(monkeypatch):
+    monkeypatch.setenv("TZ", "UTC")
+    time.tzset()
+    yield
+    monkeypatch.undo()
+    time.tzset()
+
+
+@pytest.fixture()
+def calendar(fake_graph):
+    install_default_routes(fake_graph, events=0)
+    view = CalendarView(fake_graph)
+    view.add(*(event_resource(i, iCalUId=f"uid-{i}") for i in range(10)))
+    return view
+
+
+@pytest.fixture()
+def mock_get(graph_account):
+    with patch("outlook_cli.commands.cal_cmd.get_account") as mock:
+        mock.return_value = graph_account
+        yield mock
+
+
+def _view(account, page_size=100):
+    return calendar_view.CalendarView(
+        calendar_view.connect(calendar_view.db_path(ids.account_key(account))),
+        account.con,
+        account.protocol.service_url,
+        "cal",
+        fields=exporter.EXPORT_FIELDS,
+        page_size=page_size,
+    )
+
+
+def test_vevent_round_trips_through_the_reader():
+    resource = event_resource(
+        3,
+        iCalUId="040000008200E00074C5B7101A82E008",
+        subject="Plan; review, and more",
+        body={"contentType": "html", "content": "<html><p>Line one</p><br>Line two " + "x" * 80 + "</html>"},
+        attendees=[
+            {
+                "type": "optional",
+                "status": {"response": "accepted"},
+                "emailAddress": {"name": "Doe, Jane", "address": "jane@example.com"},
+            }
+        ],
+        lastModifiedDateTime="2025-01-20T08:00:00.123Z",
+    )
+    text = exporter.vevent(resource)
+    assert all(len(line.encode()) <= 75 for line in text.split("\r\n"))
+    unfolded = list(ical.unfold(text.splitlines(keepends=True)))
+    assert 'ATTENDEE;CN="Doe, Jane";ROLE=OPT-PARTICIPANT;PARTSTAT=ACCEPTED:mailto:jane@example.com' in unfolded
+    assert "DTSTAMP:20250120T080000Z" in text
+
+    (parsed,) = importer.read_ics(text.splitlines(keepends=True))
+    assert parsed.subject == "Plan; review, and more"
+    assert parsed.uid == "040000008200E00074C5B7101A82E008"
+    assert parsed.start == calendar_view.instant(resource["start"])
+    assert parsed.body == "Line one\nLine two " + "x" * 80
+
+
+def test_vevent_all_day_and_occurrence():
+    resource = event_resource(
+        4,
+        isAllDay=True,
+        type="occurrence",
+        originalStart="2025-02-05T00:00:00Z",
+        start={"dateTime": "2025-02-05T00:00:00.0000000", "timeZone": "UTC"},
+        end={"dateTime": "2025-02-06T00:00:00.0000000", "timeZone": "UTC"},
+        showAs="free",
+    )
+    text = exporter.vevent(resource)
+    assert "DTSTART;VALUE=DATE:20250205\r\n" in text
+    assert "DTEND;VALUE=DATE:20250206\r\n" in text
+    assert "RECURRENCE-ID;VALUE=DATE:20250205\r\n" in text
+    assert "TRANSP:TRANSPARENT\r\n" in text
+
+
+def test_fold_keeps_multibyte_characters_whole():
+    line = ical.content_line("SUMMARY", "ø" * 60)
+    assert all(len(part.encode()) <= 75 for part in line.split("\r\n"))
+    assert list(ical.unfold(line.splitlines(keepends=True))) == ["SUMMARY:" + "ø" * 60]
+
+
+def test_export_file_is_incremental(graph_account, calendar, fake_graph, config_dir):
+    path = config_dir / "cal.ics"
+    view = _view(graph_account)
+    first = exporter.export_file(view, date(2025, 2, 1), date(2025, 3, 1), path)
+    assert (first.added, first.changed, first.removed) == (10, 0, 0)
+    content = path.read_bytes()
+    assert content.startswith(b"BEGIN:VCALENDAR\r\n") and content.endswith(b"END:VCALENDAR\r\n")
+    assert [event.uid for event in importer.read_ics(content.decode().splitlines())] == [
+        f"uid-{i}" for i in range(10)
+    ]
+
+    # Nothing changed: the file is not touched.
+    mtime = path.stat().st_mtime_ns
+    again = exporter.export_file(_view(graph_account), date(2025, 2, 1), date(2025, 3, 1), path)
+    assert not again.rewritten and again.unchanged == 10
+    assert path.stat().st_mtime_ns == mtime
+
+    calendar.change("evt-2", subject="Moved")
+    calendar.remove("evt-5")
+    calendar.add(event_resource(20, iCalUId="uid-20"))
+    view = _view(graph_account)
+    third = exporter.export_file(view, date(2025, 2, 1), date(2025, 3, 1), path)
+    assert (third.added, third.changed, third.unchanged, third.removed) == (1, 1, 8, 1)
+    # Only the changed days were downloaded again.
+    assert len(view.refetched) == 3
+    subjects = [event.subject for event in importer.read_ics(path.read_text().splitlines())]
+    assert "Moved" in subjects and "Event 5" not in subjects and "Event 20" in subjects
+    assert path.read_bytes().count(b"BEGIN:VEVENT") == 10
+
+
+def test_export_file_starts_over_after_edits(graph_account, calendar, config_dir):
+    path = config_dir / "cal.ics"
+    exporter.export_file(_view(graph_account), date(2025, 2, 1), date(2025, 3, 1), path)
+    path.write_bytes(path.read_bytes().replace(b"Event 1\r\n", b"Edited\r\n"))
+    result = exporter.export_file(_view(graph_account), date(2025, 2, 1), date(2025, 3, 1), path)
+    assert result.rewritten and result.added == 10
+    assert b"Edited" not in path.read_bytes()
+
+
+def test_cal_export_to_file_and_stdout(mock_get, calendar, tmp_path):
+    path = tmp_path / "feb.ics"
+    args = ["cal", "export", "--start", "2025-02-01", "--end", "2025-03-01"]
+    result = runner.invoke(app, [*args, "--out", str(path)])
+    assert result.exit_code == 0, result.output
+    assert "Exported 10 events" in result.output
+    assert "up to date" in " ".join(runner.invoke(app, [*args, "--out", str(path)]).output.split())
+
+    result = runner.invoke(app, ["cal", "export", "--start", "2025-02-03", "--end", "2025-02-05"])
+    assert result.exit_code == 0
+    assert [event.subject for event in importer.read_ics(result.stdout.splitlines())] == ["Event 2", "Event 3"]
+
+
+def test_cal_export_is_not_forwarded_to_the_daemon(mock_get, calendar):
+    with patch("outlook_cli.daemon.forward") as forward:
+        result = runner.invoke(app, ["cal", "export", "--start", "2025-02-03", "--end", "2025-02-05"])
+    assert result.exit_code == 0, result.output
+    assert "BEGIN:VCALENDAR" in result.stdout
+    forward.assert_not_called()
+
+
+def test_cal_export_rejects_empty_range(mock_get):
+    result = runner.invoke(app, ["cal", "export", "--start", "2025-02-05", "--end", "2025-02-05"])
+    assert result.exit_code == 1
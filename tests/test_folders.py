@@ -0,0 +1,186 @@
+"""Tests for the local folder map, ``mail folders`` and multi-folder search."""
+
+import json
+import time
+from unittest.mock import patch
+
+import pytest
+from typer.testing import CliRunner
+
+from outlook_cli import folders, ids
+from outlook_cli.folders import FolderMap
+from outlook_cli.main import app
+from tests.fake_graph import FolderMessages, FolderTree, folder_resource, message_resource
+
+runner = CliRunner()
+
+
+@pytest.fixture()
+def tree(fake_graph):
+    return FolderTree(fake_graph)
+
+
+def _synced(graph_account, **kwargs) -> FolderMap:
+    folder_map = FolderMap()
+    folders.sync(folder_map, graph_account.con, graph_account.protocol.service_url, **kwargs)
+    return folder_map
+
+
+def test_resolve_paths_and_names(graph_account, tree):
+    folder_map = _synced(graph_account)
+    assert folder_map.resolve("Projects/2025/Q1").id == "projects-2025-q1"
+    assert folder_map.resolve("projects/2025").id == "projects-2025"
+    assert folder_map.resolve("Q1").id == "projects-2025-q1"
+    assert folder_map.resolve("archive").id == "archive"
+    # Two folders are called "2025", so the bare name is ambiguous.
+    assert folder_map.resolve("2025") is None
+    assert folder_map.resolve("Projects/Nope") is None
+
+
+def test_sync_pages_and_continues_from_delta_link(graph_account, tree):
+    folder_map = _synced(graph_account, page_size=4)
+    assert len(folder_map.folders) == 6
+    assert folder_map.delta_link
+
+    tree.add(folder_resource("projects-2025-q2", "Q2", "projects-2025"))
+    tree.remove("archive-2025")
+    requests = folders.sync(folder_map, graph_account.con, graph_account.protocol.service_url)
+    assert requests == 1
+    assert folder_map.resolve("Projects/2025/Q2").id == "projects-2025-q2"
+    assert "archive-2025" not in folder_map.folders
+    assert folder_map.resolve("2025").id == "projects-2025"
+
+
+def test_expired_delta_link_reloads_tree(graph_account, tree):
+    folder_map = _synced(graph_account)
+    tree.expired.add(len(tree.log))
+    tree.remove("archive")
+
+    folders.sync(folder_map, graph_account.con, graph_account.protocol.service_url)
+    assert "archive" not in folder_map.folders
+    assert len(folder_map.folders) == 5
+
+
+def test_map_round_trips_through_cache(config_dir, graph_account, tree):
+    path = folders.cache_path(ids.account_key(graph_account))
+    _synced(graph_account).save(path)
+    loaded = FolderMap.load(path)
+    assert loaded.path(loaded.folders["projects-2025-q1"]) == "Projects/2025/Q1"
+    assert loaded.delta_link
+
+
+def test_corrupt_cache_loads_empty(config_dir):
+    path = folders.cache_path("someone@example.com")
+    path.write_text("{not json")
+    assert FolderMap.load(path).folders == {}
+
+
+@patch("outlook_cli.commands.mail_cmd.get_account")
+def test_search_nested_folder_resolves_from_cache(mock_get, graph_account, fake_graph, tree):
+    mock_get.return_value = graph_account
+    fake_graph.route("GET", r"/me/mailFolders/(?P<id>[^/]+)/messages")(lambda req: {"value": []})
+
+    result = runner.invoke(app, ["mail", "search", "--folder", "Projects/2025/Q1"])
+    assert result.exit_code == 0
+    result = runner.invoke(app, ["mail", "search", "--folder", "Projects/2025/Q1"])
+    assert result.exit_code == 0
+
+    paths = [req.path for req in fake_graph.requests]
+    assert paths.count("/me/mailFolders/delta") == 1
+    assert paths.count("/me/mailFolders/projects-2025-q1/messages") == 2
+
+
+@patch("outlook_cli.commands.mail_cmd.get_account")
+def test_folders_command_lists_tree(mock_get, graph_account, fake_graph, tree):
+    mock_get.return_value = graph_account
+
+    result = runner.invoke(app, ["mail", "folders"])
+    assert result.exit_code == 0
+    assert "Q1" in result.output
+    assert len(fake_graph.requests) == 1
+
+
+@patch("outlook_cli.commands.mail_cmd.get_account")
+def test_folders_command_jsonl(mock_get, graph_account, tree):
+    mock_get.return_value = graph_account
+
+    result = runner.invoke(app, ["--output", "jsonl", "mail", "folders"])
+    assert result.exit_code == 0
+    records = [json.loads(line) for line in result.output.splitlines()]
+    assert [record["path"] for record in records] == [
+        "Archive", "Archive/2025", "Inbox", "Projects", "Projects/2025", "Projects/2025/Q1",
+    ]
+    assert records[-1]["unread"] == 2
+
+
+# ── Searching several folders ──────────────────────────────────
+
+SEARCHED = {"inbox": "Inbox", "archive": "Archive", "projects-2025-q1": "Projects/2025/Q1"}
+
+
+def _received(index: int, folder: int) -> str:
+    minutes = index * 3 + folder
+    return f"2025-02-{1 + minutes // 1440:02d}T{minutes // 60 % 24:02d}:{minutes % 60:02d}:00Z"
+
+
+@pytest.fixture()
+def folder_messages(graph_account, fake_graph, tree):
+    """300 messages in each searched folder, interleaved in time."""
+    with patch("outlook_cli.commands.mail_cmd.get_account") as mock_get:
+        mock_get.return_value = graph_account
+        yield FolderMessages(
+            fake_graph,
+            {
+                key: [
+                    message_resource(index * 3 + offset, receivedDateTime=_received(index, offset))
+                    for index in range(300)
+                ]
+                for offset, key in enumerate(SEARCHED)
+            },
+        )
+
+
+def _searched(*args: str) -> list[dict]:
+    result = runner.invoke(app, ["--output", "jsonl", "mail", "search", *args])
+    assert result.exit_code == 0, result.output
+    return [json.loads(line) for line in result.stdout.splitlines()]
+
+
+def test_search_several_folders_merges_newest_first(folder_messages):
+    records = _searched("--folder", "Inbox", "--folder", "archive", "--folder", "Projects/2025/Q1", "--limit", "9")
+    assert [record["id"] for record in records] == [f"msg-{index}" for index in range(899, 890, -1)]
+    assert [record["folder"] for record in records[:3]] == ["Projects/2025/Q1", "archive", "Inbox"]
+
+
+def test_search_all_folders(folder_messages, fake_graph):
+    records = _searched("--all-folders", "--limit", "5")
+    assert len(records) == 5
+    assert {record["folder"] for record in records} == set(SEARCHED.values())
+    assert fake_graph.count("GET", "/me/mailFolders/delta") == 1
+    # Every folder in the tree is searched, empty ones included.
+    assert fake_graph.count("GET", r"/me/mailFolders/[^/]+/messages") == 6
+
+
+def test_search_several_folders_stops_at_limit(folder_messages, fake_graph):
+    records = _searched("--folder", "Inbox", "--folder", "Archive", "--folder", "Q1", "--limit", "150")
+    assert len(records) == 150
+    # 150 messages come from the first page of each folder (and at most one
+    # page read ahead), never from all nine pages.
+    assert fake_graph.count("GET", r"/me/mailFolders/[^/]+/messages") <= 6
+
+
+def test_search_fetches_folders_concurrently(folder_messages, fake_graph):
+    @fake_graph.route("GET", r"/me/mailFolders/(?P<folder>[^/]+)/messages")
+    def _slow(req):
+        time.sleep(0.1)
+        return folder_messages._messages(req)
+
+    records = _searched("--folder", "Inbox", "--folder", "Archive", "--folder", "Q1")
+    assert len(records) == 25
+    assert fake_graph.peak_in_flight == len(SEARCHED)
+
+
+def test_search_several_folders_table(folder_messages):
+    result = runner.invoke(app, ["mail", "search", "--folder", "Inbox", "--folder", "Archive", "--limit", "4"])
+    assert result.exit_code == 0, result.output
+    assert "Folder" in result.output and "Archive" in result.output
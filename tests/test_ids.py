@@ -0,0 +1,120 @@
+"""Tests for the persistent ID cache (ids.json) and --refresh-ids."""
+
+import json
+from unittest.mock import patch
+
+import pytest
+from typer.testing import CliRunner
+
+from outlook_cli import ids
+from outlook_cli.main import app
+from tests.fake_graph import CalendarView, event_resource, install_default_routes
+
+runner = CliRunner()
+
+WINDOW = ["--start", "2025-02-01", "--end", "2025-03-01"]
+LOOKUP = r"^/me/calendar$"
+
+
+@pytest.fixture(autouse=True)
+def _no_refresh(monkeypatch):
+    monkeypatch.setattr(ids, "refresh", False)
+
+
+@pytest.fixture()
+def calendar(graph_account, fake_graph):
+    install_default_routes(fake_graph, events=0)
+    view = CalendarView(fake_graph)
+    view.add(*(event_resource(i) for i in range(3)))
+    with patch("outlook_cli.commands.cal_cmd.get_account") as mock:
+        mock.return_value = graph_account
+        yield view
+
+
+def _list(*args: str) -> None:
+    result = runner.invoke(app, [*args, "cal", "list", *WINDOW])
+    assert result.exit_code == 0, result.output
+
+
+def test_cache_round_trip(config_dir):
+    cache = ids.IdCache()
+    cache.put("me@graph", ids.DEFAULT_CALENDAR, {"id": "cal-1", "name": "Calendar"})
+    cache.save()
+    loaded = ids.IdCache.load()
+    assert loaded.get("me@graph", ids.DEFAULT_CALENDAR) == {"id": "cal-1", "name": "Calendar"}
+    assert loaded.get("other@graph", ids.DEFAULT_CALENDAR) is None
+    assert loaded.forget("me@graph", ids.DEFAULT_CALENDAR)
+    assert not loaded.forget("me@graph", ids.DEFAULT_CALENDAR)
+
+
+def test_unreadable_cache_is_empty(config_dir):
+    (config_dir / ids.CACHE_FILENAME).write_text("{not json")
+    assert ids.IdCache.load().accounts == {}
+
+
+def test_account_paths_are_distinct_and_stable(config_dir):
+    mine = ids.account_path("me@graph", "mirror.db")
+    assert mine.parent == config_dir
+    assert mine.name.startswith("mirror-") and mine.suffix == ".db"
+    assert mine == ids.account_path("me@graph", "mirror.db")
+    assert mine != ids.account_path("other@graph", "mirror.db")
+
+
+def test_warm_run_skips_calendar_lookup(calendar, fake_graph, config_dir):
+    _list()
+    assert fake_graph.count("GET", LOOKUP) == 1
+    _list()
+    _list()
+    assert fake_graph.count("GET", LOOKUP) == 1
+    (section,) = json.loads((config_dir / ids.CACHE_FILENAME).read_text())["accounts"].values()
+    assert section[ids.DEFAULT_CALENDAR] == {"id": "cal-default", "name": "Calendar"}
+
+
+def test_refresh_ids_looks_up_again(calendar, fake_graph):
+    _list()
+    _list("--refresh-ids")
+    assert fake_graph.count("GET", LOOKUP) == 2
+    # The flag lasts for one invocation only.
+    _list()
+    assert fake_graph.count("GET", LOOKUP) == 2
+
+
+def test_not_found_forgets_cached_id(calendar, fake_graph, graph_account):
+    _list()
+    key = ids.account_key(graph_account)
+    assert ids.IdCache.load().get(key, ids.DEFAULT_CALENDAR) is not None
+
+    fake_graph.inject(r"/me/calendars/cal-default/", status=404, times=1)
+    result = runner.invoke(app, ["cal", "list", "--start", "2025-04-01", "--end", "2025-04-02"])
+    assert result.exit_code == 1
+    assert "Failed to list events" in result.output
+    assert ids.IdCache.load().get(key, ids.DEFAULT_CALENDAR) is None
+
+    _list()
+    assert fake_graph.count("GET", LOOKUP) == 2
+
+
+def test_only_the_calendar_itself_missing_counts():
+    assert ids.calendar_missing("cal-1", "/v1.0/me/calendars/cal-1/calendarView", 404, None)
+    assert ids.calendar_missing("cal-1", "/v1.0/me/calendars/cal-1/events", 400, {"error": {"code": ids.NOT_FOUND}})
+    # An event that isn't there, or a failure that isn't "not found", keeps the id.
+    assert not ids.calendar_missing("cal-1", "/v1.0/me/calendars/cal-1/events/evt-9", 404, None)
+    assert not ids.calendar_missing("cal-1", "/v1.0/me/calendars/cal-1/calendarView", 503, None)
+    assert not ids.calendar_missing("cal-1", "/v1.0/me/calendars/cal-12/events", 404, None)
+
+
+def test_forget_calendar_only_drops_the_cached_id(calendar, graph_account):
+    _list()
+    key = ids.account_key(graph_account)
+    assert not ids.forget_calendar(graph_account, "some-other-calendar")
+    assert ids.IdCache.load().get(key, ids.DEFAULT_CALENDAR) is not None
+    assert ids.forget_calendar(graph_account, "cal-default")
+    assert ids.IdCache.load().get(key, ids.DEFAULT_CALENDAR) is None
+
+
+def test_entries_are_per_account(calendar, fake_graph, graph_account):
+    _list()
+    with patch.object(type(graph_account), "username", new="someone-else@example.com"):
+        _list()
+    assert fake_graph.count("GET", LOOKUP) == 2
+    assert len(ids.IdCache.load().accounts) == 2
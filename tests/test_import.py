@@ -0,0 +1,307 @@
+"""Tests for ICS/CSV parsing and ``cal import``."""
+
+import time
+from datetime import date, datetime, timedelta, timezone
+from unittest.mock import patch
+from zoneinfo import ZoneInfo
+
+import pytest
+import requests
+from typer.testing import CliRunner
+
+from outlook_cli import ical, importer
+from outlook_cli.main import app
+from tests.fake_graph import install_default_routes
+
+runner = CliRunner()
+
+ICS = """BEGIN:VCALENDAR\r
+VERSION:2.0\r
+BEGIN:VTIMEZONE\r
+TZID:Europe/Copenhagen\r
+BEGIN:STANDARD\r
+DTSTART:19701025T030000\r
+END:STANDARD\r
+END:VTIMEZONE\r
+BEGIN:VEVENT\r
+UID:planning-1@example.com\r
+SUMMARY:Planning\\, Q3\r
+DTSTART;TZID="Europe/Copenhagen":20250210T090000\r
+DTEND;TZID="Europe/Copenhagen":20250210T100000\r
+DESCRIPTION:Agenda:\\nbudget and \r
+ hiring\r
+LOCATION:Room 1\r
+BEGIN:VALARM\r
+ACTION:DISPLAY\r
+DESCRIPTION:Reminder\r
+END:VALARM\r
+END:VEVENT\r
+BEGIN:VEVENT\r
+UID:offsite@example.com\r
+SUMMARY:Offsite\r
+DTSTART;VALUE=DATE:20250212\r
+END:VEVENT\r
+BEGIN:VEVENT\r
+SUMMARY:Call\r
+DTSTART:20250211T140000Z\r
+DURATION:PT1H30M\r
+END:VEVENT\r
+END:VCALENDAR\r
+"""
+
+
+@pytest.fixture(autouse=True)
+def _utc(monkeypatch):
+    monkeypatch.setenv("TZ", "UTC")
+    time.tzset()
+    yield
+    monkeypatch.undo()
+    time.tzset()
+
+
+@pytest.fixture()
+def created(fake_graph):
+    install_default_routes(fake_graph, events=0)
+    bodies = []
+
+    @fake_graph.route("POST", r"/me/calendars/(?P<cal>[^/]+)/events")
+    def _create(req):
+        body = req.json()
+        if body["subject"] == "Broken":
+            return 400, {"error": {"code": "ErrorInvalidRequest", "message": "Bad event"}}
+        bodies.append(body)
+        return {**body, "id": f"evt-new-{len(bodies)}"}
+
+    return bodies
+
+
+@pytest.fixture()
+def mock_get(graph_account):
+    with patch("outlook_cli.commands.cal_cmd.get_account") as mock:
+        mock.return_value = graph_account
+        yield mock
+
+
+# ── Parsing ───────────────────────────────────────────────────
+
+
+def test_ics_unfolds_unescapes_and_skips_alarms():
+    events = list(importer.read_ics(ICS.splitlines(keepends=True)))
+    assert [event.subject for event in events] == ["Planning, Q3", "Offsite", "Call"]
+    planning = events[0]
+    assert planning.body == "Agenda:\nbudget and hiring"
+    assert planning.location == "Room 1"
+    # Copenhagen is UTC+1 in February.
+    assert planning.start == datetime(2025, 2, 10, 8, tzinfo=timezone.utc)
+    assert planning.end - planning.start == timedelta(hours=1)
+
+
+def test_ics_all_day_and_duration():
+    _, offsite, call = importer.read_ics(ICS.splitlines())
+    assert offsite.all_day and offsite.end - offsite.start == timedelta(days=1)
+    payload = offsite.payload()
+    assert payload["isAllDay"] is True
+    assert payload["start"]["dateTime"] == "2025-02-12T00:00:00"
+    assert payload["end"]["dateTime"] == "2025-02-13T00:00:00"
+    assert call.end == datetime(2025, 2, 11, 15, 30, tzinfo=timezone.utc)
+
+
+def test_ics_keys_follow_uid_or_content():
+    planning, offsite, call = importer.read_ics(ICS.splitlines())
+    again = list(importer.read_ics(ICS.replace("Room 1", "Room 2").splitlines()))
+    # Same UID: same key, whatever else changed; no UID: key from subject and times.
+    assert [event.key for event in again] == [planning.key, offsite.key, call.key]
+    assert planning.payload()["transactionId"] == planning.key
+    assert len({planning.key, offsite.key, call.key}) == 3
+
+
+def test_parse_line_keeps_quoted_colons():
+    assert ical.parse_line('ATTENDEE;CN="Doe: Jane":mailto:jane@example.com') == (
+        "ATTENDEE",
+        {"CN": "Doe: Jane"},
+        "mailto:jane@example.com",
+    )
+
+
+def test_parse_datetime_forms():
+    assert ical.parse_datetime(({}, "20250210")) == (datetime(2025, 2, 10, tzinfo=timezone.utc), True)
+    assert ical.parse_datetime(({}, "20250210T090000Z"))[0] == datetime(2025, 2, 10, 9, tzinfo=timezone.utc)
+    # Unknown zones (e.g. Windows names) fall back to local time.
+    unknown = ical.parse_datetime(({"TZID": "W. Europe Standard Time"}, "20250210T090000"))[0]
+    assert unknown == datetime(2025, 2, 10, 9, tzinfo=timezone.utc)
+    assert ical.parse_duration("-P1DT2H") == -timedelta(days=1, hours=2)
+
+
+def test_rrules_map_to_graph_recurrence():
+    start = datetime(2025, 2, 10, 9, tzinfo=ZoneInfo("Europe/Copenhagen"))  # a Monday
+    weekly = importer.recurrence("FREQ=WEEKLY;INTERVAL=2;BYDAY=MO,WE;COUNT=10", start)
+    assert weekly == {
+        "pattern": {"type": "weekly", "interval": 2, "daysOfWeek": ["monday", "wednesday"], "firstDayOfWeek": "monday"},
+        "range": {
+            "startDate": "2025-02-10",
+            "recurrenceTimeZone": "Europe/Copenhagen",
+            "type": "numbered",
+            "numberOfOccurrences": 10,
+        },
+    }
+    workdays = importer.recurrence("FREQ=DAILY;BYDAY=MO,TU,WE,TH,FR;UNTIL=20250301T000000Z", start)
+    assert workdays["pattern"]["type"] == "weekly" and len(workdays["pattern"]["daysOfWeek"]) == 5
+    assert workdays["range"] == {
+        "startDate": "2025-02-10",
+        "recurrenceTimeZone": "Europe/Copenhagen",
+        "type": "endDate",
+        "endDate": "2025-03-01",
+    }
+    assert importer.recurrence("FREQ=MONTHLY;BYDAY=-1FR", start)["pattern"] == {
+        "interval": 1,
+        "type": "relativeMonthly",
+        "daysOfWeek": ["friday"],
+        "index": "last",
+    }
+    assert importer.recurrence("FREQ=YEARLY", start)["pattern"] == {
+        "interval": 1,
+        "type": "absoluteYearly",
+        "dayOfMonth": 10,
+        "month": 2,
+    }
+    for unsupported in ("FREQ=HOURLY", "FREQ=MONTHLY;BYDAY=MO", "FREQ=MONTHLY;BYMONTHDAY=1,15", "FREQ=WEEKLY;BYHOUR=9"):
+        with pytest.raises(ValueError):
+            importer.recurrence(unsupported, start)
+
+
+def test_cal_import_creates_series_and_reports_what_it_cannot(mock_get, created, tmp_path):
+    path = tmp_path / "series.ics"
+    path.write_text(
+        "BEGIN:VCALENDAR\n"
+        "BEGIN:VEVENT\nUID:standup\nSUMMARY:Standup\nDTSTART;TZID=Europe/Copenhagen:20250210T090000\n"
+        "DURATION:PT15M\nRRULE:FREQ=WEEKLY;BYDAY=MO,TU,WE,TH,FR\nEND:VEVENT\n"
+        "BEGIN:VEVENT\nUID:standup\nRECURRENCE-ID;TZID=Europe/Copenhagen:20250212T090000\nSUMMARY:Standup\n"
+        "DTSTART;TZID=Europe/Copenhagen:20250212T100000\nDURATION:PT15M\nEND:VEVENT\n"
+        "BEGIN:VEVENT\nUID:gym\nSUMMARY:Gym\nDTSTART:20250210T170000Z\nDURATION:PT1H\n"
+        "RRULE:FREQ=WEEKLY\nEXDATE:20250217T170000Z\nEND:VEVENT\n"
+        "BEGIN:VEVENT\nUID:pay\nSUMMARY:Payday\nDTSTART;VALUE=DATE:20250215\n"
+        "RRULE:FREQ=MONTHLY;BYMONTHDAY=15,30\nEND:VEVENT\n"
+        "END:VCALENDAR\n"
+    )
+
+    result = runner.invoke(app, ["cal", "import", str(path)])
+
+    assert result.exit_code == 0, result.output
+    assert "1 created" in result.output and "3 not supported" in result.output
+    assert "event 2: Standup: changed occurrences" in result.output
+    assert "event 3: Gym: recurring events with EXDATE" in result.output
+    assert "event 4: Payday" in result.output
+    [standup] = created
+    # A series keeps its wall-clock time, so it doesn't move with DST.
+    assert standup["start"] == {"dateTime": "2025-02-10T09:00:00", "timeZone": "Europe/Copenhagen"}
+    assert standup["end"] == {"dateTime": "2025-02-10T09:15:00", "timeZone": "Europe/Copenhagen"}
+    assert standup["recurrence"]["pattern"]["daysOfWeek"][-1] == "friday"
+
+
+def test_csv_reader():
+    lines = [
+        "Subject,Start,End,Location,uid\n",
+        "Standup,2025-02-10 09:00,2025-02-10 09:15,,s-1\n",
+        "Review,2025-02-10T13:00:00+01:00,2025-02-10T14:00:00+01:00,Room 2,\n",
+    ]
+    standup, review = importer.read_csv(lines)
+    assert standup.uid == "s-1" and standup.location is None
+    assert review.start == datetime(2025, 2, 10, 12, tzinfo=timezone.utc)
+    assert review.location == "Room 2"
+
+
+def test_csv_reader_rejects_bad_rows():
+    with pytest.raises(importer.ImportFormatError, match="start"):
+        list(importer.read_csv(["subject,end\n"]))
+    with pytest.raises(importer.ImportFormatError, match="line 2"):
+        list(importer.read_csv(["subject,start,end\n", "X,tomorrow,later\n"]))
+
+
+# ── Import ────────────────────────────────────────────────────
+
+
+def _events(count: int, subject: str = "Event"):
+    first = datetime(2025, 2, 10, 9, tzinfo=timezone.utc)
+    for index in range(count):
+        start = first + timedelta(hours=index)
+        yield importer.NewEvent(f"{subject} {index}", start, start + timedelta(minutes=30), uid=f"uid-{index}")
+
+
+def test_run_import_batches_and_journals(graph_account, created, fake_graph, config_dir):
+    journal = importer.connect_journal()
+    url = graph_account.protocol.service_url
+
+    result = importer.run_import(_events(45), graph_account.con, url, "cal", journal, workers=2)
+    assert result.created == 45 and result.skipped == 0 and not result.failed
+    assert fake_graph.count("POST", r"/\$batch") == 3 == result.request_count
+    assert sorted(body["subject"] for body in created) == sorted(f"Event {i}" for i in range(45))
+
+    # A rerun with more events only creates the new ones.
+    again = importer.run_import(_events(50), graph_account.con, url, "cal", journal)
+    assert again.created == 5 and again.skipped == 45
+    assert len(created) == 50
+    # Another calendar has its own journal entries.
+    other = importer.run_import(_events(1), graph_account.con, url, "other", journal)
+    assert other.created == 1
+    journal.close()
+
+
+def test_run_import_skips_duplicates_in_file(graph_account, created, config_dir):
+    journal = importer.connect_journal()
+    events = [*_events(2), *_events(2)]
+    result = importer.run_import(events, graph_account.con, graph_account.protocol.service_url, "cal", journal)
+    assert result.created == 2 and result.skipped == 2
+    journal.close()
+
+
+def test_cal_import_ics_then_rerun(mock_get, created, fake_graph, tmp_path):
+    path = tmp_path / "events.ics"
+    path.write_text(ICS, newline="")
+
+    result = runner.invoke(app, ["cal", "import", str(path)])
+    assert result.exit_code == 0, result.output
+    assert "3 created, 0 already imported" in result.output
+    assert fake_graph.count("POST", r"/\$batch") == 1
+
+    result = runner.invoke(app, ["cal", "import", str(path)])
+    assert result.exit_code == 0
+    assert "0 created, 3 already imported" in result.output
+    assert len(created) == 3
+    assert fake_graph.count("POST", r"/\$batch") == 1
+
+
+def test_cal_import_csv_reports_failures(mock_get, created, tmp_path):
+    path = tmp_path / "events.txt"
+    path.write_text(
+        "subject,start,end\n"
+        "Fine,2025-02-10 09:00,2025-02-10 10:00\n"
+        "Broken,2025-02-10 11:00,2025-02-10 12:00\n"
+    )
+    assert "--format" in runner.invoke(app, ["cal", "import", str(path)]).output
+
+    result = runner.invoke(app, ["cal", "import", str(path), "--format", "csv"])
+    assert result.exit_code == 1
+    assert "line 3: Broken" in result.output
+    assert "1 created" in result.output and "1 failed" in result.output
+
+    # The failed event is retried on the next run; the created one is not.
+    result = runner.invoke(app, ["cal", "import", str(path), "--format", "csv"])
+    assert "0 created, 1 already imported, 1 failed" in result.output
+    assert [body["subject"] for body in created] == ["Fine"]
+
+
+def test_cal_import_reports_graph_errors_as_such(mock_get, created, tmp_path):
+    path = tmp_path / "events.ics"
+    path.write_text(ICS, newline="")
+
+    with patch("outlook_cli.importer.execute", side_effect=requests.ConnectionError("connection reset")):
+        result = runner.invoke(app, ["cal", "import", str(path)])
+
+    assert result.exit_code == 1
+    assert "Import failed" in result.output and "Cannot read" not in result.output
+
+
+def test_ics_date_start_is_local_midnight():
+    event = next(importer.read_ics(["BEGIN:VEVENT", "DTSTART;VALUE=DATE:20250301", "END:VEVENT"]))
+    assert event.start.date() == date(2025, 3, 1)
+    assert event.subject == ""
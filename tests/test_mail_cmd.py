@@ -47,12 +47,13 @@ def test_search_with_query(mock_get, mock_account, mock_message):
 @patch("outlook_cli.commands.mail_cmd.get_account")
 def test_read_message(mock_get, mock_print, mock_message):
     account = mock_get.return_value
+    account.con.default_headers = {}
     mailbox = account.mailbox.return_value
     mailbox.get_message.return_value = mock_message
 
     result = runner.invoke(app, ["mail", "read", "msg-123"])
     assert result.exit_code == 0
-    mock_print.assert_called_once_with(mock_message)
+    mock_print.assert_called_once_with(mock_message, max_chars=None, unique=False)
 
 
 @patch("outlook_cli.commands.mail_cmd.get_account")
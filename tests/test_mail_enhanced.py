@@ -72,8 +72,8 @@ def test_search_has_attachments_filter(mock_get, mock_account):
 
 
 @patch("outlook_cli.commands.mail_cmd.get_account")
-def test_search_text_with_filters_warns(mock_get, mock_account, mock_message):
-    """Text search + filters should warn that filters are ignored."""
+def test_search_text_with_filters_warns(mock_get, mock_account, mock_message, config_dir):
+    """Text search + filters should warn that filters are ignored when the folder is not mirrored."""
     mock_get.return_value = mock_account
     inbox = mock_account.mailbox().inbox_folder()
     inbox.get_messages.return_value = iter([mock_message])
@@ -1,5 +1,8 @@
 """CLI integration tests for main app."""
 
+import subprocess
+import sys
+
 from typer.testing import CliRunner
 
 from outlook_cli import __version__
@@ -20,3 +23,32 @@ def test_help():
     assert "auth" in result.output
     assert "mail" in result.output
     assert "cal" in result.output
+
+
+def test_subcommands_resolve_lazily():
+    result = runner.invoke(app, ["mail", "--help"])
+    assert result.exit_code == 0
+    assert "search" in result.output
+
+
+def test_output_format_is_checked():
+    result = runner.invoke(app, ["-o", "xml", "auth", "--help"])
+    assert result.exit_code == 2
+    assert "'xml' is not one of table, json, jsonl" in result.output
+
+
+def test_version_does_not_import_heavy_modules():
+    """``--version`` must not pay for O365, msal or the subcommand modules."""
+    code = (
+        "import sys\n"
+        "from outlook_cli.main import app\n"
+        "try:\n"
+        "    app(['--version'])\n"
+        "except SystemExit:\n"
+        "    pass\n"
+        "heavy = ('O365', 'msal', 'outlook_cli.commands.mail_cmd', 'outlook_cli.commands.cal_cmd',\n"
+        "         'outlook_cli.output', 'outlook_cli.ids')\n"
+        "print('loaded:', ','.join(m for m in heavy if m in sys.modules))\n"
+    )
+    proc = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert proc.stdout.splitlines()[-1] == "loaded: "
@@ -0,0 +1,187 @@
+"""Tests for mail merge (``mail send --batch``)."""
+
+import json
+import time
+from itertools import count
+from unittest.mock import patch
+
+import pytest
+from typer.testing import CliRunner
+
+from outlook_cli import merge
+from outlook_cli.main import app
+from tests.fake_graph import Outbox
+
+runner = CliRunner()
+
+ROWS = [
+    {"email": "ann@example.com", "name": "Ann", "amount": "10.00"},
+    {"email": "bob@example.com", "name": "Bob", "amount": "20.50"},
+    {"email": "cy@example.com", "name": "Cy <admin>", "amount": "7.25"},
+]
+
+
+@pytest.fixture()
+def outbox(graph_account, fake_graph):
+    with patch("outlook_cli.commands.mail_cmd.get_account") as mock_get:
+        mock_get.return_value = graph_account
+        yield Outbox(fake_graph)
+
+
+def _csv(path, rows):
+    lines = [",".join(rows[0])] + [",".join(row.values()) for row in rows]
+    path.write_text("\n".join(lines) + "\n")
+    return path
+
+
+def _batch(rows_path, *args: str, body: str = "Hi {name}, you owe {amount}."):
+    return runner.invoke(
+        app,
+        [
+            "mail", "send", "--batch", str(rows_path),
+            "--to", "{email}", "--subject", "Invoice for {name}", "--body", body,
+            "--per-minute", "0", *args,
+        ],
+    )
+
+
+def _journal(path) -> list[dict]:
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+def test_render_fills_columns_and_keeps_escaped_braces():
+    row = {"name": "Ann & co", "n": 3}
+    assert merge.render("{{literal}} {name}: { n }", row) == "{literal} Ann & co: 3"
+    assert merge.render("<p>{name}</p>", row, escape=True) == "<p>Ann &amp; co</p>"
+    with pytest.raises(merge.MergeError, match="'missing'"):
+        merge.render("{missing}", row)
+
+
+def test_read_rows_csv_and_jsonl(tmp_path):
+    assert list(merge.read_rows(_csv(tmp_path / "rows.csv", ROWS))) == ROWS
+    jsonl = tmp_path / "rows.jsonl"
+    jsonl.write_text("\n".join(json.dumps(row) for row in ROWS) + "\n\n")
+    assert list(merge.read_rows(jsonl)) == ROWS
+    jsonl.write_text("[1, 2]\n")
+    with pytest.raises(merge.MergeError, match="line 1"):
+        list(merge.read_rows(jsonl))
+
+
+def test_batch_sends_one_message_per_row(outbox, tmp_path):
+    rows = _csv(tmp_path / "rows.csv", ROWS)
+
+    result = _batch(rows)
+
+    assert result.exit_code == 0, result.output
+    assert "Sent 3 message(s), 0 failed" in result.output
+    by_recipient = {message["toRecipients"][0]["emailAddress"]["address"]: message for message in outbox.sent}
+    assert by_recipient["bob@example.com"]["subject"] == "Invoice for Bob"
+    assert by_recipient["bob@example.com"]["body"] == {"contentType": "Text", "content": "Hi Bob, you owe 20.50."}
+    journal = _journal(tmp_path / "rows.csv.journal.jsonl")
+    assert sorted(entry["row"] for entry in journal) == [1, 2, 3]
+    assert {entry["status"] for entry in journal} == {"sent"}
+
+
+def test_rerun_sends_only_failed_rows(outbox, fake_graph, tmp_path):
+    rows = [*ROWS, {"email": "", "name": "Nobody", "amount": "0"}]
+    path = _csv(tmp_path / "rows.csv", rows)
+    fake_graph.inject(r"/me/sendMail", status=400, times=1, retry_after=None)
+
+    first = _batch(path, "--workers", "1")
+
+    assert first.exit_code == 1
+    assert "Row 4: no recipient" in first.output
+    assert "Sent 2 message(s), 2 failed" in first.output
+
+    rows[3]["email"] = "nobody@example.com"
+    _csv(path, rows)
+    second = _batch(path)
+
+    assert second.exit_code == 0, second.output
+    assert "Sent 2 message(s), 0 failed, 2 already sent" in second.output
+    recipients = sorted(message["toRecipients"][0]["emailAddress"]["address"] for message in outbox.sent)
+    assert recipients == ["ann@example.com", "bob@example.com", "cy@example.com", "nobody@example.com"]
+    third = _batch(path)
+    assert "Sent 0 message(s), 0 failed, 4 already sent" in third.output
+
+
+def test_unreadable_row_journals_the_sends_in_flight(outbox, tmp_path):
+    rows = tmp_path / "rows.jsonl"
+    valid = [{"email": f"user{index}@example.com", "name": f"User {index}", "amount": "1"} for index in range(6)]
+    rows.write_text("".join(json.dumps(row) + "\n" for row in valid) + "{not json\n")
+
+    first = _batch(rows)
+
+    assert first.exit_code == 1
+    assert "line 7" in first.output
+    assert len(outbox.sent) == 6
+    journal = _journal(tmp_path / "rows.jsonl.journal.jsonl")
+    assert sorted(entry["row"] for entry in journal) == [1, 2, 3, 4, 5, 6]
+
+    rows.write_text("".join(json.dumps(row) + "\n" for row in valid))
+    second = _batch(rows)
+    assert "Sent 0 message(s), 0 failed, 6 already sent" in second.output
+    assert len(outbox.sent) == 6
+
+
+def test_throttled_sends_are_retried(outbox, fake_graph, tmp_path):
+    fake_graph.inject(r"/me/sendMail", status=429, times=2, retry_after="0")
+
+    result = _batch(_csv(tmp_path / "rows.csv", ROWS))
+
+    assert result.exit_code == 0, result.output
+    assert len(outbox.sent) == 3
+
+
+def test_html_template_escapes_values_and_attachments_are_shared(outbox, tmp_path):
+    template = tmp_path / "notice.html"
+    template.write_text("<p>Dear {name},</p>")
+    terms = tmp_path / "terms.txt"
+    terms.write_text("Terms apply.")
+
+    result = runner.invoke(
+        app,
+        [
+            "mail", "send", "--batch", str(_csv(tmp_path / "rows.csv", ROWS)), "--journal", str(tmp_path / "j.jsonl"),
+            "--to", "{email}", "--subject", "Notice", "--template", str(template), "--attach", str(terms),
+            "--per-minute", "0",
+        ],
+    )
+
+    assert result.exit_code == 0, result.output
+    cy = next(message for message in outbox.sent if "Cy" in message["body"]["content"])
+    assert cy["body"] == {"contentType": "HTML", "content": "<p>Dear Cy &lt;admin&gt;,</p>"}
+    assert all(Outbox.attachments(message) == {"terms.txt": b"Terms apply."} for message in outbox.sent)
+    assert (tmp_path / "j.jsonl").exists()
+
+
+def test_body_or_template_is_required(tmp_path):
+    result = runner.invoke(app, ["mail", "send", "--to", "a@example.com", "--subject", "S"])
+    assert result.exit_code == 1
+    assert "--body or --template" in result.output
+
+
+def test_sends_are_paced_bounded_and_read_lazily(graph_account, fake_graph, tmp_path):
+    Outbox(fake_graph)
+    consumed = count()
+    rows = ({"email": f"user{next(consumed)}@example.com"} for _ in range(50))
+    seen_at_first_result: list[int] = []
+
+    started = time.monotonic()
+    summary = merge.send_all(
+        graph_account.con,
+        fake_graph.service_url,
+        rows,
+        merge.Template("{email}", "Hello", "Body"),
+        merge.Journal(tmp_path / "journal.jsonl"),
+        workers=2,
+        per_minute=6000,
+        on_result=lambda result: seen_at_first_result or seen_at_first_result.append(next(consumed)),
+    )
+
+    assert summary.sent == 50
+    # 100 a second, evenly spaced: 49 gaps of 10 ms.
+    assert time.monotonic() - started >= 0.45
+    assert fake_graph.peak_in_flight <= 2
+    # At most the in-flight window (twice the workers) is read ahead.
+    assert seen_at_first_result[0] <= 2 * 2 + 1
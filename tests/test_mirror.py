@@ -0,0 +1,256 @@
+"""Tests for the local mailbox mirror and ``mail sync`` / ``mail search --offline``."""
+
+import json
+from datetime import datetime
+from unittest.mock import patch
+
+import pytest
+from requests.exceptions import HTTPError
+from typer.testing import CliRunner
+
+from outlook_cli import ids, mirror
+from outlook_cli.main import app
+from tests.fake_graph import DeltaFolder, FakeResponse, FolderTree, message_resource
+
+runner = CliRunner()
+
+
+@pytest.fixture()
+def inbox(fake_graph):
+    folder = DeltaFolder(fake_graph, "Inbox")
+    folder.add(*(message_resource(i) for i in range(25)))
+    return folder
+
+
+@pytest.fixture()
+def db(graph_account):
+    connection = mirror.connect(mirror.db_path(ids.account_key(graph_account)))
+    yield connection
+    connection.close()
+
+
+def _sync(db, account, **kwargs):
+    return mirror.sync_folder(db, account.con, account.protocol.service_url, "Inbox", "Inbox", page_size=10, **kwargs)
+
+
+def test_initial_sync_walks_all_pages(db, graph_account, inbox, fake_graph):
+    result = _sync(db, graph_account)
+
+    assert (result.upserted, result.total, result.requests) == (25, 25, 3)
+    assert result.full
+    first = fake_graph.requests[0]
+    assert "odata.maxpagesize=10" in first.headers["prefer"]
+    assert "body" not in first.query["$select"].split(",")
+
+
+def test_incremental_sync_transfers_only_changes(db, graph_account, inbox):
+    _sync(db, graph_account)
+    inbox.add(message_resource(3, isRead=True, subject="Edited"), message_resource(99))
+    inbox.remove("msg-4")
+
+    result = _sync(db, graph_account)
+
+    assert (result.upserted, result.removed, result.requests) == (2, 1, 1)
+    assert not result.full
+    assert result.total == 25
+    edited = mirror.search(db, query="Edited")
+    assert [msg.object_id for msg in edited] == ["msg-3"]
+    assert edited[0].is_read
+
+
+def test_unchanged_folder_costs_one_request(db, graph_account, inbox):
+    _sync(db, graph_account)
+    result = _sync(db, graph_account)
+    assert (result.upserted, result.removed, result.requests) == (0, 0, 1)
+
+
+def test_interrupted_sync_resumes_from_next_link(db, graph_account, inbox, fake_graph):
+    calls = {"count": 0}
+    original = fake_graph.routes[-1][2]
+
+    @fake_graph.route("GET", r"/me/mailFolders/Inbox/messages/delta")
+    def _flaky(req):
+        calls["count"] += 1
+        if calls["count"] == 2:
+            # Not a status the HTTP layer retries, so the sync stops here.
+            return FakeResponse(403, {"error": {"message": "interrupted"}})
+        return original(req)
+
+    with pytest.raises(HTTPError):
+        _sync(db, graph_account)
+    assert db.execute("SELECT COUNT(*) FROM messages").fetchone()[0] == 10
+
+    result = _sync(db, graph_account)
+    assert result.resumed
+    assert (result.upserted, result.requests, result.total) == (15, 2, 25)
+
+
+def test_expired_delta_token_triggers_full_resync(db, graph_account, inbox):
+    _sync(db, graph_account)
+    inbox.expired.add(len(inbox.log))
+    inbox.remove("msg-0")
+
+    result = _sync(db, graph_account)
+    assert result.full
+    assert result.total == 24
+
+
+def test_bodies_are_only_kept_when_requested(db, graph_account, inbox, fake_graph):
+    _sync(db, graph_account, bodies=True)
+    assert "body" in fake_graph.requests[0].query["$select"].split(",")
+    found = mirror.search(db, query="Body 7")
+    assert [msg.object_id for msg in found] == ["msg-7"]
+    assert found[0].body.startswith("Body of message")
+
+    _sync(db, graph_account)
+    assert mirror.search(db, query="Body 7") == []
+
+
+def test_offline_search_combines_text_and_filters(db, graph_account, inbox):
+    _sync(db, graph_account)
+
+    results = mirror.search(db, query="message", unread=True, has_attachments=True)
+    # Unread: index % 3 == 0; attachments: index % 5 == 0.
+    assert {msg.object_id for msg in results} == {"msg-0", "msg-15"}
+
+    results = mirror.search(db, sender="sender2@", start=datetime(2025, 2, 10), end=datetime(2025, 2, 28))
+    assert all(msg.sender.endswith("<sender2@example.com>") for msg in results)
+    assert all(datetime(2025, 2, 9) < msg.received.replace(tzinfo=None) for msg in results)
+
+    newest_first = mirror.search(db, limit=3)
+    assert [msg.received for msg in newest_first] == sorted((msg.received for msg in newest_first), reverse=True)
+
+
+def test_text_search_ranks_by_bm25(db):
+    with db:
+        mirror.apply_changes(db, "Inbox", [
+            message_resource(1, subject="Lunch plans", body={"content": "the quarterly report is attached"}),
+            message_resource(2, subject="Quarterly report", body={"content": "quarterly report draft"}),
+            message_resource(3, subject="Unrelated", body={"content": "nothing to see"}),
+        ])
+
+    assert [msg.object_id for msg in mirror.search(db, query="quarterly report")] == ["msg-2", "msg-1"]
+    assert [msg.object_id for msg in mirror.search(db, query="quart*")] == ["msg-2", "msg-1"]
+    # Operators and punctuation in user input are matched literally, not parsed.
+    assert mirror.search(db, query='report" OR "nothing') == []
+    assert [msg.object_id for msg in mirror.search(db, query="sender3@example.com")] == ["msg-3"]
+
+
+def test_index_follows_updates_and_removals(db):
+    with db:
+        mirror.apply_changes(db, "Inbox", [message_resource(1, subject="Budget review")])
+    with db:
+        mirror.apply_changes(db, "Inbox", [message_resource(1, subject="Offsite agenda")])
+    assert mirror.search(db, query="budget") == []
+    assert [msg.object_id for msg in mirror.search(db, query="offsite")] == ["msg-1"]
+
+    with db:
+        mirror.apply_changes(db, "Inbox", [{"id": "msg-1", "@removed": {"reason": "deleted"}}])
+    assert mirror.search(db, query="offsite") == []
+    assert db.execute("SELECT COUNT(*) FROM messages_fts").fetchone()[0] == 0
+
+
+def test_outdated_mirror_is_rebuilt(config_dir):
+    import sqlite3
+
+    path = mirror.db_path("someone@example.com")
+    legacy = sqlite3.connect(path)
+    legacy.execute("CREATE TABLE messages (folder TEXT, id TEXT, PRIMARY KEY (folder, id))")
+    legacy.commit()
+    legacy.close()
+
+    db = mirror.connect(path)
+    assert db.execute("PRAGMA user_version").fetchone()[0] == mirror.SCHEMA_VERSION
+    assert "pk" in {row["name"] for row in db.execute("PRAGMA table_info(messages)")}
+    db.close()
+
+
+# ── CLI ───────────────────────────────────────────────────────
+
+
+@patch("outlook_cli.commands.mail_cmd.get_account")
+def test_sync_command(mock_get, graph_account, inbox):
+    mock_get.return_value = graph_account
+
+    result = runner.invoke(app, ["mail", "sync"])
+    assert result.exit_code == 0
+    assert "Inbox: 25 updated, 0 removed" in result.output
+    assert "25 messages mirrored" in result.output
+
+    result = runner.invoke(app, ["mail", "sync"])
+    assert "incremental, 1 request(s)" in result.output
+
+
+@patch("outlook_cli.commands.mail_cmd.get_account")
+def test_sync_unknown_folder(mock_get, graph_account, fake_graph):
+    FolderTree(fake_graph)
+    mock_get.return_value = graph_account
+
+    result = runner.invoke(app, ["mail", "sync", "--folder", "Nope"])
+    assert result.exit_code == 1
+    assert "folder not found" in result.output.lower()
+
+
+@pytest.fixture()
+def signed_in(graph_account):
+    with patch("outlook_cli.commands.mail_cmd.get_account") as mock_get:
+        mock_get.return_value = graph_account
+        yield graph_account
+
+
+def test_search_offline_uses_mirror_only(signed_in, db, fake_graph, inbox):
+    _sync(db, signed_in)
+    fake_graph.requests.clear()
+
+    result = runner.invoke(app, ["mail", "search", "Message", "--offline", "--important"])
+    assert result.exit_code == 0
+    assert "Warning" not in result.output
+    assert "msg-10" in result.output
+    assert "msg-11" not in result.output
+    assert not fake_graph.requests
+
+
+def test_search_text_with_filters_uses_mirror(signed_in, db, fake_graph, inbox):
+    _sync(db, signed_in)
+    fake_graph.requests.clear()
+
+    result = runner.invoke(app, ["mail", "search", "message", "--from", "sender0@", "--has-attachments"])
+    assert result.exit_code == 0
+    synced_at = db.execute("SELECT synced_at FROM folders").fetchone()[0]
+    assert f"local mirror as of the sync of {datetime.fromisoformat(synced_at).astimezone():%Y-%m-%d %H:%M}" in (
+        " ".join(result.output.split())
+    )
+    assert "msg-0" in result.output
+    assert "msg-1 " not in result.output
+    assert not fake_graph.requests
+
+
+def test_search_offline_requires_sync(signed_in):
+    result = runner.invoke(app, ["mail", "search", "--offline", "--folder", "Archive"])
+    assert result.exit_code == 1
+    assert "not mirrored" in result.output.lower()
+
+
+def test_mirrors_are_kept_per_account(signed_in, db, graph_account, inbox):
+    _sync(db, graph_account)
+    assert runner.invoke(app, ["mail", "search", "--offline"]).output.count("msg-") > 0
+
+    graph_account.con.username = "other@example.com"
+    result = runner.invoke(app, ["mail", "search", "--offline"])
+    assert result.exit_code == 1
+    assert "not mirrored" in result.output.lower()
+
+
+def test_search_offline_across_folders(signed_in, db):
+    with db:
+        for name, indexes in (("Inbox", range(0, 6)), ("Archive", range(6, 12))):
+            db.execute("INSERT INTO folders (name, folder_id) VALUES (?, ?)", (name, name.lower()))
+            mirror.apply_changes(db, name, [message_resource(i) for i in indexes])
+
+    result = runner.invoke(app, ["--output", "jsonl", "mail", "search", "--offline", "--all-folders", "--limit", "50"])
+    assert result.exit_code == 0, result.output
+    records = [json.loads(line) for line in result.output.splitlines()]
+    assert sorted(record["folder"] for record in records) == ["Archive"] * 6 + ["Inbox"] * 6
+
+    result = runner.invoke(app, ["mail", "search", "--offline", "--folder", "archive", "--limit", "50"])
+    assert "msg-7" in result.output and "msg-1 " not in result.output
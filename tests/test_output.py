@@ -0,0 +1,145 @@
+"""Tests for the ``--output`` machine-readable formats."""
+
+import csv
+import io
+import json
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+import pytest
+from typer.testing import CliRunner
+
+from outlook_cli import output
+from outlook_cli.main import _command_path, app
+from outlook_cli.mirror import MirroredMessage
+from outlook_cli.output import EVENT_FIELDS, MESSAGE_FIELDS, OutputFormat
+from tests.fake_graph import install_default_routes
+
+runner = CliRunner()
+
+
+def _message(index: int) -> MirroredMessage:
+    return MirroredMessage(
+        object_id=f"msg-{index}",
+        folder="Inbox",
+        subject=f"Subject {index}, with a comma",
+        sender=f"Sender {index} <sender{index}@example.com>",
+        received=datetime(2025, 2, 1, 10, index, tzinfo=timezone.utc),
+        is_read=index % 2 == 0,
+        importance="normal",
+        has_attachments=False,
+        to=["me@example.com", "team@example.com"],
+        cc=[],
+        body="",
+    )
+
+
+def _write(fmt, items):
+    out = io.StringIO()
+    count = output.write(items, output.message_record, MESSAGE_FIELDS, fmt=fmt, out=out)
+    return count, out.getvalue()
+
+
+def test_message_record():
+    assert output.message_record(_message(1)) == {
+        "id": "msg-1",
+        "received": "2025-02-01T10:01:00+00:00",
+        "from_name": "Sender 1",
+        "from_address": "sender1@example.com",
+        "subject": "Subject 1, with a comma",
+        "is_read": False,
+        "importance": "normal",
+        "has_attachments": False,
+        "to": ["me@example.com", "team@example.com"],
+        "cc": [],
+    }
+
+
+def test_json_is_one_array():
+    count, text = _write(OutputFormat.json, (_message(i) for i in range(3)))
+    assert count == 3
+    assert [record["id"] for record in json.loads(text)] == ["msg-0", "msg-1", "msg-2"]
+
+
+def test_json_empty_is_empty_array():
+    assert _write(OutputFormat.json, [])[1] == "[]\n"
+
+
+def test_jsonl_one_record_per_line():
+    _, text = _write(OutputFormat.jsonl, (_message(i) for i in range(3)))
+    lines = text.splitlines()
+    assert len(lines) == 3
+    assert json.loads(lines[1])["subject"] == "Subject 1, with a comma"
+
+
+@pytest.mark.parametrize("fmt, delimiter", [(OutputFormat.csv, ","), (OutputFormat.tsv, "\t")])
+def test_delimited_has_header_and_flat_cells(fmt, delimiter):
+    _, text = _write(fmt, [_message(1)])
+    rows = list(csv.reader(io.StringIO(text), delimiter=delimiter))
+    assert rows[0] == list(MESSAGE_FIELDS)
+    record = dict(zip(rows[0], rows[1]))
+    assert record["subject"] == "Subject 1, with a comma"
+    assert record["is_read"] == "false"
+    assert record["to"] == "me@example.com;team@example.com"
+
+
+def test_records_are_written_as_items_arrive():
+    out = io.StringIO()
+
+    def arriving():
+        yield _message(1)
+        assert "msg-1" in out.getvalue()
+        yield _message(2)
+
+    assert output.write(arriving(), output.message_record, MESSAGE_FIELDS, fmt=OutputFormat.jsonl, out=out) == 2
+
+
+def test_command_path_skips_root_options():
+    assert _command_path(["mail", "search"]) == ("mail", "search")
+    assert _command_path(["--output", "json", "mail", "search"]) == ("mail", "search")
+    assert _command_path(["-o", "csv", "cal", "list"]) == ("cal", "list")
+    assert _command_path(["--output=jsonl", "mail"]) == ("mail", None)
+    assert _command_path(["--version"]) == (None, None)
+
+
+# ── Commands ──────────────────────────────────────────────────
+
+
+@patch("outlook_cli.commands.mail_cmd.get_account")
+def test_mail_search_jsonl(mock_get, graph_account, fake_graph):
+    mock_get.return_value = graph_account
+    install_default_routes(fake_graph, messages=250)
+
+    result = runner.invoke(app, ["--output", "jsonl", "mail", "search", "--limit", "230"])
+    assert result.exit_code == 0
+    records = [json.loads(line) for line in result.stdout.splitlines()]
+    assert len(records) == 230
+    assert records[0]["id"] == "msg-0"
+    assert records[0]["to"] == ["me@example.com"]
+    assert "body" not in records[0]
+    assert "toRecipients" in fake_graph.requests[-1].query["$select"].split(",")
+
+
+@patch("outlook_cli.commands.mail_cmd.get_account")
+def test_mail_search_warning_stays_off_stdout(mock_get, graph_account, fake_graph, config_dir):
+    mock_get.return_value = graph_account
+    install_default_routes(fake_graph)
+
+    result = runner.invoke(app, ["-o", "json", "mail", "search", "Message", "--unread"])
+    assert result.exit_code == 0
+    assert isinstance(json.loads(result.stdout), list)
+    assert "Filters are ignored" in result.stderr
+
+
+@patch("outlook_cli.commands.cal_cmd.get_account")
+def test_cal_list_csv(mock_get, graph_account, fake_graph):
+    mock_get.return_value = graph_account
+    install_default_routes(fake_graph, events=3)
+
+    result = runner.invoke(app, ["-o", "csv", "cal", "list", "--start", "2025-02-01", "--end", "2025-03-01"])
+    assert result.exit_code == 0
+    rows = list(csv.DictReader(io.StringIO(result.stdout)))
+    assert tuple(rows[0]) == EVENT_FIELDS
+    assert [row["subject"] for row in rows] == ["Event 0", "Event 1", "Event 2"]
+    assert rows[0]["organizer"] == "boss@example.com"
+    assert rows[0]["location"] == "Room 0"
@@ -0,0 +1,181 @@
+"""Tests for resumable ``--cursor`` paging in ``mail search`` and ``cal list``."""
+
+import json
+import re
+import time
+from unittest.mock import patch
+
+import pytest
+from typer.testing import CliRunner
+
+from outlook_cli import paging
+from outlook_cli.main import app
+from tests.fake_graph import (
+    CalendarView,
+    FolderMessages,
+    FolderTree,
+    event_resource,
+    install_default_routes,
+    message_resource,
+)
+
+runner = CliRunner()
+
+WINDOW = ["--start", "2025-02-01", "--end", "2025-03-01"]
+
+
+@pytest.fixture(autouse=True)
+def _utc(monkeypatch):
+    monkeypatch.setenv("TZ", "UTC")
+    time.tzset()
+    yield
+    monkeypatch.undo()
+    time.tzset()
+
+
+@pytest.fixture()
+def mail(graph_account, fake_graph):
+    install_default_routes(fake_graph, messages=25, events=0)
+    with patch("outlook_cli.commands.mail_cmd.get_account") as mock_get:
+        mock_get.return_value = graph_account
+        yield fake_graph
+
+
+@pytest.fixture()
+def calendar(graph_account, fake_graph):
+    install_default_routes(fake_graph, events=0)
+    view = CalendarView(fake_graph)
+    # One instance a day, plus one sharing evt-3's start to exercise ties.
+    view.add(*(event_resource(i) for i in range(20)), event_resource(100, start=event_resource(3)["start"]))
+    with patch("outlook_cli.commands.cal_cmd.get_account") as mock_get:
+        mock_get.return_value = graph_account
+        yield view
+
+
+def _run(*args: str) -> tuple[list[dict], str]:
+    """Records on stdout and the cursor printed on stderr (or None)."""
+    result = runner.invoke(app, ["--output", "jsonl", *args])
+    assert result.exit_code == 0, result.output
+    match = re.search(r"--cursor (\S+)", result.stderr)
+    return [json.loads(line) for line in result.stdout.splitlines()], match.group(1) if match else None
+
+
+def test_token_round_trip():
+    token = paging.encode("mail", {"folders": {"Inbox": ["https://graph/v1.0/me/x?$skip=10", 3]}})
+    assert re.fullmatch(r"[A-Za-z0-9_-]+", token)
+    assert paging.decode(token, "mail")["folders"] == {"Inbox": ["https://graph/v1.0/me/x?$skip=10", 3]}
+    with pytest.raises(paging.CursorError, match="mail"):
+        paging.decode(token, "events")
+    with pytest.raises(paging.CursorError):
+        paging.decode("not-a-cursor", "mail")
+
+
+def test_pages_report_the_position_after_each_item(graph_account, fake_graph):
+    install_default_routes(fake_graph, messages=7, events=0)
+    url = f"{graph_account.protocol.service_url}me/mailFolders/Inbox/messages?$top=3"
+    items = list(paging.pages(graph_account.con, (url, 1)))
+    assert [item["id"] for item, _ in items] == [f"msg-{i}" for i in range(1, 7)]
+    assert items[0][1] == (url, 2)
+    assert "skip=3" in items[1][1][0] and items[1][1][1] == 0
+    assert items[-1][1] is None
+
+
+def test_mail_search_resumes_mid_page(mail):
+    first, cursor = _run("mail", "search", "--limit", "12", "--page-size", "5")
+    assert [record["id"] for record in first] == [f"msg-{i}" for i in range(12)]
+    assert cursor and mail.count("GET", "/messages") == 3
+
+    second, cursor = _run("mail", "search", "--limit", "12", "--cursor", cursor)
+    assert [record["id"] for record in second] == [f"msg-{i}" for i in range(12, 24)]
+    # Continues from the page it stopped in; the first pages are not fetched again.
+    assert mail.count("GET", "/messages") == 6
+
+    third, cursor = _run("mail", "search", "--limit", "12", "--cursor", cursor)
+    assert [record["id"] for record in third] == ["msg-24"]
+    assert cursor is None
+
+
+def test_mail_cursor_keeps_filters(mail):
+    _, cursor = _run("mail", "search", "--unread", "--limit", "2")
+    mail.requests.clear()
+    _run("mail", "search", "--cursor", cursor)
+    assert "isRead eq false" in mail.requests[0].query["$filter"]
+
+
+def test_mail_cursor_across_folders(graph_account, fake_graph):
+    FolderTree(fake_graph)
+    FolderMessages(
+        fake_graph,
+        {
+            key: [message_resource(i * 2 + n, receivedDateTime=f"2025-02-01T10:{i * 2 + n:02d}:00Z") for i in range(15)]
+            for n, key in enumerate(("inbox", "archive"))
+        },
+    )
+    with patch("outlook_cli.commands.mail_cmd.get_account") as mock_get:
+        mock_get.return_value = graph_account
+        args = ["mail", "search", "--folder", "Inbox", "--folder", "Archive"]
+        everything, _ = _run(*args, "--limit", "30")
+        first, cursor = _run(*args, "--limit", "7", "--page-size", "4")
+        second, cursor = _run("mail", "search", "--limit", "30", "--cursor", cursor)
+    assert first + second == everything
+    assert cursor is None
+    assert {record["folder"] for record in second} == {"Inbox", "Archive"}
+
+
+def test_mail_cursor_drops_used_up_folders(graph_account, fake_graph):
+    FolderTree(fake_graph)
+    FolderMessages(
+        fake_graph,
+        {
+            "inbox": [message_resource(i, receivedDateTime=f"2025-02-01T10:{i:02d}:00Z") for i in range(10)],
+            "archive": [],
+            "projects": [message_resource(50, receivedDateTime="2025-02-01T11:00:00Z")],
+        },
+    )
+    with patch("outlook_cli.commands.mail_cmd.get_account") as mock_get:
+        mock_get.return_value = graph_account
+        args = ["mail", "search", "--folder", "Inbox", "--folder", "Archive", "--folder", "Projects"]
+        first, cursor = _run(*args, "--limit", "4", "--page-size", "3")
+        # Archive had nothing and Projects' only message was shown: only Inbox is left.
+        assert [record["folder"] for record in first] == ["Projects", "Inbox", "Inbox", "Inbox"]
+        assert len(paging.decode(cursor, "mail")["folders"]) == 1
+        fake_graph.requests.clear()
+        second, cursor = _run("mail", "search", "--limit", "30", "--cursor", cursor)
+    assert len(second) == 7 and cursor is None
+    assert all("/inbox/" in req.path.lower() for req in fake_graph.requests if "/messages" in req.path)
+
+
+def test_cursor_outside_graph_endpoint_is_refused(mail):
+    token = paging.encode("mail", {"folders": {"Inbox": ["https://attacker.example/steal", 0]}, "labels": None})
+    result = runner.invoke(app, ["mail", "search", "--cursor", token])
+    assert result.exit_code == 1
+    assert not mail.requests
+
+
+def test_cal_list_resumes_after_last_instance(calendar):
+    everything, cursor = _run("cal", "list", *WINDOW, "--limit", "100")
+    assert len(everything) == 21 and cursor is None
+
+    pages, cursor = [], None
+    for _ in range(10):
+        args = ["--cursor", cursor] if cursor else WINDOW
+        records, cursor = _run("cal", "list", *args, "--limit", "4")
+        pages.append(records)
+        if cursor is None:
+            break
+    assert [record["id"] for page in pages for record in page] == [record["id"] for record in everything]
+    assert [len(page) for page in pages] == [4, 4, 4, 4, 4, 1]
+
+
+def test_cal_list_cursor_keeps_filters(calendar):
+    calendar.add(event_resource(200, subject="Standup"), event_resource(201, subject="Standup"))
+    first, cursor = _run("cal", "list", *WINDOW, "--subject", "standup", "--limit", "1")
+    second, cursor = _run("cal", "list", "--cursor", cursor, "--limit", "1")
+    assert [record["id"] for record in first + second] == ["evt-200", "evt-201"]
+
+
+def test_cursor_for_another_command_is_refused(mail, calendar):
+    _, cursor = _run("mail", "search", "--limit", "2")
+    result = runner.invoke(app, ["cal", "list", "--cursor", cursor])
+    assert result.exit_code == 1
+    assert "mail" in result.output
@@ -0,0 +1,86 @@
+"""Tests for OData query building and list-view field projections."""
+
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+from typer.testing import CliRunner
+
+from outlook_cli.main import app
+from outlook_cli.query import MAIL_LIST_FIELDS, ODataQuery, parse_fields
+from tests.fake_graph import install_default_routes
+
+runner = CliRunner()
+
+
+def test_filters_are_joined_with_and():
+    query = ODataQuery()
+    query.equals("isRead", False).equals("importance", "high").contains("from/emailAddress/address", "o'brien")
+    query.greater_equal("receivedDateTime", datetime(2025, 1, 1, tzinfo=timezone.utc))
+
+    assert query.as_params() == {
+        "$filter": (
+            "isRead eq false and importance eq 'high' and "
+            "contains(from/emailAddress/address, 'o''brien') and "
+            "receivedDateTime ge 2025-01-01T00:00:00Z"
+        )
+    }
+
+
+def test_search_and_select():
+    query = ODataQuery(select=["id", "subject"]).search('say "hi"')
+    assert query.as_params() == {"$search": '"say \\"hi\\""', "$select": "id,subject"}
+
+
+def test_null_literal():
+    assert ODataQuery().unequal("recurrence", None).as_params() == {"$filter": "recurrence ne null"}
+
+
+def test_parse_fields():
+    assert parse_fields(None, MAIL_LIST_FIELDS) == list(MAIL_LIST_FIELDS)
+    assert parse_fields("subject, body", MAIL_LIST_FIELDS) == ["id", "subject", "body"]
+    assert parse_fields("all", MAIL_LIST_FIELDS) is None
+    assert parse_fields("*", MAIL_LIST_FIELDS) is None
+
+
+# ── Against the stand-in server ───────────────────────────────
+
+
+@patch("outlook_cli.commands.mail_cmd.get_account")
+def test_mail_search_requests_list_fields_only(mock_get, graph_account, fake_graph):
+    mock_get.return_value = graph_account
+    install_default_routes(fake_graph)
+
+    result = runner.invoke(app, ["mail", "search", "--limit", "5", "--unread", "--from", "sender3@"])
+    assert result.exit_code == 0
+    assert "Message 3" in result.output
+
+    request = fake_graph.requests[-1]
+    assert request.query["$select"].split(",") == list(MAIL_LIST_FIELDS)
+    assert request.query["$filter"] == "isRead eq false and contains(from/emailAddress/address, 'sender3@')"
+
+
+@patch("outlook_cli.commands.mail_cmd.get_account")
+def test_mail_search_custom_and_full_fields(mock_get, graph_account, fake_graph):
+    mock_get.return_value = graph_account
+    install_default_routes(fake_graph)
+
+    runner.invoke(app, ["mail", "search", "--fields", "subject,from"])
+    assert fake_graph.requests[-1].query["$select"] == "id,subject,from"
+
+    runner.invoke(app, ["mail", "search", "--fields", "all"])
+    assert "$select" not in fake_graph.requests[-1].query
+
+
+@patch("outlook_cli.commands.cal_cmd.get_account")
+def test_cal_list_requests_list_fields_only(mock_get, graph_account, fake_graph):
+    mock_get.return_value = graph_account
+    install_default_routes(fake_graph)
+
+    result = runner.invoke(app, ["cal", "list", "--start", "2025-02-01", "--end", "2025-02-28"])
+    assert result.exit_code == 0
+    assert "Event 1" in result.output
+
+    request = fake_graph.requests[-1]
+    assert request.path.endswith("/calendarView")
+    assert "body" not in request.query["$select"].split(",")
+    assert "startDateTime" in request.query
@@ -0,0 +1,159 @@
+"""Tests for background prefetch and streamed list rendering."""
+
+import io
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+from typer.testing import CliRunner
+
+from outlook_cli import display
+from outlook_cli.main import app
+from outlook_cli.stream import prefetch
+from tests.fake_graph import install_default_routes
+
+runner = CliRunner()
+
+
+@pytest.fixture()
+def piped_console(monkeypatch):
+    buffer = io.StringIO()
+    monkeypatch.setattr(display, "interactive", None)
+    display.console.file = buffer
+    yield buffer
+    display.console.file = None
+
+
+def _message(index):
+    msg = MagicMock()
+    msg.sender = f"sender{index}@example.com"
+    msg.subject = f"Subject {index}"
+    msg.received = None
+    msg.object_id = f"msg-{index}"
+    msg.is_read = index % 2 == 0
+    msg.importance = "normal"
+    msg.has_attachments = False
+    return msg
+
+
+# ── prefetch ──────────────────────────────────────────────────
+
+
+def test_prefetch_yields_everything_in_order():
+    assert list(prefetch(iter(range(250)), buffer=10)) == list(range(250))
+
+
+def test_prefetch_reraises_fetch_errors():
+    def pages():
+        yield 1
+        raise RuntimeError("page 2 failed")
+
+    iterator = prefetch(pages())
+    assert next(iterator) == 1
+    with pytest.raises(RuntimeError, match="page 2 failed"):
+        next(iterator)
+
+
+def test_prefetch_runs_ahead_of_the_consumer():
+    produced = []
+
+    def pages():
+        for index in range(10):
+            produced.append(index)
+            yield index
+
+    iterator = prefetch(pages(), buffer=3)
+    assert next(iterator) == 0
+    for _ in range(100):
+        if len(produced) >= 4:
+            break
+        time.sleep(0.01)
+    # One consumed, three buffered, the next one waiting to be queued.
+    assert len(produced) >= 4
+    iterator.close()
+
+
+def test_prefetch_stops_worker_when_consumer_quits():
+    produced = []
+    finished = threading.Event()
+
+    def pages():
+        try:
+            for index in range(1000):
+                produced.append(index)
+                yield index
+        finally:
+            finished.set()
+
+    iterator = prefetch(pages(), buffer=2)
+    next(iterator)
+    iterator.close()
+    assert finished.wait(2)
+    assert len(produced) < 10
+
+
+# ── Rendering ─────────────────────────────────────────────────
+
+
+def test_piped_rows_are_written_as_they_arrive(piped_console):
+    def arriving():
+        yield _message(1)
+        # The first row must be on the wire before the second is fetched.
+        assert "Subject 1" in piped_console.getvalue()
+        yield _message(2)
+
+    assert display.stream_mail_table(arriving()) == 2
+    lines = piped_console.getvalue().splitlines()
+    assert lines == [
+        "●\t\t\tsender1@example.com\tSubject 1\t\tmsg-1",
+        "\t\t\tsender2@example.com\tSubject 2\t\tmsg-2",
+    ]
+
+
+def test_interactive_without_live_terminal_prints_one_table(piped_console, monkeypatch):
+    monkeypatch.setattr(display, "interactive", True)
+
+    assert display.stream_mail_table(_message(i) for i in range(3)) == 3
+    output = piped_console.getvalue()
+    assert output.count("Messages") == 1
+    assert "Subject 2" in output
+    assert "\t" not in output
+
+
+# ── Commands ──────────────────────────────────────────────────
+
+
+@patch("outlook_cli.commands.mail_cmd.get_account")
+def test_large_search_streams_pages(mock_get, graph_account, fake_graph):
+    mock_get.return_value = graph_account
+    install_default_routes(fake_graph, messages=250)
+
+    result = runner.invoke(app, ["mail", "search", "--limit", "230"])
+    assert result.exit_code == 0
+    lines = result.output.splitlines()
+    assert len(lines) == 230
+    assert lines[-1].endswith("msg-229")
+    pages = [req for req in fake_graph.requests if req.path.endswith("/messages")]
+    assert [req.query.get("$skip", "0") for req in pages] == ["0", "100", "200"]
+
+
+@patch("outlook_cli.commands.mail_cmd.get_account")
+def test_small_search_keeps_table(mock_get, graph_account, fake_graph):
+    mock_get.return_value = graph_account
+    install_default_routes(fake_graph)
+
+    result = runner.invoke(app, ["mail", "search", "--limit", "5"])
+    assert result.exit_code == 0
+    assert "Messages" in result.output
+
+
+@patch("outlook_cli.commands.cal_cmd.get_account")
+def test_large_cal_list_streams_pages(mock_get, graph_account, fake_graph):
+    mock_get.return_value = graph_account
+    install_default_routes(fake_graph, events=150)
+
+    result = runner.invoke(app, ["cal", "list", "--start", "2025-02-01", "--end", "2025-03-01", "--limit", "150"])
+    assert result.exit_code == 0
+    assert len(result.output.splitlines()) == 150
+    assert fake_graph.count("GET", r"/calendarView") == 2
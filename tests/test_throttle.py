@@ -0,0 +1,209 @@
+"""Tests for request pacing, throttling retries and per-mailbox limits."""
+
+import io
+import threading
+import time
+from unittest.mock import patch
+
+from requests import Response
+from typer.testing import CliRunner
+
+from outlook_cli import throttle
+from outlook_cli.main import app
+from outlook_cli.throttle import Throttle, TokenBucket, mailbox_key, retry_after
+from tests.fake_graph import install_default_routes
+
+runner = CliRunner()
+
+
+class FakeClock:
+    """A monotonic clock that only moves when something sleeps on it."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+        self.sleeps: list[float] = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(round(seconds, 3))
+        self.now += seconds
+
+
+def _response(status: int, **headers: str) -> Response:
+    response = Response()
+    response.status_code = status
+    response.raw = io.BytesIO(b"")
+    response.headers.update(headers)
+    return response
+
+
+def _throttle(clock: FakeClock, **kwargs) -> Throttle:
+    kwargs.setdefault("burst", 1000)
+    return Throttle(sleep=clock.sleep, clock=clock, jitter=lambda: 1.0, **kwargs)
+
+
+def _replies(*statuses_and_headers):
+    replies = iter(statuses_and_headers)
+    return lambda: next(replies)
+
+
+# ── Building blocks ───────────────────────────────────────────
+
+
+def test_token_bucket_paces_after_burst():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=2, capacity=2, clock=clock)
+    assert [bucket.reserve() for _ in range(4)] == [0, 0, 0.5, 1.0]
+    clock.now += 1  # repays the borrowed tokens, none to spare
+    assert bucket.reserve() == 0.5
+
+
+def test_retry_after_header_forms():
+    assert retry_after(_response(429, **{"Retry-After": "7"})) == 7
+    http_date = time.strftime("%a, %d %b %Y %H:%M:%S GMT", time.gmtime(time.time() + 30))
+    assert 25 < retry_after(_response(429, **{"Retry-After": http_date})) <= 30
+    assert retry_after(_response(429, **{"Retry-After": "soon"})) is None
+    assert retry_after(_response(429)) is None
+
+
+def test_mailbox_key():
+    assert mailbox_key("https://graph.microsoft.com/v1.0/me/messages") == "me"
+    assert mailbox_key("https://graph.microsoft.com/v1.0/users/Alice@Example.com/events") == "alice@example.com"
+
+
+# ── Retries ───────────────────────────────────────────────────
+
+
+def test_retry_after_is_honoured():
+    clock = FakeClock()
+    limiter = _throttle(clock)
+    send = _replies(_response(429, **{"Retry-After": "3"}), _response(200))
+
+    assert limiter.send("me", "GET", send).status_code == 200
+    assert clock.sleeps == [3]
+    stats = limiter.snapshot()
+    assert (stats.requests, stats.throttled, stats.retries) == (2, 1, 1)
+
+
+def test_backoff_without_retry_after_then_give_up():
+    clock = FakeClock()
+    limiter = _throttle(clock, max_retries=3)
+
+    response = limiter.send("me", "GET", lambda: _response(503))
+    assert response.status_code == 503
+    assert clock.sleeps == [1, 2, 4]
+    assert limiter.snapshot().requests == 4
+
+
+def test_server_errors_retried_only_for_idempotent_methods():
+    clock = FakeClock()
+    limiter = _throttle(clock)
+
+    assert limiter.send("me", "POST", _replies(_response(500), _response(202))).status_code == 500
+    assert limiter.send("me", "GET", _replies(_response(500), _response(200))).status_code == 200
+    # 503 means the request was not processed, so even a POST is resent.
+    assert limiter.send("me", "POST", _replies(_response(503), _response(202))).status_code == 202
+
+
+def test_throttled_mailbox_holds_back_other_requests():
+    clock = FakeClock()
+    limiter = _throttle(clock)
+    limiter.send("me", "GET", _replies(_response(429, **{"Retry-After": "5"}), _response(200)))
+    clock.sleeps.clear()
+    clock.now -= 2  # the next request arrives while the mailbox is still paused
+
+    limiter.send("me", "GET", lambda: _response(200))
+    assert clock.sleeps == [2]
+    # Other mailboxes are throttled separately.
+    limiter.send("bob@example.com", "GET", lambda: _response(200))
+    assert clock.sleeps == [2]
+
+
+def test_concurrency_is_capped_per_mailbox():
+    limiter = Throttle(burst=1000)
+    active = {"now": 0, "peak": 0}
+    lock = threading.Lock()
+
+    def slow():
+        with lock:
+            active["now"] += 1
+            active["peak"] = max(active["peak"], active["now"])
+        time.sleep(0.02)
+        with lock:
+            active["now"] -= 1
+        return _response(200)
+
+    threads = [
+        threading.Thread(target=limiter.send, args=(mailbox, "GET", slow))
+        for mailbox in ("me", "bob")
+        for _ in range(12)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert limiter.snapshot().peak_concurrency == throttle.MAX_CONCURRENT
+    # Two mailboxes, four slots each.
+    assert active["peak"] == 2 * throttle.MAX_CONCURRENT
+
+
+# ── Against the stand-in server ───────────────────────────────
+
+
+@patch("outlook_cli.commands.mail_cmd.get_account")
+def test_mail_search_survives_429s(mock_get, graph_account, fake_graph):
+    mock_get.return_value = graph_account
+    install_default_routes(fake_graph)
+    clock = FakeClock()
+    limiter = throttle.install(graph_account.con, _throttle(clock))
+    fake_graph.inject(r"/messages$", times=2, retry_after="2")
+
+    result = runner.invoke(app, ["mail", "search", "--limit", "5"])
+    assert result.exit_code == 0
+    assert "Message 0" in result.output
+    assert fake_graph.count("GET", r"/messages$") == 3
+    assert clock.sleeps == [2, 2]
+    assert limiter.snapshot().throttled == 2
+
+
+@patch("outlook_cli.commands.cal_cmd.get_account")
+def test_cal_list_survives_503_without_retry_after(mock_get, graph_account, fake_graph):
+    mock_get.return_value = graph_account
+    install_default_routes(fake_graph)
+    clock = FakeClock()
+    throttle.install(graph_account.con, _throttle(clock))
+    fake_graph.inject(r"/calendarView$", status=503, retry_after=None)
+
+    result = runner.invoke(app, ["cal", "list", "--start", "2025-02-01", "--end", "2025-02-28"])
+    assert result.exit_code == 0
+    assert "Event 1" in result.output
+    assert clock.sleeps == [1]
+
+
+@patch("outlook_cli.commands.mail_cmd.get_account")
+def test_persistent_throttling_still_fails_cleanly(mock_get, graph_account, fake_graph):
+    mock_get.return_value = graph_account
+    install_default_routes(fake_graph)
+    throttle.install(graph_account.con, _throttle(FakeClock(), max_retries=2))
+    fake_graph.inject(r"/messages/msg-1$", times=10)
+
+    result = runner.invoke(app, ["mail", "read", "msg-1"])
+    assert result.exit_code == 1
+    assert fake_graph.count("GET", r"/messages/msg-1$") == 3
+
+
+@patch("outlook_cli.commands.mail_cmd.get_account")
+def test_throttle_stats_reported_on_stderr(mock_get, graph_account, fake_graph, monkeypatch):
+    mock_get.return_value = graph_account
+    install_default_routes(fake_graph)
+    limiter = throttle.install(graph_account.con, _throttle(FakeClock()))
+    monkeypatch.setattr(throttle, "_shared", limiter)
+    fake_graph.inject(r"/messages$")
+
+    result = runner.invoke(app, ["--throttle-stats", "mail", "search", "--limit", "5"])
+    assert result.exit_code == 0
+    assert "Graph: 2 request(s), 1 throttled, 1 retried" in result.stderr
+    assert "Graph:" not in result.stdout
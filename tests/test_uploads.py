@@ -0,0 +1,119 @@
+"""Tests for ``mail send --attach``: inline attachments and upload sessions."""
+
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from typer.testing import CliRunner
+
+from outlook_cli import throttle, uploads
+from outlook_cli.main import app
+from tests.fake_graph import Outbox
+
+runner = CliRunner()
+
+MB = 1024 * 1024
+
+
+def _file(directory: Path, name: str, size: int) -> Path:
+    path = directory / name
+    path.write_bytes(bytes(index % 251 for index in range(size)))
+    return path
+
+
+@pytest.fixture()
+def outbox(graph_account, fake_graph):
+    # Retried chunks shouldn't wait out real backoff delays.
+    throttle.install(graph_account.con, throttle.Throttle(sleep=lambda seconds: None))
+    with patch("outlook_cli.commands.mail_cmd.get_account") as mock_get:
+        mock_get.return_value = graph_account
+        yield Outbox(fake_graph)
+
+
+def _send(*attachments: Path) -> str:
+    args = ["mail", "send", "--to", "bob@example.com", "--subject", "Report", "--body", "Attached."]
+    for path in attachments:
+        args += ["--attach", str(path)]
+    result = runner.invoke(app, args)
+    assert result.exit_code == 0, result.output
+    return result.output
+
+
+def test_plan_sorts_files_by_size(tmp_path):
+    small = _file(tmp_path, "small.txt", 1 * MB)
+    medium = _file(tmp_path, "medium.txt", 5 * MB // 2)
+    large = _file(tmp_path, "large.bin", 4 * MB)
+    huge = tmp_path / "huge.bin"
+    with huge.open("wb") as fh:
+        fh.truncate(uploads.MAX_SIZE + 1)
+
+    plan = uploads.plan([small, medium, large, small])
+    assert plan.inline == [small, small]
+    assert plan.posted == [medium]
+    assert plan.uploaded == [large]
+    assert uploads.plan([small]).needs_draft is False
+    with pytest.raises(ValueError, match="huge.bin"):
+        uploads.plan([huge])
+
+
+def test_small_files_go_inline(outbox, tmp_path):
+    notes = _file(tmp_path, "notes.txt", 2000)
+
+    output = _send(notes)
+
+    assert "sent with 1 attachment" in output
+    assert not outbox.sessions and not outbox.drafts
+    assert Outbox.attachments(outbox.sent[0]) == {"notes.txt": notes.read_bytes()}
+
+
+def test_large_file_uploads_in_chunks(outbox, fake_graph, tmp_path):
+    report = _file(tmp_path, "report.bin", 7 * MB)
+    notes = _file(tmp_path, "notes.txt", 2000)
+
+    output = _send(report, notes)
+
+    assert "Uploaded report.bin (7.0 MB)" in output
+    [message] = outbox.sent
+    assert Outbox.attachments(message) == {"notes.txt": notes.read_bytes(), "report.bin": report.read_bytes()}
+    puts = [req for req in fake_graph.requests if req.method == "PUT"]
+    assert len(puts) == 3
+    assert all(len(req.body) <= uploads.CHUNK_SIZE for req in puts)
+    # The upload URL carries its own credentials; the bearer token stays home.
+    assert all("authorization" not in req.headers for req in puts)
+    assert not outbox.drafts
+
+
+def test_lost_chunk_response_resumes_from_the_session(outbox, fake_graph, tmp_path):
+    report = _file(tmp_path, "report.bin", 7 * MB)
+    outbox.lost = {1}
+
+    _send(report)
+
+    assert Outbox.attachments(outbox.sent[0])["report.bin"] == report.read_bytes()
+    assert fake_graph.count("GET", r"/upload/0") == 1
+
+
+def test_failed_upload_deletes_the_draft(outbox, fake_graph, tmp_path):
+    report = _file(tmp_path, "report.bin", 4 * MB)
+    fake_graph.inject(r"/upload/0", status=404, times=1, retry_after=None)
+
+    result = runner.invoke(
+        app, ["mail", "send", "--to", "bob@example.com", "--subject", "S", "--body", "B", "--attach", str(report)]
+    )
+
+    assert result.exit_code == 1
+    assert "Failed to attach report.bin" in result.output
+    assert outbox.deleted == ["draft-1"]
+    assert not outbox.sent
+
+
+def test_upload_gives_up_after_repeated_failures(graph_account, fake_graph, tmp_path):
+    throttle.install(graph_account.con, throttle.Throttle(sleep=lambda seconds: None, max_retries=0))
+    outbox = Outbox(fake_graph)
+    report = _file(tmp_path, "report.bin", 4 * MB)
+    outbox.drafts["draft-1"] = {"id": "draft-1", "attachments": []}
+    upload_url = uploads.create_session(graph_account.con, fake_graph.service_url, "draft-1", report)
+    fake_graph.inject(r"/upload/0", status=503, times=10, retry_after=None)
+
+    with pytest.raises(uploads.UploadFailed, match="gave up after 2 retries"):
+        uploads.upload(graph_account.con, upload_url, report, max_retries=2, sleep=lambda seconds: None)
@@ -0,0 +1,140 @@
+"""Tests for ``mail watch`` and the delta polling behind it."""
+
+import json
+import shlex
+import sys
+from unittest.mock import patch
+
+import pytest
+from typer.testing import CliRunner
+
+from outlook_cli import watch
+from outlook_cli.main import _command_path, app
+from tests.fake_graph import DeltaFolder, message_resource
+
+runner = CliRunner()
+
+
+@pytest.fixture()
+def inbox(graph_account, fake_graph):
+    folder = DeltaFolder(fake_graph, "Inbox")
+    folder.add(*(message_resource(i) for i in range(25)))
+    with patch("outlook_cli.commands.mail_cmd.get_account") as mock_get:
+        mock_get.return_value = graph_account
+        yield folder
+
+
+def _watch_once(*args: str) -> list[dict]:
+    result = runner.invoke(app, ["mail", "watch", "--once", *args])
+    assert result.exit_code == 0, result.output
+    return [json.loads(line) for line in result.stdout.splitlines()]
+
+
+def test_backoff_resets_on_activity_and_grows_while_idle():
+    backoff = watch.Backoff(10, 60)
+    assert [backoff.next(changes) for changes in (0, 0, 0, 0, 3, 0)] == [20, 40, 60, 60, 10, 20]
+
+
+def test_poll_baseline_then_changes(graph_account, inbox, fake_graph):
+    watcher = watch.Watcher(graph_account.con, graph_account.protocol.service_url, "Inbox", page_size=10)
+    first = watcher.poll()
+    assert first.baseline and not first.changed and first.requests == 3
+
+    inbox.add(message_resource(30), message_resource(3, isRead=True))
+    inbox.remove("msg-4")
+    second = watcher.poll()
+    assert not second.baseline
+    assert [item["id"] for item in second.changed] == ["msg-30", "msg-3"]
+    assert (second.removed, second.requests) == (1, 1)
+
+    assert watcher.poll().changed == []
+
+
+def test_expired_link_takes_a_new_baseline(graph_account, inbox):
+    watcher = watch.Watcher(graph_account.con, graph_account.protocol.service_url, "Inbox")
+    watcher.poll()
+    inbox.expired.add(len(inbox.log))
+    result = watcher.poll()
+    assert result.baseline and not result.changed
+    assert watcher.delta_link
+
+
+def test_follow_waits_by_activity(graph_account, inbox):
+    watcher = watch.Watcher(graph_account.con, graph_account.protocol.service_url, "Inbox")
+    arrivals = iter([[], [message_resource(40)], [], []])
+
+    def _round(result):
+        inbox.add(*next(arrivals))
+
+    waits: list[float] = []
+    watch.follow(watcher, _round, watch.Backoff(5, 30), rounds=4, sleep=waits.append)
+    # Baseline, idle, new mail, idle.
+    assert waits == [10, 20, 5]
+
+
+def test_watch_reports_only_new_and_changed(inbox, config_dir):
+    assert _watch_once() == []
+    assert (config_dir / watch.STATE_FILENAME).exists()
+
+    inbox.add(message_resource(50, subject="Fresh"), message_resource(7, isRead=False))
+    records = _watch_once()
+    assert [(record["id"], record["subject"]) for record in records] == [("msg-50", "Fresh"), ("msg-7", "Message 7")]
+    assert set(records[0]) >= {"received", "from_address", "is_read"}
+
+    assert _watch_once() == []
+
+
+def test_watch_idle_poll_is_one_request(inbox, fake_graph):
+    _watch_once()
+    fake_graph.requests.clear()
+    _watch_once()
+    assert fake_graph.count("GET", "/messages/delta") == 1
+
+
+def test_watch_runs_hook_per_message(inbox, tmp_path):
+    _watch_once()
+    inbox.add(message_resource(60), message_resource(61))
+    log = tmp_path / "hook.log"
+    script = (
+        "import json, os, sys; record = json.load(sys.stdin); "
+        f"open({str(log)!r}, 'a').write(os.environ['OUTLOOK_MESSAGE_ID'] + ' ' + record['subject'] + '\\n')"
+    )
+    records = _watch_once("--exec", shlex.join([sys.executable, "-c", script]))
+    assert records == []
+    assert log.read_text().splitlines() == ["msg-60 Message 60", "msg-61 Message 61"]
+
+
+def test_watch_warns_on_stderr_when_a_hook_fails(inbox):
+    _watch_once()
+    inbox.add(message_resource(80))
+
+    result = runner.invoke(app, ["mail", "watch", "--once", "--exec", shlex.join([sys.executable, "-c", "exit(3)"])])
+
+    assert result.exit_code == 0
+    assert "Warning: Hook exited with 3 for msg-80" in result.stderr
+    assert result.stdout == ""
+
+
+def test_watch_interrupted_mid_round_reports_it_again(inbox):
+    _watch_once()
+    inbox.add(message_resource(70), message_resource(71))
+    handled: list[str] = []
+
+    def _hook(command, record):
+        if len(handled) == 1:
+            raise KeyboardInterrupt
+        handled.append(record["id"])
+
+    with patch("outlook_cli.commands.mail_cmd._run_hook", side_effect=_hook):
+        _watch_once("--exec", "true")
+
+    assert handled == ["msg-70"]
+    assert [record["id"] for record in _watch_once()] == ["msg-70", "msg-71"]
+
+
+def test_watch_is_not_forwarded_to_the_daemon(inbox):
+    assert _command_path(["-o", "jsonl", "mail", "watch", "--once"]) == ("mail", "watch")
+    with patch("outlook_cli.daemon.forward") as forward:
+        result = runner.invoke(app, ["mail", "watch", "--once"])
+    assert result.exit_code == 0
+    forward.assert_not_called()